@@ -0,0 +1,93 @@
+'''
+Reading time of the Picasso profiles.
+
+The 'masked' row reads the variables with the netCDF4 auto-masking, as the
+Picasso reader did before, and the 'raw' row reads plain arrays with NaN for
+the fill values (NcValues). Both include the arithmetic the reader applies to
+the profiles. The last row is the complete read_data_file.
+
+Usage
+-----
+python benchmarks/bench_picasso_read.py [-n REPEAT] [-f PICASSO_FILE]
+'''
+
+import os
+import sys
+import timeit
+import argparse
+import numpy as np
+from netCDF4 import Dataset
+
+projectDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(
+    projectDir, 'include', 'iannis_b-lidar_molecular-de3d2ef2f36b'))
+sys.path.append(os.path.join(projectDir, 'src'))
+
+from polly2scc import polly_2_earlinet_convertor, NcValues, logger
+
+PROFILES = ['aerBsc_raman_355', 'aerBsc_raman_532', 'aerBsc_raman_1064',
+            'aerExt_raman_355', 'aerExt_raman_532',
+            'volDepol_raman_355', 'volDepol_raman_532',
+            'parDepol_raman_355', 'parDepol_raman_532']
+
+
+def read_masked(filename):
+    with Dataset(filename, 'r') as fh:
+        pData = fh.variables
+        altitude = pData['height'][:] + 100.0
+        temperature = pData['temperature'][:] + 273.16
+        res = [(pData[varname][:], 0.1 * pData[varname][:])
+               for varname in PROFILES]
+
+    return altitude, temperature, res
+
+
+def read_raw(filename):
+    with Dataset(filename, 'r') as fh:
+        fh.set_auto_maskandscale(False)
+        pData = fh.variables
+        pValues = NcValues(pData)
+        altitude = pValues['height'] + 100.0
+        temperature = pValues['temperature'] + 273.16
+        res = [(pValues[varname], 0.1 * pValues[varname])
+               for varname in PROFILES]
+
+    return altitude, temperature, res
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', dest='repeat', type=int, default=20,
+                        help='number of repetitions')
+    parser.add_argument(
+        '-f', dest='filename',
+        default=os.path.join(
+            projectDir, 'data',
+            '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'),
+        help='Picasso profile file')
+    args = parser.parse_args()
+
+    logger.setLevel('ERROR')
+    for handler in logger.handlers:
+        handler.setLevel('ERROR')
+
+    p2eConvertor = polly_2_earlinet_convertor(
+        'PollyXT_TROPOS', 'leipzig', fileType='picasso', category=1)
+
+    cases = [
+        ('masked (netCDF4 auto-masking)', lambda: read_masked(args.filename)),
+        ('raw (NaN for fill values)', lambda: read_raw(args.filename)),
+        ('read_data_file',
+         lambda: p2eConvertor.read_data_file(args.filename)),
+    ]
+
+    print('{0:<36s} {1:>12s}'.format('case', 'time [ms]'))
+    for label, func in cases:
+        # best of n, to suppress disturbances from other processes
+        res = timeit.repeat(func, number=1, repeat=args.repeat)
+        print('{0:<36s} {1:>12.2f}'.format(label, np.min(res) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
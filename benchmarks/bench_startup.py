@@ -0,0 +1,93 @@
+'''
+Start-up time and memory footprint of the molecular modules used by polly2scc.
+
+Every measurement runs in a fresh interpreter. The 'eager' rows import
+matplotlib.pyplot together with the module, which is what every worker paid
+before the plotting dependencies were loaded lazily.
+
+Usage
+-----
+python benchmarks/bench_startup.py [-n REPEAT]
+'''
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+projectDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+molecularDir = os.path.join(
+    projectDir, 'include', 'iannis_b-lidar_molecular-de3d2ef2f36b')
+
+CHILD_SCRIPT = '''
+import sys, time, json
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss = rss / 1024   # bytes on macOS, KiB on linux
+except ImportError:
+    rss = float('nan')
+print(json.dumps({{'time': t1 - t0, 'rss': rss,
+                  'matplotlib': 'matplotlib' in sys.modules}}))
+'''
+
+CASES = [
+    ('molecular.rayleigh_depol',
+     'import molecular.rayleigh_depol'),
+    ('molecular.rayleigh_depol (eager)',
+     'import matplotlib.pyplot\nimport molecular.rayleigh_depol'),
+    ('molecular.raman_scattering',
+     'import molecular.raman_scattering'),
+    ('molecular.raman_scattering (eager)',
+     'import matplotlib.pyplot\nimport molecular.raman_scattering'),
+]
+
+
+def run_case(imports):
+    '''
+    import the modules in a new interpreter and return the measurements.
+    '''
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [molecularDir, env.get('PYTHONPATH', '')])
+    env['MPLBACKEND'] = 'Agg'
+
+    out = subprocess.check_output(
+        [sys.executable, '-c', CHILD_SCRIPT.format(imports=imports)],
+        env=env)
+
+    return json.loads(out.decode('utf-8').strip().splitlines()[-1])
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', dest='repeat', type=int, default=5,
+                        help='number of interpreter starts per case')
+    args = parser.parse_args()
+
+    print('{0:<40s} {1:>12s} {2:>14s} {3:>11s}'.format(
+        'case', 'import [ms]', 'max RSS [MiB]', 'matplotlib'))
+
+    for label, imports in CASES:
+        try:
+            res = [run_case(imports) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError:
+            print('{0:<40s} {1:>12s}'.format(label, 'failed'))
+            continue
+
+        # best of n, to suppress disturbances from other processes
+        importTime = min([item['time'] for item in res]) * 1e3
+        rss = min([item['rss'] for item in res]) / 1024
+        print('{0:<40s} {1:>12.1f} {2:>14.1f} {3:>11s}'.format(
+            label, importTime, rss, str(res[0]['matplotlib'])))
+
+
+if __name__ == '__main__':
+    main()
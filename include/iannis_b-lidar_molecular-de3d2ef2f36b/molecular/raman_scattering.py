@@ -21,7 +21,6 @@ Fraunhofer spectrum. Applied Optics 36, 5224 (1997).
 It is not thoroughly tested, so use with care.
 '''
 import numpy as np
-from matplotlib import pyplot as plt
 
 from . import us_std
 from .constants import hc_k, hc, k_b
@@ -246,14 +245,70 @@ def delta_mol(n_incident, molecular_parameters, relative_transmissions):
 
         epsilons.append(epsilon)
 
-    numerator = np.sum([con * gamma_square * (3 * x + 1) for (con, gamma_square, x)
-                        in zip(concentrations, gamma_squares, relative_transmissions)])
-    denominator = np.sum([con * gamma_square * (3 * x + 1 + 45 / epsilon) for (con, gamma_square, x, epsilon)
-                          in zip(concentrations, gamma_squares, relative_transmissions, epsilons)])
+    # Plain sum() so that the relative transmissions can also be arrays (one value per temperature)
+    numerator = sum(con * gamma_square * (3 * x + 1) for (con, gamma_square, x)
+                    in zip(concentrations, gamma_squares, relative_transmissions))
+    denominator = sum(con * gamma_square * (3 * x + 1 + 45 / epsilon) for (con, gamma_square, x, epsilon)
+                      in zip(concentrations, gamma_squares, relative_transmissions, epsilons))
     delta_m = 3.0 / 4 * numerator / denominator
     return delta_m
 
 
+def cross_section_terms(n_incident, J_stokes, J_antistokes, molecular_parameters):
+    """ Splits the rotational Raman backscattering cross sections of both branches
+    in a temperature-independent prefactor and a normalized rotational energy,
+    so that b(J, T) = prefactor[J] / T * exp(-energy[J] / T).
+
+    Parameters
+    ----------
+    n_incident : float
+       Wavenumber of incident light [cm-1]
+    J_stokes : array of int
+       Rotational quantum numbers of the Stokes branch
+    J_antistokes : array of int
+       Rotational quantum numbers of the anti-Stokes branch
+    molecular_parameters : dict
+       A dictionary containing molecular parameters.
+
+    Returns
+    -------
+    prefactor : array
+       Stokes lines followed by anti-Stokes lines [cm^{2}sr^{-1}K]
+    energy : array
+       Rotational energy divided by the Boltzmann constant [K]
+    """
+    B0 = molecular_parameters['B0']
+
+    # Check if callable or just a number
+    gamma_square_input = molecular_parameters['gamma_square']
+
+    if callable(gamma_square_input):
+        gamma_square = gamma_square_input(n_incident)
+    else:
+        gamma_square = gamma_square_input  # Assume a float is provided
+
+    g = np.array(molecular_parameters['g'])
+    I_factor = (2 * molecular_parameters['I'] + 1) ** 2
+
+    J_s = np.asarray(J_stokes, dtype=float)
+    J_as = np.asarray(J_antistokes, dtype=float)
+
+    b_s = 64 * np.pi ** 4 * hc_k / 15
+
+    pref_stokes = b_s * g[np.remainder(J_stokes, 2)] * B0 * \
+        (n_incident + raman_shift_stokes(J_s, molecular_parameters)) ** 4 * gamma_square
+    pref_stokes = pref_stokes / I_factor * (J_s + 1) * (J_s + 2) / (2 * J_s + 3)
+
+    pref_astokes = b_s * g[np.remainder(J_antistokes, 2)] * B0 * \
+        (n_incident + raman_shift_antistokes(J_as, molecular_parameters)) ** 4 * gamma_square
+    pref_astokes = pref_astokes / I_factor * J_as * (J_as - 1) / (2 * J_as - 1)
+
+    prefactor = np.concatenate((pref_stokes, pref_astokes))
+    energy = np.concatenate((rotational_energy(J_s, molecular_parameters),
+                             rotational_energy(J_as, molecular_parameters))) / k_b
+    return prefactor, energy
+
+
 class DepolarizationLidar:
 
     def __init__(self, wavelength=532.0, fwhm=0.55):
@@ -302,7 +357,30 @@ class DepolarizationLidar:
         self.dl_astokes_O2 = 1 / \
                              (1 / self.wavelength + np.array(self.dn_astokes_O2) * 10 ** -7)
 
+        # Temperature-independent parts of the cross sections and the filter
+        # transmission of each line (Stokes lines first), evaluated once.
+        self.terms_N2 = cross_section_terms(self.wavenumber, self.J_stokes, self.J_astokes, N2_parameters)
+        self.terms_O2 = cross_section_terms(self.wavenumber, self.J_stokes, self.J_astokes, O2_parameters)
+
+        self.transmission_N2 = self.optical_filter(np.concatenate((self.dl_stokes_N2, self.dl_astokes_N2)))
+        self.transmission_O2 = self.optical_filter(np.concatenate((self.dl_stokes_O2, self.dl_astokes_O2)))
+
     def delta_mol_temperature(self, T):
+        """ Calculates the molecular depolarization ratio.
+
+        Parameters
+        ----------
+        T : float or array
+           Temperature [K]. Arrays (e.g. a full temperature profile) are
+           evaluated in one step.
+
+        Returns
+        -------
+        delta_m : float or array
+           The apparent molecular depolarization ratio.
+        x_N2, x_O2 : float or array
+           The relative transmission of the rotational Raman wings of N2 and O2.
+        """
         x_N2, x_O2 = self.rotation_contribution_temperature(T)
 
         delta_m = delta_mol(self.wavenumber, [N2_parameters, O2_parameters], [x_N2, x_O2])
@@ -310,21 +388,8 @@ class DepolarizationLidar:
         return delta_m, x_N2, x_O2
 
     def rotation_contribution_temperature(self, T):
-        ds_stokes = [cross_section_stokes(
-            self.wavenumber, J, T, N2_parameters) for J in self.J_stokes]
-        ds_astokes = [cross_section_antistokes(
-            self.wavenumber, J, T, N2_parameters) for J in self.J_astokes]
-
-        x_N2 = (np.sum(self.optical_filter(self.dl_stokes_N2) * ds_stokes) +
-                np.sum(self.optical_filter(self.dl_astokes_N2) * ds_astokes)) / (np.sum(ds_stokes) + np.sum(ds_astokes))
-
-        ds_stokes = [cross_section_stokes(
-            self.wavenumber, J, T, O2_parameters) for J in self.J_stokes]
-        ds_astokes = [cross_section_antistokes(
-            self.wavenumber, J, T, O2_parameters) for J in self.J_astokes]
-
-        x_O2 = (np.sum(self.optical_filter(self.dl_stokes_O2) * ds_stokes) +
-                np.sum(self.optical_filter(self.dl_astokes_O2) * ds_astokes)) / (np.sum(ds_stokes) + np.sum(ds_astokes))
+        x_N2 = _filtered_fraction(T, self.terms_N2, self.transmission_N2)
+        x_O2 = _filtered_fraction(T, self.terms_O2, self.transmission_O2)
         return x_N2, x_O2
 
     def delta_mol_at_altitude(self, altitudes):
@@ -335,15 +400,15 @@ class DepolarizationLidar:
         Ts = np.array([atmosphere.temperature(altitude)
                        for altitude in altitudes])
 
-        delta_mols = []
-
-        for T in Ts:
-            delta_m, _, _ = self.delta_mol_temperature(T)
-            delta_mols.append(delta_m)
+        delta_mols, _, _ = self.delta_mol_temperature(Ts)
 
         return delta_mols
 
     def plot_spectrum(self, T, molecular_parameters, figsize=(10, 5)):
+        # Imported here, so that the module can be used without loading a
+        # plotting backend (e.g. on headless processing nodes).
+        from matplotlib import pyplot as plt
+
         ds_stokes = [cross_section_stokes(
             self.wavenumber, J, T, molecular_parameters) for J in self.J_stokes]
         ds_astokes = [cross_section_antistokes(
@@ -400,6 +465,23 @@ class DepolarizationLidar:
         plt.show()
 
 
+def _filtered_fraction(T, terms, transmission):
+    """ Evaluates the (J x T) cross-section matrix in one step and returns the
+    fraction of the rotational Raman lines transmitted by the filter, for every
+    temperature in T.
+    """
+    prefactor, energy = terms
+    T = np.asarray(T, dtype=float)
+    T_row = T.reshape(1, -1)
+
+    ds = prefactor[:, np.newaxis] / T_row * np.exp(-energy[:, np.newaxis] / T_row)
+    x = np.dot(transmission, ds) / np.sum(ds, axis=0)
+
+    if T.ndim == 0:
+        return x[0]
+    return x.reshape(T.shape)
+
+
 class FilterFunction:
     def __init__(self, wavelength, fwhm):
         '''
@@ -34,7 +34,6 @@ Any comments should be sent to ioannis@inoe.ro
 
 '''
 import numpy as np
-from matplotlib import pyplot as plt
 
 from . import us_std
 
@@ -175,14 +174,48 @@ def delta_mol(n_incident, concentrations, molecular_parameters, relative_transmi
                      for parameter in molecular_parameters]
     epsilons = [parameter['epsilon'](n_incident) for parameter in molecular_parameters]
 
-    numerator = np.sum([con * gamma_square * (3 * x + 1) for (con, gamma_square, x)
-                        in zip(concentrations, gamma_squares, relative_transmisions)])
-    denominator = np.sum([con * gamma_square * (3 * x + 1 + 45. / epsilon) for (con, gamma_square, x, epsilon)
-                          in zip(concentrations, gamma_squares, relative_transmisions, epsilons)])
+    # Plain sum() so that the relative transmissions can also be arrays (one value per temperature)
+    numerator = sum(con * gamma_square * (3 * x + 1) for (con, gamma_square, x)
+                    in zip(concentrations, gamma_squares, relative_transmisions))
+    denominator = sum(con * gamma_square * (3 * x + 1 + 45. / epsilon) for (con, gamma_square, x, epsilon)
+                      in zip(concentrations, gamma_squares, relative_transmisions, epsilons))
     delta_m = 3. / 4. * numerator / denominator
     return delta_m
 
 
+def delta_sigma_terms(n_incident, J_stokes, J_astokes, molecular_parameters):
+    """ Splits the rotational Raman backscatter coefficients of both branches in a
+    temperature-independent prefactor and a normalized rotational energy, so that
+
+       delta_sigma(J, T) = prefactor[J] / T * exp(-energy[J] / T)
+
+    The Stokes lines come first, followed by the anti-Stokes lines. The result
+    is the same as calling delta_sigma_stokes/delta_sigma_antistokes for every J.
+    """
+    gamma_square = molecular_parameters['gamma_square'](n_incident)
+    g = np.array(molecular_parameters['g'])
+    B0 = molecular_parameters['B0']
+    I_factor = (2 * molecular_parameters['I'] + 1) ** 2
+
+    J_s = np.asarray(J_stokes, dtype=float)
+    J_as = np.asarray(J_astokes, dtype=float)
+
+    b_s = 64 * np.pi ** 4 * hc_k / 15.
+
+    pref_stokes = b_s * (g[np.remainder(J_stokes, 2)] * B0 *
+                         (n_incident + delta_n_stokes(J_s, molecular_parameters)) ** 4 * gamma_square)
+    pref_stokes = pref_stokes / I_factor * ((J_s + 1) * (J_s + 2)) / (2 * J_s + 3.)
+
+    pref_astokes = b_s * (g[np.remainder(J_astokes, 2)] * B0 *
+                          (n_incident + delta_n_antistokes(J_as, molecular_parameters)) ** 4 * gamma_square)
+    pref_astokes = pref_astokes / I_factor * (J_as * (J_as - 1)) / (2 * J_as - 1.)
+
+    prefactor = np.concatenate((pref_stokes, pref_astokes))
+    energy = np.concatenate((energy_rotational_norm(J_s, molecular_parameters),
+                             energy_rotational_norm(J_as, molecular_parameters)))
+    return prefactor, energy
+
+
 class DepolarizationLidar:
 
     def __init__(self, wavelength=532.0, fwhm=0.55):
@@ -220,8 +253,21 @@ class DepolarizationLidar:
         self.wl_stokes_O2 = 1e7 / (self.wavenumber - self.dn_stokes_O2)
         self.wl_astokes_O2 = 1e7 / (self.wavenumber - self.dn_astokes_O2)
 
+        # Temperature-independent parts, evaluated once per instance. The
+        # filter transmission of every line (Stokes lines first) does not
+        # depend on temperature either.
+        self.terms_N2 = delta_sigma_terms(self.wavenumber, self.J_stokes, self.J_astokes, N2_parameters)
+        self.terms_O2 = delta_sigma_terms(self.wavenumber, self.J_stokes, self.J_astokes, O2_parameters)
+
+        self.transmission_N2 = self.optical_filter(np.concatenate((self.wl_stokes_N2, self.wl_astokes_N2)))
+        self.transmission_O2 = self.optical_filter(np.concatenate((self.wl_stokes_O2, self.wl_astokes_O2)))
+
     def delta_mol_temperature(self, T):
+        """ Molecular depolarization ratio at temperature T (in Kelvin).
 
+        T can be a float or an array of temperatures, e.g. a full temperature
+        profile. An array of the same shape is returned in the latter case.
+        """
         x_N2, x_O2 = self.rotation_contribution_temperature(T)
 
         delta_m = delta_mol(self.wavenumber, [0.78084, 0.209476], [N2_parameters, O2_parameters], [x_N2, x_O2])
@@ -229,21 +275,11 @@ class DepolarizationLidar:
         return delta_m
 
     def rotation_contribution_temperature(self, T):
-        ds_stokes = np.array([delta_sigma_stokes(
-            self.wavenumber, J, T, N2_parameters) for J in self.J_stokes])
-        ds_astokes = np.array([delta_sigma_antistokes(
-            self.wavenumber, J, T, N2_parameters) for J in self.J_astokes])
-
-        x_N2 = (np.sum(self.optical_filter(self.wl_stokes_N2) * ds_stokes) +
-                np.sum(self.optical_filter(self.wl_astokes_N2) * ds_astokes)) / (np.sum(ds_stokes) + np.sum(ds_astokes))
-
-        ds_stokes = np.array([delta_sigma_stokes(
-            self.wavenumber, J, T, O2_parameters) for J in self.J_stokes])
-        ds_astokes = np.array([delta_sigma_antistokes(
-            self.wavenumber, J, T, O2_parameters) for J in self.J_astokes])
-
-        x_O2 = (np.sum(self.optical_filter(self.wl_stokes_O2) * ds_stokes) +
-                np.sum(self.optical_filter(self.wl_astokes_O2) * ds_astokes)) / (np.sum(ds_stokes) + np.sum(ds_astokes))
+        """ Relative part of the rotational Raman wings of N2 and O2 transmitted by
+        the filter at temperature T (float or array, in Kelvin).
+        """
+        x_N2 = _filtered_fraction(T, self.terms_N2, self.transmission_N2)
+        x_O2 = _filtered_fraction(T, self.terms_O2, self.transmission_O2)
         return x_N2, x_O2
 
     def delta_mol_at_altitude(self, altitudes):
@@ -254,16 +290,14 @@ class DepolarizationLidar:
         Ts = np.array([atmosphere.temperature(altitude)
                        for altitude in altitudes])
 
-        delta_mols = []
-
-        for T in Ts:
-            delta_m = self.delta_mol_temperature(T)
-            delta_mols.append(delta_m)
-
-        return delta_mols
+        return self.delta_mol_temperature(Ts)
 
     def plot_spectrum(self, T, molecular_parameters, show_filter=True, show_filtered=True, legend=True, suptitle=None,
                       figsize=(8, 5), xlim=None):
+        # Imported here, so that the module can be used without loading a
+        # plotting backend (e.g. on headless processing nodes).
+        from matplotlib import pyplot as plt
+
         ds_stokes = [delta_sigma_stokes(
             self.wavenumber, J, T, molecular_parameters) for J in self.J_stokes]
         ds_astokes = [delta_sigma_antistokes(
@@ -340,6 +374,22 @@ class DepolarizationLidar:
         plt.show()
 
 
+def _filtered_fraction(T, terms, transmission):
+    """ Evaluates the (J x T) matrix of line intensities in one step and returns
+    the filtered fraction for every temperature.
+    """
+    prefactor, energy = terms
+    T = np.asarray(T, dtype=float)
+    T_row = T.reshape(1, -1)
+
+    ds = prefactor[:, np.newaxis] / T_row * np.exp(-energy[:, np.newaxis] / T_row)
+    x = np.dot(transmission, ds) / np.sum(ds, axis=0)
+
+    if T.ndim == 0:
+        return x[0]
+    return x.reshape(T.shape)
+
+
 class FilterFunction:
 
     def __init__(self, wavelength, fwhm):
@@ -8,8 +8,11 @@ Applied Optics 34, no. 15 (May 20, 1995): 2765-2773.
 
 import numpy as np
 
-from .refractive_index import n_air
-from .molecular_properties import kings_factor_atmosphere, rho_atmosphere, epsilon_atmosphere
+from .refractive_index import n_air, molar_fraction_water_vapour, moist_air_density, \
+                              n_standard_air_with_CO2, n_water_vapor
+from .molecular_properties import kings_factor_atmosphere, rho_atmosphere, epsilon_atmosphere, \
+                                  kings_factor_N2, kings_factor_O2, kings_factor_Ar, \
+                                  kings_factor_CO2, kings_factor_H2O
 from .utilities import number_density_at_pt, rh_to_pressure
 
 ASSUME_AIR_IDEAL = True
@@ -273,3 +276,112 @@ def beta_pi_cabannes(wavelength, pressure=1013.25, temperature=288.15, C=385., r
     beta_pi = N * sigma_pi
 
     return beta_pi
+
+
+class MolecularProfile:
+
+    def __init__(self, pressure, temperature, C=385., rh=0.):
+        '''
+        Molecular scattering properties of one meteorological profile at
+        several wavelengths.
+
+        The number density, the water vapour fraction and the density terms of
+        the refractive index only depend on pressure and temperature. They are
+        evaluated once, when the object is created. The wavelength dependent
+        factors are evaluated per wavelength and broadcast over the profile,
+        so that the results are identical to the functions of this module.
+
+        Parameters
+        ----------
+        pressure: float or array
+           The atmospheric pressure [hPa]
+        temperature: float or array
+           The atmospheric temperature [K]
+        C: float
+           CO2 concentration [ppmv].
+        rh: float or array
+           Relative humidity from 0 to 100 [%]
+
+        Available methods:
+
+        sigma(wavelength)   - Rayleigh-scattering cross section [m2]
+        alpha(wavelength)   - Rayleigh extinction coefficient [m-1]
+        beta_pi(wavelength) - Rayleigh backscatter coefficient [m-1sr-1]
+
+        The methods accept a scalar or a list of wavelengths [nm]. For a list,
+        the result has an additional leading wavelength axis.
+        '''
+        self.pressure = np.array(pressure, dtype=float)
+        self.temperature = np.array(temperature, dtype=float)
+        self.C = C
+        self.rh = rh
+
+        # Temperature and pressure dependent terms, independent of wavelength
+        self.p_e = rh_to_pressure(rh, self.temperature)
+        self.N = number_density_at_pt(self.pressure, self.temperature, rh, ideal=ASSUME_AIR_IDEAL)
+
+        Xw = molar_fraction_water_vapour(self.pressure, self.temperature, rh)
+        rho_axs, _, _ = moist_air_density(1013.25, 288.15, C, 0)
+        rho_ws, _, _ = moist_air_density(13.33, 293.15, 0, 1)  # C not relevant
+        _, rho_a, rho_w = moist_air_density(self.pressure, self.temperature, C, Xw)
+        self.density_ratio_air = rho_a / rho_axs
+        self.density_ratio_wv = rho_w / rho_ws
+
+        # Gas concentrations used in the King's factor
+        self.c_h2o = self.p_e / self.pressure
+        self.c_tot = 0.78084 + 0.20946 + 0.00934 + 1e-6 * C + self.c_h2o
+
+    def _wavelength(self, wavelength):
+        ''' Wavelength as column vector, so that it broadcasts over the profile. '''
+        wavelength = np.array(wavelength, dtype=float)
+
+        if not np.all((wavelength >= 200) & (wavelength <= 4000)):
+            raise ValueError("King's factor formula is only valid from 0.2 to 4um.")
+
+        return wavelength.reshape(wavelength.shape + (1,) * self.pressure.ndim)
+
+    def refractive_index(self, wavelength):
+        ''' Refractive index of air, see refractive_index.n_air. '''
+        wl = self._wavelength(wavelength)
+
+        n_axs = n_standard_air_with_CO2(wl, self.C)
+        n_ws = n_water_vapor(wl)
+
+        return 1 + self.density_ratio_air * (n_axs - 1) + self.density_ratio_wv * (n_ws - 1)
+
+    def kings_factor(self, wavelength):
+        ''' King's factor of the atmosphere, see molecular_properties.kings_factor_atmosphere. '''
+        wl = self._wavelength(wavelength)
+        wavenumber = 1 / (wl * 10 ** -7)
+
+        F_dry = 0.78084 * kings_factor_N2(wavenumber) + 0.20946 * kings_factor_O2(wavenumber) + \
+            0.00934 * kings_factor_Ar() + 1e-6 * self.C * kings_factor_CO2()
+
+        return (F_dry + self.c_h2o * kings_factor_H2O()) / self.c_tot
+
+    def sigma(self, wavelength):
+        ''' Rayleigh-scattering cross section per molecule [m2], see sigma_rayleigh. '''
+        wl_m = self._wavelength(wavelength) * 10 ** -9
+
+        n = self.refractive_index(wavelength)
+        f_k = self.kings_factor(wavelength)
+
+        f1 = (24. * np.pi ** 3) / (wl_m ** 4 * self.N ** 2)
+        f2 = (n ** 2 - 1.) ** 2 / (n ** 2 + 2.) ** 2
+
+        return f1 * f2 * f_k
+
+    def alpha(self, wavelength):
+        ''' Rayleigh extinction coefficient [m-1], see alpha_rayleigh. '''
+        return self.N * self.sigma(wavelength)
+
+    def beta_pi(self, wavelength):
+        ''' Rayleigh backscatter coefficient [m-1sr-1], see beta_pi_rayleigh. '''
+        f_k = self.kings_factor(wavelength)
+
+        # Phase function at 180 degrees
+        r = (6 * f_k - 6) / (7 * f_k + 3)
+        gamma = r / (2 - r)
+        phase = 3 / (4 * (1 + 2 * gamma)) * ((1 + 3 * gamma) + (1 - gamma)) / (4 * np.pi)
+
+        return self.sigma(wavelength) * phase * self.N
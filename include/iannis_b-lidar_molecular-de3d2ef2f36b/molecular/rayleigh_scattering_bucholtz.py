@@ -296,6 +296,65 @@ def atmospheric_optical_depth(wavelength, pressure, temperature, altitude):
     return tau
 
 
+def atmospheric_optical_depth_profile(wavelength, pressure, temperature, altitude):
+    r"""
+    Calculate the cumulative Rayleigh optical depth and the two-way transmission
+    for every bin of a profile.
+    
+    Parameters
+    ----------
+    wavelength: float or array of floats
+       The wavelength(s) of the radiation [nanometers].
+    pressure: array
+       The pressure profile [mbars].
+    temperature: array
+       The temperature profile [K].
+    altitude: array
+       The altitude corresponding to the profiles of the physical quantities,
+       in increasing order. [km]
+       
+    Returns
+    -------
+    tau: array
+       The optical depth between the first altitude bin and each altitude bin.
+       Shape (wavelengths, altitudes), or (altitudes,) for a single wavelength.
+    transmission: array
+       The two-way atmospheric transmission, same shape as tau.
+       
+    Notes
+    -----
+    The cross section is calculated once per wavelength and scaled with the
+    number density of each bin (see `volume_scattering_coefficient`):
+    
+    .. math::
+       \tau(\lambda, z) = \int_{z_0}^{z} \beta_s(\lambda) \frac{P(z')}{P_s} \frac{T_s}{T(z')} dz'
+       
+       T^2(\lambda, z) = e^{-2 \tau(\lambda, z)}
+    
+    The integral is evaluated with the cumulative trapezoidal rule, so the
+    last bin equals the result of `atmospheric_optical_depth` for the same
+    profile.
+    """
+    wavelength = np.asarray(wavelength, dtype=float)
+    pressure = np.asarray(pressure, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+
+    #   One cross section per wavelength. [cm^2]
+    sigma = scattering_cross_section(np.atleast_1d(wavelength))
+
+    #   Total Rayleigh volume-scattering coefficient of all wavelengths. [km^-1]
+    beta_km = (N_s * sigma)[:, np.newaxis] * (pressure * T_s / (P_s * temperature))[np.newaxis, :] * 1E+5
+
+    #   Cumulative trapezoid, starting with 0 at the first bin.
+    tau = cumtrapz(beta_km, altitude, axis=-1, initial=0)
+    transmission = np.exp(-2 * tau)
+
+    if wavelength.ndim == 0:
+        return tau[0], transmission[0]
+
+    return tau, transmission
+
+
 def depolarization_factor(wavelength):
     r"""
     Calculate the depolarization factor for a specific wavelength.
@@ -161,4 +161,32 @@ def atmospheric_optical_depth_us_std(wavelength, zmin=0, zmax=50000):
     pressures = np.array([atm.pressure(z_i) for z_i in z])
 
     optical_depth = atmospheric_optical_depth(wavelength, pressures, temperatures, z / 1000.)  # / 1000, convert to Km, to be compatible with base OD function
-    return optical_depth
\ No newline at end of file
+    return optical_depth
+
+
+def atmospheric_optical_depth_profile_us_std(wavelength, altitude):
+    r"""
+    Calculate the cumulative Rayleigh optical depth and the two-way transmission
+    of the US standard atmosphere at every altitude bin.
+
+    Parameters
+    ----------
+    wavelength: float or array of floats
+        The wavelength(s) of the radiation [nanometers].
+    altitude: array
+        The altitude bins, in increasing order. [m]
+
+    Returns
+    -------
+    tau: array
+        The optical depth between the first and each altitude bin.
+    transmission: array
+        The two-way atmospheric transmission.
+    """
+    altitude = np.asarray(altitude, dtype=float)
+
+    atm = Atmosphere()
+    temperatures = np.array([atm.temperature(z_i) for z_i in altitude])
+    pressures = np.array([atm.pressure(z_i) for z_i in altitude])
+
+    return atmospheric_optical_depth_profile(wavelength, pressures, temperatures, altitude / 1000.)  # / 1000, convert to Km
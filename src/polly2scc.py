@@ -5,14 +5,42 @@ import logging
 import glob
 import re
 import argparse
+import hashlib
+import json
+import csv
+import copy
+import fnmatch
+import sqlite3
+import shutil
+import socket
+import multiprocessing
+import tempfile
+import threading
+import time
+import bisect
+import socketserver
+import functools
+import queue
+import http.client
+import urllib.parse
 import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, \
+    wait, FIRST_COMPLETED, as_completed
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from types import SimpleNamespace
 from pbr.version import VersionInfo
 from packaging import version
 from datetime import datetime, timedelta, timezone
 from argparse import RawTextHelpFormatter
+from http.server import HTTPServer, BaseHTTPRequestHandler
 from netCDF4 import Dataset
 from scipy.interpolate import interp1d
 from molecular.rayleigh_scattering import *
+from molecular.rayleigh_depol import DepolarizationLidar
+from molecular.rayleigh_scattering_bucholtz import \
+    atmospheric_optical_depth_profile
 
 LOG_MODE = 'DEBUG'
 LOGFILE = 'log'
@@ -23,6 +51,123 @@ METADATA_FILE = 'metadata_klett_raman.toml'
 CAMPAIGN_LIST_FILE = 'campaign_list.toml'
 NETCDF_FORMAT = "NETCDF4"
 NETCDF_COMPLEVEL = 5   # netCDF compression level
+# wavelengths of the depolarization channels [nm]. The FWHM of their filters
+# is configured per campaign in the campaign list (depol_filter_fwhm_355 ...)
+DEPOL_WAVELENGTHS = [355, 532]
+WAVELENGTHS = [355, 532, 1064]   # emission wavelengths [nm]
+EARLINET_PRODUCTS = ['b355', 'e355', 'b532', 'e532', 'b1064']
+BACKSCATTER_METHODS = ['raman', 'klett']
+MOLECULAR_CACHE_SIZE = 64   # number of molecular cache entries per process
+PROFILE_BLOCK_ROWS = 32   # number of per-bin quantities per profile block
+PROFILE_STORE_MAGIC = b'P2SSTORE'   # leading bytes of the profile store files
+PROFILE_STORE_VERSION = 2
+PROFILE_STORE_EXT = '.p2s'
+# container entries which are not saved in the profile store ('altitude' is
+# restored from 'height', the height above the station)
+PROFILE_STORE_SKIP_KEYS = ['molecular_profile', 'altitude']
+# file patterns of the input files, used for indexing the archive
+LABVIEW_FILE_PATTERN = '*smooth.txt'
+PICASSO_FILE_PATTERN = '*_profiles.nc'
+CATALOGUE_FILE = 'polly2scc_catalogue.sqlite'
+FINGERPRINT_CHUNK = 65536   # bytes from head and tail for file fingerprints
+# start time in the filenames of the input files
+# labview: le_arielle-20190723_2100-0058-49smooth.txt
+# picasso: 2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc
+# (regex, time format, time resolution of the filename)
+FILENAME_TIME_PATTERNS = [
+    (r'(?<=-)\d{8}_\d{4}(?=-\d{4}-)', '%Y%m%d_%H%M', timedelta(minutes=1)),
+    (r'^\d{4}_\d{2}_\d{2}(?=_)', '%Y_%m_%d', timedelta(days=1))]
+PREFETCH_BUDGET = 512   # default size limit of the prefetched files [MB]
+# conversion status of the input files in the run report
+STATUS_CONVERTED = 'converted'
+STATUS_SKIPPED_EXISTING = 'skipped-existing'   # all the output files exist
+STATUS_UNSUPPORTED_KLETT = 'unsupported-klett'
+STATUS_NO_CAMPAIGN = 'no-campaign'
+STATUS_ERROR = 'error'
+REPORT_FIELDS = ['file', 'status', 'message', 'methods', 'written',
+                 'skipped', 'read_time', 'write_time', 'total_time']
+WRITE_QUEUE_SIZE = 10   # default number of pending writes per writer
+JOURNAL_SYNC_INTERVAL = 10   # interval for syncing the journal to disk [s]
+# peak memory of converting a file: base [B] + factor * file size, before
+# the calibration with the measured peaks (see `MemoryModel`)
+MEMORY_MODEL = {'labview': (16 * 1024 ** 2, 12.0),
+                'picasso': (16 * 1024 ** 2, 24.0)}
+MEMORY_SAMPLES = 50   # measured peaks per file type used for the calibration
+# percentile of the ratios between the measured and the estimated peaks,
+# used as calibration factor (robust against single outliers)
+MEMORY_PERCENTILE = 90
+CLAIM_DIR = '.polly2scc_claims'   # claim folder in the output directory
+CLAIM_STALE = 600   # age of a claim without heartbeat before it is stolen [s]
+CLAIM_POLL_INTERVAL = 5   # interval for checking the claims of others [s]
+JOB_QUEUE_FILE = 'polly2scc_jobs.sqlite'
+# options of `polly2scc` which are saved with the submitted jobs
+JOB_OPTIONS = ['polly_type', 'location', 'file_type', 'category', 'method',
+               'filename', 'output_dir', 'range_lim_b', 'range_lim_e',
+               'camp_info', 'force', 'range_variants', 'store_dir', 'query',
+               'catalogue_file', 'recursive', 'since', 'until', 'writers',
+               'report', 'trace_file']
+JOB_STATES = ['queued', 'running', 'done', 'dead']
+JOB_MAX_ATTEMPTS = 3   # attempts of a job before it is dead-lettered
+JOB_LEASE = 600   # lease of a running job, renewed by the worker [s]
+JOB_BACKOFF = 60   # delay before the first retry, doubled for each retry [s]
+JOB_POLL_INTERVAL = 5   # interval for polling the queue when it is empty [s]
+# a running job is only preempted by a job of a higher class which was not
+# taken by an idle worker for this multiple of the poll interval
+JOB_PREEMPT_POLLS = 2
+JOB_THROUGHPUT_WINDOW = 3600   # time window for the queue throughput [s]
+# priority classes of the jobs, from the highest priority. Real-time jobs
+# (recent measurements) are run before the backfill of older measurements.
+PRIORITY_CLASSES = ['realtime', 'backfill']
+REALTIME_WINDOW = timedelta(days=2)   # age of measurements for real-time jobs
+LATENCY_PERCENTILES = [50, 90, 99]   # reported percentiles of job latency
+# (name, type, help, label names) of the metrics (see `MetricsRegistry`)
+METRICS = [
+    ('polly2scc_files_total', 'counter',
+     'Input files by conversion status.', ['status']),
+    ('polly2scc_products_written_total', 'counter',
+     'EARLINET files written by product type.', ['product']),
+    ('polly2scc_written_bytes_total', 'counter',
+     'Size of the written EARLINET files in bytes.', []),
+    ('polly2scc_errors_total', 'counter',
+     'Failed input files and writes by error class.', ['error']),
+    ('polly2scc_stage_seconds', 'histogram',
+     'Duration of the conversion stages (read, write, total) of the ' +
+     'input files.', ['stage']),
+    ('polly2scc_cache_hits_total', 'counter', 'Cache hits.', ['cache']),
+    ('polly2scc_cache_misses_total', 'counter', 'Cache misses.', ['cache']),
+    ('polly2scc_queue_jobs', 'gauge',
+     'Jobs of the job queue by state.', ['state']),
+    ('polly2scc_uploads_total', 'counter',
+     'Uploaded EARLINET files by upload status.', ['status']),
+    ('polly2scc_uploaded_bytes_total', 'counter',
+     'Size of the uploaded EARLINET files in bytes.', [])]
+METRICS_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120]   # [s]
+TRACE_SUMMARY_TOP = 20   # slowest spans shown by `summarize_trace`
+UPLOAD_JOURNAL = 'polly2scc_upload.journal'
+UPLOAD_CONNECTIONS = 4   # concurrent uploads over keep-alive connections
+UPLOAD_MAX_ATTEMPTS = 5   # attempts of an upload before it fails
+UPLOAD_BACKOFF = 1.0   # delay before the first retry, doubled each time [s]
+UPLOAD_TIMEOUT = 60   # timeout of the upload connections [s]
+# environment variable with the bearer token for the upload endpoint
+UPLOAD_TOKEN_ENV = 'POLLY2SCC_UPLOAD_TOKEN'
+UPLOAD_CHUNK = 65536   # block size for the checksums and uploads [B]
+# upload status of the EARLINET files
+STATUS_UPLOADED = 'uploaded'
+STATUS_UPLOAD_EXISTS = 'exists'   # the endpoint has the same file
+UPLOAD_FIELDS = ['file', 'status', 'message', 'checksum', 'size',
+                 'attempts', 'upload_time']
+# required content of the EARLINET files of each product
+EARLINET_PRODUCTS_FILE = 'earlinet_products.toml'
+# product type in the filenames of the EARLINET files
+PRODUCT_PATTERN = r'_(b355|e355|b532|e532|b1064)\.nc$'
+VALIDATE_MAX_VALUES = 16   # variables up to this size are checked by value
+# verdicts of `validate_file`
+STATUS_VALID = 'valid'
+STATUS_INVALID = 'invalid'
+VALIDATE_FIELDS = ['file', 'product', 'status', 'problems', 'time']
+# the netCDF/HDF5 library is not thread-safe. All netCDF access from threads
+# other than the main thread has to hold the lock.
+NETCDF_LOCK = threading.RLock()
 PROJECTDIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 
 # initialize the logger
@@ -78,2579 +223,7666 @@ def find_in_string(dec, inStr):
     return val
 
 
-class polly_2_earlinet_convertor(object):
-    """
-    Description
-    -----------
-    convert the polly data into EARLINET format
+def read_nc_variable(ncVar):
+    '''
+    read the netCDF variable into a plain ndarray. The dataset should be
+    opened with `set_auto_maskandscale(False)`. As with the auto-masking of
+    netCDF4, the raw values equal to _FillValue or missing_value are masked
+    before scale_factor/add_offset are applied, and the masked values are
+    replaced by NaN (integer variables become float if any is masked).
 
-    Method
-    ------
-    read_data_file:
-        read polly results into data container of 'variables', 'dimensions' and
-        'global_attri'
-    search_data_files:
-        search the polly data files through wildcards
-    write_to_earlinet_nc:
-        write data container into EARLINET nc files
+    Parameters
+    ----------
+    ncVar: netCDF4.Variable
 
-    History
+    Returns
     -------
-    2019-09-09. First edition by Zhenping
-    """
+    values: ndarray
+    '''
 
-    def __init__(self, pollyType='', location='', fileType='labview',
-                 category=2, method='raman', output_dir='', *,
-                 camp_info_file='', force=False):
-        '''
-        initialize the instance
+    values = ncVar[:]
 
-        parameters
-        ----------
-        pollyType: str
-            polly type. e.g., pollyxt_tropos
-        location: str
-            location of the campaign.
-        fileType: str
-            polly file type. (labview | picasso)
-        category: int
-            category of the results.
-        method: str
-            Klett or Raman method for calculating backscatter values (klett |
-            raman)
-        output_dir: str
-            directory for saving the converted files
+    mask = np.zeros(np.shape(values), dtype=bool)
+    if values.dtype.kind in 'iuf':
+        for attr in ['_FillValue', 'missing_value']:
+            if hasattr(ncVar, attr):
+                mask |= np.isin(values, np.ravel(getattr(ncVar, attr)))
 
-        Keywords
-        --------
-        camp_info_file: str
-            campaign info file to provide the global attributes.
-        force: boolean
-            flag to control whether to overwirte the netCDF files.
-        '''
+    if hasattr(ncVar, 'scale_factor') or hasattr(ncVar, 'add_offset'):
+        values = values * getattr(ncVar, 'scale_factor', 1) + \
+            getattr(ncVar, 'add_offset', 0)
 
-        # initialize the class variables
-        self.pollyType = pollyType
-        self.location = location
-        self.fileType = fileType
-        self.category = category
-        self.method = method
-        self.projectDir = PROJECTDIR
-        self.outputDir = output_dir
-        self.force = force
+    if mask.any():
+        if values.dtype.kind != 'f':
+            values = values.astype(np.double)
+        values[mask] = np.nan
 
-        # setup the campaign config file
-        self.camp_info_file = os.path.join(
-            self.projectDir, 'config', camp_info_file)
+    return values
 
-        # load conversion key
-        self.conversion_key = self.load_convert_key_config()
 
-        # load campaign list
-        self.campaign_dict = self.load_campaign_list()
+def read_nc_attributes(ncVariables):
+    '''
+    attributes of the netCDF variables, which can be used without accessing
+    the netCDF file again, e.g., `attris['aerBsc_raman_355'].retrieving_info`.
 
-        # load metadata for the nc variables
-        # if self.method.lower()=='raman':
-        #     METADATA_FILE = 'metadata_klett_raman.toml'
-        # elif self.method.lower()=='klett':
-        #     METADATA_FILE = 'metadata_klett_raman.toml'
-        metadataFile = os.path.join(self.projectDir, 'config', METADATA_FILE)
-        self.metadata = self.load_metadata(metadataFile)
+    Parameters
+    ----------
+    ncVariables: dict
+        netCDF variables of the dataset.
 
-        # get instrument list
-        instrument_list = []
-        for camp_label in self.campaign_dict:
-            instrument_list.append(self.campaign_dict[camp_label]['system'])
-        self.instrument_list = list(set(instrument_list))
+    Returns
+    -------
+    attris: OrderedDict
+        attributes of each variable.
+    '''
 
-        # get location list
-        location_list = []
-        for camp_label in self.campaign_dict:
-            location_list.append(self.campaign_dict[camp_label]['location'])
-        self.location_list = list(set(location_list))
+    return OrderedDict(
+        (varname, SimpleNamespace(**ncVar.__dict__))
+        for varname, ncVar in ncVariables.items())
 
-    def load_metadata(self, filename):
-        '''
-        load the metadata for output nc files.
 
-        Parameters
-        ----------
-        filename: str
-            absolute path of the metadata file.
-        Returns
-        -------
-        metaData: dict
-            metadata.
-        '''
+def parse_range_variant(spec):
+    '''
+    parse the specification of a named range variant.
 
-        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
-            logger.error(
-                'metadata file does not exist!\n{file}'.format(filename))
-            raise FileNotFoundError
+    Parameters
+    ----------
+    spec: str
+        'name:bottom:top' or 'name:bottom:top:products', with the products
+        separated by comma. e.g., 'cut:500:8000:b532,e532'.
 
-        with open(filename, 'r', encoding='utf-8') as fh:
-            metaData = toml.loads(fh.read())
+    Returns
+    -------
+    variant: tuple
+        (name, [bottom, top], products). products is None for all products.
 
-        return metaData
+    Examples
+    --------
+    >>> parse_range_variant('cut:500:8000:b532')
+    ('cut', [500.0, 8000.0], ['b532'])
+    '''
 
-    def load_campaign_list(self):
-        '''
-        load the campaign information list into a dict.
+    items = spec.split(':')
+    if len(items) not in [3, 4]:
+        raise argparse.ArgumentTypeError(
+            'range variant must be name:bottom:top[:products], ' +
+            'got {0}'.format(spec))
+
+    name = items[0]
+    if not re.match(r'^[A-Za-z0-9-]+$', name):
+        raise argparse.ArgumentTypeError(
+            'range variant name may only contain letters, digits and ' +
+            "'-', got {0}".format(name))
+    if name.lower() in BACKSCATTER_METHODS + EARLINET_PRODUCTS:
+        # would be mistaken for the method or product in the filenames
+        raise argparse.ArgumentTypeError(
+            'range variant name must not be a method or product, ' +
+            'got {0}'.format(name))
 
-        Returns
-        -------
-        camp_dict: dict
-            campaign dict.
-        '''
+    try:
+        rangeLim = [float(items[1]), float(items[2])]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            'invalid range of variant {0}: {1}'.format(name, spec))
+
+    if len(items) == 4:
+        prods = [prod.strip() for prod in items[3].split(',')]
+        unknown = [prod for prod in prods if prod not in EARLINET_PRODUCTS]
+        if unknown:
+            raise argparse.ArgumentTypeError(
+                'unknown products of variant {0}: {1} (choose from {2})'.
+                format(name, ', '.join(unknown),
+                       ', '.join(EARLINET_PRODUCTS)))
+    else:
+        prods = None
 
-        camp_list_file = os.path.join(
-            self.projectDir, 'config', CAMPAIGN_LIST_FILE)
+    return name, rangeLim, prods
 
-        # check the campaign list file
-        if (not os.path.exists(camp_list_file)) or \
-           (not os.path.isfile(camp_list_file)):
-            logger.error(
-                'campaign list file does not exist!\n{file}'.format(
-                    file=camp_list_file))
-            raise FileNotFoundError
 
-        with open(camp_list_file, 'r', encoding='utf-8') as fh:
-            camp_dict = toml.loads(fh.read())
+def parse_quota(spec):
+    '''
+    parse the concurrency quota of a priority class from the command line.
+    ('class=number', e.g., 'backfill=2')
+    '''
 
-        # convert the timestamp to datetime object
-        for camp_label in camp_dict:
-            camp_dict[camp_label]['starttime'] = datetime.strptime(
-                camp_dict[camp_label]['starttime'], '%Y-%m-%d %H:%M:%S')
-            camp_dict[camp_label]['endtime'] = datetime.strptime(
-                camp_dict[camp_label]['endtime'], '%Y-%m-%d %H:%M:%S')
+    items = spec.split('=')
+    if (len(items) != 2) or (items[0] not in PRIORITY_CLASSES):
+        raise argparse.ArgumentTypeError(
+            'invalid quota {0} (e.g., backfill=2)'.format(spec))
+    try:
+        quota = int(items[1])
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            'invalid quota {0} (e.g., backfill=2)'.format(spec))
 
-        return camp_dict
+    return items[0], quota
 
-    def load_convert_key_config(self):
-        '''
-        load the convert key for mapping the labview/picasso configurations to
-        EARLINET standard configurations.
 
-        Returns
-        -------
-        conversion_key: dict
-            conversion keys.
-        '''
+def parse_datetime(value):
+    '''
+    parse the datetime from the command line. ('YYYY-mm-dd',
+    'YYYY-mm-dd HH:MM', 'YYYY-mm-ddTHH:MM' or 'YYYYmmdd')
+    '''
 
-        if self.fileType.lower() == 'labview':
-            convert_key_filepath = os.path.join(
-                self.projectDir, 'config', LABVIEW_KEY_FILE)
-        elif self.fileType.lower() == 'picasso':
-            convert_key_filepath = os.path.join(
-                self.projectDir, 'config', PICASSO_KEY_FILE)
+    for timeFormat in ['%Y-%m-%d', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M',
+                       '%Y%m%d']:
+        try:
+            return datetime.strptime(value, timeFormat)
+        except ValueError:
+            continue
 
-        if (not os.path.exists(convert_key_filepath)) or \
-           (not os.path.isfile(convert_key_filepath)):
-            logger.error(
-                'file does not exist!\n{file}'.format(
-                    file=convert_key_filepath))
-            raise FileNotFoundError
+    raise argparse.ArgumentTypeError(
+        'invalid datetime {0} (e.g., 2020-05-06 or 2020-05-06 12:00)'.format(
+            value))
 
-        # load conversion key
-        try:
-            with open(convert_key_filepath, 'r', encoding='utf-8') as fh:
-                conversion_key = toml.loads(fh.read())
-        except Exception as e:
-            logger.error(
-                'Failure in reading {file}'.format(
-                    file=convert_key_filepath))
-            raise IOError
 
-        return conversion_key
+def filename_time(basename):
+    '''
+    start time of the profile from the labview or Picasso filename.
 
-    def load_camp_info(self, camp_info_file=None):
-        '''
-        load the campain information
+    Parameters
+    ----------
+    basename: str
+        filename of the data file.
 
-        Parameters
-        ----------
-        camp_info_file: str
-            absolute path of campaign information file.
+    Returns
+    -------
+    timeSpan: tuple
+        (start, stop) of the time, which can be resolved from the filename.
+        Picasso filenames only contain the date, so that the span is the
+        whole day. None if the filename does not follow the conventions.
+    '''
 
-        Returns
-        -------
-        camp_info: dict
-            campaign information
-        '''
+    for pattern, timeFormat, resolution in FILENAME_TIME_PATTERNS:
+        match = re.search(pattern, basename)
+        if match:
+            try:
+                start = datetime.strptime(match.group(0), timeFormat)
+            except ValueError:
+                return None
+            return start, start + resolution
 
-        if (not os.path.exists(camp_info_file)) or \
-           (not os.path.isfile(camp_info_file)):
-            logger.error(
-                'campaign configuration file does not exist!\n{file}'
-                .format(file=camp_info_file))
-            raise FileNotFoundError
+    return None
 
-        with open(camp_info_file, 'r', encoding='uft-8') as fh:
-            camp_info = toml.loads(fh.read())
 
-        return camp_info
+def _directory_time_span(dateParts):
+    '''
+    time span of a year/month/day directory. dateParts are the integer
+    components from the directory names, e.g., [2020, 5].
+    '''
 
-    def read_data_file(self, filename, *args, **kwargs):
-        '''
-        read the data from the polly data file (labview or picasso style)
+    start = datetime(*(list(dateParts) + [1] * (3 - len(dateParts))))
+    if len(dateParts) == 1:
+        stop = datetime(dateParts[0] + 1, 1, 1)
+    elif len(dateParts) == 2:
+        stop = datetime(dateParts[0] + dateParts[1] // 12,
+                        dateParts[1] % 12 + 1, 1)
+    else:
+        stop = start + timedelta(days=1)
 
-        Parameters
-        ----------
-        filename: str
-            absolute path of the data file.
+    return start, stop
 
-        Returns
-        -------
-        dims: dict
-            dimensions
-        data: dict
-            data
-        global_attri: dict
-            global attributes
-        '''
 
-        if self.fileType.lower() == 'labview':
-            dims, data, global_attri = \
-                self.__read_labview_results(filename, **kwargs)
-        elif self.fileType.lower() == 'picasso':
-            dims, data, global_attri = \
-                self.__read_picasso_results(filename, **kwargs)
-        else:
-            logger.error(
-                'Wrong input of fileType: {fileType}'.format(
-                    fileType=self.fileType))
+def _in_time_window(timeSpan, since, until):
+    '''
+    whether the time span (start, stop) overlaps with [since, until).
+    '''
 
-        return dims, data, global_attri
+    return ((since is None) or (timeSpan[1] > since)) and \
+        ((until is None) or (timeSpan[0] < until))
 
-    def list_avail_prodType(self, variable):
-        '''
-        list available earlinet products that can be converted to.
 
-        Parameters
-        ----------
-        variable: dict
-            Data container.
+def _directory_date_part(name, dateParts):
+    '''
+    integer value of the year/month/day directory name following dateParts,
+    or None if the name is not part of a date.
+    '''
 
-        Returns
-        -------
-        availProdList: list
-            available product list that can be converted.
-        '''
+    limits = [(4, 1900, 2999), (2, 1, 12), (2, 1, 31)]
+    if (len(dateParts) == 3) or \
+       (len(name) != limits[len(dateParts)][0]) or (not name.isdigit()):
+        return None
 
-        availProdList = []
+    value = int(name)
+    if limits[len(dateParts)][1] <= value <= limits[len(dateParts)][2]:
+        try:
+            _directory_time_span(list(dateParts) + [value])
+        except ValueError:
+            # no valid date, e.g., 2019/02/30
+            return None
+        return value
+    else:
+        return None
 
-        if variable is None:
-            # when no campaign info file was found or data is lost
-            return
 
-        # determine b355
-        if ('pdr_355' in variable.keys()) and \
-           ('vdr_355' in variable.keys()) and \
-           ('bsc_355' in variable.keys()):
-            availProdList.append('b355')
+def iter_data_files(directory, patterns, recursive=False, since=None,
+                    until=None):
+    '''
+    generator of the data files in the directory, which is scanned lazily
+    with os.scandir.
 
-        # determine e355
-        if ('ext_355' in variable.keys()) and \
-           ('bsc_355' in variable.keys()):
-            availProdList.append('e355')
+    Parameters
+    ----------
+    directory: str
+        directory of the data files.
+    patterns: str or list
+        filename patterns with wildcards. e.g., '*smooth.txt'
+    recursive: boolean
+        whether to search the sub directories.
+    since: datetime
+        only files with the start time in the filename from since on.
+    until: datetime
+        only files with the start time in the filename before until.
+
+    Yields
+    ------
+    filename: str
+        path of the data file. Files of a directory are yielded in
+        alphabetical order. With time limits, files without the start time
+        in the filename are skipped, and year/month/day sub directories
+        outside the time window are not searched.
+    '''
 
-        # determine b532
-        if ('pdr_532' in variable.keys()) and \
-           ('vdr_532' in variable.keys()) and \
-           ('bsc_532' in variable.keys()):
-            availProdList.append('b532')
+    if isinstance(patterns, str):
+        patterns = [patterns]
 
-        # determine e532
-        if ('ext_532' in variable.keys()) and \
-           ('bsc_532' in variable.keys()):
-            availProdList.append('e532')
+    # directories to be searched, with the date from year/month/day folders
+    stack = [(directory or os.curdir, [])]
+    while stack:
+        path, dateParts = stack.pop()
+        try:
+            entries = sorted(os.scandir(path), key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning('Failed in scanning {path}: {err}'.format(
+                path=path, err=e))
+            continue
+
+        subDirs = []
+        for entry in entries:
+            if entry.is_dir():
+                if recursive and (not entry.name.startswith('.')):
+                    subDirs.append(entry)
+                continue
+
+            if not any(fnmatch.fnmatch(entry.name, pattern) and
+                       (pattern.startswith('.') or
+                        not entry.name.startswith('.'))
+                       for pattern in patterns):
+                continue
+
+            if (since is not None) or (until is not None):
+                timeSpan = filename_time(entry.name)
+                if timeSpan is None:
+                    logger.debug(
+                        'No time in filename {0}. Skipped!'.format(
+                            entry.path))
+                    continue
+                if not _in_time_window(timeSpan, since, until):
+                    continue
+
+            yield entry.path
+
+        # depth-first, in alphabetical order
+        for entry in reversed(subDirs):
+            subDateParts = dateParts
+            value = _directory_date_part(entry.name, dateParts)
+            if value is not None:
+                subDateParts = dateParts + [value]
+                if not _in_time_window(
+                        _directory_time_span(subDateParts), since, until):
+                    continue
+
+            stack.append((entry.path, subDateParts))
+
+
+def to_json_value(value):
+    '''
+    convert the value into JSON-serializable types. numpy arrays and scalars
+    are tagged with their dtype, so that from_json_value restores them.
+    '''
 
-        # determine b1064
-        if ('bsc_1064' in variable.keys()):
-            availProdList.append('b1064')
+    if isinstance(value, (np.ndarray, np.generic)):
+        return {
+            '__ndarray__': np.asarray(value).tolist(),
+            'dtype': np.asarray(value).dtype.str,
+            'ndim': np.ndim(value)
+        }
+    elif isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    else:
+        return value
 
-        return availProdList
 
-    def search_data_files(self, filename, filepath=None):
+def from_json_value(value):
+    '''
+    inverse of to_json_value.
+    '''
+
+    if isinstance(value, dict) and ('__ndarray__' in value):
+        array = np.array(value['__ndarray__'], dtype=np.dtype(value['dtype']))
+        if value['ndim'] == 0:
+            # numpy scalar
+            return array[()]
+        return array
+    elif isinstance(value, list):
+        return [from_json_value(item) for item in value]
+    else:
+        return value
+
+
+class NcValues(dict):
+    '''
+    values of netCDF variables, which are read with read_nc_variable (holding
+    NETCDF_LOCK) when they are accessed for the first time.
+    '''
+
+    def __init__(self, ncVariables):
+        super().__init__()
+        self.ncVariables = ncVariables
+
+    def __missing__(self, varname):
+        with NETCDF_LOCK:
+            self[varname] = read_nc_variable(self.ncVariables[varname])
+
+        return self[varname]
+
+
+class MolecularCache(object):
+    """
+    Description
+    -----------
+    least-recently-used cache for molecular profiles. The profiles from one
+    sounding (GDAS1 or radiosonde) are shared by all the files which use it,
+    so that the molecular quantities are only calculated once per process.
+    The cache can be used from several threads.
+
+    Method
+    ------
+    fingerprint:
+        hash of the height, pressure and temperature profiles.
+    fetch:
+        return the cached value of a key or calculate and cache it.
+    stats:
+        hit and miss counts.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, maxsize=MOLECULAR_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def fingerprint(*profiles):
         '''
-        Search the polly data files. Wildcards are supported.
+        hash of the meteorological profiles.
 
         Parameters
         ----------
-        filename: str
-            regular expression search pattern for data files.
-        filepath: str
-            directory of data files.
+        profiles: array
+            profiles of the same sounding, e.g., height, pressure and
+            temperature. Masked values are treated as NaN.
+
         Returns
         -------
-        fileList: list
-            found data files that need to be converted.
+        fingerprint: str
+            hex digest of the profiles.
         '''
 
-        if not filepath:
-            filepath = os.getcwd()
+        sha = hashlib.sha1()
+        for profile in profiles:
+            profile = np.ascontiguousarray(
+                np.ma.filled(
+                    np.ma.masked_invalid(profile).astype(np.double), np.nan))
+            sha.update(str(profile.shape).encode('utf-8'))
+            sha.update(profile.tobytes())
 
-        # search the files
-        logger.info('Start to search polly data files...')
-        if self.fileType.lower() == 'labview':
-            fileList = glob.glob(os.path.join(filepath, filename))
+        return sha.hexdigest()
 
-        elif self.fileType.lower() == 'picasso':
-            fileList = glob.glob(os.path.join(filepath, filename))
+    def fetch(self, key, func):
+        '''
+        return the cached value of the key. If the key is not cached, the
+        value will be calculated by func() and the least-recently-used entry
+        will be discarded when the cache is full. func() is called without
+        holding the lock; if another thread cached the key in the meantime,
+        its value is returned.
+        '''
 
-        logger.info('number of files: {nFiles:d}'.format(nFiles=len(fileList)))
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
 
-        return fileList
+            self.misses += 1
 
-    def search_camp_info_file(self, pollyType, location, starttime):
-        '''
-        search the required campaign info file.
-        If no file was found, return None.
+        value = func()
 
-        Parameters
-        ----------
-        pollyType: str
-            polly type
-        location: str
-            campaign location.
-        starttime: datetime
-            starttime of the profile.
-        Returns
-        -------
-        campaign_file_list: str
-            absolute path of the campaign file.
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        '''
+        hit and miss counts and the number of cached entries.
         '''
 
-        instrument_list = [item.lower() for item in self.instrument_list]
-        location_list = [item.lower() for item in self.location_list]
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries)
+            }
 
-        if (not (pollyType.lower() in instrument_list)) or \
-           (not (location.lower() in location_list)):
-            return ''
 
-        # search campaign info file
-        campaign_dict = self.campaign_dict
-        campaign_file_list = []
-        for item in self.campaign_dict:
-            flagLocation = self.campaign_dict[item]['location'].lower() == \
-                           location.lower()
-            flagSystem = self.campaign_dict[item]['system'].lower() == \
-                pollyType.lower()
-            flagTime = (starttime > self.campaign_dict[item]['starttime']) and\
-                       (starttime <= self.campaign_dict[item]['endtime'])
-            if flagLocation and flagSystem and flagTime:
-                campaign_file_list.append(os.path.join(self.projectDir,
-                                                       'config',
-                                                       item + '.toml'))
+# process-wide molecular cache
+molecular_cache = MolecularCache()
 
-        if len(campaign_file_list) > 1:
-            logger.error(
-                'Duplicated campaign info files were found.\n{file}'
-                .format(file=campaign_file_list))
 
-        if not campaign_file_list:
-            logger.warning('No campaign info file was found.')
-            return ''
-        else:
-            logger.info(
-                '{file} will be loaded for campaign configs.'
-                .format(file=campaign_file_list[0]))
+class MetricsRegistry(object):
+    """
+    Description
+    -----------
+    counters, gauges and histograms of the conversion (METRICS), rendered in
+    the Prometheus text format. The metrics are updated once per input file
+    or output file, not in the profile calculations.
 
-        return campaign_file_list[0]
+    Usage
+    -----
+    metrics.inc('polly2scc_files_total', status='converted')
+    metrics.observe('polly2scc_stage_seconds', 0.3, stage='read')
+    metrics.write_textfile('/var/lib/node_exporter/polly2scc.prom')
 
-    def __read_labview_results(self, filename):
+    Method
+    ------
+    inc:
+        increase a counter.
+    set:
+        set a gauge.
+    observe:
+        add a value to a histogram.
+    add_collector:
+        add a function which updates metrics before rendering.
+    snapshot:
+        samples of all the metrics, e.g., for sending them to the parent
+        process.
+    merge:
+        add the samples of a snapshot.
+    render:
+        metrics in the Prometheus text format.
+    write_textfile:
+        write the rendered metrics to a file.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, definitions=METRICS, buckets=METRICS_BUCKETS):
+        self.definitions = OrderedDict(
+            (name, (kind, helpMsg, labels))
+            for name, kind, helpMsg, labels in definitions)
+        self.buckets = list(buckets)
+        self.collectors = []
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def _key(self, name, labels):
+        return name, tuple(
+            str(labels[label]) for label in self.definitions[name][2])
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            # count of each bucket (and +Inf), sum and count
+            histogram = self._values.setdefault(
+                key, [0] * (len(self.buckets) + 3))
+            histogram[bisect.bisect_left(self.buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def add_collector(self, collector):
+        '''
+        add a function, which is called with the registry before rendering.
         '''
-        read labview results into the data pool, which will then be exported
-        to earlinet data format.
 
-        If the file does no exist or the file was retrieved with Klett method,
-        return None
+        self.collectors.append(collector)
+
+    def snapshot(self):
+        with self._lock:
+            return [(key, copy.copy(value))
+                    for key, value in self._values.items()]
+
+    def merge(self, samples):
+        '''
+        add the counters and histograms and set the gauges of a snapshot.
         '''
 
-        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
-            logger.warning(
-                '{file} does not exist!\nFinish!'.format(file=filename))
-            return None, None, None
+        with self._lock:
+            for key, value in samples:
+                kind = self.definitions[key[0]][0]
+                if kind == 'histogram' and key in self._values:
+                    self._values[key] = [
+                        a + b for a, b in zip(self._values[key], value)]
+                elif kind == 'counter':
+                    self._values[key] = self._values.get(key, 0) + value
+                else:
+                    self._values[key] = value
+
+    @staticmethod
+    def _format_labels(names, values, extra=''):
+        labels = ['{0}="{1}"'.format(
+                      name, value.replace('\\', '\\\\').replace(
+                          '"', '\\"').replace('\n', '\\n'))
+                  for name, value in zip(names, values)]
+        if extra:
+            labels.append(extra)
+
+        return '{' + ','.join(labels) + '}' if labels else ''
+
+    def render(self):
+        '''
+        metrics in the Prometheus text format (version 0.0.4).
+        '''
 
-        logger.info('Start reading {filename}'.format(filename=filename))
+        for collector in self.collectors:
+            collector(self)
+
+        with self._lock:
+            values = dict(self._values)
+
+        lines = []
+        for name, (kind, helpMsg, labelNames) in self.definitions.items():
+            samples = sorted(
+                (key[1], value) for key, value in values.items()
+                if key[0] == name)
+            if not samples:
+                continue
+
+            lines.append('# HELP {0} {1}'.format(name, helpMsg))
+            lines.append('# TYPE {0} {1}'.format(name, kind))
+            for labelValues, value in samples:
+                if kind != 'histogram':
+                    lines.append('{0}{1} {2}'.format(
+                        name, self._format_labels(labelNames, labelValues),
+                        repr(float(value))))
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(self.buckets + ['+Inf'], value):
+                    cumulative += count
+                    lines.append('{0}_bucket{1} {2:d}'.format(
+                        name, self._format_labels(
+                            labelNames, labelValues,
+                            'le="{0}"'.format(bound)), cumulative))
+                lines.append('{0}_sum{1} {2}'.format(
+                    name, self._format_labels(labelNames, labelValues),
+                    repr(float(value[-2]))))
+                lines.append('{0}_count{1} {2:d}'.format(
+                    name, self._format_labels(labelNames, labelValues),
+                    value[-1]))
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, filename):
+        '''
+        write the metrics for the textfile collector of the node exporter.
+        The file is replaced atomically.
+        '''
 
-        # read labview info file
-        infoFilename = filename[0:-4] + '-info.txt'
-        labviewInfo = self.__read_labview_info(infoFilename)
+        tmpFile = '{0}.{1:d}.tmp'.format(filename, os.getpid())
+        with open(tmpFile, 'w', encoding='utf-8') as fh:
+            fh.write(self.render())
+        os.replace(tmpFile, filename)
 
-        if not labviewInfo:
-            # if failed in retrieving the labview info
-            return None, None, None
 
-        # TODO: add support profiles with Klett/Fernald method
-        # jump over Klett profiles
-        if labviewInfo['retrieving_method'] == 1:
-            logger.warning(
-                'Klett file was not supported.\n{file}\nJump over!!!'.
-                format(file=filename))
+# process-wide metrics
+metrics = MetricsRegistry()
 
-            return None, None, None
 
-        # search the campaign info file
-        if (not os.path.exists(self.camp_info_file)) or \
-           (not os.path.isfile(self.camp_info_file)):
-            logger.warning(
-                'Campaign info file does not exist. Please check the {file}'
-                .format(file=self.camp_info_file) +
-                '.\nNow turn to auto-searching.')
+class _MetricsHandler(BaseHTTPRequestHandler):
 
-            # auto-search for campaign info file
-            self.camp_info_file = self.search_camp_info_file(
-                self.pollyType, self.location, labviewInfo['starttime'])
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
 
-            if (not os.path.exists(self.camp_info_file)) or \
-               (not os.path.isfile(self.camp_info_file)):
-                logger.warning(
-                    'Failed in searching the campaign info file. ' +
-                    'Your instrument or campaign is not ' +
-                    'supported by the campaign list. (see isse #4)')
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-                return None, None, None
+    def log_message(self, format, *args):
+        logger.debug(format % args)
 
-        # load the campaign info
-        with open(self.camp_info_file, 'r', encoding='utf-8') as fh:
-            camp_info = toml.loads(fh.read())
 
-        if not (camp_info['processor_name']):
-            # set processor_name automatically if not set in the camp_info file
-            camp_info['processor_name'] = labviewInfo['software_version']
+class _MetricsServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
 
-            if not (labviewInfo['software_version']):
-                logger.warn(
-                    'No software_version in your info file.\n' +
-                    'Please check your labview version. Or set the ' +
-                    'process_name in the campaign info file.')
 
-                return None, None, None
+def serve_metrics(port, address='127.0.0.1'):
+    '''
+    serve the metrics at http://address:port/metrics in a background
+    thread.
 
-        self.camp_info = camp_info
+    Returns
+    -------
+    server: HTTPServer
+        call server.shutdown() to stop it.
+    '''
 
-        # read labview data file
-        labviewData = self.__read_labview_data(filename)
+    server = _MetricsServer((address, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    logger.info('Serve metrics at http://{0}:{1:d}/metrics'.format(
+        address, server.server_address[1]))
 
-        # cut off the bins with influences from smoothing
-        smoothWin = labviewInfo['smoothWindow']
-        labviewDataCut = labviewData[0:-int(smoothWin/2), :]
+    return server
 
-        # convert the data matrix into dict with unit conversion
-        labviewDataDict = {
-            'height': labviewDataCut[:, 0] * 1e3,
-            'bsc_355': labviewDataCut[:, 1] * 1e-6,
-            'bsc_std_355': labviewDataCut[:, 2] * 1e-6,
-            'bsc_532': labviewDataCut[:, 3] * 1e-6,
-            'bsc_std_532': labviewDataCut[:, 4] * 1e-6,
-            'bsc_1064': labviewDataCut[:, 5] * 1e-6,
-            'bsc_std_1064': labviewDataCut[:, 6] * 1e-6,
-            'ext_355': labviewDataCut[:, 7] * 1e-6,
-            'ext_std_355': labviewDataCut[:, 8] * 1e-6,
-            'ext_532': labviewDataCut[:, 9] * 1e-6,
-            'ext_std_532': labviewDataCut[:, 10] * 1e-6,
-            'lr_355': labviewDataCut[:, 11],
-            'lr_std_355': labviewDataCut[:, 12],
-            'lr_532': labviewDataCut[:, 13],
-            'lr_std_532': labviewDataCut[:, 14],
-            'height_vdr_532': labviewDataCut[:, 21] * 1e3,
-            'vdr_532': labviewDataCut[:, 22],
-            'vdr_std_532': labviewDataCut[:, 23],
-            'height_pdr_532': labviewDataCut[:, 24] * 1e3,
-            'pdr_532': labviewDataCut[:, 25],
-            'pdr_std_532': labviewDataCut[:, 26],
-            'height_sounding': labviewDataCut[:, 27] * 1e3,
-            'temperature': labviewDataCut[:, 28],
-            'pressure': labviewDataCut[:, 29],
-            'height_vdr_355': labviewDataCut[:, 30] * 1e3,
-            'vdr_355': labviewDataCut[:, 31],
-            'vdr_std_355': labviewDataCut[:, 32],
-            'height_pdr_355': labviewDataCut[:, 33] * 1e3,
-            'pdr_355': labviewDataCut[:, 34],
-            'pdr_std_355': labviewDataCut[:, 35],
-            # the unit of Rayleigh scatterinf coef. in labview file was wrong
-            'bsc_mol_355': labviewDataCut[:, 66] * 1e-3,
-            'bsc_mol_532': labviewDataCut[:, 67] * 1e-3,
-            'bsc_mol_1064': labviewDataCut[:, 68] * 1e-3
-        }
 
-        # interpolate the data into the same grid
-        fh_vdr_532 = interp1d(
-            labviewDataDict['height_vdr_532'],
-            labviewDataDict['vdr_532'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_vdr_std_532 = interp1d(
-            labviewDataDict['height_vdr_532'],
-            labviewDataDict['vdr_std_532'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_pdr_532 = interp1d(
-            labviewDataDict['height_pdr_532'],
-            labviewDataDict['pdr_532'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_pdr_std_532 = interp1d(
-            labviewDataDict['height_pdr_532'],
-            labviewDataDict['pdr_std_532'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_vdr_355 = interp1d(
-            labviewDataDict['height_vdr_355'],
-            labviewDataDict['vdr_355'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_vdr_std_355 = interp1d(
-            labviewDataDict['height_vdr_355'],
-            labviewDataDict['vdr_std_355'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_pdr_355 = interp1d(
-            labviewDataDict['height_pdr_355'],
-            labviewDataDict['pdr_355'],
-            kind='linear',
-            fill_value='extrapolate')
-        fh_pdr_std_355 = interp1d(
-            labviewDataDict['height_pdr_355'],
-            labviewDataDict['pdr_std_355'],
-            kind='linear',
-            fill_value='extrapolate')
-
-        labviewDataDict['vdr_532'] = fh_vdr_532(labviewDataDict['height'])
-        labviewDataDict['vdr_std_532'] = fh_vdr_std_532(
-            labviewDataDict['height'])
-        labviewDataDict['pdr_532'] = fh_pdr_532(labviewDataDict['height'])
-        labviewDataDict['pdr_std_532'] = fh_pdr_std_532(
-            labviewDataDict['height'])
-        labviewDataDict['vdr_355'] = fh_vdr_355(labviewDataDict['height'])
-        labviewDataDict['vdr_std_355'] = fh_vdr_std_355(
-            labviewDataDict['height'])
-        labviewDataDict['pdr_355'] = fh_pdr_355(labviewDataDict['height'])
-        labviewDataDict['pdr_std_355'] = fh_pdr_std_355(
-            labviewDataDict['height'])
+class Tracer(object):
+    """
+    Description
+    -----------
+    spans of the conversion of each input file, exported as JSON lines. A
+    span has a name, a start time (unix time), a duration [s], attributes
+    and the span it belongs to. The spans of an input file form a tree
+    below its 'file' span:
+
+    file
+        discover          waiting for the next file of the search
+        read
+            read_info     labview info file
+            read_data
+            regrid        labview profiles onto the common height grid
+            molecular
+        store             profile store
+        write_product     one for each EARLINET file
+            write_nc
+
+    Tracing is off until start is called; a span then costs a few
+    microseconds. The spans of a tree are written together when its root
+    span ends. Threads continue the trace of another thread with its
+    context (see current). Processes which did not call start (e.g.,
+    forked writers) discard their spans.
+
+    Usage
+    -----
+    tracer.start('polly2scc.trace')
+    with tracer.span('read', file_type='labview'):
+        ...
+        tracer.annotate(bins=1000)
+    tracer.stop()
 
-        # calculate the backscatter-ratio at the reference height
-        refMask355 = (labviewDataDict['height'] >=
-                      labviewInfo['backscatter_calibration_range_355'][0]) & \
-                     (labviewDataDict['height'] <=
-                      labviewInfo['backscatter_calibration_range_355'][1])
-        refBscMol355 = np.nanmean(labviewDataDict['bsc_mol_355'][refMask355])
-        refBscRatio355 = labviewInfo['backscatter_calibration_value_355'] / \
-            refBscMol355 + 1
-        refMask532 = (labviewDataDict['height'] >=
-                      labviewInfo['backscatter_calibration_range_532'][0]) & \
-                     (labviewDataDict['height'] <=
-                      labviewInfo['backscatter_calibration_range_532'][1])
-        refBscMol532 = np.nanmean(labviewDataDict['bsc_mol_532'][refMask532])
-        refBscRatio532 = labviewInfo['backscatter_calibration_value_532'] / \
-            refBscMol532 + 1
-        refMask1064 = (labviewDataDict['height'] >=
-                       labviewInfo['backscatter_calibration_range_1064'][0]) &\
-                      (labviewDataDict['height'] <=
-                       labviewInfo['backscatter_calibration_range_1064'][1])
-        refBscMol1064 = np.nanmean(
-            labviewDataDict['bsc_mol_1064'][refMask1064])
-        refBscRatio1064 = labviewInfo['backscatter_calibration_value_1064'] / \
-            refBscMol1064 + 1
+    Method
+    ------
+    start:
+        start tracing to a file, or to a buffer without filename.
+    stop:
+        stop tracing and close the file.
+    span:
+        context of a span.
+    begin, end:
+        start and end a span, for code which is not one block.
+    record:
+        add a span which started before.
+    annotate:
+        add attributes to the current span.
+    current:
+        context (trace, span) of the current span.
+    collect:
+        take the finished spans out of the buffer.
+    add:
+        export the spans of another process.
 
-        # convert the labview data into the data container
-        dimensions = {
-            'altitude': len(labviewDataDict['height']),
-            'time': 1,
-            'wavelength': 1,
-            'nv': 2   # number of values (2 for reference height)
-        }
+    History
+    -------
+    2026-10-19. First edition.
+    """
 
-        data = {
-            'altitude': labviewDataDict['height'] +
-            camp_info['station_altitude'],
-            'time':
-            labviewInfo['starttime'].replace(tzinfo=timezone.utc).timestamp(),
-            'time_bounds':
-            np.array([tObj.replace(tzinfo=timezone.utc).timestamp()
-                      for tObj in labviewInfo['time_bounds']]),
-            'vertical_resolution_355': labviewInfo['vertical_resolution'] *
-                labviewInfo['smoothWindow'] *
-                np.ones(labviewDataDict['height'].shape, dtype=np.double),
-            'vertical_resolution_532': labviewInfo['vertical_resolution'] *
-                labviewInfo['smoothWindow'] *
-                np.ones(labviewDataDict['height'].shape, dtype=np.double),
-            'vertical_resolution_1064': labviewInfo['vertical_resolution'] *
-                labviewInfo['smoothWindow'] *
-                np.ones(labviewDataDict['height'].shape, dtype=np.double),
-            'cloud_mask': -127 * np.ones(labviewDataDict['height'].shape,
-                                         dtype=np.byte),
-            'cirrus_contamination': 0,   # 0: not_available;
-                                         # 1: no_cirrus;
-                                         # 2: cirrus_detected
-            'cirrus_contamination_source': 0,   # 0: not_available;
-                                                # 1: user_provided;
-                                                # 2: automatic_calculated
-            'error_retrieval_method_355': 1,   # 0: monte_carlo;
-                                               # 1: error_propagation
-            'error_retrieval_method_532': 1,   # 0: monte_carlo;
-                                               # 1: error_propagation
-            'error_retrieval_method_1064': 1,   # 0: monte_carlo;
-                                                # 1: error_propagation
-            'extinction_evaluation_algorithm_355': 1,   # 0: Ansmann;
-                                                # 1: via_backscatter_ratio
-            'extinction_evaluation_algorithm_532': 1,   # 0: Ansmann;
-                                                # 1: via_backscatter_ratio
-            'extinction_evaluation_algorithm_1064': 1,   # 0: Ansmann;
-                                                # 1: via_backscatter_ratio
-            'backscatter_evaluation_method_355':
-                labviewInfo['backscatter_evaluation_method'],
-            'backscatter_evaluation_method_532':
-                labviewInfo['backscatter_evaluation_method'],
-            'backscatter_evaluation_method_1064':
-                labviewInfo['backscatter_evaluation_method'],
-            'raman_backscatter_algorithm_355':
-                labviewInfo['raman_backscatter_algorithm'],
-            'raman_backscatter_algorithm_532':
-                labviewInfo['raman_backscatter_algorithm'],
-            'raman_backscatter_algorithm_1064':
-                labviewInfo['raman_backscatter_algorithm'],
-            'extinction_assumed_wavelength_dependence_355':
-                labviewInfo['extinction_assumed_wavelength_dependence'],
-            'extinction_assumed_wavelength_dependence_532':
-                labviewInfo['extinction_assumed_wavelength_dependence'],
-            'extinction_assumed_wavelength_dependence_1064':
-                labviewInfo['extinction_assumed_wavelength_dependence'],
-            'backscatter_calibration_range_355':
-                labviewInfo['backscatter_calibration_range_355'],
-            'backscatter_calibration_range_532':
-                labviewInfo['backscatter_calibration_range_532'],
-            'backscatter_calibration_range_1064':
-                labviewInfo['backscatter_calibration_range_1064'],
-            'backscatter_calibration_value_355':
-                refBscRatio355,
-            'backscatter_calibration_value_532':
-                refBscRatio532,
-            'backscatter_calibration_value_1064':
-                refBscRatio1064,
-            # the backscatter calibration search range
-            # was not supported by labview. Therefore, set it to be constants.
-            'backscatter_calibration_search_range_355':
-                [0, 20000],
-            'backscatter_calibration_search_range_532':
-                [0, 20000],
-            'backscatter_calibration_search_range_1064':
-                [0, 20000],
-            'ext_355': labviewDataDict['ext_355'],
-            'ext_std_355': labviewDataDict['ext_std_355'],
-            'ext_532': labviewDataDict['ext_532'],
-            'ext_std_532': labviewDataDict['ext_std_532'],
-            'bsc_355': labviewDataDict['bsc_355'],
-            'bsc_std_355': labviewDataDict['bsc_std_355'],
-            'bsc_532': labviewDataDict['bsc_532'],
-            'bsc_std_532': labviewDataDict['bsc_std_532'],
-            'bsc_1064': labviewDataDict['bsc_1064'],
-            'bsc_std_1064': labviewDataDict['bsc_std_1064'],
-            'vdr_355': labviewDataDict['vdr_355'],
-            'vdr_std_355': labviewDataDict['vdr_std_355'],
-            'vdr_532': labviewDataDict['vdr_532'],
-            'vdr_std_532': labviewDataDict['vdr_std_532'],
-            'pdr_355': labviewDataDict['pdr_355'],
-            'pdr_std_355': labviewDataDict['pdr_std_355'],
-            'pdr_532': labviewDataDict['pdr_532'],
-            'pdr_std_532': labviewDataDict['pdr_std_532'],
-            'user_defined_category': self.category,
-            'cirrus_contamination_source': 0,
-            'atmospheric_molecular_calculation_source':
-            labviewInfo['sounding_type'],
-            'latitude': camp_info['station_latitude'],
-            'longitude': camp_info['station_longitude'],
-            'shots': labviewInfo['shots'],
-            'station_altitude': camp_info['station_altitude'],
-            'zenith_angle': labviewInfo['zenith_angle']
-            }
+    def __init__(self):
+        self.enabled = False
+        self.pid = None
+        self._fh = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._finished = []
+
+    def start(self, filename=''):
+        self.stop()
+        if filename:
+            self._fh = open(filename, 'a', encoding='utf-8')
+        self.pid = os.getpid()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+        if (self._fh is not None) and (self.pid == os.getpid()):
+            self._export()
+            self._fh.close()
+        self._fh = None
+        self._finished = []
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            # (span, perf_counter at the start) of the open spans
+            self._local.stack = []
+
+        return self._local.stack
+
+    def current(self):
+        '''
+        context (trace, span) of the current span of this thread, for
+        continuing the trace in another thread. None without span.
+        '''
 
-        # setup global attributes
-        global_attris = camp_info
+        stack = self._stack() if self.enabled else None
+        if not stack:
+            return None
 
-        return dimensions, data, global_attris
+        return stack[-1][0]['trace'], stack[-1][0]['span']
 
-    def __read_labview_data(self, filename):
+    def begin(self, name, parent=None, started=None, **attributes):
+        '''
+        start a span as child of the current span of this thread, or of
+        parent (see current) if there is none. started is the start time
+        (time.time()) if the span started before. Returns None if tracing
+        is off.
         '''
-        read the labview retrieving data.
 
-        Parameters
-        ----------
-        filename: str
-            absolute path of the labview data file.
+        if not self.enabled:
+            return None
 
-        Returns
-        -------
-        dataMatrix: numpy matrix (height * column)
+        stack = self._stack()
+        if stack:
+            parent = stack[-1][0]['trace'], stack[-1][0]['span']
+        now = time.time()
+        span = OrderedDict([
+            ('trace', parent[0] if parent else os.urandom(8).hex()),
+            ('span', os.urandom(8).hex()),
+            ('parent', parent[1] if parent else None),
+            ('name', name),
+            ('start', now if started is None else started),
+            ('duration', 0.0),
+            ('pid', os.getpid()),
+            ('attributes', attributes)])
+        t0 = time.perf_counter()
+        if started is not None:
+            t0 -= now - started
+        stack.append((span, t0))
+
+        return span
+
+    def end(self, span):
+        '''
+        end the span. Spans which were left open inside of it (e.g., by an
+        error) are ended as well. The tree is exported after its root.
         '''
 
-        dataMatrix = np.loadtxt(
-            filename, skiprows=1, dtype=float, encoding='cp1252')
-        return dataMatrix
+        if span is None:
+            return
 
-    def __read_labview_info(self, filename):
+        stack = self._stack()
+        finished = []
+        while stack:
+            openSpan, t0 = stack.pop()
+            openSpan['duration'] = time.perf_counter() - t0
+            finished.append(openSpan)
+            if openSpan is span:
+                break
+
+        with self._lock:
+            self._finished.extend(finished)
+        if not stack:
+            self._export()
+
+    @contextmanager
+    def span(self, name, parent=None, started=None, **attributes):
+        span = self.begin(name, parent=parent, started=started, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            if span is not None:
+                span['attributes']['error'] = type(e).__name__
+            raise
+        finally:
+            self.end(span)
+
+    def record(self, name, started, **attributes):
+        '''
+        add a span from started (time.time()) until now.
         '''
-        read the labview info file, which contains the retrieving information.
 
-        Parameters
-        ----------
-        filename: str
-            absolute path of the labview info file.
+        self.end(self.begin(name, started=started, **attributes))
 
-        Returns
-        -------
-        labviewInfo: dict
-            retrieving configurations of labview program.
-        '''
+    def annotate(self, **attributes):
+        stack = self._stack() if self.enabled else None
+        if stack:
+            stack[-1][0]['attributes'].update(attributes)
 
-        labviewInfo = self.labview_info_parser(filename)
+    def collect(self):
+        with self._lock:
+            spans, self._finished = self._finished, []
 
-        if not labviewInfo:
-            # if failed in retrieving the info
-            return None
+        return spans
 
-        # convert the datetime
-        labviewInfo['starttime'] = datetime.strptime(
-            labviewInfo['starttime'], '%y%m%d %H%M')
-        labviewInfo['endtime'] = datetime.strptime(
-            labviewInfo['endtime'], '%y%m%d %H%M')
+    def add(self, spans):
+        with self._lock:
+            self._finished.extend(spans)
+        self._export()
 
-        # concatenate reference height
-        labviewInfo['reference_height_355'] = np.array(
-            [labviewInfo['reference_height_bottom_355'],
-             labviewInfo['reference_height_top_355']])
-        labviewInfo['reference_height_532'] = np.array(
-            [labviewInfo['reference_height_bottom_532'],
-             labviewInfo['reference_height_top_532']])
-        labviewInfo['reference_height_1064'] = np.array(
-            [labviewInfo['reference_height_bottom_1064'],
-             labviewInfo['reference_height_top_1064']])
+    def _export(self):
+        if self.pid != os.getpid():
+            # inherited by a forked process
+            self.collect()
+            return
+        if self._fh is None:
+            # kept for collect
+            return
 
-        # convert the retrieving method
-        retMethodDict = dict(zip(
-            self.conversion_key['lk_retrieving_method'],
-            self.conversion_key['ek_retrieving_method']))
-        labviewInfo['retrieving_method'] = \
-            retMethodDict[labviewInfo['retrieving_method']]
+        with self._lock:
+            spans, self._finished = self._finished, []
+            self._fh.write(''.join(
+                json.dumps(span, default=str) + '\n' for span in spans))
+            self._fh.flush()
 
-        # convert the flag_use_particle_ext_for_raman_bsc
-        ramanMethodDict = dict(zip(
-            self.conversion_key['lk_raman_backscatter_algorithm'],
-            self.conversion_key['ek_raman_backscatter_algorithm']
-        ))
-        labviewInfo['raman_backscatter_algorithm'] = \
-            ramanMethodDict[labviewInfo['flag_use_particle_ext_for_raman_bsc']]
 
-        # convert the sounding type
-        soundingSearchList = self.conversion_key['ek_meteor_source']
-        labviewInfo['sounding_type'] = \
-            soundingSearchList[labviewInfo['sounding_type']]
+# process-wide tracer
+tracer = Tracer()
 
-        data = {
-                'software_version': labviewInfo['software_version'],
-                'starttime': labviewInfo['starttime'],
-                'endtime': labviewInfo['endtime'],
-                'sounding_type': labviewInfo['sounding_type'],
-                'atmospheric_molecular_calculation_source':
-                labviewInfo['sounding_type'],   # 0: US_standard_atmosphere;
-                                                # 1: radiosonding;
-                                                # 2: ecmwf;
-                                                # 3: icon-iglo-12-23;
-                                                # 4: gdas
-                'backscatter_calibration_range_355': \
-                labviewInfo['reference_height_355'],
-                'backscatter_calibration_range_532': \
-                labviewInfo['reference_height_532'],
-                'backscatter_calibration_range_1064': \
-                labviewInfo['reference_height_1064'],
-                'backscatter_calibration_range_search_algorithm': 0,
-                'backscatter_calibration_value_355': \
-                labviewInfo['reference_value_355'],
-                'backscatter_calibration_value_532': \
-                labviewInfo['reference_value_532'],
-                'backscatter_calibration_value_1064': \
-                labviewInfo['reference_value_1064'],
-                # 0: Raman; 1: elastic_backscatter
-                'backscatter_evaluation_method': \
-                labviewInfo['retrieving_method'],
-                'smoothWindow': labviewInfo['smooth_ext_355'],
-                'retrieving_method': labviewInfo['retrieving_method'],
-                # Ångstroem exponent
-                'extinction_assumed_wavelength_dependence': labviewInfo['AE'],
-                # 0: weighted_linear_fit; 1: non-weighted_linear_fit
-                'extinction_evaluation_algorithm': 1,
-                'shots': 1,   # number of accumulated laser shots
-                # seconds since 1970-01-01 00:00:00
-                'time': labviewInfo['starttime'],
-                # time_bounds
-                'time_bounds': \
-                [labviewInfo['starttime'], labviewInfo['endtime']],
-                # 1: cirrus; 2: climatol; 4: dicycles; 8: etna; 16: forfires;
-                # 32: photosmog; 64: rurban; 128: sahadust; 256: stratos;
-                # 512: satellite_overpass
-                'user_defined_category': self.category,
-                'vertical_resolution': labviewInfo['dz'],   # [m]
-                'zenith_angle': \
-                np.rad2deg(np.arccos(labviewInfo['dz'] /
-                           labviewInfo['range_resolution'])),
-                'raman_backscatter_algorithm':
-                labviewInfo['raman_backscatter_algorithm']
-            }
 
-        return data
+def traced(name):
+    '''
+    decorator for tracing each call of the function as a span.
+    '''
 
-    def labview_info_parser(self, filename):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ProfileContainer(MutableMapping):
+    """
+    Description
+    -----------
+    data container of one retrieved profile, which is returned by the
+    readers and consumed by the EARLINET writers.
+
+    The per-bin quantities (e.g., 'bsc_355', 'altitude') are stored as rows
+    of contiguous 2-D float blocks of PROFILE_BLOCK_ROWS rows, with boolean
+    blocks for the masked bins. Constant-valued profiles (e.g.,
+    'cloud_mask') are kept as a single value and broadcast to the profile
+    length when they are accessed. The per-wavelength scalars (keys ending
+    with the wavelength, e.g., 'backscatter_calibration_value_355') are kept
+    in one small record per wavelength and the rest in a common record.
+
+    The container behaves like the former data dict, so that
+    `data['bsc_355']`, `'bsc_355' in data` and `data.keys()` still work.
+    Per-bin quantities are returned as views of their row (masked arrays if
+    any bin is masked). Rows are never moved or reused: setting a key again
+    overwrites its row in place, the rows of deleted keys stay unused and new
+    blocks are added when the blocks are full. A view therefore always shows
+    the data of its own key. With `mask_invalid=True`, NaN values are masked,
+    so that they are written as _FillValue.
+
+    Method
+    ------
+    set_constant:
+        set a constant-valued profile.
+    copy:
+        copy of the container.
+    to_store, from_store:
+        conversion from and to the profile store.
+    as_dict:
+        copy of the container as a plain dict.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    __slots__ = ('n_bins', 'mask_invalid', '_blocks', '_masks', '_nRows',
+                 '_rows', '_constants', '_records', '_keys')
+
+    def __init__(self, n_bins, *args, mask_invalid=False, **kwargs):
+        self.n_bins = n_bins
+        self.mask_invalid = mask_invalid   # NaN marks missing values
+        self._blocks = []   # blocks of PROFILE_BLOCK_ROWS rows
+        self._masks = []
+        self._nRows = 0   # number of used rows (including deleted keys)
+        self._rows = {}   # key -> row index over all the blocks
+        self._constants = {}   # key -> 0-d array of the constant value
+        self._records = {}   # wavelength (or None) -> {key: value}
+        self._keys = OrderedDict()   # key -> storage of the key
+
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _wavelength(key):
+        '''
+        wavelength from the key suffix (None for wavelength independent keys).
+        '''
+
+        suffix = key.rsplit('_', 1)[-1]
+        if suffix.isdigit() and (int(suffix) in WAVELENGTHS):
+            return int(suffix)
+        else:
+            return None
+
+    def _is_profile(self, value):
+        return isinstance(value, np.ndarray) and \
+            (value.shape == (self.n_bins,)) and \
+            (value.dtype.kind == 'f')
+
+    def _new_row(self):
+        if self._nRows == len(self._blocks) * PROFILE_BLOCK_ROWS:
+            # add a block (the existing ones are kept, together with the
+            # views of their rows)
+            self._blocks.append(
+                np.empty((PROFILE_BLOCK_ROWS, self.n_bins), dtype=np.double))
+            self._masks.append(
+                np.zeros((PROFILE_BLOCK_ROWS, self.n_bins), dtype=bool))
+
+        self._nRows += 1
+
+        return self._nRows - 1
+
+    def _row(self, row):
+        '''
+        values and mask of a row.
+        '''
+
+        block, indx = divmod(row, PROFILE_BLOCK_ROWS)
+
+        return self._blocks[block][indx], self._masks[block][indx]
+
+    def set_constant(self, key, value, dtype=np.double):
+        '''
+        set a profile with the same value at all range bins. It is stored as
+        one value and broadcast to the profile length on access.
+        '''
+
+        if key in self._keys:
+            del self[key]
+
+        self._constants[key] = np.array(value, dtype=dtype)
+        self._keys[key] = 'constant'
+
+    def __setitem__(self, key, value):
+        if self._is_profile(value) and (self._keys.get(key) == 'block'):
+            # overwrite the row of the key in place
+            row = self._rows[key]
+        else:
+            if key in self._keys:
+                del self[key]
+            if self._is_profile(value):
+                row = self._new_row()
+
+        if self._is_profile(value):
+            values, mask = self._row(row)
+            values[:] = np.ma.getdata(value)
+            mask[:] = np.ma.getmaskarray(value)
+            if self.mask_invalid:
+                mask |= np.isnan(values)
+            self._rows[key] = row
+            self._keys[key] = 'block'
+        else:
+            wavelength = self._wavelength(key)
+            self._records.setdefault(wavelength, {})[key] = value
+            self._keys[key] = 'record'
+
+    def __getitem__(self, key):
+        storage = self._keys[key]
+
+        if storage == 'block':
+            values, mask = self._row(self._rows[key])
+            if mask.any():
+                return np.ma.MaskedArray(values, mask=mask, copy=False)
+            else:
+                return values
+        elif storage == 'constant':
+            return np.broadcast_to(self._constants[key], (self.n_bins,))
+        else:
+            return self._records[self._wavelength(key)][key]
+
+    def __delitem__(self, key):
+        storage = self._keys.pop(key)
+
+        if storage == 'block':
+            # the row is not reused, since views of it may still exist
+            del self._rows[key]
+        elif storage == 'constant':
+            del self._constants[key]
+        else:
+            del self._records[self._wavelength(key)][key]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '<{cls}: {n_bins} bins, {n_keys} keys>'.format(
+            cls=type(self).__name__, n_bins=self.n_bins, n_keys=len(self))
+
+    def copy(self):
+        '''
+        copy of the container (the values of the records are not copied).
         '''
-        parsing the information from the labview info file.
+
+        new = ProfileContainer(self.n_bins, mask_invalid=self.mask_invalid)
+        new._blocks = [block.copy() for block in self._blocks]
+        new._masks = [mask.copy() for mask in self._masks]
+        new._nRows = self._nRows
+        new._rows = dict(self._rows)
+        new._constants = dict(self._constants)
+        new._records = {
+            wavelength: dict(record)
+            for wavelength, record in self._records.items()}
+        new._keys = OrderedDict(self._keys)
+
+        return new
+
+    def to_store(self, columns):
+        '''
+        split the container into a JSON-serializable header and columns for
+        the profile store.
 
         Parameters
         ----------
-        filename: str
-            absolute path of labview info file.
+        columns: list
+            column arrays of the store. The per-bin quantities (and their
+            masks) are appended to it.
 
         Returns
         -------
-        data: dict
-            retrieving configurations used in labview program.
+        header: dict
+            description of the container, which refers to the columns by
+            their index.
         '''
 
-        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
-            logger.warning('Labview info file does not exist.\n{infoFile}'.
-                           format(infoFile=filename))
-            return None
-
-        # decoder structure
-        # key: regex, conversion function fill value
-        # Inspired by Martin Radenz
-        decoders = {
-            'starttime': (
-                    r'(?<=Messung von \(UTC\):)\d+.\d+',
-                    str,
-                    '000000 0000'
-            ),
-            'endtime': (r'(?<=bis \(UTC\): )\d+.\d+', str, '000000 0000'),
-            'reference_height_bottom_355': (
-                r'(?<=refheigt355\(m\) from : )\d+',
-                float,
-                0
-            ),
-            'reference_height_top_355': (
-                r'(?<=refheight355 \(m\) to: )\d+',
-                float,
-                0
-            ),
-            'reference_value_355': (
-                r'(?<=refwert355 \(km\^-1 sr\^-1\): )\d+\.\d+[eE]-?\d+',
-                float,
-                0
-            ),
-            'reference_height_bottom_532': (
-                r'(?<=refheigt532\(m\) from : )\d+',
-                float,
-                0
-            ),
-            'reference_height_top_532': (
-                r'(?<=refheight532 \(m\) to: )\d+',
-                float,
-                0
-            ),
-            'reference_value_532': (
-                r'(?<=refwert532 \(km\^-1 sr\^-1\): )\d+\.\d+[eE]-?\d+',
-                float,
-                0
-            ),
-            'reference_height_bottom_1064': (
-                r'(?<=refheigt1064\(m\) from : )\d+',
-                float,
-                0
-            ),
-            'reference_height_top_1064': (
-                r'(?<=refheight1064 \(m\) to: )\d+',
-                float,
-                0
-            ),
-            'reference_value_1064': (
-                r'(?<=refwert1064 \(km\^-1 sr\^-1\): )\d+\.\d+[eE]-?\d+',
-                float,
-                0
-            ),
-            'smooth_ext_355': (r'(?<=smoothingalpha355: )\d+', int, 0),
-            'smooth_bsc_355': (r'(?<=smootingbeta355: )\d+', int, 0),
-            'smooth_ext_532': (r'(?<=smoothingalpha532: )\d+', int, 0),
-            'smooth_bsc_532': (r'(?<=smootingbeta532: )\d+', int, 0),
-            'smooth_ext_1064': (r'(?<=smoothingalpha1064: )\d+', int, 0),
-            'smooth_bsc_1064': (r'(?<=smootingbeta1064: )\d+', int, 0),
-            'dz':  (r'(?<=dz: )\d+\.?\d+', float, 0),
-            'retrieving_method': (r'(?<=\nMethod:)\w+', str, 'Raman'),
-            'AE':  (
-                r'(?<=Angström for Raman Extinction: )\d+\.?\d+',
-                float,
-                0
-            ),
-            'sounding_type': (r'(?<=Sounding Type: )\d\.?\d+', float, 0),
-            'flag_deadtime_correction': (
-                r'(?<=Death time correction: )\w+',
-                str,
-                'no'
-            ),
-            'flag_use_particle_ext_for_raman_bsc': (
-                r'(?<=Use particle ext for raman Bsc: )\w+',
-                str,
-                'no'
-            ),
-            'range_resolution': (
-                r'(?<=Range resolution: )\d+\.?\d+',
-                float,
-                0
-            ),
-            'software_version': (r'(?<=Software version: )\w+\.?\w+', str, ''),
+        header = {
+            'n_bins': self.n_bins,
+            'mask_invalid': self.mask_invalid,
+            'keys': []
         }
 
-        # intialize the data
-        data = {}
+        for key, storage in self._keys.items():
+            if key in PROFILE_STORE_SKIP_KEYS:
+                continue
+
+            if storage == 'block':
+                values, mask = self._row(self._rows[key])
+                item = {'column': len(columns)}
+                columns.append(values)
+                if mask.any():
+                    item['mask'] = len(columns)
+                    columns.append(mask)
+            elif storage == 'constant':
+                item = to_json_value(self._constants[key])
+            else:
+                item = to_json_value(self[key])
 
-        # read the labview info file
-        with open(filename, 'r', encoding='cp1252') as fh:
-            content = fh.read()
+            header['keys'].append([key, storage, item])
 
-        for key, regex in decoders.items():
-            val = find_in_string(regex, content)
-            data.update({key: val})
+        return header
 
-        # souding_type is still a float number, convert it to integer
-        data['sounding_type'] = int(data['sounding_type'])
+    @classmethod
+    def from_store(cls, header, columns):
+        '''
+        restore the container from the header and the columns of the profile
+        store (see to_store).
+        '''
 
-        # determine the range_resolution (old version labview did't provide it)
-        if abs(data['range_resolution'] - 0) <= 1e-9:
-            logger.warn(
-                'range_resolution is 0 m. Check whether you used ' +
-                'old version labview program. We will change the ' +
-                'range_resolution to 30 m for the converison.')
-            data['range_resolution'] = 30
+        data = cls(header['n_bins'], mask_invalid=header['mask_invalid'])
+
+        for key, storage, item in header['keys']:
+            if storage == 'block':
+                values = columns[item['column']]
+                if 'mask' in item:
+                    values = np.ma.MaskedArray(
+                        values, mask=columns[item['mask']])
+                data[key] = values
+            elif storage == 'constant':
+                value = from_json_value(item)
+                data.set_constant(key, value, dtype=value.dtype)
+            else:
+                data[key] = from_json_value(item)
 
         return data
 
-    def picasso_attri_parser(self, inStr, *arg,
-                             varname='reference_search_bottom'):
+    def as_dict(self):
+        '''
+        copy of the container as a plain dict.
         '''
-        parse information from picasso variable attributes.
 
-        Parameters
-        ----------
-        inStr: str
-            input string.
+        return {key: self[key] for key in self}
 
-        Keywords
-        --------
-        varname: str
-            'reference_search_bottom'
-            'reference_search_top'
-            'smoothing_window':
-            'angstroem_exponent' for Raman method
-            'fixed lidar ratio' for Klett method
-            'reference_value'
-            'meteor_source'
 
-        Returns
-        -------
-        val:
-            varname value.
-        '''
+def write_profile_store(filename, dimensions, dataMethods, global_attri,
+                        info):
+    '''
+    write the data containers of one input file into a profile store file.
 
-        if self.method.lower() == 'raman':
-            decoders = {
-                'reference_search_top': (
-                    r'(?<=Reference search range:......... - )\d+.\d+',
-                    float,
-                    0
-                ),
-                'reference_search_bottom': (
-                    r'(?<=Reference search range: )\d+.\d+',
-                    float,
-                    0,
-                ),
-                'smoothing_window': (
-                    r'(?<=Smoothing window: )\d+\.+\d+[eE][+-]\d+',
-                    float,
-                    0
-                ),
-                'angstroem_exponent': (
-                    r'(?<=Angstroem exponent: )\d+.\d+',
-                    float,
-                    0
-                ),
-                'reference_value': (
-                    r'(?<=Reference value: )\d+\.\d+[eE]-?\d+',
-                    float,
-                    0
-                ),
-                'meteor_source': (
-                    r'(?<=Meteorological Source: )\w+',
-                    str,
-                    'standard_atmosphere'
-                )
-            }
-        elif self.method.lower() == 'klett':
-            decoders = {
-                'reference_search_top': (
-                    r'(?<=Reference search range:......... - )\d+.\d+',
-                    float,
-                    0
-                ),
-                'reference_search_bottom': (
-                    r'(?<=Reference search range: )\d+.\d+',
-                    float,
-                    0,
-                ),
-                'smoothing_window': (
-                    r'(?<=Smoothing window: )\d+\.+\d+[eE][+-]\d+',
-                    float,
-                    0
-                ),
-                'angstroem_exponent': (
-                    r'(?<=Angstroem exponent: )\d+.\d+',
-                    float,
-                    0
-                ),
-                'fixed_lidar_ratio': (
-                    r'(?<=Fixed lidar ratio:  )\d+.\d+',
-                    float,
-                    0
-                ),
-                'reference_value': (
-                    r'(?<=Reference value: )\d+\.\d+[eE]-?\d+',
-                    float,
-                    0
-                ),
-                'meteor_source': (
-                    r'(?<=Meteorological Source: )\w+',
-                    str,
-                    'standard_atmosphere'
-                )
-            }
+    The file consists of PROFILE_STORE_MAGIC, the length of the JSON header
+    (8 bytes, little endian), the JSON header and the binary columns, which
+    start at the next multiple of 8 bytes. The columns keep the dtype of the
+    container (float64 for the profiles, bool for the masks), so that the
+    EARLINET files exported from the store are identical to the ones
+    converted from the original file.
 
-        if varname in decoders.keys():
-            val = find_in_string(decoders[varname], inStr)
-        else:
-            raise ValueError
+    Parameters
+    ----------
+    filename: str
+        absolute path of the profile store file.
+    dimensions: dict
+    dataMethods: OrderedDict
+        data container of each backscatter method.
+    global_attri: dict
+    info: dict
+        settings of the convertor (pollyType, location, fileType, category,
+        camp_info_file and source).
+    '''
 
-        return val
+    columns = []
+    header = dict(info)
+    header['version'] = PROFILE_STORE_VERSION
+    header['dimensions'] = to_json_value(dimensions)
+    header['global_attri'] = to_json_value(global_attri)
+    header['methods'] = list(dataMethods.keys())
+    header['containers'] = [
+        data.to_store(columns) for data in dataMethods.values()]
+
+    offset = 0
+    header['columns'] = []
+    for column in columns:
+        header['columns'].append({
+            'dtype': column.dtype.str,
+            'length': len(column),
+            'offset': offset})
+        offset += column.nbytes
+
+    headerBytes = json.dumps(header).encode('utf-8')
+    dataStart = len(PROFILE_STORE_MAGIC) + 8 + len(headerBytes)
+    padding = -dataStart % 8
+
+    with open(filename, 'wb') as fh:
+        fh.write(PROFILE_STORE_MAGIC)
+        fh.write(len(headerBytes).to_bytes(8, 'little'))
+        fh.write(headerBytes)
+        fh.write(b'\x00' * padding)
+        for column in columns:
+            fh.write(np.ascontiguousarray(column).tobytes())
+
+
+def read_profile_store(filename):
+    '''
+    read the profile store file written by write_profile_store.
 
-    def __read_picasso_results(self, filename, *args):
-        '''
-        read picasso results into the data pool, which will then be exported
-        to earlinet data format.
+    Parameters
+    ----------
+    filename: str
+        absolute path of the profile store file.
 
-        Parameters
-        ----------
-        filename: str
-            absolute path of the Picasso profiles.
+    Returns
+    -------
+    info: dict
+        header of the profile store.
+    dimensions: dict
+    dataMethods: OrderedDict
+        data container of each backscatter method.
+    global_attri: dict
+    '''
 
-        Returns
-        -------
-        dimensions: dict
-        data: dict
-        global_attri: dict
-        '''
+    with open(filename, 'rb') as fh:
+        if fh.read(len(PROFILE_STORE_MAGIC)) != PROFILE_STORE_MAGIC:
+            raise ValueError(
+                '{file} is not a profile store file.'.format(file=filename))
 
-        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
-            logger.warning(
-                '{file} does not exist!\nFinish!'.format(file=filename))
-            return None, None, None
+        headerLen = int.from_bytes(fh.read(8), 'little')
+        header = json.loads(fh.read(headerLen).decode('utf-8'))
+        fh.read(-(len(PROFILE_STORE_MAGIC) + 8 + headerLen) % 8)
+        buffer = bytearray(fh.read())
 
-        logger.info('Start reading {filename}'.format(filename=filename))
+    if header['version'] > PROFILE_STORE_VERSION:
+        raise ValueError(
+            'Unsupported profile store version {0} of {1}'.format(
+                header['version'], filename))
 
-        # read picasso data
-        fh = Dataset(filename, 'r')
-        pData = fh.variables
+    columns = [
+        np.frombuffer(
+            buffer, dtype=np.dtype(item['dtype']), count=item['length'],
+            offset=item['offset'])
+        for item in header['columns']]
 
-        # check the Picasso program version
-        # Only if version >= 2.0, the conversion can be applied
-        if (version.parse(fh.version) < version.parse('2.0')):
-            raise RuntimeError(
-                'The profile was processed by old versioned ' +
-                'Picasso (< v2.0). Some mandatory variables ' +
-                'required by EARLINET data format is ' +
-                'therefore missing.')
+    dataMethods = OrderedDict()
+    for method, containerHeader in zip(header['methods'],
+                                       header['containers']):
+        data = ProfileContainer.from_store(containerHeader, columns)
+        if 'altitude' not in data:
+            data['altitude'] = data['height'] + data['station_altitude']
+        dataMethods[method] = data
 
-        # search the campaign info file
-        if (not os.path.exists(self.camp_info_file)) or \
-           (not os.path.isfile(self.camp_info_file)):
-            logger.warning(
-                'Campaign info file does not exist. Please check the {file}'
-                .format(file=self.camp_info_file) +
-                '.\nNow turn to auto-searching.')
+    return header, from_json_value(header['dimensions']), dataMethods, \
+        from_json_value(header['global_attri'])
 
-            # auto-search for campaign info file
-            self.camp_info_file = self.search_camp_info_file(
-                self.pollyType, self.location,
-                datetime.utcfromtimestamp(pData['start_time'][:]))
 
-            if (not os.path.exists(self.camp_info_file)) or \
-               (not os.path.isfile(self.camp_info_file)):
-                logger.warning(
-                    'Failed in searching the campaign info file. ' +
-                    'Your instrument or campaign is not ' +
-                    'supported by the campaign list.')
-                return None, None, None
+def file_fingerprint(filename):
+    '''
+    fingerprint of the file from its size and the first and last
+    FINGERPRINT_CHUNK bytes, to avoid reading large files completely.
 
-        # load the campaign info
-        with open(self.camp_info_file, 'r', encoding='utf-8') as camp_fh:
-            camp_info = toml.loads(camp_fh.read())
+    Parameters
+    ----------
+    filename: str
+        absolute path of the file.
 
-        if not (camp_info['processor_name']):
-            # set processor_name automatically if not set in the camp_info file
-            camp_info['processor_name'] = 'Pollynet_Processing_Chain'
-            camp_info['processor_version'] = fh.version
+    Returns
+    -------
+    fingerprint: str
+        hex digest.
+    '''
 
-        self.camp_info = camp_info
+    size = os.path.getsize(filename)
+    sha = hashlib.sha1(str(size).encode('utf-8'))
+    with open(filename, 'rb') as fh:
+        sha.update(fh.read(FINGERPRINT_CHUNK))
+        if size > 2 * FINGERPRINT_CHUNK:
+            fh.seek(-FINGERPRINT_CHUNK, os.SEEK_END)
+        sha.update(fh.read(FINGERPRINT_CHUNK))
 
-        # convert the labview data into the data container
-        dimensions = {
-            'altitude': len(pData['height']),
-            'time': 1,
-            'wavelength': 1,
-            'nv': 2   # number of values (2 for reference height)
-        }
+    return sha.hexdigest()
 
-        meteorDict = dict(zip(
-            self.conversion_key['pk_meteor_source'],
-            self.conversion_key['ek_meteor_source']))
-        data = {
-            'altitude': pData['height'][:] + camp_info['station_altitude'],
-            'time': np.mean([pData['start_time'][:], pData['end_time'][:]]),
-            'time_bounds':
-            np.array([pData['start_time'][:], pData['end_time'][:]]),
-            'cloud_mask': -127 * np.ones(pData['height'].shape, dtype=np.byte),
-            'cirrus_contamination': 1,   # 0: not_available;
-                                         # 1: no_cirrus;
-                                         # 2: cirrus_detected
-            'cirrus_contamination_source': 2,   # 0: not_available;
-                                                # 1: user_provided;
-                                                # 2: automatic_calculated
-            'user_defined_category': self.category,
-            'cirrus_contamination_source': 0,
-            'atmospheric_molecular_calculation_source':
-                meteorDict[self.picasso_attri_parser(
-                                pData['pressure'].retrieving_info,
-                                varname='meteor_source')],
-            'latitude': camp_info['station_latitude'],
-            'longitude': camp_info['station_longitude'],
-            'shots': pData['shots'][:],
-            'station_altitude': camp_info['station_altitude'],
-            'zenith_angle': pData['zenith_angle'][:],
-        }
 
-        # capsule data into 355 data container
-        if self.method.lower() == 'raman':
-            if 'aerBsc_raman_355' in pData.keys():
-                smoothWin_355 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_355'].retrieving_info,
-                    varname='smoothing_window')
-                refH_bottom_355 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_355'].retrieving_info,
-                    varname='reference_search_bottom')
-                refH_top_355 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_355'].retrieving_info,
-                    varname='reference_search_top')
-                angstr_355 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_355'].retrieving_info,
-                    varname='angstroem_exponent')
-                refVal_355 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_355'].retrieving_info,
-                    varname='reference_value')
+class ArchiveCatalogue(object):
+    """
+    Description
+    -----------
+    SQLite catalogue of the labview and Picasso files in the archive. Each
+    row describes one input file and backscatter method, so that the files
+    can be selected by queries instead of converting them all.
 
-                # calculate the backscatter-ratio at the reference height
-                refMask355 = (pData['height'][:] >= refH_bottom_355) & \
-                             (pData['height'][:] <= refH_top_355)
-                refBscMol355 = np.nanmean(
-                    beta_pi_rayleigh(
-                        355,
-                        pressure=np.float64(pData['pressure'][refMask355]),
-                        temperature=np.float64(
-                            pData['temperature'][refMask355] + 273.16)))
-                refBscRatio355 = refVal_355 / refBscMol355 + 1
+    Columns of the table `inputs`: path, file_type, method, start_time,
+    end_time (UTC, 'YYYY-MM-DD HH:MM:SS'), system, location, smoothing [m],
+    products (comma-separated, e.g., 'b355,e355'), campaign (name of the
+    campaign info file), fingerprint, mtime and size.
 
-                # 0: monte_carlo;
-                # 1: error_propagation
-                data['error_retrieval_method_355'] = 1
+    Method
+    ------
+    is_current:
+        whether the file was indexed since its last modification.
+    update:
+        replace the rows of a file.
+    remove:
+        remove the rows of a file.
+    paths:
+        indexed files below a directory.
+    query:
+        files matching a query.
 
-                # 0: Ansmann;
-                # 1: via_backscatter_ratio
-                data['extinction_evaluation_algorithm_355'] = 0
+    History
+    -------
+    2026-10-19. First edition.
+    """
 
-                # 0: Raman
-                # 1: elastic_backscatter
-                data['backscatter_evaluation_method_355'] = 0
+    COLUMNS = ['path', 'file_type', 'method', 'start_time', 'end_time',
+               'system', 'location', 'smoothing', 'products', 'campaign',
+               'fingerprint', 'mtime', 'size']
+
+    def __init__(self, filename, readonly=False):
+        self.filename = filename
+        if readonly:
+            if not os.path.isfile(filename):
+                raise FileNotFoundError(
+                    'Catalogue does not exist: {0}'.format(filename))
+            self.conn = sqlite3.connect(
+                'file:{0}?mode=ro'.format(filename), uri=True)
+        else:
+            self.conn = sqlite3.connect(filename)
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS inputs (' +
+                'path TEXT NOT NULL, file_type TEXT, method TEXT, ' +
+                'start_time TEXT, end_time TEXT, system TEXT, ' +
+                'location TEXT, smoothing REAL, products TEXT, ' +
+                'campaign TEXT, fingerprint TEXT, mtime REAL, size INTEGER, ' +
+                'PRIMARY KEY (path, method))')
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def is_current(self, path, mtime, size):
+        '''
+        whether the file was indexed with the same modification time and
+        size.
+        '''
 
-                # 0: Ansmann
-                # 1: via_backscatter_ratio
-                data['raman_backscatter_algorithm_355'] = 0
+        row = self.conn.execute(
+            'SELECT mtime, size FROM inputs WHERE path = ? LIMIT 1',
+            (path,)).fetchone()
 
-                data['vertical_resolution_355'] = smoothWin_355 * \
-                    np.ones(pData['height'][:].shape, dtype=np.double)
-                data['extinction_assumed_wavelength_dependence_355'] =\
-                    angstr_355
-                data['backscatter_calibration_range_355'] = \
-                    pData['reference_height_355'][:]
-                data['backscatter_calibration_value_355'] = refBscRatio355
-                data['backscatter_calibration_search_range_355'] = \
-                    [refH_bottom_355, refH_top_355]
-                data['bsc_355'] = pData['aerBsc_raman_355'][:]
-                data['bsc_std_355'] = 0.1 * pData['aerBsc_raman_355'][:]
+        return (row is not None) and (row[0] == mtime) and (row[1] == size)
 
-        elif self.method.lower() == 'klett':
-            if 'aerBsc_klett_355' in pData.keys():
-                smoothWin_355 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_355'].retrieving_info,
-                    varname='smoothing_window')
-                refH_bottom_355 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_355'].retrieving_info,
-                    varname='reference_search_bottom')
-                refH_top_355 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_355'].retrieving_info,
-                    varname='reference_search_top')
-                angstr_355 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_355'].retrieving_info,
-                    varname='angstroem_exponent')
-                fixed_lidar_ratio_355 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_355'].retrieving_info,
-                    varname='fixed_lidar_ratio')
-                refVal_355 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_355'].retrieving_info,
-                    varname='reference_value')
+    def update(self, path, entries):
+        '''
+        replace the rows of the file with the entries (list of dict with the
+        keys in COLUMNS).
+        '''
 
-                # calculate the backscatter-ratio at the reference height
-                refMask355 = (pData['height'][:] >= refH_bottom_355) & \
-                             (pData['height'][:] <= refH_top_355)
-                refBscMol355 = np.nanmean(
-                    beta_pi_rayleigh(
-                        355,
-                        pressure=np.float64(pData['pressure'][refMask355]),
-                        temperature=np.float64(
-                            pData['temperature'][refMask355] + 273.16)))
-                refBscRatio355 = refVal_355 / refBscMol355 + 1
+        with self.conn:
+            self.conn.execute('DELETE FROM inputs WHERE path = ?', (path,))
+            self.conn.executemany(
+                'INSERT INTO inputs ({0}) VALUES ({1})'.format(
+                    ', '.join(self.COLUMNS),
+                    ', '.join(['?'] * len(self.COLUMNS))),
+                [[entry[key] for key in self.COLUMNS] for entry in entries])
 
-                # 0: monte_carlo;
-                # 1: error_propagation
-                data['error_retrieval_method_355'] = 1
+    def remove(self, path):
+        with self.conn:
+            self.conn.execute('DELETE FROM inputs WHERE path = ?', (path,))
 
-                # 0: Ansmann;
-                # 1: via_backscatter_ratio
-                data['extinction_evaluation_algorithm_355'] = 0
+    def paths(self, directory):
+        '''
+        indexed files below the directory.
+        '''
 
-                # 0: Raman
-                # 1: elastic_backscatter
-                data['backscatter_evaluation_method_355'] = 0
+        prefix = os.path.join(directory, '')
+        rows = self.conn.execute('SELECT DISTINCT path FROM inputs')
 
-                # 0: Ansmann
-                # 1: via_backscatter_ratio
-                data['raman_backscatter_algorithm_355'] = 0
+        return [row[0] for row in rows if row[0].startswith(prefix)]
 
-                data['vertical_resolution_355'] = smoothWin_355 * \
-                    np.ones(pData['height'][:].shape, dtype=np.double)
-                data['extinction_assumed_wavelength_dependence_355'] =\
-                    angstr_355
-                data['assumed_particle_lidar_ratio'] = fixed_lidar_ratio_355
-                data['backscatter_calibration_range_355'] = \
-                    pData['reference_height_355'][:]
-                data['backscatter_calibration_value_355'] = refBscRatio355
-                data['backscatter_calibration_search_range_355'] = \
-                    [refH_bottom_355, refH_top_355]
-                data['bsc_355'] = pData['aerBsc_raman_355'][:]
-                data['bsc_std_355'] = 0.1 * pData['aerBsc_raman_355'][:]
+    def query(self, where='', fileType=None):
+        '''
+        files matching the query.
 
-        if 'aerExt_raman_355' in pData.keys():
-            data['ext_355'] = pData['aerExt_raman_355'][:]
-            data['ext_std_355'] = 0.1 * pData['aerExt_raman_355'][:]
+        Parameters
+        ----------
+        where: str
+            SQL condition on the columns of the table `inputs`, e.g.,
+            "method = 'raman' AND start_time >= '2020-05-01'".
+        fileType: str
+            only return files of this type. (labview | picasso)
 
-        if 'volDepol_raman_355' in pData.keys():
-            data['pdr_355'] = pData['parDepol_raman_355'][:]
-            data['pdr_std_355'] = 0.1 * pData['parDepol_raman_355'][:]
-            data['vdr_355'] = pData['volDepol_raman_355'][:]
-            data['vdr_std_355'] = 0.1 * pData['volDepol_raman_355'][:]
+        Returns
+        -------
+        fileList: list
+            sorted absolute paths of the matching files.
+        '''
 
-        # capsule data into 532 data container
-        if self.method.lower() == 'raman':
-            if 'aerBsc_raman_532' in pData.keys():
-                smoothWin_532 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_532'].retrieving_info,
-                    varname='smoothing_window')
-                refH_bottom_532 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_532'].retrieving_info,
-                    varname='reference_search_bottom')
-                refH_top_532 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_532'].retrieving_info,
-                    varname='reference_search_top')
-                angstr_532 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_532'].retrieving_info,
-                    varname='angstroem_exponent')
-                refVal_532 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_532'].retrieving_info,
-                    varname='reference_value')
+        conditions = []
+        params = []
+        if where:
+            conditions.append('({0})'.format(where))
+        if fileType:
+            conditions.append('file_type = ?')
+            params.append(fileType.lower())
 
-                # calculate the backscatter-ratio at the reference height
-                refMask532 = (pData['height'][:] >= refH_bottom_532) & \
-                             (pData['height'][:] <= refH_top_532)
-                refBscMol532 = np.nanmean(
-                    beta_pi_rayleigh(
-                        532,
-                        pressure=np.float64(pData['pressure'][refMask532]),
-                        temperature=np.float64(
-                            pData['temperature'][refMask532] + 273.16)))
-                refBscRatio532 = refVal_532 / refBscMol532 + 1
+        sql = 'SELECT DISTINCT path FROM inputs'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY path'
 
-                # 0: monte_carlo;
-                # 1: error_propagation
-                data['error_retrieval_method_532'] = 1
+        return [row[0] for row in self.conn.execute(sql, params)]
 
-                # 0: Ansmann;
-                # 1: via_backscatter_ratio
-                data['extinction_evaluation_algorithm_532'] = 0
 
-                # 0: Raman
-                # 1: elastic_backscatter
-                data['backscatter_evaluation_method_532'] = 0
+class InputPrefetcher(object):
+    """
+    Description
+    -----------
+    read-ahead of the input files from slow network shares. While the
+    current file is converted, the next files are copied to a local scratch
+    directory by a thread pool, so that the readers only see local files.
 
-                # 0: Ansmann
-                # 1: via_backscatter_ratio
-                data['raman_backscatter_algorithm_532'] = 0
+    The number of files read ahead is limited by depth, and the size of the
+    files in the scratch directory (including the file being converted) by
+    budget. A file larger than the budget is only fetched when the scratch
+    directory is empty.
 
-                data['vertical_resolution_532'] = smoothWin_532 * \
-                    np.ones(pData['height'][:].shape, dtype=np.double)
-                data['extinction_assumed_wavelength_dependence_532'] =\
-                    angstr_532
-                data['backscatter_calibration_range_532'] = \
-                    pData['reference_height_532'][:]
-                data['backscatter_calibration_value_532'] = refBscRatio532
-                data['backscatter_calibration_search_range_532'] = \
-                    [refH_bottom_532, refH_top_532]
-                data['bsc_532'] = pData['aerBsc_raman_532'][:]
-                data['bsc_std_532'] = 0.1 * pData['aerBsc_raman_532'][:]
+    Usage
+    -----
+    prefetcher = InputPrefetcher(fileList, convertor.input_files, depth=2)
+    for task, localFile in prefetcher:
+        convertor.read_data_file(localFile)
 
-        elif self.method.lower() == 'klett':
-            if 'aerBsc_klett_532' in pData.keys():
-                smoothWin_532 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_532'].retrieving_info,
-                    varname='smoothing_window')
-                refH_bottom_532 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_532'].retrieving_info,
-                    varname='reference_search_bottom')
-                refH_top_532 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_532'].retrieving_info,
-                    varname='reference_search_top')
-                angstr_532 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_532'].retrieving_info,
-                    varname='angstroem_exponent')
-                fixed_lidar_ratio_532 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_532'].retrieving_info,
-                    varname='fixed_lidar_ratio')
-                refVal_532 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_532'].retrieving_info,
-                    varname='reference_value')
+    Method
+    ------
+    stats:
+        number and size of the prefetched files, and the stall time.
 
-                # calculate the backscatter-ratio at the reference height
-                refMask532 = (pData['height'][:] >= refH_bottom_532) & \
-                             (pData['height'][:] <= refH_top_532)
-                refBscMol532 = np.nanmean(
-                    beta_pi_rayleigh(
-                        532,
-                        pressure=np.float64(pData['pressure'][refMask532]),
-                        temperature=np.float64(
-                            pData['temperature'][refMask532] + 273.16)))
-                refBscRatio532 = refVal_532 / refBscMol532 + 1
+    History
+    -------
+    2026-10-19. First edition.
+    """
 
-                # 0: monte_carlo;
-                # 1: error_propagation
-                data['error_retrieval_method_532'] = 1
+    def __init__(self, tasks, input_files, depth=2,
+                 budget=PREFETCH_BUDGET * 1024 ** 2, scratch_dir=None):
+        '''
+        Parameters
+        ----------
+        tasks: iterable
+            data files (can be a generator).
+        input_files: function
+            returns all the files to be fetched for a data file, starting
+            with the data file itself (e.g., the labview info file).
+        depth: int
+            maximum number of files read ahead.
+        budget: int
+            maximum size of the files in the scratch directory. [bytes]
+        scratch_dir: str
+            local directory for the copies (default: system temp folder).
+        '''
 
-                # 0: Ansmann;
-                # 1: via_backscatter_ratio
-                data['extinction_evaluation_algorithm_532'] = 0
+        self.tasks = tasks
+        self.input_files = input_files
+        self.depth = max(int(depth), 1)
+        self.budget = budget
+        self.scratch_dir = scratch_dir
+        self.nFiles = 0
+        self.nBytes = 0
+        self.stallTime = 0.0
+        self.fetchTime = 0.0
+        self._bytes = 0   # size of the files in the scratch directory
+        self._lock = threading.Lock()
+
+    def _size(self, task):
+        return sum(os.path.getsize(item) for item in self.input_files(task)
+                   if os.path.isfile(item))
+
+    def _fetch(self, task):
+        '''
+        copy the files of the task to a new scratch folder.
+        '''
 
-                # 0: Raman
-                # 1: elastic_backscatter
-                data['backscatter_evaluation_method_532'] = 0
+        t0 = time.perf_counter()
+        localDir = tempfile.mkdtemp(prefix='polly2scc_', dir=self.scratch_dir)
+        try:
+            for item in self.input_files(task):
+                if os.path.isfile(item):
+                    shutil.copyfile(
+                        item, os.path.join(localDir, os.path.basename(item)))
+        except Exception:
+            shutil.rmtree(localDir, ignore_errors=True)
+            raise
+        with self._lock:
+            self.fetchTime += time.perf_counter() - t0
+
+        return os.path.join(localDir, os.path.basename(task)), localDir
+
+    def _release(self, future, size):
+        try:
+            localDir = future.result()[1]
+        except Exception:
+            localDir = None
+        if localDir:
+            shutil.rmtree(localDir, ignore_errors=True)
+        self._bytes -= size
+
+    def __iter__(self):
+        tasks = iter(self.tasks)
+        pending = deque()   # (task, size, future) in the order of the tasks
+        nextTask = None
+        nextSize = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.depth)
+        try:
+            while True:
+                # fill the read-ahead queue
+                while len(pending) < self.depth:
+                    if nextTask is None:
+                        nextTask = next(tasks, None)
+                        if nextTask is None:
+                            break
+                        nextSize = self._size(nextTask)
+                    if self._bytes and \
+                       (self._bytes + nextSize > self.budget):
+                        break
+                    pending.append(
+                        (nextTask, nextSize,
+                         executor.submit(self._fetch, nextTask)))
+                    self._bytes += nextSize
+                    nextTask = None
+
+                if not pending:
+                    break
+
+                task, size, future = pending.popleft()
+                t0 = time.perf_counter()
+                try:
+                    localFile = future.result()[0]
+                except Exception as e:
+                    logger.warning(
+                        'Failed in prefetching {file}: {err}'.format(
+                            file=task, err=e))
+                    localFile = task
+                self.stallTime += time.perf_counter() - t0
+                self.nFiles += 1
+                self.nBytes += size
+
+                try:
+                    yield task, localFile
+                finally:
+                    self._release(future, size)
+        finally:
+            for task, size, future in pending:
+                self._release(future, size)
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        '''
+        number and size [MB] of the prefetched files, the time waiting for
+        the files (stall) and the time spent on copying them (fetch). [s]
+        '''
 
-                # 0: Ansmann
-                # 1: via_backscatter_ratio
-                data['raman_backscatter_algorithm_532'] = 0
+        return {
+            'files': self.nFiles,
+            'size': self.nBytes / 1024 ** 2,
+            'stall': self.stallTime,
+            'fetch': self.fetchTime
+        }
 
-                data['vertical_resolution_532'] = smoothWin_532 * \
-                    np.ones(pData['height'][:].shape, dtype=np.double)
-                data['extinction_assumed_wavelength_dependence_532'] = \
-                    angstr_532
-                data['assumed_particle_lidar_ratio'] = fixed_lidar_ratio_532
-                data['backscatter_calibration_range_532'] = \
-                    pData['reference_height_532'][:]
-                data['backscatter_calibration_value_532'] = refBscRatio532
-                data['backscatter_calibration_search_range_532'] = \
-                    [refH_bottom_532, refH_top_532]
-                data['bsc_532'] = pData['aerBsc_klett_532'][:]
-                data['bsc_std_532'] = 0.1 * pData['aerBsc_klett_532'][:]
 
-        if 'aerExt_raman_532' in pData.keys():
-            data['ext_532'] = pData['aerExt_raman_532'][:]
-            data['ext_std_532'] = 0.1 * pData['aerExt_raman_532'][:]
+def _write_product(p2e_convertor, args, kwargs, parent=None):
+    '''
+    write one EARLINET file in the writers of WriteBehindQueue. parent is
+    the trace context of the input file (see `Tracer.current`).
+    '''
 
-        if 'volDepol_raman_532' in pData.keys():
-            data['pdr_532'] = pData['parDepol_raman_532'][:]
-            data['pdr_std_532'] = 0.1 * pData['parDepol_raman_532'][:]
-            data['vdr_532'] = pData['volDepol_raman_532'][:]
-            data['vdr_std_532'] = 0.1 * pData['volDepol_raman_532'][:]
+    with tracer.span('write_product', parent=parent, queued=True,
+                     product=kwargs.get('prodType', 'b355'),
+                     variant=kwargs.get('variant') or ''):
+        return p2e_convertor.write_to_earlinet_nc(*args, **kwargs)
 
-        # capsule data into 1064 data container
-        if self.method.lower() == 'raman':
-            if 'aerBsc_raman_1064' in pData.keys():
-                smoothWin_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_1064'].retrieving_info,
-                    varname='smoothing_window')
-                refH_bottom_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_1064'].retrieving_info,
-                    varname='reference_search_bottom')
-                refH_top_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_1064'].retrieving_info,
-                    varname='reference_search_top')
-                angstr_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_1064'].retrieving_info,
-                    varname='angstroem_exponent')
-                refVal_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_raman_1064'].retrieving_info,
-                    varname='reference_value')
 
-                # calculate the backscatter-ratio at the reference height
-                refMask1064 = (pData['height'][:] >= refH_bottom_1064) & \
-                              (pData['height'][:] <= refH_top_1064)
-                refBscMol1064 = np.nanmean(
-                    beta_pi_rayleigh(
-                        1064,
-                        pressure=np.float64(pData['pressure'][refMask1064]),
-                        temperature=np.float64(
-                            pData['temperature'][refMask1064] + 273.16)))
-                refBscRatio1064 = refVal_1064 / refBscMol1064 + 1
+class WriteBehindQueue(object):
+    """
+    Description
+    -----------
+    write the EARLINET files in background writers, so that the next input
+    file is read while the files of the previous one are written. The
+    writers are threads or, for processes=True, processes (the data are
+    then pickled to the writer).
 
-                # 0: monte_carlo;
-                # 1: error_propagation
-                data['error_retrieval_method_1064'] = 1
+    submit blocks when maxsize writes are pending (back-pressure). A write
+    is only done when flush returned without an error: flush waits for all
+    the pending writes and raises a RuntimeError if any of them failed.
 
-                # 0: Ansmann;
-                # 1: via_backscatter_ratio
-                data['extinction_evaluation_algorithm_1064'] = 0
+    Usage
+    -----
+    writeQueue = WriteBehindQueue(writers=2)
+    writeQueue.submit(convertor, data, dims, global_attri, prodType='b355')
+    writeQueue.close()   # flush the pending writes
 
-                # 0: Raman
-                # 1: elastic_backscatter
-                data['backscatter_evaluation_method_1064'] = 0
+    Method
+    ------
+    submit:
+        queue a write_to_earlinet_nc call.
+    flush:
+        wait for all the pending writes.
+    close:
+        flush and stop the writers.
+    stats:
+        number of written files and the time blocked by a full queue.
 
-                # 0: Ansmann
-                # 1: via_backscatter_ratio
-                data['raman_backscatter_algorithm_1064'] = 0
+    History
+    -------
+    2026-10-19. First edition.
+    """
 
-                data['vertical_resolution_1064'] = smoothWin_1064 * \
-                    np.ones(pData['height'][:].shape, dtype=np.double)
-                data['extinction_assumed_wavelength_dependence_1064'] = \
-                    angstr_1064
-                data['backscatter_calibration_range_1064'] = \
-                    pData['reference_height_1064'][:]
-                data['backscatter_calibration_value_1064'] = refBscRatio1064
-                data['backscatter_calibration_search_range_1064'] = \
-                    [refH_bottom_1064, refH_top_1064]
-                data['bsc_1064'] = pData['aerBsc_raman_1064'][:]
-                data['bsc_std_1064'] = 0.1 * pData['aerBsc_raman_1064'][:]
+    def __init__(self, writers=1, maxsize=None, processes=False):
+        self.writers = max(int(writers), 1)
+        self.maxsize = maxsize or WRITE_QUEUE_SIZE * self.writers
+        self.processes = processes
+        if processes:
+            self._executor = ProcessPoolExecutor(max_workers=self.writers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.writers)
+        self._slots = threading.BoundedSemaphore(self.maxsize)
+        self._futures = []
+        self.nWritten = 0
+        self.nFailed = 0
+        self.blockTime = 0.0
+
+    def submit(self, p2e_convertor, *args, **kwargs):
+        '''
+        queue write_to_earlinet_nc(*args, **kwargs) of the convertor. The
+        convertor is copied, as its campaign info changes with the next file.
+        '''
 
-        elif self.method.lower() == 'klett':
-            if 'aerBsc_klett_1064' in pData.keys():
-                smoothWin_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_1064'].retrieving_info,
-                    varname='smoothing_window')
-                refH_bottom_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_1064'].retrieving_info,
-                    varname='reference_search_bottom')
-                refH_top_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_1064'].retrieving_info,
-                    varname='reference_search_top')
-                # angstr_1064 = self.picasso_attri_parser(
-                #     pData['aerBsc_raman_1064'].retrieving_info,
-                #     varname='angstroem_exponent')
-                fixed_lidar_ratio_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_1064'].retrieving_info,
-                    varname='fixed_lidar_ratio')
-                refVal_1064 = self.picasso_attri_parser(
-                    pData['aerBsc_klett_1064'].retrieving_info,
-                    varname='reference_value')
+        t0 = time.perf_counter()
+        self._slots.acquire()
+        self.blockTime += time.perf_counter() - t0
 
-                # calculate the backscatter-ratio at the reference height
-                refMask1064 = (pData['height'][:] >= refH_bottom_1064) & \
-                              (pData['height'][:] <= refH_top_1064)
-                refBscMol1064 = np.nanmean(
-                    beta_pi_rayleigh(
-                        1064,
-                        pressure=np.float64(pData['pressure'][refMask1064]),
-                        temperature=np.float64(
-                            pData['temperature'][refMask1064] + 273.16)))
-                refBscRatio1064 = refVal_1064 / refBscMol1064 + 1
+        try:
+            # writer processes do not trace
+            future = self._executor.submit(
+                _write_product, copy.copy(p2e_convertor), args, kwargs,
+                None if self.processes else tracer.current())
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        self._futures.append(future)
+
+        return future
+
+    def flush(self):
+        '''
+        wait until all the pending writes are finished.
 
-                # 0: monte_carlo;
-                # 1: error_propagation
-                data['error_retrieval_method_1064'] = 1
+        Returns
+        -------
+        fileList: list
+            files written since the last flush.
+        '''
 
-                # 0: Ansmann;
-                # 1: via_backscatter_ratio
-                data['extinction_evaluation_algorithm_1064'] = 0
+        futures, self._futures = self._futures, []
+        fileList = []
+        errors = []
+        for future in futures:
+            try:
+                filename = future.result()
+            except Exception as e:
+                errors.append(e)
+                logger.error('Failed in writing: {err}'.format(err=e))
+                continue
+            if filename:
+                fileList.append(filename)
+
+        self.nWritten += len(fileList)
+        self.nFailed += len(errors)
+        if errors:
+            raise RuntimeError(
+                '{0:d} of {1:d} writes failed.'.format(
+                    len(errors), len(futures)))
 
-                # 0: Raman
-                # 1: elastic_backscatter
-                data['backscatter_evaluation_method_1064'] = 0
+        return fileList
 
-                # 0: Ansmann
-                # 1: via_backscatter_ratio
-                data['raman_backscatter_algorithm_1064'] = 0
+    def close(self):
+        '''
+        flush the pending writes and stop the writers.
+        '''
 
-                data['vertical_resolution_1064'] = smoothWin_1064 * \
-                    np.ones(pData['height'][:].shape, dtype=np.double)
-                data['assumed_particle_lidar_ratio'] = fixed_lidar_ratio_1064
-                data['backscatter_calibration_range_1064'] = \
-                    pData['reference_height_1064'][:]
-                data['backscatter_calibration_value_1064'] = refBscRatio1064
-                data['backscatter_calibration_search_range_1064'] = \
-                    [refH_bottom_1064, refH_top_1064]
-                data['bsc_1064'] = pData['aerBsc_klett_1064'][:]
-                data['bsc_std_1064'] = 0.1 * pData['aerBsc_klett_1064'][:]
+        try:
+            return self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def stats(self):
+        return {
+            'written': self.nWritten,
+            'failed': self.nFailed,
+            'blocked': self.blockTime
+        }
 
-        # setup global attributes
-        global_attris = camp_info
 
-        return dimensions, data, global_attris
+def process_memory(reset=False):
+    '''
+    current and peak resident memory of this process. Only available on
+    Linux (/proc/self/status).
 
-    def __write_2_earlinet_b355(self, filename, variables, dimensions,
-                                global_attri, *args,
-                                range_lim=[0, 14000], **kwargs):
+    Parameters
+    ----------
+    reset: boolean
+        whether to reset the peak to the current memory before.
+
+    Returns
+    -------
+    rss, peak: int
+        current and peak resident memory [B]. None if not available.
+    '''
+
+    try:
+        if reset:
+            with open('/proc/self/clear_refs', 'w') as fh:
+                fh.write('5')
+        memory = {}
+        with open('/proc/self/status', 'r') as fh:
+            for line in fh:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    # in kB
+                    memory[line[:5]] = int(line.split()[1]) * 1024
+        return memory['VmRSS'], memory['VmHWM']
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+class MemoryModel(object):
+    """
+    Description
+    -----------
+    estimate the peak memory of converting an input file from its size and
+    type. The estimate is base + factor * size (MEMORY_MODEL), scaled to
+    the MEMORY_PERCENTILE percentile of the ratios between the measured and
+    the estimated peaks of the last MEMORY_SAMPLES files of the type. The
+    measured peaks can be saved to a JSON file, to calibrate the next runs.
+
+    Usage
+    -----
+    memoryModel = MemoryModel('memory_model.json')
+    estimate = memoryModel.estimate('picasso', os.path.getsize(filename))
+    memoryModel.observe('picasso', os.path.getsize(filename), peak)
+    memoryModel.save()
+
+    Method
+    ------
+    estimate:
+        estimated peak memory of a file.
+    observe:
+        add a measured peak memory.
+    save:
+        save the measured peaks.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, filename='', model=MEMORY_MODEL):
+        self.filename = filename
+        self.model = dict(model)
+        self.samples = {}
+        if filename and os.path.isfile(filename):
+            with open(filename, 'r', encoding='utf-8') as fh:
+                self.samples = json.load(fh)
+
+    def _default(self, fileType, size):
+        base, factor = self.model.get(
+            fileType.lower(), max(self.model.values()))
+
+        return base + factor * size
+
+    def scale(self, fileType):
         '''
-        write variables to b355 file.
+        calibration factor of the file type (1 without measured peaks).
         '''
 
-        if not range_lim[0] is None:
-            flagBinsBFile = (variables['altitude'] >= range_lim[0]) & \
-                            (variables['altitude'] <= range_lim[1])
-        else:
-            flagBinsBFile = np.ones(variables['altitude'].shape, dtype=bool)
+        samples = self.samples.get(fileType.lower(), [])
+        if not samples:
+            return 1.0
 
-        if np.sum(flagBinsBFile) == 0:
-            logger.warn(
-                'No bins were selected with your input range_lim.\n',
-                'Jump over {file}.'.format(file=filename))
-        else:
-            if self.method.lower() == 'raman':
-                var_b355 = {
-                    'altitude':
-                        variables['altitude'][flagBinsBFile],
-                    'atmospheric_molecular_calculation_source':
-                        variables['atmospheric_molecular_calculation_source'],
-                    'backscatter':
-                        variables['bsc_355'][flagBinsBFile],
-                    'backscatter_calibration_range':
-                        variables['backscatter_calibration_range_355'],
-                    'backscatter_calibration_range_search_algorithm':
-                        0,
-                    'backscatter_calibration_search_range':
-                        variables['backscatter_calibration_search_range_355'],
-                    'backscatter_calibration_value':
-                        variables['backscatter_calibration_value_355'],
-                    'backscatter_evaluation_method':
-                        variables['backscatter_evaluation_method_355'],
-                    'cirrus_contamination':
-                        variables['cirrus_contamination'],
-                    'cirrus_contamination_source':
-                        variables['cirrus_contamination_source'],
-                    'cloud_mask':
-                        variables['cloud_mask'][flagBinsBFile],
-                    'earlinet_product_type':
-                        2,
-                    'elastic_backscatter_algorithm':
-                        1,
-                    'error_backscatter':
-                        variables['bsc_std_355'][flagBinsBFile],
-                    'error_particledepolarization':
-                        variables['pdr_std_355'][flagBinsBFile],
-                    'error_retrieval_method':
-                        variables['error_retrieval_method_355'],
-                    'error_volumedepolarization':
-                        variables['vdr_std_355'][flagBinsBFile],
-                    'latitude':
-                        variables['latitude'],
-                    'longitude':
-                        variables['longitude'],
-                    'particledepolarization':
-                        variables['pdr_355'][flagBinsBFile],
-                    'raman_backscatter_algorithm':
-                        variables['raman_backscatter_algorithm_355'],
-                    'shots':
-                        variables['shots'],
-                    'station_altitude':
-                        variables['station_altitude'],
-                    'time':
-                        variables['time'],
-                    'time_bounds':
-                        variables['time_bounds'],
-                    'user_defined_category':
-                        variables['user_defined_category'],
-                    'vertical_resolution':
-                        variables['vertical_resolution_355'][flagBinsBFile],
-                    'volumedepolarization':
-                        variables['vdr_355'][flagBinsBFile],
-                    'wavelength':
-                        355,
-                    'zenith_angle':
-                        variables['zenith_angle']
-                }
-            elif self.method.lower() == 'klett':
-                var_b355 = {
-                    'altitude':
-                        variables['altitude'][flagBinsBFile],
-                    'assumed_particle_lidar_ratio':
-                        variables['assumed_particle_lidar_ratio'],
-                    'atmospheric_molecular_calculation_source':
-                        variables['atmospheric_molecular_calculation_source'],
-                    'backscatter':
-                        variables['bsc_355'][flagBinsBFile],
-                    'backscatter_calibration_range':
-                        variables['backscatter_calibration_range_355'],
-                    'backscatter_calibration_range_search_algorithm':
-                        0,
-                    'backscatter_calibration_search_range':
-                        variables['backscatter_calibration_search_range_355'],
-                    'backscatter_calibration_value':
-                        variables['backscatter_calibration_value_355'],
-                    'backscatter_evaluation_method':
-                        variables['backscatter_evaluation_method_355'],
-                    'cirrus_contamination':
-                        variables['cirrus_contamination'],
-                    'cirrus_contamination_source':
-                        variables['cirrus_contamination_source'],
-                    'cloud_mask':
-                        variables['cloud_mask'][flagBinsBFile],
-                    'earlinet_product_type':
-                        2,
-                    'elastic_backscatter_algorithm':
-                        1,
-                    'error_backscatter':
-                        variables['bsc_std_355'][flagBinsBFile],
-                    'error_particledepolarization':
-                        variables['pdr_std_355'][flagBinsBFile],
-                    'error_retrieval_method':
-                        variables['error_retrieval_method_355'],
-                    'error_volumedepolarization':
-                        variables['vdr_std_355'][flagBinsBFile],
-                    'latitude':
-                        variables['latitude'],
-                    'longitude':
-                        variables['longitude'],
-                    'particledepolarization':
-                        variables['pdr_355'][flagBinsBFile],
-                    'raman_backscatter_algorithm':
-                        variables['raman_backscatter_algorithm_355'],
-                    'shots':
-                        variables['shots'],
-                    'station_altitude':
-                        variables['station_altitude'],
-                    'time':
-                        variables['time'],
-                    'time_bounds':
-                        variables['time_bounds'],
-                    'user_defined_category':
-                        variables['user_defined_category'],
-                    'vertical_resolution':
-                        variables['vertical_resolution_355'][flagBinsBFile],
-                    'volumedepolarization':
-                        variables['vdr_355'][flagBinsBFile],
-                    'wavelength':
-                        355,
-                    'zenith_angle':
-                        variables['zenith_angle']
-                }
+        # nearest-rank percentile
+        ratios = sorted(peak / self._default(fileType, size)
+                        for size, peak in samples)
+        rank = int(np.ceil(MEMORY_PERCENTILE / 100.0 * len(ratios)))
 
-            dim_b355 = dimensions
-            dim_b355['altitude'] = np.sum(flagBinsBFile)
-            global_attri_b355 = global_attri
-            logger.info('Writing data to {file}'.format(file=filename))
-            self.__write_2_earlinet_nc(filename, var_b355, dim_b355,
-                                       global_attri_b355)
+        return ratios[max(rank, 1) - 1]
 
-    def __write_2_earlinet_e355(self, filename, variables, dimensions,
-                                global_attri, *args,
-                                range_lim=[0, 5000], **kwargs):
+    def estimate(self, fileType, size):
+        return self.scale(fileType) * self._default(fileType, size)
+
+    def observe(self, fileType, size, peak):
+        samples = self.samples.setdefault(fileType.lower(), [])
+        samples.append([size, peak])
+        del samples[:-MEMORY_SAMPLES]
+
+    def save(self):
+        if not self.filename:
+            return
+
+        with open(self.filename, 'w', encoding='utf-8') as fh:
+            json.dump(self.samples, fh)
+
+
+class RunJournal(object):
+    """
+    Description
+    -----------
+    checkpoint journal of a batch run. The result of each input file is
+    appended as one JSON line (see `convert_files`) when the file is
+    finished, i.e., after all its background writes were done. The journal
+    is flushed after each line and synced to disk every
+    JOURNAL_SYNC_INTERVAL seconds.
+
+    With resume=True, the journal of an interrupted run is read and
+    continued. The files with a result other than STATUS_ERROR are done and
+    are not converted again; failed files are converted again.
+
+    Usage
+    -----
+    journal = RunJournal('run.journal', resume=True)
+    fileLists = [task for task in fileLists if not journal.is_done(task)]
+    journal.add(record, futures)
+    journal.close()
+
+    Method
+    ------
+    is_done:
+        whether the input file was done in a previous run.
+    add:
+        add the result of an input file.
+    poll:
+        write the results whose background writes are finished.
+    write:
+        append a result to the journal.
+    close:
+        write all the results and close the journal.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, filename, resume=False):
+        self.filename = filename
+        self.done = OrderedDict()
+
+        complete = True
+        if resume and os.path.isfile(filename):
+            with open(filename, 'r', encoding='utf-8') as fh:
+                for line in fh:
+                    complete = line.endswith('\n')
+                    try:
+                        record = json.loads(
+                            line, object_pairs_hook=OrderedDict)
+                    except ValueError:
+                        # the last line of an interrupted run
+                        logger.warning(
+                            'Incomplete line in {file}: {line}'.format(
+                                file=filename, line=line.strip()))
+                        continue
+                    key = os.path.abspath(record['file'])
+                    if record['status'] == STATUS_ERROR:
+                        self.done.pop(key, None)
+                    else:
+                        self.done[key] = record
+
+        self._fh = open(filename, 'a' if resume else 'w', encoding='utf-8')
+        if not complete:
+            # start behind the incomplete line
+            self._fh.write('\n')
+        self._pending = []
+        self._syncTime = time.time()
+
+    def is_done(self, filename):
+        return os.path.abspath(filename) in self.done
+
+    def add(self, record, futures=[]):
         '''
-        write to earlinet e355 file.
+        add the result of an input file. It is written when the futures of
+        its background writes are finished.
         '''
 
-        if not range_lim[0] is None:
-            flagBinsEFile = (variables['altitude'] >= range_lim[0]) & \
-                            (variables['altitude'] <= range_lim[1])
-        else:
-            flagBinsEFile = np.ones(variables['altitude'].shape, dtype=bool)
+        self._pending.append((record, futures))
+        self.poll()
 
-        if np.sum(flagBinsEFile) == 0:
-            logger.warn(
-                'No bins were selected with your input range_lim.\n',
-                'Jump over {file}.'.format(file=filename))
-        else:
-            var_e355 = {
-                'altitude':
-                    variables['altitude'][flagBinsEFile],
-                'atmospheric_molecular_calculation_source':
-                    variables['atmospheric_molecular_calculation_source'],
-                'backscatter':
-                    variables['bsc_355'][flagBinsEFile],
-                'backscatter_calibration_range':
-                    variables['backscatter_calibration_range_355'],
-                'backscatter_calibration_range_search_algorithm':
-                    0,
-                'backscatter_calibration_search_range':
-                    variables['backscatter_calibration_search_range_355'],
-                'backscatter_calibration_value':
-                    variables['backscatter_calibration_value_355'],
-                'backscatter_evaluation_method':
-                    variables['backscatter_evaluation_method_355'],
-                'cirrus_contamination':
-                    variables['cirrus_contamination'],
-                'cirrus_contamination_source':
-                    variables['cirrus_contamination_source'],
-                'cloud_mask':
-                    variables['cloud_mask'][flagBinsEFile],
-                'earlinet_product_type':
-                    1,
-                'elastic_backscatter_algorithm':
-                    1,
-                'error_backscatter':
-                    variables['bsc_std_355'][flagBinsEFile],
-                'error_extinction':
-                    variables['ext_std_355'][flagBinsEFile],
-                'error_retrieval_method':
-                    variables['error_retrieval_method_355'],
-                'extinction':
-                    variables['ext_355'][flagBinsEFile],
-                'extinction_assumed_wavelength_dependence':
-                    variables['extinction_assumed_wavelength_dependence_355'],
-                'extinction_evaluation_algorithm':
-                    variables['extinction_evaluation_algorithm_355'],
-                'latitude':
-                    variables['latitude'],
-                'longitude':
-                    variables['longitude'],
-                'raman_backscatter_algorithm':
-                    variables['raman_backscatter_algorithm_355'],
-                'shots':
-                    variables['shots'],
-                'station_altitude':
-                    variables['station_altitude'],
-                'time':
-                    variables['time'],
-                'time_bounds':
-                    variables['time_bounds'],
-                'user_defined_category':
-                    variables['user_defined_category'],
-                'vertical_resolution':
-                    variables['vertical_resolution_355'][flagBinsEFile],
-                'wavelength':
-                    355,
-                'zenith_angle':
-                    variables['zenith_angle']
-            }
-            dim_e355 = dimensions
-            dim_e355['altitude'] = np.sum(flagBinsEFile)
-            global_attri_e355 = global_attri
-            logger.info('Writing data to {file}'.format(file=filename))
-            self.__write_2_earlinet_nc(filename, var_e355, dim_e355,
-                                       global_attri_e355)
+    def poll(self):
+        '''
+        write the results in order, as long as their writes are finished.
+        '''
 
-    def __write_2_earlinet_b532(self, filename, variables, dimensions,
-                                global_attri, *args,
-                                range_lim=[0, 14000], **kwargs):
+        while self._pending and \
+                all(future.done() for future in self._pending[0][1]):
+            record, futures = self._pending.pop(0)
+            check_pending_writes([(record, futures)])
+            self.write(record)
+
+    def write(self, record):
+        self._fh.write(json.dumps(record) + '\n')
+        self._fh.flush()
+
+        if time.time() - self._syncTime >= JOURNAL_SYNC_INTERVAL:
+            os.fsync(self._fh.fileno())
+            self._syncTime = time.time()
+
+    def close(self):
         '''
-        write to earlinet b532 file.
+        write the finished results and close the journal. Call it after
+        flushing the write queue.
         '''
 
-        if not range_lim[0] is None:
-            flagBinsBFile = (variables['altitude'] >= range_lim[0]) & \
-                            (variables['altitude'] <= range_lim[1])
-        else:
-            flagBinsBFile = np.ones(variables['altitude'].shape, dtype=bool)
+        self.poll()
+        if self._pending:
+            logger.warning(
+                '{0:d} files with unfinished writes are not journaled.'.format(
+                    len(self._pending)))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
 
-        if np.sum(flagBinsBFile) == 0:
-            logger.warn(
-                'No bins were selected with your input range_lim.\n',
-                'Jump over {file}.'.format(file=filename))
-        else:
-            if self.method.lower() == 'raman':
-                var_b532 = {
-                    'altitude':
-                        variables['altitude'][flagBinsBFile],
-                    'atmospheric_molecular_calculation_source':
-                        variables['atmospheric_molecular_calculation_source'],
-                    'backscatter':
-                        variables['bsc_532'][flagBinsBFile],
-                    'backscatter_calibration_range':
-                        variables['backscatter_calibration_range_532'],
-                    'backscatter_calibration_range_search_algorithm':
-                        0,
-                    'backscatter_calibration_search_range':
-                        variables['backscatter_calibration_search_range_532'],
-                    'backscatter_calibration_value':
-                        variables['backscatter_calibration_value_532'],
-                    'backscatter_evaluation_method':
-                        variables['backscatter_evaluation_method_532'],
-                    'cirrus_contamination':
-                        variables['cirrus_contamination'],
-                    'cirrus_contamination_source':
-                        variables['cirrus_contamination_source'],
-                    'cloud_mask':
-                        variables['cloud_mask'][flagBinsBFile],
-                    'earlinet_product_type':
-                        6,
-                    'elastic_backscatter_algorithm':
-                        1,
-                    'error_backscatter':
-                        variables['bsc_std_532'][flagBinsBFile],
-                    'error_particledepolarization':
-                        variables['pdr_std_532'][flagBinsBFile],
-                    'error_retrieval_method':
-                        variables['error_retrieval_method_532'],
-                    'error_volumedepolarization':
-                        variables['vdr_std_532'][flagBinsBFile],
-                    'latitude':
-                        variables['latitude'],
-                    'longitude':
-                        variables['longitude'],
-                    'particledepolarization':
-                        variables['pdr_532'][flagBinsBFile],
-                    'raman_backscatter_algorithm':
-                        variables['raman_backscatter_algorithm_532'],
-                    'shots':
-                        variables['shots'],
-                    'station_altitude':
-                        variables['station_altitude'],
-                    'time':
-                        variables['time'],
-                    'time_bounds':
-                        variables['time_bounds'],
-                    'user_defined_category':
-                        variables['user_defined_category'],
-                    'vertical_resolution':
-                        variables['vertical_resolution_532'][flagBinsBFile],
-                    'volumedepolarization':
-                        variables['vdr_532'][flagBinsBFile],
-                    'wavelength':
-                        532,
-                    'zenith_angle':
-                        variables['zenith_angle']
-                }
-            elif self.method.lower() == 'klett':
-                var_b532 = {
-                    'altitude':
-                        variables['altitude'][flagBinsBFile],
-                    'assumed_particle_lidar_ratio':
-                        variables['assumed_particle_lidar_ratio'],
-                    'atmospheric_molecular_calculation_source':
-                        variables['atmospheric_molecular_calculation_source'],
-                    'backscatter':
-                        variables['bsc_532'][flagBinsBFile],
-                    'backscatter_calibration_range':
-                        variables['backscatter_calibration_range_532'],
-                    'backscatter_calibration_range_search_algorithm':
-                        0,
-                    'backscatter_calibration_search_range':
-                        variables['backscatter_calibration_search_range_532'],
-                    'backscatter_calibration_value':
-                        variables['backscatter_calibration_value_532'],
-                    'backscatter_evaluation_method':
-                        variables['backscatter_evaluation_method_532'],
-                    'cirrus_contamination':
-                        variables['cirrus_contamination'],
-                    'cirrus_contamination_source':
-                        variables['cirrus_contamination_source'],
-                    'cloud_mask':
-                        variables['cloud_mask'][flagBinsBFile],
-                    'earlinet_product_type':
-                        6,
-                    'elastic_backscatter_algorithm':
-                        1,
-                    'error_backscatter':
-                        variables['bsc_std_532'][flagBinsBFile],
-                    'error_particledepolarization':
-                        variables['pdr_std_532'][flagBinsBFile],
-                    'error_retrieval_method':
-                        variables['error_retrieval_method_532'],
-                    'error_volumedepolarization':
-                        variables['vdr_std_532'][flagBinsBFile],
-                    'latitude':
-                        variables['latitude'],
-                    'longitude':
-                        variables['longitude'],
-                    'particledepolarization':
-                        variables['pdr_532'][flagBinsBFile],
-                    'raman_backscatter_algorithm':
-                        variables['raman_backscatter_algorithm_532'],
-                    'shots':
-                        variables['shots'],
-                    'station_altitude':
-                        variables['station_altitude'],
-                    'time':
-                        variables['time'],
-                    'time_bounds':
-                        variables['time_bounds'],
-                    'user_defined_category':
-                        variables['user_defined_category'],
-                    'vertical_resolution':
-                        variables['vertical_resolution_532'][flagBinsBFile],
-                    'volumedepolarization':
-                        variables['vdr_532'][flagBinsBFile],
-                    'wavelength':
-                        532,
-                    'zenith_angle':
-                        variables['zenith_angle']
-                }
-            dim_b532 = dimensions
-            dim_b532['altitude'] = np.sum(flagBinsBFile)
-            global_attri_b532 = global_attri
-            logger.info('Writing data to {file}'.format(file=filename))
-            self.__write_2_earlinet_nc(filename, var_b532, dim_b532,
-                                       global_attri_b532)
 
-    def __write_2_earlinet_e532(self, filename, variables, dimensions,
-                                global_attri, *args,
-                                range_lim=[0, 5000], **kwargs):
+class FileClaims(RunJournal):
+    """
+    Description
+    -----------
+    distribute the input files among the nodes which convert the same files
+    over a shared filesystem, without a broker. A node claims a file by
+    creating its claim file exclusively (O_CREAT | O_EXCL) in the claim
+    directory, and marks it as done after the conversion by renaming a
+    result file to the done file. Both are atomic on local filesystems and
+    on NFS (v3 or later).
+
+    The claims are refreshed by a heartbeat. A claim which was not
+    refreshed for stale seconds (e.g., of a crashed node) is stolen by
+    renaming it, which only one node succeeds in. After its own pass, a
+    node waits for the files claimed by others and steals them if their
+    claims become stale, so that all the files are done when a node
+    finishes.
+
+    As a RunJournal, the done files are written when all the background
+    writes of a file are finished.
+
+    Usage
+    -----
+    claims = FileClaims('/share/output/.polly2scc_claims')
+    for task in claims.claim_tasks(fileLists):
+        claims.add(record)
+    claims.close()
+
+    Method
+    ------
+    claim:
+        claim a file.
+    claim_tasks:
+        generator of the files claimed by this node.
+    is_done:
+        whether the file was done by any node.
+    write:
+        mark a file as done (unless it failed) and release its claim.
+    close:
+        mark the finished files as done and release the other claims.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, claim_dir, owner=None, stale=CLAIM_STALE,
+                 poll_interval=CLAIM_POLL_INTERVAL):
+        self.claimDir = claim_dir
+        self.owner = owner or '{0}:{1:d}'.format(
+            socket.gethostname(), os.getpid())
+        self.stale = stale
+        self.pollInterval = poll_interval
+        self.done = OrderedDict()
+        self.nStolen = 0
+        self._pending = []
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stopEvent = threading.Event()
+        self._heartbeat = None
+        os.makedirs(claim_dir, exist_ok=True)
+
+    def _path(self, filename, ext):
+        filename = os.path.abspath(filename)
+        key = hashlib.sha1(filename.encode('utf-8')).hexdigest()[:12]
+
+        return os.path.join(
+            self.claimDir,
+            '{0}.{1}{2}'.format(os.path.basename(filename), key, ext))
+
+    def is_done(self, filename):
+        return os.path.exists(self._path(filename, '.done'))
+
+    def claim(self, filename):
         '''
-        write to earlient e532 file.
+        claim the file. Stale claims of other nodes are stolen.
+
+        Returns
+        -------
+        flag: boolean
+            whether the file was claimed by this node.
+        '''
+
+        if self.is_done(filename):
+            return False
+
+        claimFile = self._path(filename, '.claim')
+        try:
+            fd = os.open(claimFile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return self._steal(filename, claimFile)
+
+        with os.fdopen(fd, 'w') as fh:
+            json.dump({'owner': self.owner, 'file': filename}, fh)
+        if self.is_done(filename):
+            # done and released by another node since the check above
+            os.remove(claimFile)
+            return False
+        with self._lock:
+            self._held.add(claimFile)
+        self._start_heartbeat()
+
+        return True
+
+    def _steal(self, filename, claimFile):
+        try:
+            if time.time() - os.stat(claimFile).st_mtime < self.stale:
+                return False
+            # only one node succeeds in renaming the stale claim
+            staleFile = '{0}.{1}.stale'.format(
+                claimFile, re.sub(r'\W', '_', self.owner))
+            os.rename(claimFile, staleFile)
+        except FileNotFoundError:
+            # released or stolen by another node
+            return False
+
+        if time.time() - os.stat(staleFile).st_mtime < self.stale:
+            # claimed again by another node meanwhile; give it back
+            try:
+                os.link(staleFile, claimFile)
+            except FileExistsError:
+                pass
+            os.remove(staleFile)
+            return False
+
+        os.remove(staleFile)
+        logger.warning('Steal the stale claim of {file}'.format(file=filename))
+        self.nStolen += 1
+
+        return self.claim(filename)
+
+    def claim_tasks(self, tasks):
+        '''
+        generator of the files claimed by this node. The files claimed by
+        others are checked again after the pass, until they are done or
+        their claims become stale.
+        '''
+
+        others = []
+        for task in tasks:
+            if self.claim(task):
+                yield task
+            elif not self.is_done(task):
+                others.append(task)
+
+        while others:
+            for task in list(others):
+                if self.is_done(task):
+                    others.remove(task)
+                elif self.claim(task):
+                    others.remove(task)
+                    yield task
+            if others:
+                time.sleep(self.pollInterval)
+
+    def _start_heartbeat(self):
+        if self._heartbeat is not None:
+            return
+
+        self._heartbeat = threading.Thread(target=self._refresh_claims)
+        self._heartbeat.daemon = True
+        self._heartbeat.start()
+
+    def _refresh_claims(self):
+        while not self._stopEvent.wait(self.stale / 4.0):
+            with self._lock:
+                claimFiles = list(self._held)
+            for claimFile in claimFiles:
+                try:
+                    os.utime(claimFile)
+                except FileNotFoundError:
+                    logger.warning('Lost the claim {0}'.format(claimFile))
+
+    def _release(self, claimFile):
+        with self._lock:
+            self._held.discard(claimFile)
+        try:
+            os.remove(claimFile)
+        except FileNotFoundError:
+            pass
+
+    def write(self, record):
+        '''
+        mark the file as done with its result, and release the claim. Failed
+        files are not marked as done, so that they are retried by another
+        node or the next pass.
+        '''
+
+        if record['status'] == STATUS_ERROR:
+            logger.warning('Release the claim of the failed {file}'.format(
+                file=record['file']))
+            self._release(self._path(record['file'], '.claim'))
+            return
+
+        doneFile = self._path(record['file'], '.done')
+        tmpFile = '{0}.{1}.tmp'.format(
+            doneFile, re.sub(r'\W', '_', self.owner))
+        with open(tmpFile, 'w', encoding='utf-8') as fh:
+            json.dump(dict(record, owner=self.owner), fh)
+        os.rename(tmpFile, doneFile)
+        self._release(self._path(record['file'], '.claim'))
+
+    def close(self):
+        '''
+        mark the finished files as done, and release the claims of the
+        unfinished files (e.g., after an interrupt). Call it after flushing
+        the write queue.
+        '''
+
+        self.poll()
+        with self._lock:
+            claimFiles = list(self._held)
+        for claimFile in claimFiles:
+            self._release(claimFile)
+
+        self._stopEvent.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+
+
+class JobQueue(object):
+    """
+    Description
+    -----------
+    durable job queue in a SQLite database, shared by the processes which
+    submit and run conversions. Each job is a set of `polly2scc` options
+    (see JOB_OPTIONS).
+
+    A worker claims a job with a lease and renews the lease while running
+    it. Jobs with an expired lease (e.g., of a killed worker) are claimed
+    again. A failed job is retried after backoff * 2 ** (attempts - 1)
+    seconds, and is dead-lettered after max_attempts attempts.
+
+    Each job has a priority class (see PRIORITY_CLASSES). Real-time jobs are
+    claimed first, the most recent measurement first; the other jobs in the
+    order of submission. The number of running jobs of a class can be
+    limited by quotas.
+
+    Table `jobs`: id, state (see JOB_STATES), options (JSON), attempts,
+    max_attempts, submitted, available, owner, lease_expires, started,
+    finished (unix time), files (number of input files), message, priority
+    and measured (unix time of the measurement, if known).
+
+    Usage
+    -----
+    jobQueue = JobQueue('jobs.sqlite')
+    jobQueue.submit({'polly_type': 'arielle', ...})
+    job = jobQueue.claim('worker1')
+    jobQueue.complete(job['id'], 'worker1', files=10)
+
+    Method
+    ------
+    submit:
+        add a job.
+    claim:
+        take the next available job (of some classes).
+    renew:
+        extend the lease of a running job.
+    complete:
+        mark a running job as done.
+    fail:
+        retry a running job later, or dead-letter it.
+    release:
+        give a running job back to the queue (preemption).
+    is_waiting:
+        whether a job of a class waits and can be claimed.
+    requeue:
+        queue the dead jobs again.
+    jobs:
+        jobs of a state.
+    stats:
+        number of jobs of each state, the throughput and the latency.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, filename, backoff=JOB_BACKOFF):
+        self.filename = filename
+        self.backoff = backoff
+        # transactions are handled explicitly, to claim jobs atomically
+        self.conn = sqlite3.connect(
+            filename, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs (' +
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, state TEXT NOT NULL, ' +
+            'options TEXT NOT NULL, attempts INTEGER DEFAULT 0, ' +
+            'max_attempts INTEGER, submitted REAL, available REAL, ' +
+            'owner TEXT, lease_expires REAL, started REAL, finished REAL, ' +
+            'files INTEGER, message TEXT, priority TEXT DEFAULT ' +
+            "'backfill', measured REAL)")
+        # queues of the first edition
+        columns = [row[1] for row in
+                   self.conn.execute('PRAGMA table_info(jobs)')]
+        if 'priority' not in columns:
+            self.conn.execute(
+                "ALTER TABLE jobs ADD COLUMN priority TEXT DEFAULT 'backfill'")
+            self.conn.execute('ALTER TABLE jobs ADD COLUMN measured REAL')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, available)')
+
+    def close(self):
+        self.conn.close()
+
+    def submit(self, options, max_attempts=JOB_MAX_ATTEMPTS,
+               priority='backfill', measured=None):
+        '''
+        add a job.
+
+        Parameters
+        ----------
+        options: dict
+            keyword arguments of `polly2scc` (JSON serializable).
+        max_attempts: int
+            attempts before the job is dead-lettered.
+        priority: str
+            priority class (see PRIORITY_CLASSES).
+        measured: datetime
+            time of the measurement, for ordering the real-time jobs.
+
+        Returns
+        -------
+        jobId: int
+        '''
+
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError('Unknown priority class {0}'.format(priority))
+        if measured is not None:
+            measured = measured.replace(tzinfo=timezone.utc).timestamp()
+
+        now = time.time()
+        cursor = self.conn.execute(
+            'INSERT INTO jobs (state, options, max_attempts, submitted, ' +
+            'available, priority, measured) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ('queued', json.dumps(options), max_attempts, now, now,
+             priority, measured))
+
+        return cursor.lastrowid
+
+    def _full_classes(self, quotas, now):
+        '''
+        priority classes with as many running jobs as their quota.
+        '''
+
+        if not quotas:
+            return []
+
+        running = dict(self.conn.execute(
+            'SELECT priority, COUNT(*) FROM jobs WHERE state = ? AND ' +
+            'lease_expires >= ? GROUP BY priority', ('running', now)))
+
+        return [priority for priority, quota in quotas.items()
+                if running.get(priority, 0) >= quota]
+
+    def claim(self, owner, lease=JOB_LEASE, quotas=None, priorities=None,
+              waited=0):
+        '''
+        take the next available job, or a running job with an expired lease.
+
+        Parameters
+        ----------
+        owner: str
+            name of the worker.
+        lease: float
+            lease of the job. [s]
+        quotas: dict
+            maximum number of running jobs of the priority classes.
+        priorities: list
+            only take jobs of these priority classes. (default: all)
+        waited: float
+            only take queued jobs which have been available for this time
+            (e.g., not taken by an idle worker). [s]
+
+        Returns
+        -------
+        job: dict
+            id, options (dict), attempts (including this one) and priority
+            of the job. None if no job is available.
+        '''
+
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            # expired leases count as failed attempts
+            self.conn.execute(
+                'UPDATE jobs SET state = ?, finished = ?, ' +
+                'message = ? WHERE state = ? AND lease_expires < ? AND ' +
+                'attempts >= max_attempts',
+                ('dead', now, 'lease expired', 'running', now))
+            fullClasses = self._full_classes(quotas, now)
+            classes = [priority for priority in priorities or PRIORITY_CLASSES
+                       if priority not in fullClasses]
+            row = self.conn.execute(
+                'SELECT id, options, attempts, priority FROM jobs WHERE ' +
+                '((state = ? AND available <= ?) OR ' +
+                '(state = ? AND lease_expires < ?)) AND ' +
+                'priority IN ({0}) '.format(', '.join(['?'] * len(classes))) +
+                # real-time jobs first, the most recent measurement first
+                'ORDER BY priority != ?, CASE WHEN priority = ? THEN ' +
+                '-IFNULL(measured, 0) ELSE id END, id LIMIT 1',
+                ['queued', now - waited, 'running', now] + classes +
+                ['realtime', 'realtime']).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    'UPDATE jobs SET state = ?, owner = ?, ' +
+                    'lease_expires = ?, started = ?, ' +
+                    'attempts = attempts + 1 WHERE id = ?',
+                    ('running', owner, now + lease, now, row['id']))
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        if row is None:
+            return None
+
+        return {'id': row['id'], 'options': json.loads(row['options']),
+                'attempts': row['attempts'] + 1, 'priority': row['priority']}
+
+    def is_waiting(self, priority, quotas=None):
+        '''
+        whether a job of the priority class can be claimed now.
+        '''
+
+        now = time.time()
+        if priority in self._full_classes(quotas, now):
+            return False
+
+        row = self.conn.execute(
+            'SELECT 1 FROM jobs WHERE state = ? AND available <= ? AND ' +
+            'priority = ? LIMIT 1', ('queued', now, priority)).fetchone()
+
+        return row is not None
+
+    def _update_running(self, jobId, owner, sql, params):
+        cursor = self.conn.execute(
+            'UPDATE jobs SET ' + sql + ' WHERE id = ? AND state = ? AND ' +
+            'owner = ?', list(params) + [jobId, 'running', owner])
+
+        # False if the lease was lost to another worker
+        return cursor.rowcount == 1
+
+    def renew(self, jobId, owner, lease=JOB_LEASE):
+        return self._update_running(
+            jobId, owner, 'lease_expires = ?', [time.time() + lease])
+
+    def complete(self, jobId, owner, files=0, message=''):
+        return self._update_running(
+            jobId, owner, 'state = ?, finished = ?, files = ?, message = ?',
+            ['done', time.time(), files, message])
+
+    def fail(self, jobId, owner, message=''):
+        '''
+        retry the job after the back-off, or dead-letter it after
+        max_attempts attempts.
+        '''
+
+        now = time.time()
+        row = self.conn.execute(
+            'SELECT attempts, max_attempts FROM jobs WHERE id = ?',
+            (jobId,)).fetchone()
+        if row['attempts'] >= row['max_attempts']:
+            return self._update_running(
+                jobId, owner, 'state = ?, finished = ?, message = ?',
+                ['dead', now, message])
+
+        delay = self.backoff * 2 ** (row['attempts'] - 1)
+        return self._update_running(
+            jobId, owner, 'state = ?, available = ?, message = ?',
+            ['queued', now + delay, message])
+
+    def release(self, jobId, owner):
+        '''
+        give the running job back to the queue, without counting the
+        attempt.
+        '''
+
+        return self._update_running(
+            jobId, owner,
+            'state = ?, attempts = attempts - 1, available = ?, owner = ?',
+            ['queued', time.time(), None])
+
+    def requeue(self, state='dead'):
+        '''
+        queue the jobs of the state again with new attempts.
+        '''
+
+        cursor = self.conn.execute(
+            'UPDATE jobs SET state = ?, attempts = 0, available = ? ' +
+            'WHERE state = ?', ('queued', time.time(), state))
+
+        return cursor.rowcount
+
+    def jobs(self, state):
+        rows = self.conn.execute(
+            'SELECT * FROM jobs WHERE state = ? ORDER BY id', (state,))
+
+        return [dict(row) for row in rows]
+
+    def stats(self, window=JOB_THROUGHPUT_WINDOW):
+        '''
+        number of jobs of each state and the throughput.
+
+        Returns
+        -------
+        stats: OrderedDict
+            number of jobs of each state in JOB_STATES, jobs_per_hour and
+            files_per_hour (done in the last window seconds), oldest_wait
+            (waiting time of the oldest queued job [s]) and latency (for
+            each priority class, the LATENCY_PERCENTILES of the time from
+            submitting to finishing the jobs done in the last window
+            seconds [s]).
         '''
 
-        if not range_lim[0] is None:
-            flagBinsEFile = (variables['altitude'] >= range_lim[0]) & \
-                            (variables['altitude'] <= range_lim[1])
+        now = time.time()
+        stats = OrderedDict((state, 0) for state in JOB_STATES)
+        for row in self.conn.execute(
+                'SELECT state, COUNT(*) FROM jobs GROUP BY state'):
+            stats[row[0]] = row[1]
+
+        row = self.conn.execute(
+            'SELECT COUNT(*), TOTAL(files) FROM jobs WHERE state = ? AND ' +
+            'finished >= ?', ('done', now - window)).fetchone()
+        stats['jobs_per_hour'] = row[0] * 3600.0 / window
+        stats['files_per_hour'] = row[1] * 3600.0 / window
+
+        row = self.conn.execute(
+            'SELECT MIN(submitted) FROM jobs WHERE state = ?',
+            ('queued',)).fetchone()
+        stats['oldest_wait'] = 0.0 if row[0] is None else now - row[0]
+
+        stats['latency'] = OrderedDict()
+        for priority in PRIORITY_CLASSES:
+            latency = [row[0] for row in self.conn.execute(
+                'SELECT finished - submitted FROM jobs WHERE state = ? ' +
+                'AND priority = ? AND finished >= ?',
+                ('done', priority, now - window))]
+            if latency:
+                stats['latency'][priority] = OrderedDict(
+                    ('p{0:d}'.format(percentile),
+                     float(np.percentile(latency, percentile)))
+                    for percentile in LATENCY_PERCENTILES)
+
+        return stats
+
+
+class UploadSession(object):
+    """
+    Description
+    -----------
+    HTTP session for uploading the EARLINET files to an endpoint, with a
+    pool of keep-alive connections. Each request takes an idle connection
+    of the pool (or opens a new one) and gives it back after reading the
+    response; connections with errors are closed. The number of
+    connections is bounded by the number of concurrent requests, e.g., the
+    threads of `upload_files`.
+
+    Usage
+    -----
+    session = UploadSession('http://localhost:8080/earlinet')
+    status, headers, body = session.request('HEAD', 'file.nc')
+    session.close()
+
+    Method
+    ------
+    request:
+        send a request for a file below the URL of the endpoint.
+    close:
+        close the idle connections.
+
+    History
+    -------
+    2026-10-19. First edition.
+    """
+
+    def __init__(self, url, timeout=UPLOAD_TIMEOUT, token=''):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == 'https':
+            self._connectionClass = http.client.HTTPSConnection
+        elif parts.scheme == 'http':
+            self._connectionClass = http.client.HTTPConnection
         else:
-            flagBinsEFile = np.ones(variables['altitude'].shape, dtype=bool)
+            raise ValueError('Unsupported URL: {0}'.format(url))
+
+        self.url = url
+        self.host = parts.netloc
+        self.path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.token = token
+        self.nConnections = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.nConnections += 1
+            return self._connectionClass(self.host, timeout=self.timeout)
 
-        if np.sum(flagBinsEFile) == 0:
-            logger.warn(
-                'No bins were selected with your input range_lim.\n',
-                'Jump over {file}.'.format(file=filename))
+    def request(self, method, name, body=None, headers={}):
+        '''
+        send a request for the file name of the endpoint.
+
+        Returns
+        -------
+        status: int
+            HTTP status.
+        headers: HTTPMessage
+            response headers.
+        body: bytes
+            response body.
+        '''
+
+        headers = dict(headers)
+        if self.token:
+            headers['Authorization'] = 'Bearer ' + self.token
+
+        connection = self._connection()
+        try:
+            connection.request(
+                method, self.path + '/' + urllib.parse.quote(name),
+                body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except Exception:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
         else:
-            var_e532 = {
-                'altitude':
-                    variables['altitude'][flagBinsEFile],
-                'atmospheric_molecular_calculation_source':
-                    variables['atmospheric_molecular_calculation_source'],
-                'backscatter':
-                    variables['bsc_532'][flagBinsEFile],
-                'backscatter_calibration_range':
-                    variables['backscatter_calibration_range_532'],
-                'backscatter_calibration_range_search_algorithm':
-                    0,
-                'backscatter_calibration_search_range':
-                    variables['backscatter_calibration_search_range_532'],
-                'backscatter_calibration_value':
-                    variables['backscatter_calibration_value_532'],
-                'backscatter_evaluation_method':
-                    variables['backscatter_evaluation_method_532'],
-                'cirrus_contamination':
-                    variables['cirrus_contamination'],
-                'cirrus_contamination_source':
-                    variables['cirrus_contamination_source'],
-                'cloud_mask':
-                    variables['cloud_mask'][flagBinsEFile],
-                'earlinet_product_type':
-                    5,
-                'elastic_backscatter_algorithm':
-                    1,
-                'error_backscatter':
-                    variables['bsc_std_532'][flagBinsEFile],
-                'error_extinction':
-                    variables['ext_std_532'][flagBinsEFile],
-                'error_retrieval_method':
-                    variables['error_retrieval_method_532'],
-                'extinction':
-                    variables['ext_532'][flagBinsEFile],
-                'extinction_assumed_wavelength_dependence':
-                    variables['extinction_assumed_wavelength_dependence_532'],
-                'extinction_evaluation_algorithm':
-                    variables['extinction_evaluation_algorithm_532'],
-                'latitude':
-                    variables['latitude'],
-                'longitude':
-                    variables['longitude'],
-                'raman_backscatter_algorithm':
-                    variables['raman_backscatter_algorithm_532'],
-                'shots':
-                    variables['shots'],
-                'station_altitude':
-                    variables['station_altitude'],
-                'time':
-                    variables['time'],
-                'time_bounds':
-                    variables['time_bounds'],
-                'user_defined_category':
-                    variables['user_defined_category'],
-                'vertical_resolution':
-                    variables['vertical_resolution_532'][flagBinsEFile],
-                'wavelength':
-                    532,
-                'zenith_angle':
-                    variables['zenith_angle']
-            }
-            dim_e532 = dimensions
-            dim_e532['altitude'] = np.sum(flagBinsEFile)
-            global_attri_e532 = global_attri
-            logger.info('Writing data to {file}'.format(file=filename))
-            self.__write_2_earlinet_nc(filename, var_e532, dim_e532,
-                                       global_attri_e532)
+            self._idle.put(connection)
+
+        return response.status, response.headers, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    # keep-alive connections
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.nConnections += 1
+
+    def _reply(self, status, message='', headers={}):
+        body = message.encode('utf-8')
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _target(self):
+        name = urllib.parse.unquote(self.path.split('?')[0]).split('/')[-1]
+        if name in ['', '.', '..']:
+            return None
+
+        return os.path.join(self.server.directory, name)
+
+    def _authorized(self):
+        return (not self.server.token) or \
+            (self.headers.get('Authorization') ==
+             'Bearer ' + self.server.token)
+
+    def do_HEAD(self):
+        target = self._target()
+        if not self._authorized():
+            self._reply(401)
+        elif (target is None) or (not os.path.isfile(target)):
+            self._reply(404)
+        else:
+            self._reply(200, headers={
+                'X-Checksum-SHA256': file_checksum(target)})
+
+    def do_PUT(self):
+        if 'Content-Length' not in self.headers:
+            self._reply(411, 'Content-Length required')
+            return
+
+        # read the body, also for errors, to keep the connection usable
+        target = self._target()
+        tmpFile = '{0}.{1:d}.part'.format(
+            target or os.path.join(self.server.directory, 'upload'),
+            threading.get_ident())
+        sha256 = hashlib.sha256()
+        remaining = int(self.headers['Content-Length'])
+        with open(tmpFile, 'wb') as fh:
+            while remaining > 0:
+                block = self.rfile.read(min(remaining, UPLOAD_CHUNK))
+                if not block:
+                    break
+                sha256.update(block)
+                fh.write(block)
+                remaining -= len(block)
+        checksum = sha256.hexdigest()
+
+        with self.server.lock:
+            failure = self.server.fail_next > 0
+            self.server.fail_next -= int(failure)
+
+        if failure or (not self._authorized()) or (target is None) or \
+                (remaining > 0) or \
+                (self.headers.get('X-Checksum-SHA256', checksum) !=
+                 checksum):
+            os.remove(tmpFile)
+            if failure:
+                self._reply(503, 'Service unavailable (stand-in)')
+            elif not self._authorized():
+                self._reply(401)
+            elif target is None:
+                self._reply(400, 'No filename')
+            else:
+                self._reply(400, 'Checksum mismatch')
+        elif os.path.isfile(target) and (file_checksum(target) == checksum):
+            # idempotent
+            os.remove(tmpFile)
+            self._reply(200, 'exists')
+        else:
+            os.replace(tmpFile, target)
+            self._reply(201, 'created')
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class _UploadServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve_upload_stub(directory, port=0, address='127.0.0.1', token=''):
+    '''
+    serve a local stand-in of the upload endpoint in a background thread,
+    for testing the uploads offline. The files of `PUT /<name>` are saved
+    in directory; `HEAD /<name>` returns the checksum of a saved file in
+    the X-Checksum-SHA256 header.
+
+    Parameters
+    ----------
+    directory: str
+        directory for the uploaded files.
+    port: int
+        port of the endpoint (a free port if 0).
+    address: str
+    token: str
+        bearer token which is required, if not empty.
+
+    Returns
+    -------
+    server: HTTPServer
+        call server.shutdown() to stop it. Set server.fail_next to answer
+        the next uploads with 503. server.nConnections counts the
+        connections.
+    '''
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    server = _UploadServer((address, port), _UploadHandler)
+    server.directory = directory
+    server.token = token
+    server.fail_next = 0
+    server.nConnections = 0
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    logger.info('Serve the upload stand-in at http://{0}:{1:d}/'.format(
+        address, server.server_address[1]))
+
+    return server
+
+
+class polly_2_earlinet_convertor(object):
+    """
+    Description
+    -----------
+    convert the polly data into EARLINET format
+
+    Method
+    ------
+    read_data_file:
+        read polly results into data container of 'variables', 'dimensions' and
+        'global_attri'
+    search_data_files:
+        search the polly data files through wildcards
+    iter_data_files:
+        generator of the polly data files (recursive, with time window)
+    write_to_earlinet_nc:
+        write data container into EARLINET nc files
+
+    History
+    -------
+    2019-09-09. First edition by Zhenping
+    """
+
+    def __init__(self, pollyType='', location='', fileType='labview',
+                 category=2, method='raman', output_dir='', *,
+                 camp_info_file='', force=False):
+        '''
+        initialize the instance
+
+        parameters
+        ----------
+        pollyType: str
+            polly type. e.g., pollyxt_tropos
+        location: str
+            location of the campaign.
+        fileType: str
+            polly file type. (labview | picasso)
+        category: int
+            category of the results.
+        method: str or list
+            Klett or Raman method for calculating backscatter values (klett |
+            raman). Several methods can be given as list or comma-separated
+            string (e.g., 'raman,klett'), to convert both from one read.
+        output_dir: str
+            directory for saving the converted files
+
+        Keywords
+        --------
+        camp_info_file: str
+            campaign info file to provide the global attributes.
+        force: boolean
+            flag to control whether to overwirte the netCDF files.
+        '''
+
+        # initialize the class variables
+        self.pollyType = pollyType
+        self.location = location
+        self.fileType = fileType
+        self.category = category
+        if isinstance(method, str):
+            method = method.split(',')
+        self.methods = [item.strip().lower() for item in method]
+        self.method = self.methods[0]
+        self.projectDir = PROJECTDIR
+        self.outputDir = output_dir
+        self.force = force
+        self.read_status = None
+        # (campaign, key) of the missing filter FWHMs, logged once
+        self.missingFwhm = set()
+
+        # setup the campaign config file
+        self.camp_info_file = os.path.join(
+            self.projectDir, 'config', camp_info_file)
+
+        # load conversion key
+        self.conversion_key = self.load_convert_key_config()
+
+        # load campaign list
+        self.campaign_dict = self.load_campaign_list()
+
+        # load metadata for the nc variables
+        # if self.method.lower()=='raman':
+        #     METADATA_FILE = 'metadata_klett_raman.toml'
+        # elif self.method.lower()=='klett':
+        #     METADATA_FILE = 'metadata_klett_raman.toml'
+        metadataFile = os.path.join(self.projectDir, 'config', METADATA_FILE)
+        self.metadata = self.load_metadata(metadataFile)
+
+        # get instrument list
+        instrument_list = []
+        for camp_label in self.campaign_dict:
+            instrument_list.append(self.campaign_dict[camp_label]['system'])
+        self.instrument_list = list(set(instrument_list))
+
+        # get location list
+        location_list = []
+        for camp_label in self.campaign_dict:
+            location_list.append(self.campaign_dict[camp_label]['location'])
+        self.location_list = list(set(location_list))
+
+    def load_metadata(self, filename):
+        '''
+        load the metadata for output nc files.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the metadata file.
+        Returns
+        -------
+        metaData: dict
+            metadata.
+        '''
+
+        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
+            logger.error(
+                'metadata file does not exist!\n{file}'.format(filename))
+            raise FileNotFoundError
+
+        with open(filename, 'r', encoding='utf-8') as fh:
+            metaData = toml.loads(fh.read())
+
+        return metaData
+
+    def load_campaign_list(self):
+        '''
+        load the campaign information list into a dict.
+
+        Returns
+        -------
+        camp_dict: dict
+            campaign dict.
+        '''
+
+        camp_list_file = os.path.join(
+            self.projectDir, 'config', CAMPAIGN_LIST_FILE)
+
+        # check the campaign list file
+        if (not os.path.exists(camp_list_file)) or \
+           (not os.path.isfile(camp_list_file)):
+            logger.error(
+                'campaign list file does not exist!\n{file}'.format(
+                    file=camp_list_file))
+            raise FileNotFoundError
+
+        with open(camp_list_file, 'r', encoding='utf-8') as fh:
+            camp_dict = toml.loads(fh.read())
+
+        # convert the timestamp to datetime object
+        for camp_label in camp_dict:
+            camp_dict[camp_label]['starttime'] = datetime.strptime(
+                camp_dict[camp_label]['starttime'], '%Y-%m-%d %H:%M:%S')
+            camp_dict[camp_label]['endtime'] = datetime.strptime(
+                camp_dict[camp_label]['endtime'], '%Y-%m-%d %H:%M:%S')
+
+        return camp_dict
+
+    def load_convert_key_config(self):
+        '''
+        load the convert key for mapping the labview/picasso configurations to
+        EARLINET standard configurations.
+
+        Returns
+        -------
+        conversion_key: dict
+            conversion keys.
+        '''
+
+        if self.fileType.lower() == 'labview':
+            convert_key_filepath = os.path.join(
+                self.projectDir, 'config', LABVIEW_KEY_FILE)
+        elif self.fileType.lower() == 'picasso':
+            convert_key_filepath = os.path.join(
+                self.projectDir, 'config', PICASSO_KEY_FILE)
+
+        if (not os.path.exists(convert_key_filepath)) or \
+           (not os.path.isfile(convert_key_filepath)):
+            logger.error(
+                'file does not exist!\n{file}'.format(
+                    file=convert_key_filepath))
+            raise FileNotFoundError
+
+        # load conversion key
+        try:
+            with open(convert_key_filepath, 'r', encoding='utf-8') as fh:
+                conversion_key = toml.loads(fh.read())
+        except Exception as e:
+            logger.error(
+                'Failure in reading {file}'.format(
+                    file=convert_key_filepath))
+            raise IOError
+
+        return conversion_key
+
+    def load_camp_info(self, camp_info_file=None):
+        '''
+        load the campain information
+
+        Parameters
+        ----------
+        camp_info_file: str
+            absolute path of campaign information file.
+
+        Returns
+        -------
+        camp_info: dict
+            campaign information
+        '''
+
+        if (not os.path.exists(camp_info_file)) or \
+           (not os.path.isfile(camp_info_file)):
+            logger.error(
+                'campaign configuration file does not exist!\n{file}'
+                .format(file=camp_info_file))
+            raise FileNotFoundError
+
+        with open(camp_info_file, 'r', encoding='utf-8') as fh:
+            camp_info = toml.loads(fh.read())
+
+        return camp_info
+
+    def read_data_file(self, filename, *args, **kwargs):
+        '''
+        read the data from the polly data file (labview or picasso style)
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the data file.
+
+        Returns
+        -------
+        dims: dict
+            dimensions
+        data: ProfileContainer
+            data (can be used as a dict)
+        global_attri: dict
+            global attributes
+        '''
+
+        dims, dataMethods, global_attri = \
+            self.read_data_file_methods(filename, *args, **kwargs)
+
+        if dataMethods:
+            # results of the first method
+            data = list(dataMethods.values())[0]
+        else:
+            data = None
+
+        return dims, data, global_attri
+
+    def read_data_file_methods(self, filename, *args, **kwargs):
+        '''
+        read the data from the polly data file (labview or picasso style) for
+        all the backscatter methods in self.methods. The file, the meteorology
+        and the attributes are only read once.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the data file.
+
+        Returns
+        -------
+        dims: dict
+            dimensions
+        dataMethods: OrderedDict
+            data container of each method. Labview results are always
+            retrieved with Raman method.
+        global_attri: dict
+            global attributes
+        '''
+
+        # reason why no data was read (status, message)
+        self.read_status = None
+
+        if self.fileType.lower() == 'labview':
+            dims, data, global_attri = \
+                self.__read_labview_results(filename, **kwargs)
+            if data is None:
+                dataMethods = None
+            else:
+                dataMethods = OrderedDict([(data['method'], data)])
+        elif self.fileType.lower() == 'picasso':
+            dims, dataMethods, global_attri = \
+                self.__read_picasso_results(filename, **kwargs)
+        else:
+            logger.error(
+                'Wrong input of fileType: {fileType}'.format(
+                    fileType=self.fileType))
+
+        return dims, dataMethods, global_attri
+
+    def list_avail_prodType(self, variable):
+        '''
+        list available earlinet products that can be converted to.
+
+        Parameters
+        ----------
+        variable: dict
+            Data container.
+
+        Returns
+        -------
+        availProdList: list
+            available product list that can be converted.
+        '''
+
+        availProdList = []
+
+        if variable is None:
+            # when no campaign info file was found or data is lost
+            return
+
+        # determine b355
+        if ('pdr_355' in variable.keys()) and \
+           ('vdr_355' in variable.keys()) and \
+           ('bsc_355' in variable.keys()):
+            availProdList.append('b355')
+
+        # determine e355
+        if ('ext_355' in variable.keys()) and \
+           ('bsc_355' in variable.keys()):
+            availProdList.append('e355')
+
+        # determine b532
+        if ('pdr_532' in variable.keys()) and \
+           ('vdr_532' in variable.keys()) and \
+           ('bsc_532' in variable.keys()):
+            availProdList.append('b532')
+
+        # determine e532
+        if ('ext_532' in variable.keys()) and \
+           ('bsc_532' in variable.keys()):
+            availProdList.append('e532')
+
+        # determine b1064
+        if ('bsc_1064' in variable.keys()):
+            availProdList.append('b1064')
+
+        return availProdList
+
+    def search_data_files(self, filename, filepath=None):
+        '''
+        Search the polly data files. Wildcards are supported.
+
+        Parameters
+        ----------
+        filename: str
+            regular expression search pattern for data files.
+        filepath: str
+            directory of data files.
+        Returns
+        -------
+        fileList: list
+            found data files that need to be converted.
+        '''
+
+        # search the files
+        logger.info('Start to search polly data files...')
+        fileList = list(self.iter_data_files(filename, filepath=filepath))
+
+        logger.info('number of files: {nFiles:d}'.format(nFiles=len(fileList)))
+
+        return fileList
+
+    def input_files(self, filename):
+        '''
+        all the files which are read for converting the data file.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the data file.
+
+        Returns
+        -------
+        fileList: list
+            the data file and the labview info file.
+        '''
+
+        if self.fileType.lower() == 'labview':
+            return [filename, filename[0:-4] + '-info.txt']
+        else:
+            return [filename]
+
+    def iter_data_files(self, filename, filepath=None, recursive=False,
+                        since=None, until=None):
+        '''
+        generator of the polly data files, so that the conversion can start
+        with the first file found. Wildcards are supported in the filename
+        and the filepath.
+
+        Parameters
+        ----------
+        filename: str
+            search pattern for data files.
+        filepath: str
+            directory of data files.
+        recursive: boolean
+            whether to search the sub directories of filepath.
+        since: datetime
+            only files with the start time in the filename from since on.
+        until: datetime
+            only files with the start time in the filename before until.
+
+        Yields
+        ------
+        filename: str
+            path of the data file.
+        '''
+
+        if not filepath:
+            filepath = os.getcwd()
+
+        if glob.has_magic(filepath):
+            directories = sorted(
+                item for item in glob.glob(filepath) if os.path.isdir(item))
+        else:
+            directories = [filepath]
+
+        for directory in directories:
+            for item in iter_data_files(
+                    directory, filename, recursive=recursive, since=since,
+                    until=until):
+                yield item
+
+    def search_camp_info_file(self, pollyType, location, starttime):
+        '''
+        search the required campaign info file.
+        If no file was found, return None.
+
+        Parameters
+        ----------
+        pollyType: str
+            polly type
+        location: str
+            campaign location.
+        starttime: datetime
+            starttime of the profile.
+        Returns
+        -------
+        campaign_file_list: str
+            absolute path of the campaign file.
+        '''
+
+        instrument_list = [item.lower() for item in self.instrument_list]
+        location_list = [item.lower() for item in self.location_list]
+
+        if (not (pollyType.lower() in instrument_list)) or \
+           (not (location.lower() in location_list)):
+            return ''
+
+        # search campaign info file
+        campaign_dict = self.campaign_dict
+        campaign_file_list = []
+        for item in self.campaign_dict:
+            flagLocation = self.campaign_dict[item]['location'].lower() == \
+                           location.lower()
+            flagSystem = self.campaign_dict[item]['system'].lower() == \
+                pollyType.lower()
+            flagTime = (starttime > self.campaign_dict[item]['starttime']) and\
+                       (starttime <= self.campaign_dict[item]['endtime'])
+            if flagLocation and flagSystem and flagTime:
+                campaign_file_list.append(os.path.join(self.projectDir,
+                                                       'config',
+                                                       item + '.toml'))
+
+        if len(campaign_file_list) > 1:
+            logger.error(
+                'Duplicated campaign info files were found.\n{file}'
+                .format(file=campaign_file_list))
+
+        if not campaign_file_list:
+            logger.warning('No campaign info file was found.')
+            return ''
+        else:
+            logger.info(
+                '{file} will be loaded for campaign configs.'
+                .format(file=campaign_file_list[0]))
+
+        return campaign_file_list[0]
+
+    def scan_data_file(self, filename):
+        '''
+        collect the catalogue entries of a data file (see ArchiveCatalogue).
+        Only the labview info file or the netCDF header and attributes of the
+        Picasso file are read.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the data file.
+
+        Returns
+        -------
+        entries: list
+            one dict for each backscatter method in the file. Empty if the
+            file can not be interpreted.
+        '''
+
+        stat = os.stat(filename)
+        entry = {
+            'path': os.path.abspath(filename),
+            'file_type': self.fileType.lower(),
+            'fingerprint': file_fingerprint(filename),
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'system': self.pollyType,
+            'location': self.location
+        }
+        timeFormat = '%Y-%m-%d %H:%M:%S'
+        entries = []
+
+        if self.fileType.lower() == 'labview':
+            labviewInfo = self.__read_labview_info(
+                filename[0:-4] + '-info.txt')
+            if not labviewInfo:
+                return []
+
+            if labviewInfo['retrieving_method'] == 0:
+                # labview profiles have a fixed set of columns
+                products = self.list_avail_prodType(dict.fromkeys(
+                    ['bsc_355', 'vdr_355', 'pdr_355', 'ext_355',
+                     'bsc_532', 'vdr_532', 'pdr_532', 'ext_532',
+                     'bsc_1064']))
+                method = 'raman'
+            else:
+                # Klett files are not supported by the reader
+                products = []
+                method = 'klett'
+
+            starttime = labviewInfo['starttime']
+            endtime = labviewInfo['endtime']
+            entries.append(dict(
+                entry, method=method, products=products,
+                smoothing=labviewInfo['vertical_resolution'] *
+                labviewInfo['smoothWindow']))
+
+        elif self.fileType.lower() == 'picasso':
+            with NETCDF_LOCK, Dataset(filename, 'r') as fh:
+                fh.set_auto_maskandscale(False)
+                pData = fh.variables
+                attrs = fh.__dict__
+                starttime = datetime.utcfromtimestamp(
+                    float(pData['start_time'][0]))
+                endtime = datetime.utcfromtimestamp(
+                    float(pData['end_time'][0]))
+                if attrs.get('source'):
+                    entry['system'] = attrs['source']
+                if attrs.get('location'):
+                    entry['location'] = attrs['location']
+
+                for method in BACKSCATTER_METHODS:
+                    # the same variables as read by the Picasso reader
+                    keys = {}
+                    smoothing = None
+                    for wavelength in WAVELENGTHS:
+                        bscVar = 'aerBsc_{0}_{1:d}'.format(method, wavelength)
+                        if bscVar in pData.keys():
+                            keys['bsc_{0:d}'.format(wavelength)] = None
+                        if (bscVar in pData.keys()) and (smoothing is None):
+                            smoothing = self.picasso_attri_parser(
+                                pData[bscVar].retrieving_info,
+                                varname='smoothing_window', method=method)
+                        if 'aerExt_raman_{0:d}'.format(wavelength) in pData:
+                            keys['ext_{0:d}'.format(wavelength)] = None
+                        if 'volDepol_raman_{0:d}'.format(wavelength) in pData:
+                            keys['vdr_{0:d}'.format(wavelength)] = None
+                            keys['pdr_{0:d}'.format(wavelength)] = None
+
+                    products = self.list_avail_prodType(keys)
+                    if products:
+                        entries.append(dict(
+                            entry, method=method, products=products,
+                            smoothing=smoothing))
+
+        else:
+            logger.error(
+                'Wrong input of fileType: {fileType}'.format(
+                    fileType=self.fileType))
+            return []
+
+        campaign = self.search_camp_info_file(
+            entry['system'], entry['location'], starttime)
+        for item in entries:
+            item['start_time'] = starttime.strftime(timeFormat)
+            item['end_time'] = endtime.strftime(timeFormat)
+            item['products'] = ','.join(item['products'])
+            item['campaign'] = \
+                os.path.splitext(os.path.basename(campaign))[0]
+
+        return entries
+
+    def range_slice(self, altitude, range_lim):
+        '''
+        resolve the range limits into one contiguous block of range bins.
+        Product variables can then be taken as views of the profiles.
+
+        Parameters
+        ----------
+        altitude: array
+            altitude of each range bin (monotonically increasing). (m)
+        range_lim: 2-element list
+            bottom and top of the range window (both included). None for no
+            limit.
+
+        Returns
+        -------
+        binsSlice: slice
+            range bins within range_lim.
+        '''
+
+        altitude = np.ma.getdata(altitude)
+
+        if range_lim[0] is None:
+            start = 0
+        else:
+            start = int(np.searchsorted(altitude, range_lim[0], side='left'))
+
+        if range_lim[1] is None:
+            stop = len(altitude)
+        else:
+            stop = int(np.searchsorted(altitude, range_lim[1], side='right'))
+
+        return slice(start, max(start, stop))
+
+    def get_depol_filter_fwhm(self, wavelength):
+        '''
+        FWHM of the filter of the depolarization channel, which is set with
+        'depol_filter_fwhm_{wavelength}' in the entry of the current campaign
+        in the campaign list.
+
+        Parameters
+        ----------
+        wavelength: int
+            wavelength of the depolarization channel. (nm)
+
+        Returns
+        -------
+        fwhm: float
+            FWHM of the filter. (nm) None if it was not configured.
+        '''
+
+        camp_label = os.path.splitext(
+            os.path.basename(self.camp_info_file))[0]
+        key = 'depol_filter_fwhm_{0:d}'.format(wavelength)
+        fwhm = self.campaign_dict.get(camp_label, {}).get(key)
+
+        if fwhm is None:
+            if (camp_label, key) not in self.missingFwhm:
+                self.missingFwhm.add((camp_label, key))
+                logger.warning(
+                    ('No {key} for {campaign} in the campaign list. ' +
+                     'moleculardepolarization is not written at ' +
+                     '{wavelength:d} nm.').format(
+                        key=key, campaign=camp_label, wavelength=wavelength))
+            return None
+
+        return float(fwhm)
+
+    def calc_molecular_depol(self, temperature, wavelength, fwhm):
+        '''
+        calculate the molecular depolarization ratio for each range bin.
+
+        Parameters
+        ----------
+        temperature: array
+            temperature profile. (K)
+        wavelength: int
+            wavelength of the depolarization channel. (nm)
+        fwhm: float
+            FWHM of the filter of the depolarization channel. (nm)
+
+        Returns
+        -------
+        mdr: array
+            molecular depolarization ratio. (NaN for missing temperature)
+        '''
+
+        if not hasattr(self, '_depol_lidar'):
+            self._depol_lidar = {}
+
+        if (wavelength, fwhm) not in self._depol_lidar:
+            self._depol_lidar[(wavelength, fwhm)] = DepolarizationLidar(
+                wavelength, fwhm)
+
+        temperature = np.ma.filled(
+            np.ma.masked_invalid(temperature).astype(np.double), np.nan)
+        mdr = np.full(temperature.shape, np.nan)
+        flagValid = temperature > 0
+        mdr[flagValid] = self._depol_lidar[
+            (wavelength, fwhm)].delta_mol_temperature(temperature[flagValid])
+
+        return mdr
+
+    def get_molecular_profile(self, height, pressure, temperature,
+                              fingerprint=None):
+        '''
+        molecular profile of the sounding, which is shared with all the other
+        files of the same sounding through the process-wide molecular cache.
+
+        Parameters
+        ----------
+        height: array
+            height. (m)
+        pressure: array
+            pressure. (hPa)
+        temperature: array
+            temperature. (K)
+
+        Keywords
+        --------
+        fingerprint: str
+            MolecularCache.fingerprint of the height, pressure and temperature,
+            if it was already calculated.
+
+        Returns
+        -------
+        profile: MolecularProfile
+        '''
+
+        if fingerprint is None:
+            fingerprint = MolecularCache.fingerprint(
+                height, pressure, temperature)
+        key = (fingerprint, None)
+
+        return molecular_cache.fetch(
+            key,
+            lambda: MolecularProfile(
+                pressure=np.ma.filled(
+                    np.ma.asarray(pressure, dtype=np.double), np.nan),
+                temperature=np.ma.filled(
+                    np.ma.asarray(temperature, dtype=np.double), np.nan)))
+
+    def get_molecular_quantities(self, height, pressure, temperature,
+                                 wavelength, fingerprint=None):
+        '''
+        molecular quantities of the sounding at the given wavelength. They
+        are taken from the process-wide molecular cache if the same sounding
+        has been used before.
+
+        Parameters
+        ----------
+        height: array
+            height. (m)
+        pressure: array
+            pressure. (hPa)
+        temperature: array
+            temperature. (K)
+        wavelength: int
+            wavelength. (nm)
+
+        Keywords
+        --------
+        fingerprint: str
+            MolecularCache.fingerprint of the height, pressure and temperature,
+            if it was already calculated.
+
+        Returns
+        -------
+        quantities: dict
+            'beta_mol': molecular backscatter coefficient. (m^-1*sr^-1)
+            'alpha_mol': molecular extinction coefficient. (m^-1)
+            'mdr': molecular depolarization ratio. (only for the wavelengths
+            with depolarization channel whose filter FWHM is configured)
+            The arrays are shared between the files and read-only.
+        '''
+
+        if fingerprint is None:
+            fingerprint = MolecularCache.fingerprint(
+                height, pressure, temperature)
+
+        fwhm = None
+        if wavelength in DEPOL_WAVELENGTHS:
+            fwhm = self.get_depol_filter_fwhm(wavelength)
+
+        def calc_quantities():
+            profile = self.get_molecular_profile(
+                height, pressure, temperature, fingerprint=fingerprint)
+            quantities = {
+                'beta_mol': profile.beta_pi(wavelength),
+                'alpha_mol': profile.alpha(wavelength)
+            }
+            if fwhm is not None:
+                quantities['mdr'] = self.calc_molecular_depol(
+                    temperature, wavelength, fwhm)
+
+            for item in quantities.values():
+                item.flags.writeable = False
+
+            return quantities
+
+        key = (fingerprint, wavelength, fwhm)
+
+        return molecular_cache.fetch(key, calc_quantities)
+
+    def calc_molecular_optical_depth(self, variables,
+                                     wavelengths=WAVELENGTHS):
+        '''
+        calculate the cumulative molecular optical depth and the two-way
+        molecular transmission from the lowest range bin to each range bin.
+        The profiles of all wavelengths are calculated in one pass and added to
+        the data container.
+
+        Parameters
+        ----------
+        variables: dict
+            data container with 'altitude' (m), 'pressure' (hPa) and
+            'temperature' (K).
+
+        Keywords
+        --------
+        wavelengths: list
+            wavelengths. (nm)
+
+        Returns
+        -------
+        variables: dict
+            data container with 'mol_od_{wavelength}' and
+            'mol_trans_{wavelength}'.
+        '''
+
+        tau, transmission = atmospheric_optical_depth_profile(
+            wavelengths,
+            np.ma.filled(variables['pressure'], np.nan),
+            np.ma.filled(variables['temperature'], np.nan),
+            np.ma.filled(variables['altitude'], np.nan) / 1e3)
+
+        for indx, wavelength in enumerate(wavelengths):
+            variables['mol_od_{0:d}'.format(wavelength)] = tau[indx]
+            variables['mol_trans_{0:d}'.format(wavelength)] = \
+                transmission[indx]
+
+        return variables
+
+    def __read_labview_results(self, filename):
+        '''
+        read labview results into the data pool, which will then be exported
+        to earlinet data format.
+
+        If the file does no exist or the file was retrieved with Klett method,
+        return None
+        '''
+
+        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
+            logger.warning(
+                '{file} does not exist!\nFinish!'.format(file=filename))
+            self.read_status = (STATUS_ERROR, 'file does not exist')
+            return None, None, None
+
+        logger.info('Start reading {filename}'.format(filename=filename))
+
+        # read labview info file
+        infoFilename = filename[0:-4] + '-info.txt'
+        labviewInfo = self.__read_labview_info(infoFilename)
+
+        if not labviewInfo:
+            # if failed in retrieving the labview info
+            self.read_status = (STATUS_ERROR, 'no labview info file')
+            return None, None, None
+
+        # TODO: add support profiles with Klett/Fernald method
+        # jump over Klett profiles
+        if labviewInfo['retrieving_method'] == 1:
+            logger.warning(
+                'Klett file was not supported.\n{file}\nJump over!!!'.
+                format(file=filename))
+
+            self.read_status = (
+                STATUS_UNSUPPORTED_KLETT, 'labview Klett file')
+            return None, None, None
+
+        # search the campaign info file
+        if (not os.path.exists(self.camp_info_file)) or \
+           (not os.path.isfile(self.camp_info_file)):
+            logger.warning(
+                'Campaign info file does not exist. Please check the {file}'
+                .format(file=self.camp_info_file) +
+                '.\nNow turn to auto-searching.')
+
+            # auto-search for campaign info file
+            self.camp_info_file = self.search_camp_info_file(
+                self.pollyType, self.location, labviewInfo['starttime'])
+
+            if (not os.path.exists(self.camp_info_file)) or \
+               (not os.path.isfile(self.camp_info_file)):
+                logger.warning(
+                    'Failed in searching the campaign info file. ' +
+                    'Your instrument or campaign is not ' +
+                    'supported by the campaign list. (see isse #4)')
+
+                self.read_status = (
+                    STATUS_NO_CAMPAIGN, 'no campaign info file')
+                return None, None, None
+
+        # load the campaign info
+        with open(self.camp_info_file, 'r', encoding='utf-8') as fh:
+            camp_info = toml.loads(fh.read())
+
+        if not (camp_info['processor_name']):
+            # set processor_name automatically if not set in the camp_info file
+            camp_info['processor_name'] = labviewInfo['software_version']
+
+            if not (labviewInfo['software_version']):
+                logger.warn(
+                    'No software_version in your info file.\n' +
+                    'Please check your labview version. Or set the ' +
+                    'process_name in the campaign info file.')
+
+                self.read_status = (
+                    STATUS_ERROR, 'no software_version in the info file')
+                return None, None, None
+
+        self.camp_info = camp_info
+
+        # read labview data file
+        labviewData = self.__read_labview_data(filename)
+
+        # cut off the bins with influences from smoothing
+        smoothWin = labviewInfo['smoothWindow']
+        labviewDataCut = labviewData[0:-int(smoothWin/2), :]
+
+        # convert the data matrix into dict with unit conversion
+        labviewDataDict = {
+            'height': labviewDataCut[:, 0] * 1e3,
+            'bsc_355': labviewDataCut[:, 1] * 1e-6,
+            'bsc_std_355': labviewDataCut[:, 2] * 1e-6,
+            'bsc_532': labviewDataCut[:, 3] * 1e-6,
+            'bsc_std_532': labviewDataCut[:, 4] * 1e-6,
+            'bsc_1064': labviewDataCut[:, 5] * 1e-6,
+            'bsc_std_1064': labviewDataCut[:, 6] * 1e-6,
+            'ext_355': labviewDataCut[:, 7] * 1e-6,
+            'ext_std_355': labviewDataCut[:, 8] * 1e-6,
+            'ext_532': labviewDataCut[:, 9] * 1e-6,
+            'ext_std_532': labviewDataCut[:, 10] * 1e-6,
+            'lr_355': labviewDataCut[:, 11],
+            'lr_std_355': labviewDataCut[:, 12],
+            'lr_532': labviewDataCut[:, 13],
+            'lr_std_532': labviewDataCut[:, 14],
+            'height_vdr_532': labviewDataCut[:, 21] * 1e3,
+            'vdr_532': labviewDataCut[:, 22],
+            'vdr_std_532': labviewDataCut[:, 23],
+            'height_pdr_532': labviewDataCut[:, 24] * 1e3,
+            'pdr_532': labviewDataCut[:, 25],
+            'pdr_std_532': labviewDataCut[:, 26],
+            'height_sounding': labviewDataCut[:, 27],
+            'temperature': labviewDataCut[:, 28],
+            'pressure': labviewDataCut[:, 29],
+            'height_vdr_355': labviewDataCut[:, 30] * 1e3,
+            'vdr_355': labviewDataCut[:, 31],
+            'vdr_std_355': labviewDataCut[:, 32],
+            'height_pdr_355': labviewDataCut[:, 33] * 1e3,
+            'pdr_355': labviewDataCut[:, 34],
+            'pdr_std_355': labviewDataCut[:, 35],
+            # the unit of Rayleigh scatterinf coef. in labview file was wrong
+            'bsc_mol_355': labviewDataCut[:, 66] * 1e-3,
+            'bsc_mol_532': labviewDataCut[:, 67] * 1e-3,
+            'bsc_mol_1064': labviewDataCut[:, 68] * 1e-3
+        }
+
+        # interpolate the data into the same grid
+        regridSpan = tracer.begin(
+            'regrid', bins=len(labviewDataDict['height']))
+        fh_vdr_532 = interp1d(
+            labviewDataDict['height_vdr_532'],
+            labviewDataDict['vdr_532'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_vdr_std_532 = interp1d(
+            labviewDataDict['height_vdr_532'],
+            labviewDataDict['vdr_std_532'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_pdr_532 = interp1d(
+            labviewDataDict['height_pdr_532'],
+            labviewDataDict['pdr_532'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_pdr_std_532 = interp1d(
+            labviewDataDict['height_pdr_532'],
+            labviewDataDict['pdr_std_532'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_vdr_355 = interp1d(
+            labviewDataDict['height_vdr_355'],
+            labviewDataDict['vdr_355'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_vdr_std_355 = interp1d(
+            labviewDataDict['height_vdr_355'],
+            labviewDataDict['vdr_std_355'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_pdr_355 = interp1d(
+            labviewDataDict['height_pdr_355'],
+            labviewDataDict['pdr_355'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_pdr_std_355 = interp1d(
+            labviewDataDict['height_pdr_355'],
+            labviewDataDict['pdr_std_355'],
+            kind='linear',
+            fill_value='extrapolate')
+
+        labviewDataDict['vdr_532'] = fh_vdr_532(labviewDataDict['height'])
+        labviewDataDict['vdr_std_532'] = fh_vdr_std_532(
+            labviewDataDict['height'])
+        labviewDataDict['pdr_532'] = fh_pdr_532(labviewDataDict['height'])
+        labviewDataDict['pdr_std_532'] = fh_pdr_std_532(
+            labviewDataDict['height'])
+        labviewDataDict['vdr_355'] = fh_vdr_355(labviewDataDict['height'])
+        labviewDataDict['vdr_std_355'] = fh_vdr_std_355(
+            labviewDataDict['height'])
+        labviewDataDict['pdr_355'] = fh_pdr_355(labviewDataDict['height'])
+        labviewDataDict['pdr_std_355'] = fh_pdr_std_355(
+            labviewDataDict['height'])
+
+        # interpolate the sounding into the same grid
+        fh_temperature = interp1d(
+            labviewDataDict['height_sounding'],
+            labviewDataDict['temperature'],
+            kind='linear',
+            fill_value='extrapolate')
+        fh_pressure = interp1d(
+            labviewDataDict['height_sounding'],
+            labviewDataDict['pressure'],
+            kind='linear',
+            fill_value='extrapolate')
+        labviewDataDict['temperature'] = fh_temperature(
+            labviewDataDict['height'])   # [K]
+        labviewDataDict['pressure'] = fh_pressure(
+            labviewDataDict['height']) / 100   # [Pa] -> [hPa]
+        tracer.end(regridSpan)
+
+        # molecular quantities of the sounding (shared with the other files
+        # of the same sounding)
+        molecular = {}
+        with tracer.span('molecular'):
+            fingerprint = MolecularCache.fingerprint(
+                labviewDataDict['height'],
+                labviewDataDict['pressure'],
+                labviewDataDict['temperature'])
+            for wavelength in WAVELENGTHS:
+                molecular[wavelength] = self.get_molecular_quantities(
+                    labviewDataDict['height'],
+                    labviewDataDict['pressure'],
+                    labviewDataDict['temperature'],
+                    wavelength, fingerprint=fingerprint)
+
+        # calculate the backscatter-ratio at the reference height
+        refMask355 = (labviewDataDict['height'] >=
+                      labviewInfo['backscatter_calibration_range_355'][0]) & \
+                     (labviewDataDict['height'] <=
+                      labviewInfo['backscatter_calibration_range_355'][1])
+        refBscMol355 = np.nanmean(labviewDataDict['bsc_mol_355'][refMask355])
+        refBscRatio355 = labviewInfo['backscatter_calibration_value_355'] / \
+            refBscMol355 + 1
+        refMask532 = (labviewDataDict['height'] >=
+                      labviewInfo['backscatter_calibration_range_532'][0]) & \
+                     (labviewDataDict['height'] <=
+                      labviewInfo['backscatter_calibration_range_532'][1])
+        refBscMol532 = np.nanmean(labviewDataDict['bsc_mol_532'][refMask532])
+        refBscRatio532 = labviewInfo['backscatter_calibration_value_532'] / \
+            refBscMol532 + 1
+        refMask1064 = (labviewDataDict['height'] >=
+                       labviewInfo['backscatter_calibration_range_1064'][0]) &\
+                      (labviewDataDict['height'] <=
+                       labviewInfo['backscatter_calibration_range_1064'][1])
+        refBscMol1064 = np.nanmean(
+            labviewDataDict['bsc_mol_1064'][refMask1064])
+        refBscRatio1064 = labviewInfo['backscatter_calibration_value_1064'] / \
+            refBscMol1064 + 1
+
+        # convert the labview data into the data container
+        dimensions = {
+            'altitude': len(labviewDataDict['height']),
+            'time': 1,
+            'wavelength': 1,
+            'nv': 2   # number of values (2 for reference height)
+        }
+
+        data = ProfileContainer(len(labviewDataDict['height']), {
+            'height': labviewDataDict['height'],   # above the station
+            'altitude': labviewDataDict['height'] +
+            camp_info['station_altitude'],
+            'time':
+            labviewInfo['starttime'].replace(tzinfo=timezone.utc).timestamp(),
+            'time_bounds':
+            np.array([tObj.replace(tzinfo=timezone.utc).timestamp()
+                      for tObj in labviewInfo['time_bounds']]),
+            'cirrus_contamination': 0,   # 0: not_available;
+                                         # 1: no_cirrus;
+                                         # 2: cirrus_detected
+            'cirrus_contamination_source': 0,   # 0: not_available;
+                                                # 1: user_provided;
+                                                # 2: automatic_calculated
+            'error_retrieval_method_355': 1,   # 0: monte_carlo;
+                                               # 1: error_propagation
+            'error_retrieval_method_532': 1,   # 0: monte_carlo;
+                                               # 1: error_propagation
+            'error_retrieval_method_1064': 1,   # 0: monte_carlo;
+                                                # 1: error_propagation
+            'extinction_evaluation_algorithm_355': 1,   # 0: Ansmann;
+                                                # 1: via_backscatter_ratio
+            'extinction_evaluation_algorithm_532': 1,   # 0: Ansmann;
+                                                # 1: via_backscatter_ratio
+            'extinction_evaluation_algorithm_1064': 1,   # 0: Ansmann;
+                                                # 1: via_backscatter_ratio
+            'backscatter_evaluation_method_355':
+                labviewInfo['backscatter_evaluation_method'],
+            'backscatter_evaluation_method_532':
+                labviewInfo['backscatter_evaluation_method'],
+            'backscatter_evaluation_method_1064':
+                labviewInfo['backscatter_evaluation_method'],
+            'raman_backscatter_algorithm_355':
+                labviewInfo['raman_backscatter_algorithm'],
+            'raman_backscatter_algorithm_532':
+                labviewInfo['raman_backscatter_algorithm'],
+            'raman_backscatter_algorithm_1064':
+                labviewInfo['raman_backscatter_algorithm'],
+            'extinction_assumed_wavelength_dependence_355':
+                labviewInfo['extinction_assumed_wavelength_dependence'],
+            'extinction_assumed_wavelength_dependence_532':
+                labviewInfo['extinction_assumed_wavelength_dependence'],
+            'extinction_assumed_wavelength_dependence_1064':
+                labviewInfo['extinction_assumed_wavelength_dependence'],
+            'backscatter_calibration_range_355':
+                labviewInfo['backscatter_calibration_range_355'],
+            'backscatter_calibration_range_532':
+                labviewInfo['backscatter_calibration_range_532'],
+            'backscatter_calibration_range_1064':
+                labviewInfo['backscatter_calibration_range_1064'],
+            'backscatter_calibration_value_355':
+                refBscRatio355,
+            'backscatter_calibration_value_532':
+                refBscRatio532,
+            'backscatter_calibration_value_1064':
+                refBscRatio1064,
+            # the backscatter calibration search range
+            # was not supported by labview. Therefore, set it to be constants.
+            'backscatter_calibration_search_range_355':
+                [0, 20000],
+            'backscatter_calibration_search_range_532':
+                [0, 20000],
+            'backscatter_calibration_search_range_1064':
+                [0, 20000],
+            'ext_355': labviewDataDict['ext_355'],
+            'ext_std_355': labviewDataDict['ext_std_355'],
+            'ext_532': labviewDataDict['ext_532'],
+            'ext_std_532': labviewDataDict['ext_std_532'],
+            'bsc_355': labviewDataDict['bsc_355'],
+            'bsc_std_355': labviewDataDict['bsc_std_355'],
+            'bsc_532': labviewDataDict['bsc_532'],
+            'bsc_std_532': labviewDataDict['bsc_std_532'],
+            'bsc_1064': labviewDataDict['bsc_1064'],
+            'bsc_std_1064': labviewDataDict['bsc_std_1064'],
+            'vdr_355': labviewDataDict['vdr_355'],
+            'vdr_std_355': labviewDataDict['vdr_std_355'],
+            'vdr_532': labviewDataDict['vdr_532'],
+            'vdr_std_532': labviewDataDict['vdr_std_532'],
+            'pdr_355': labviewDataDict['pdr_355'],
+            'pdr_std_355': labviewDataDict['pdr_std_355'],
+            'pdr_532': labviewDataDict['pdr_532'],
+            'pdr_std_532': labviewDataDict['pdr_std_532'],
+            'temperature': labviewDataDict['temperature'],
+            'pressure': labviewDataDict['pressure'],
+            'molecular_profile': self.get_molecular_profile(
+                labviewDataDict['height'],
+                labviewDataDict['pressure'],
+                labviewDataDict['temperature'],
+                fingerprint=fingerprint),
+            'user_defined_category': self.category,
+            'cirrus_contamination_source': 0,
+            'atmospheric_molecular_calculation_source':
+            labviewInfo['sounding_type'],
+            'latitude': camp_info['station_latitude'],
+            'longitude': camp_info['station_longitude'],
+            'shots': labviewInfo['shots'],
+            'station_altitude': camp_info['station_altitude'],
+            'zenith_angle': labviewInfo['zenith_angle'],
+            'method': 'raman'
+            })
+
+        # molecular depolarization ratio (only if the filter FWHM of the
+        # depolarization channel is configured for the campaign)
+        for wavelength in DEPOL_WAVELENGTHS:
+            if 'mdr' in molecular[wavelength]:
+                data['mdr_{0:d}'.format(wavelength)] = \
+                    molecular[wavelength]['mdr']
+
+        # molecular optical depth and two-way transmission
+        self.calc_molecular_optical_depth(data)
+
+        # constant-valued profiles
+        for wavelength in WAVELENGTHS:
+            data.set_constant(
+                'vertical_resolution_{0:d}'.format(wavelength),
+                labviewInfo['vertical_resolution'] *
+                labviewInfo['smoothWindow'])
+        data.set_constant('cloud_mask', -127, dtype=np.byte)
+
+        # setup global attributes
+        global_attris = camp_info
+
+        return dimensions, data, global_attris
+
+    @traced('read_data')
+    def __read_labview_data(self, filename):
+        '''
+        read the labview retrieving data.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the labview data file.
+
+        Returns
+        -------
+        dataMatrix: numpy matrix (height * column)
+        '''
+
+        dataMatrix = np.loadtxt(
+            filename, skiprows=1, dtype=float, encoding='cp1252')
+        return dataMatrix
+
+    @traced('read_info')
+    def __read_labview_info(self, filename):
+        '''
+        read the labview info file, which contains the retrieving information.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the labview info file.
+
+        Returns
+        -------
+        labviewInfo: dict
+            retrieving configurations of labview program.
+        '''
+
+        labviewInfo = self.labview_info_parser(filename)
+
+        if not labviewInfo:
+            # if failed in retrieving the info
+            return None
+
+        # convert the datetime
+        labviewInfo['starttime'] = datetime.strptime(
+            labviewInfo['starttime'], '%y%m%d %H%M')
+        labviewInfo['endtime'] = datetime.strptime(
+            labviewInfo['endtime'], '%y%m%d %H%M')
+
+        # concatenate reference height
+        labviewInfo['reference_height_355'] = np.array(
+            [labviewInfo['reference_height_bottom_355'],
+             labviewInfo['reference_height_top_355']])
+        labviewInfo['reference_height_532'] = np.array(
+            [labviewInfo['reference_height_bottom_532'],
+             labviewInfo['reference_height_top_532']])
+        labviewInfo['reference_height_1064'] = np.array(
+            [labviewInfo['reference_height_bottom_1064'],
+             labviewInfo['reference_height_top_1064']])
+
+        # convert the retrieving method
+        retMethodDict = dict(zip(
+            self.conversion_key['lk_retrieving_method'],
+            self.conversion_key['ek_retrieving_method']))
+        labviewInfo['retrieving_method'] = \
+            retMethodDict[labviewInfo['retrieving_method']]
+
+        # convert the flag_use_particle_ext_for_raman_bsc
+        ramanMethodDict = dict(zip(
+            self.conversion_key['lk_raman_backscatter_algorithm'],
+            self.conversion_key['ek_raman_backscatter_algorithm']
+        ))
+        labviewInfo['raman_backscatter_algorithm'] = \
+            ramanMethodDict[labviewInfo['flag_use_particle_ext_for_raman_bsc']]
+
+        # convert the sounding type
+        soundingSearchList = self.conversion_key['ek_meteor_source']
+        labviewInfo['sounding_type'] = \
+            soundingSearchList[labviewInfo['sounding_type']]
+
+        data = {
+                'software_version': labviewInfo['software_version'],
+                'starttime': labviewInfo['starttime'],
+                'endtime': labviewInfo['endtime'],
+                'sounding_type': labviewInfo['sounding_type'],
+                'atmospheric_molecular_calculation_source':
+                labviewInfo['sounding_type'],   # 0: US_standard_atmosphere;
+                                                # 1: radiosonding;
+                                                # 2: ecmwf;
+                                                # 3: icon-iglo-12-23;
+                                                # 4: gdas
+                'backscatter_calibration_range_355': \
+                labviewInfo['reference_height_355'],
+                'backscatter_calibration_range_532': \
+                labviewInfo['reference_height_532'],
+                'backscatter_calibration_range_1064': \
+                labviewInfo['reference_height_1064'],
+                'backscatter_calibration_range_search_algorithm': 0,
+                'backscatter_calibration_value_355': \
+                labviewInfo['reference_value_355'],
+                'backscatter_calibration_value_532': \
+                labviewInfo['reference_value_532'],
+                'backscatter_calibration_value_1064': \
+                labviewInfo['reference_value_1064'],
+                # 0: Raman; 1: elastic_backscatter
+                'backscatter_evaluation_method': \
+                labviewInfo['retrieving_method'],
+                'smoothWindow': labviewInfo['smooth_ext_355'],
+                'retrieving_method': labviewInfo['retrieving_method'],
+                # Ångstroem exponent
+                'extinction_assumed_wavelength_dependence': labviewInfo['AE'],
+                # 0: weighted_linear_fit; 1: non-weighted_linear_fit
+                'extinction_evaluation_algorithm': 1,
+                'shots': 1,   # number of accumulated laser shots
+                # seconds since 1970-01-01 00:00:00
+                'time': labviewInfo['starttime'],
+                # time_bounds
+                'time_bounds': \
+                [labviewInfo['starttime'], labviewInfo['endtime']],
+                # 1: cirrus; 2: climatol; 4: dicycles; 8: etna; 16: forfires;
+                # 32: photosmog; 64: rurban; 128: sahadust; 256: stratos;
+                # 512: satellite_overpass
+                'user_defined_category': self.category,
+                'vertical_resolution': labviewInfo['dz'],   # [m]
+                'zenith_angle': \
+                np.rad2deg(np.arccos(labviewInfo['dz'] /
+                           labviewInfo['range_resolution'])),
+                'raman_backscatter_algorithm':
+                labviewInfo['raman_backscatter_algorithm']
+            }
+
+        return data
+
+    def labview_info_parser(self, filename):
+        '''
+        parsing the information from the labview info file.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of labview info file.
+
+        Returns
+        -------
+        data: dict
+            retrieving configurations used in labview program.
+        '''
+
+        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
+            logger.warning('Labview info file does not exist.\n{infoFile}'.
+                           format(infoFile=filename))
+            return None
+
+        # decoder structure
+        # key: regex, conversion function fill value
+        # Inspired by Martin Radenz
+        decoders = {
+            'starttime': (
+                    r'(?<=Messung von \(UTC\):)\d+.\d+',
+                    str,
+                    '000000 0000'
+            ),
+            'endtime': (r'(?<=bis \(UTC\): )\d+.\d+', str, '000000 0000'),
+            'reference_height_bottom_355': (
+                r'(?<=refheigt355\(m\) from : )\d+',
+                float,
+                0
+            ),
+            'reference_height_top_355': (
+                r'(?<=refheight355 \(m\) to: )\d+',
+                float,
+                0
+            ),
+            'reference_value_355': (
+                r'(?<=refwert355 \(km\^-1 sr\^-1\): )\d+\.\d+[eE]-?\d+',
+                float,
+                0
+            ),
+            'reference_height_bottom_532': (
+                r'(?<=refheigt532\(m\) from : )\d+',
+                float,
+                0
+            ),
+            'reference_height_top_532': (
+                r'(?<=refheight532 \(m\) to: )\d+',
+                float,
+                0
+            ),
+            'reference_value_532': (
+                r'(?<=refwert532 \(km\^-1 sr\^-1\): )\d+\.\d+[eE]-?\d+',
+                float,
+                0
+            ),
+            'reference_height_bottom_1064': (
+                r'(?<=refheigt1064\(m\) from : )\d+',
+                float,
+                0
+            ),
+            'reference_height_top_1064': (
+                r'(?<=refheight1064 \(m\) to: )\d+',
+                float,
+                0
+            ),
+            'reference_value_1064': (
+                r'(?<=refwert1064 \(km\^-1 sr\^-1\): )\d+\.\d+[eE]-?\d+',
+                float,
+                0
+            ),
+            'smooth_ext_355': (r'(?<=smoothingalpha355: )\d+', int, 0),
+            'smooth_bsc_355': (r'(?<=smootingbeta355: )\d+', int, 0),
+            'smooth_ext_532': (r'(?<=smoothingalpha532: )\d+', int, 0),
+            'smooth_bsc_532': (r'(?<=smootingbeta532: )\d+', int, 0),
+            'smooth_ext_1064': (r'(?<=smoothingalpha1064: )\d+', int, 0),
+            'smooth_bsc_1064': (r'(?<=smootingbeta1064: )\d+', int, 0),
+            'dz':  (r'(?<=dz: )\d+\.?\d+', float, 0),
+            'retrieving_method': (r'(?<=\nMethod:)\w+', str, 'Raman'),
+            'AE':  (
+                r'(?<=Angström for Raman Extinction: )\d+\.?\d+',
+                float,
+                0
+            ),
+            'sounding_type': (r'(?<=Sounding Type: )\d\.?\d+', float, 0),
+            'flag_deadtime_correction': (
+                r'(?<=Death time correction: )\w+',
+                str,
+                'no'
+            ),
+            'flag_use_particle_ext_for_raman_bsc': (
+                r'(?<=Use particle ext for raman Bsc: )\w+',
+                str,
+                'no'
+            ),
+            'range_resolution': (
+                r'(?<=Range resolution: )\d+\.?\d+',
+                float,
+                0
+            ),
+            'software_version': (r'(?<=Software version: )\w+\.?\w+', str, ''),
+        }
+
+        # intialize the data
+        data = {}
+
+        # read the labview info file
+        with open(filename, 'r', encoding='cp1252') as fh:
+            content = fh.read()
+
+        for key, regex in decoders.items():
+            val = find_in_string(regex, content)
+            data.update({key: val})
+
+        # souding_type is still a float number, convert it to integer
+        data['sounding_type'] = int(data['sounding_type'])
+
+        # determine the range_resolution (old version labview did't provide it)
+        if abs(data['range_resolution'] - 0) <= 1e-9:
+            logger.warn(
+                'range_resolution is 0 m. Check whether you used ' +
+                'old version labview program. We will change the ' +
+                'range_resolution to 30 m for the converison.')
+            data['range_resolution'] = 30
+
+        return data
+
+    def picasso_attri_parser(self, inStr, *arg,
+                             varname='reference_search_bottom', method=None):
+        '''
+        parse information from picasso variable attributes.
+
+        Parameters
+        ----------
+        inStr: str
+            input string.
+
+        Keywords
+        --------
+        varname: str
+            'reference_search_bottom'
+            'reference_search_top'
+            'smoothing_window':
+            'angstroem_exponent' for Raman method
+            'fixed lidar ratio' for Klett method
+            'reference_value'
+            'meteor_source'
+        method: str
+            retrieving method of the variable. (default: self.method)
+
+        Returns
+        -------
+        val:
+            varname value.
+        '''
+
+        if method is None:
+            method = self.method
+
+        if method.lower() == 'raman':
+            decoders = {
+                'reference_search_top': (
+                    r'(?<=Reference search range:......... - )\d+.\d+',
+                    float,
+                    0
+                ),
+                'reference_search_bottom': (
+                    r'(?<=Reference search range: )\d+.\d+',
+                    float,
+                    0,
+                ),
+                'smoothing_window': (
+                    r'(?<=Smoothing window: )\d+\.+\d+[eE][+-]\d+',
+                    float,
+                    0
+                ),
+                'angstroem_exponent': (
+                    r'(?<=Angstroem exponent: )\d+.\d+',
+                    float,
+                    0
+                ),
+                'reference_value': (
+                    r'(?<=Reference value: )\d+\.\d+[eE]-?\d+',
+                    float,
+                    0
+                ),
+                'meteor_source': (
+                    r'(?<=Meteorological Source: )\w+',
+                    str,
+                    'standard_atmosphere'
+                )
+            }
+        elif method.lower() == 'klett':
+            decoders = {
+                'reference_search_top': (
+                    r'(?<=Reference search range:......... - )\d+.\d+',
+                    float,
+                    0
+                ),
+                'reference_search_bottom': (
+                    r'(?<=Reference search range: )\d+.\d+',
+                    float,
+                    0,
+                ),
+                'smoothing_window': (
+                    r'(?<=Smoothing window: )\d+\.+\d+[eE][+-]\d+',
+                    float,
+                    0
+                ),
+                'angstroem_exponent': (
+                    r'(?<=Angstroem exponent: )\d+.\d+',
+                    float,
+                    0
+                ),
+                'fixed_lidar_ratio': (
+                    r'(?<=Fixed lidar ratio:  )\d+.\d+',
+                    float,
+                    0
+                ),
+                'reference_value': (
+                    r'(?<=Reference value: )\d+\.\d+[eE]-?\d+',
+                    float,
+                    0
+                ),
+                'meteor_source': (
+                    r'(?<=Meteorological Source: )\w+',
+                    str,
+                    'standard_atmosphere'
+                )
+            }
+
+        if varname in decoders.keys():
+            val = find_in_string(decoders[varname], inStr)
+        else:
+            raise ValueError
+
+        return val
+
+    def __read_picasso_results(self, filename, *args):
+        '''
+        read picasso results into the data pool, which will then be exported
+        to earlinet data format.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the Picasso profiles.
+
+        Returns
+        -------
+        dimensions: dict
+        dataMethods: OrderedDict
+            data container of each backscatter method in self.methods.
+        global_attri: dict
+        '''
+
+        if (not os.path.exists(filename)) or (not os.path.isfile(filename)):
+            logger.warning(
+                '{file} does not exist!\nFinish!'.format(file=filename))
+            self.read_status = (STATUS_ERROR, 'file does not exist')
+            return None, None, None
+
+        logger.info('Start reading {filename}'.format(filename=filename))
+
+        # NETCDF_LOCK is only held for the netCDF calls, so that the profiles
+        # are assembled while other threads write their files
+        with NETCDF_LOCK:
+            fh = Dataset(filename, 'r')
+            fh.set_auto_maskandscale(False)
+            ncVersion = fh.version
+            pData = read_nc_attributes(fh.variables)
+
+        try:
+            return self.__read_picasso_dataset(
+                ncVersion, pData, NcValues(fh.variables))
+        finally:
+            with NETCDF_LOCK:
+                fh.close()
+
+    def __read_picasso_dataset(self, ncVersion, pData, pValues):
+        '''
+        convert the opened Picasso profiles into the data containers (see
+        __read_picasso_results).
+
+        Parameters
+        ----------
+        ncVersion: str
+            Picasso version of the profiles.
+        pData: OrderedDict
+            attributes of the netCDF variables (see read_nc_attributes).
+        pValues: NcValues
+            values of the netCDF variables.
+        '''
+
+        # read picasso data (as plain arrays with NaN for the fill values)
+        readSpan = tracer.begin('read_data')
+
+        # check the Picasso program version
+        # Only if version >= 2.0, the conversion can be applied
+        if (version.parse(ncVersion) < version.parse('2.0')):
+            raise RuntimeError(
+                'The profile was processed by old versioned ' +
+                'Picasso (< v2.0). Some mandatory variables ' +
+                'required by EARLINET data format is ' +
+                'therefore missing.')
+
+        # search the campaign info file
+        if (not os.path.exists(self.camp_info_file)) or \
+           (not os.path.isfile(self.camp_info_file)):
+            logger.warning(
+                'Campaign info file does not exist. Please check the {file}'
+                .format(file=self.camp_info_file) +
+                '.\nNow turn to auto-searching.')
+
+            # auto-search for campaign info file
+            self.camp_info_file = self.search_camp_info_file(
+                self.pollyType, self.location,
+                datetime.utcfromtimestamp(pValues['start_time'][0]))
+
+            if (not os.path.exists(self.camp_info_file)) or \
+               (not os.path.isfile(self.camp_info_file)):
+                logger.warning(
+                    'Failed in searching the campaign info file. ' +
+                    'Your instrument or campaign is not ' +
+                    'supported by the campaign list.')
+                self.read_status = (
+                    STATUS_NO_CAMPAIGN, 'no campaign info file')
+                return None, None, None
+
+        # load the campaign info
+        with open(self.camp_info_file, 'r', encoding='utf-8') as camp_fh:
+            camp_info = toml.loads(camp_fh.read())
+
+        if not (camp_info['processor_name']):
+            # set processor_name automatically if not set in the camp_info file
+            camp_info['processor_name'] = 'Pollynet_Processing_Chain'
+            camp_info['processor_version'] = ncVersion
+
+        self.camp_info = camp_info
+
+        # convert the labview data into the data container
+        dimensions = {
+            'altitude': len(pValues['height']),
+            'time': 1,
+            'wavelength': 1,
+            'nv': 2   # number of values (2 for reference height)
+        }
+
+        meteorDict = dict(zip(
+            self.conversion_key['pk_meteor_source'],
+            self.conversion_key['ek_meteor_source']))
+        data = ProfileContainer(len(pValues['height']), mask_invalid=True)
+        height = np.asarray(pValues['height'], dtype=np.double)
+        data.update({
+            'height': height,   # above the station
+            'altitude': height + camp_info['station_altitude'],
+            'time': np.mean([pValues['start_time'], pValues['end_time']]),
+            'time_bounds':
+            np.array([pValues['start_time'], pValues['end_time']]),
+            'cirrus_contamination': 1,   # 0: not_available;
+                                         # 1: no_cirrus;
+                                         # 2: cirrus_detected
+            'cirrus_contamination_source': 2,   # 0: not_available;
+                                                # 1: user_provided;
+                                                # 2: automatic_calculated
+            'user_defined_category': self.category,
+            'cirrus_contamination_source': 0,
+            'atmospheric_molecular_calculation_source':
+                meteorDict[self.picasso_attri_parser(
+                                pData['pressure'].retrieving_info,
+                                varname='meteor_source')],
+            'latitude': camp_info['station_latitude'],
+            'longitude': camp_info['station_longitude'],
+            'shots': pValues['shots'],
+            'station_altitude': camp_info['station_altitude'],
+            'zenith_angle': pValues['zenith_angle'],
+            'temperature': pValues['temperature'] + 273.16,   # [K]
+            'pressure': pValues['pressure'],   # [hPa]
+        })
+        data.set_constant('cloud_mask', -127, dtype=np.byte)
+        tracer.end(readSpan)
+
+        # molecular quantities of the meteorological profile (shared with the
+        # other files of the same sounding)
+        with tracer.span('molecular'):
+            fingerprint = MolecularCache.fingerprint(
+                pValues['height'], data['pressure'], data['temperature'])
+            data['molecular_profile'] = self.get_molecular_profile(
+                pValues['height'], data['pressure'], data['temperature'],
+                fingerprint=fingerprint)
+            molecular = {}
+            for wavelength in WAVELENGTHS:
+                molecular[wavelength] = self.get_molecular_quantities(
+                    pValues['height'], data['pressure'], data['temperature'],
+                    wavelength, fingerprint=fingerprint)
+            self.calc_molecular_optical_depth(data)
+
+        # profiles retrieved with the Raman method, which are the same for
+        # all the backscatter methods
+        if 'aerExt_raman_355' in pData.keys():
+            data['ext_355'] = pValues['aerExt_raman_355']
+            data['ext_std_355'] = 0.1 * pValues['aerExt_raman_355']
+
+        if 'volDepol_raman_355' in pData.keys():
+            data['pdr_355'] = pValues['parDepol_raman_355']
+            data['pdr_std_355'] = 0.1 * pValues['parDepol_raman_355']
+            data['vdr_355'] = pValues['volDepol_raman_355']
+            data['vdr_std_355'] = 0.1 * pValues['volDepol_raman_355']
+            if 'mdr' in molecular[355]:
+                data['mdr_355'] = molecular[355]['mdr']
+
+        if 'aerExt_raman_532' in pData.keys():
+            data['ext_532'] = pValues['aerExt_raman_532']
+            data['ext_std_532'] = 0.1 * pValues['aerExt_raman_532']
+
+        if 'volDepol_raman_532' in pData.keys():
+            data['pdr_532'] = pValues['parDepol_raman_532']
+            data['pdr_std_532'] = 0.1 * pValues['parDepol_raman_532']
+            data['vdr_532'] = pValues['volDepol_raman_532']
+            data['vdr_std_532'] = 0.1 * pValues['volDepol_raman_532']
+            if 'mdr' in molecular[532]:
+                data['mdr_532'] = molecular[532]['mdr']
+
+        # setup global attributes
+        global_attris = camp_info
+
+        # backscatter profiles of each method, sharing the data read above
+        dataMethods = OrderedDict()
+        for method in self.methods:
+            dataMethods[method] = data.copy()
+            dataMethods[method]['method'] = method
+            self.__read_picasso_method(
+                dataMethods[method], pData, pValues, molecular, method)
+
+        return dimensions, dataMethods, global_attris
+
+    def __read_picasso_method(self, data, pData, pValues, molecular, method):
+        '''
+        add the backscatter profiles and the calibration values retrieved with
+        the given method to the data container.
+
+        Parameters
+        ----------
+        data: ProfileContainer
+            data container with the method-independent variables.
+        pData: OrderedDict
+            attributes of the netCDF variables (see read_nc_attributes).
+        pValues: NcValues
+            values of the netCDF variables.
+        molecular: dict
+            molecular quantities at each wavelength.
+        method: str
+            backscatter method. (raman | klett)
+        '''
+
+        # capsule data into 355 data container
+        if method.lower() == 'raman':
+            if 'aerBsc_raman_355' in pData.keys():
+                smoothWin_355 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_355'].retrieving_info,
+                    varname='smoothing_window', method=method)
+                refH_bottom_355 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_355'].retrieving_info,
+                    varname='reference_search_bottom', method=method)
+                refH_top_355 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_355'].retrieving_info,
+                    varname='reference_search_top', method=method)
+                angstr_355 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_355'].retrieving_info,
+                    varname='angstroem_exponent', method=method)
+                refVal_355 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_355'].retrieving_info,
+                    varname='reference_value', method=method)
+
+                # calculate the backscatter-ratio at the reference height
+                refMask355 = (pValues['height'] >= refH_bottom_355) & \
+                             (pValues['height'] <= refH_top_355)
+                refBscMol355 = np.nanmean(
+                    molecular[355]['beta_mol'][refMask355])
+                refBscRatio355 = refVal_355 / refBscMol355 + 1
+
+                # 0: monte_carlo;
+                # 1: error_propagation
+                data['error_retrieval_method_355'] = 1
+
+                # 0: Ansmann;
+                # 1: via_backscatter_ratio
+                data['extinction_evaluation_algorithm_355'] = 0
+
+                # 0: Raman
+                # 1: elastic_backscatter
+                data['backscatter_evaluation_method_355'] = 0
+
+                # 0: Ansmann
+                # 1: via_backscatter_ratio
+                data['raman_backscatter_algorithm_355'] = 0
+
+                data.set_constant(
+                    'vertical_resolution_355', smoothWin_355)
+                data['extinction_assumed_wavelength_dependence_355'] =\
+                    angstr_355
+                data['backscatter_calibration_range_355'] = \
+                    pValues['reference_height_355']
+                data['backscatter_calibration_value_355'] = refBscRatio355
+                data['backscatter_calibration_search_range_355'] = \
+                    [refH_bottom_355, refH_top_355]
+                data['bsc_355'] = pValues['aerBsc_raman_355']
+                data['bsc_std_355'] = 0.1 * pValues['aerBsc_raman_355']
+
+        elif method.lower() == 'klett':
+            if 'aerBsc_klett_355' in pData.keys():
+                smoothWin_355 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_355'].retrieving_info,
+                    varname='smoothing_window', method=method)
+                refH_bottom_355 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_355'].retrieving_info,
+                    varname='reference_search_bottom', method=method)
+                refH_top_355 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_355'].retrieving_info,
+                    varname='reference_search_top', method=method)
+                angstr_355 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_355'].retrieving_info,
+                    varname='angstroem_exponent', method=method)
+                fixed_lidar_ratio_355 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_355'].retrieving_info,
+                    varname='fixed_lidar_ratio', method=method)
+                refVal_355 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_355'].retrieving_info,
+                    varname='reference_value', method=method)
+
+                # calculate the backscatter-ratio at the reference height
+                refMask355 = (pValues['height'] >= refH_bottom_355) & \
+                             (pValues['height'] <= refH_top_355)
+                refBscMol355 = np.nanmean(
+                    molecular[355]['beta_mol'][refMask355])
+                refBscRatio355 = refVal_355 / refBscMol355 + 1
+
+                # 0: monte_carlo;
+                # 1: error_propagation
+                data['error_retrieval_method_355'] = 1
+
+                # 0: Ansmann;
+                # 1: via_backscatter_ratio
+                data['extinction_evaluation_algorithm_355'] = 0
+
+                # 0: Raman
+                # 1: elastic_backscatter
+                data['backscatter_evaluation_method_355'] = 0
+
+                # 0: Ansmann
+                # 1: via_backscatter_ratio
+                data['raman_backscatter_algorithm_355'] = 0
+
+                data.set_constant(
+                    'vertical_resolution_355', smoothWin_355)
+                data['extinction_assumed_wavelength_dependence_355'] =\
+                    angstr_355
+                data['assumed_particle_lidar_ratio'] = fixed_lidar_ratio_355
+                data['backscatter_calibration_range_355'] = \
+                    pValues['reference_height_355']
+                data['backscatter_calibration_value_355'] = refBscRatio355
+                data['backscatter_calibration_search_range_355'] = \
+                    [refH_bottom_355, refH_top_355]
+                data['bsc_355'] = pValues['aerBsc_raman_355']
+                data['bsc_std_355'] = 0.1 * pValues['aerBsc_raman_355']
+
+        # capsule data into 532 data container
+        if method.lower() == 'raman':
+            if 'aerBsc_raman_532' in pData.keys():
+                smoothWin_532 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_532'].retrieving_info,
+                    varname='smoothing_window', method=method)
+                refH_bottom_532 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_532'].retrieving_info,
+                    varname='reference_search_bottom', method=method)
+                refH_top_532 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_532'].retrieving_info,
+                    varname='reference_search_top', method=method)
+                angstr_532 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_532'].retrieving_info,
+                    varname='angstroem_exponent', method=method)
+                refVal_532 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_532'].retrieving_info,
+                    varname='reference_value', method=method)
+
+                # calculate the backscatter-ratio at the reference height
+                refMask532 = (pValues['height'] >= refH_bottom_532) & \
+                             (pValues['height'] <= refH_top_532)
+                refBscMol532 = np.nanmean(
+                    molecular[532]['beta_mol'][refMask532])
+                refBscRatio532 = refVal_532 / refBscMol532 + 1
+
+                # 0: monte_carlo;
+                # 1: error_propagation
+                data['error_retrieval_method_532'] = 1
+
+                # 0: Ansmann;
+                # 1: via_backscatter_ratio
+                data['extinction_evaluation_algorithm_532'] = 0
+
+                # 0: Raman
+                # 1: elastic_backscatter
+                data['backscatter_evaluation_method_532'] = 0
+
+                # 0: Ansmann
+                # 1: via_backscatter_ratio
+                data['raman_backscatter_algorithm_532'] = 0
+
+                data.set_constant(
+                    'vertical_resolution_532', smoothWin_532)
+                data['extinction_assumed_wavelength_dependence_532'] =\
+                    angstr_532
+                data['backscatter_calibration_range_532'] = \
+                    pValues['reference_height_532']
+                data['backscatter_calibration_value_532'] = refBscRatio532
+                data['backscatter_calibration_search_range_532'] = \
+                    [refH_bottom_532, refH_top_532]
+                data['bsc_532'] = pValues['aerBsc_raman_532']
+                data['bsc_std_532'] = 0.1 * pValues['aerBsc_raman_532']
+
+        elif method.lower() == 'klett':
+            if 'aerBsc_klett_532' in pData.keys():
+                smoothWin_532 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_532'].retrieving_info,
+                    varname='smoothing_window', method=method)
+                refH_bottom_532 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_532'].retrieving_info,
+                    varname='reference_search_bottom', method=method)
+                refH_top_532 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_532'].retrieving_info,
+                    varname='reference_search_top', method=method)
+                angstr_532 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_532'].retrieving_info,
+                    varname='angstroem_exponent', method=method)
+                fixed_lidar_ratio_532 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_532'].retrieving_info,
+                    varname='fixed_lidar_ratio', method=method)
+                refVal_532 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_532'].retrieving_info,
+                    varname='reference_value', method=method)
+
+                # calculate the backscatter-ratio at the reference height
+                refMask532 = (pValues['height'] >= refH_bottom_532) & \
+                             (pValues['height'] <= refH_top_532)
+                refBscMol532 = np.nanmean(
+                    molecular[532]['beta_mol'][refMask532])
+                refBscRatio532 = refVal_532 / refBscMol532 + 1
+
+                # 0: monte_carlo;
+                # 1: error_propagation
+                data['error_retrieval_method_532'] = 1
+
+                # 0: Ansmann;
+                # 1: via_backscatter_ratio
+                data['extinction_evaluation_algorithm_532'] = 0
+
+                # 0: Raman
+                # 1: elastic_backscatter
+                data['backscatter_evaluation_method_532'] = 0
+
+                # 0: Ansmann
+                # 1: via_backscatter_ratio
+                data['raman_backscatter_algorithm_532'] = 0
+
+                data.set_constant(
+                    'vertical_resolution_532', smoothWin_532)
+                data['extinction_assumed_wavelength_dependence_532'] = \
+                    angstr_532
+                data['assumed_particle_lidar_ratio'] = fixed_lidar_ratio_532
+                data['backscatter_calibration_range_532'] = \
+                    pValues['reference_height_532']
+                data['backscatter_calibration_value_532'] = refBscRatio532
+                data['backscatter_calibration_search_range_532'] = \
+                    [refH_bottom_532, refH_top_532]
+                data['bsc_532'] = pValues['aerBsc_klett_532']
+                data['bsc_std_532'] = 0.1 * pValues['aerBsc_klett_532']
+
+        # capsule data into 1064 data container
+        if method.lower() == 'raman':
+            if 'aerBsc_raman_1064' in pData.keys():
+                smoothWin_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_1064'].retrieving_info,
+                    varname='smoothing_window', method=method)
+                refH_bottom_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_1064'].retrieving_info,
+                    varname='reference_search_bottom', method=method)
+                refH_top_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_1064'].retrieving_info,
+                    varname='reference_search_top', method=method)
+                angstr_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_1064'].retrieving_info,
+                    varname='angstroem_exponent', method=method)
+                refVal_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_raman_1064'].retrieving_info,
+                    varname='reference_value', method=method)
+
+                # calculate the backscatter-ratio at the reference height
+                refMask1064 = (pValues['height'] >= refH_bottom_1064) & \
+                              (pValues['height'] <= refH_top_1064)
+                refBscMol1064 = np.nanmean(
+                    molecular[1064]['beta_mol'][refMask1064])
+                refBscRatio1064 = refVal_1064 / refBscMol1064 + 1
+
+                # 0: monte_carlo;
+                # 1: error_propagation
+                data['error_retrieval_method_1064'] = 1
+
+                # 0: Ansmann;
+                # 1: via_backscatter_ratio
+                data['extinction_evaluation_algorithm_1064'] = 0
+
+                # 0: Raman
+                # 1: elastic_backscatter
+                data['backscatter_evaluation_method_1064'] = 0
+
+                # 0: Ansmann
+                # 1: via_backscatter_ratio
+                data['raman_backscatter_algorithm_1064'] = 0
+
+                data.set_constant(
+                    'vertical_resolution_1064', smoothWin_1064)
+                data['extinction_assumed_wavelength_dependence_1064'] = \
+                    angstr_1064
+                data['backscatter_calibration_range_1064'] = \
+                    pValues['reference_height_1064']
+                data['backscatter_calibration_value_1064'] = refBscRatio1064
+                data['backscatter_calibration_search_range_1064'] = \
+                    [refH_bottom_1064, refH_top_1064]
+                data['bsc_1064'] = pValues['aerBsc_raman_1064']
+                data['bsc_std_1064'] = 0.1 * pValues['aerBsc_raman_1064']
+
+        elif method.lower() == 'klett':
+            if 'aerBsc_klett_1064' in pData.keys():
+                smoothWin_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_1064'].retrieving_info,
+                    varname='smoothing_window', method=method)
+                refH_bottom_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_1064'].retrieving_info,
+                    varname='reference_search_bottom', method=method)
+                refH_top_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_1064'].retrieving_info,
+                    varname='reference_search_top', method=method)
+                # angstr_1064 = self.picasso_attri_parser(
+                #     pData['aerBsc_raman_1064'].retrieving_info,
+                #     varname='angstroem_exponent', method=method)
+                fixed_lidar_ratio_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_1064'].retrieving_info,
+                    varname='fixed_lidar_ratio', method=method)
+                refVal_1064 = self.picasso_attri_parser(
+                    pData['aerBsc_klett_1064'].retrieving_info,
+                    varname='reference_value', method=method)
+
+                # calculate the backscatter-ratio at the reference height
+                refMask1064 = (pValues['height'] >= refH_bottom_1064) & \
+                              (pValues['height'] <= refH_top_1064)
+                refBscMol1064 = np.nanmean(
+                    molecular[1064]['beta_mol'][refMask1064])
+                refBscRatio1064 = refVal_1064 / refBscMol1064 + 1
+
+                # 0: monte_carlo;
+                # 1: error_propagation
+                data['error_retrieval_method_1064'] = 1
+
+                # 0: Ansmann;
+                # 1: via_backscatter_ratio
+                data['extinction_evaluation_algorithm_1064'] = 0
+
+                # 0: Raman
+                # 1: elastic_backscatter
+                data['backscatter_evaluation_method_1064'] = 0
+
+                # 0: Ansmann
+                # 1: via_backscatter_ratio
+                data['raman_backscatter_algorithm_1064'] = 0
+
+                data.set_constant(
+                    'vertical_resolution_1064', smoothWin_1064)
+                data['assumed_particle_lidar_ratio'] = fixed_lidar_ratio_1064
+                data['backscatter_calibration_range_1064'] = \
+                    pValues['reference_height_1064']
+                data['backscatter_calibration_value_1064'] = refBscRatio1064
+                data['backscatter_calibration_search_range_1064'] = \
+                    [refH_bottom_1064, refH_top_1064]
+                data['bsc_1064'] = pValues['aerBsc_klett_1064']
+                data['bsc_std_1064'] = 0.1 * pValues['aerBsc_klett_1064']
+
+    def __write_2_earlinet_b355(self, filename, variables, dimensions,
+                                global_attri, *args,
+                                range_lim=[0, 14000], **kwargs):
+        '''
+        write variables to b355 file.
+        '''
+
+        binsBFile = self.range_slice(variables['altitude'], range_lim)
+
+        if binsBFile.stop == binsBFile.start:
+            logger.warn(
+                'No bins were selected with your input range_lim.\n',
+                'Jump over {file}.'.format(file=filename))
+        else:
+            if variables.get('method', self.method).lower() == 'raman':
+                var_b355 = {
+                    'altitude':
+                        variables['altitude'][binsBFile],
+                    'atmospheric_molecular_calculation_source':
+                        variables['atmospheric_molecular_calculation_source'],
+                    'backscatter':
+                        variables['bsc_355'][binsBFile],
+                    'backscatter_calibration_range':
+                        variables['backscatter_calibration_range_355'],
+                    'backscatter_calibration_range_search_algorithm':
+                        0,
+                    'backscatter_calibration_search_range':
+                        variables['backscatter_calibration_search_range_355'],
+                    'backscatter_calibration_value':
+                        variables['backscatter_calibration_value_355'],
+                    'backscatter_evaluation_method':
+                        variables['backscatter_evaluation_method_355'],
+                    'cirrus_contamination':
+                        variables['cirrus_contamination'],
+                    'cirrus_contamination_source':
+                        variables['cirrus_contamination_source'],
+                    'cloud_mask':
+                        variables['cloud_mask'][binsBFile],
+                    'earlinet_product_type':
+                        2,
+                    'elastic_backscatter_algorithm':
+                        1,
+                    'error_backscatter':
+                        variables['bsc_std_355'][binsBFile],
+                    'error_particledepolarization':
+                        variables['pdr_std_355'][binsBFile],
+                    'error_retrieval_method':
+                        variables['error_retrieval_method_355'],
+                    'error_volumedepolarization':
+                        variables['vdr_std_355'][binsBFile],
+                    'latitude':
+                        variables['latitude'],
+                    'longitude':
+                        variables['longitude'],
+                    'particledepolarization':
+                        variables['pdr_355'][binsBFile],
+                    'raman_backscatter_algorithm':
+                        variables['raman_backscatter_algorithm_355'],
+                    'shots':
+                        variables['shots'],
+                    'station_altitude':
+                        variables['station_altitude'],
+                    'time':
+                        variables['time'],
+                    'time_bounds':
+                        variables['time_bounds'],
+                    'user_defined_category':
+                        variables['user_defined_category'],
+                    'vertical_resolution':
+                        variables['vertical_resolution_355'][binsBFile],
+                    'volumedepolarization':
+                        variables['vdr_355'][binsBFile],
+                    'wavelength':
+                        355,
+                    'zenith_angle':
+                        variables['zenith_angle']
+                }
+            elif variables.get('method', self.method).lower() == 'klett':
+                var_b355 = {
+                    'altitude':
+                        variables['altitude'][binsBFile],
+                    'assumed_particle_lidar_ratio':
+                        variables['assumed_particle_lidar_ratio'],
+                    'atmospheric_molecular_calculation_source':
+                        variables['atmospheric_molecular_calculation_source'],
+                    'backscatter':
+                        variables['bsc_355'][binsBFile],
+                    'backscatter_calibration_range':
+                        variables['backscatter_calibration_range_355'],
+                    'backscatter_calibration_range_search_algorithm':
+                        0,
+                    'backscatter_calibration_search_range':
+                        variables['backscatter_calibration_search_range_355'],
+                    'backscatter_calibration_value':
+                        variables['backscatter_calibration_value_355'],
+                    'backscatter_evaluation_method':
+                        variables['backscatter_evaluation_method_355'],
+                    'cirrus_contamination':
+                        variables['cirrus_contamination'],
+                    'cirrus_contamination_source':
+                        variables['cirrus_contamination_source'],
+                    'cloud_mask':
+                        variables['cloud_mask'][binsBFile],
+                    'earlinet_product_type':
+                        2,
+                    'elastic_backscatter_algorithm':
+                        1,
+                    'error_backscatter':
+                        variables['bsc_std_355'][binsBFile],
+                    'error_particledepolarization':
+                        variables['pdr_std_355'][binsBFile],
+                    'error_retrieval_method':
+                        variables['error_retrieval_method_355'],
+                    'error_volumedepolarization':
+                        variables['vdr_std_355'][binsBFile],
+                    'latitude':
+                        variables['latitude'],
+                    'longitude':
+                        variables['longitude'],
+                    'particledepolarization':
+                        variables['pdr_355'][binsBFile],
+                    'raman_backscatter_algorithm':
+                        variables['raman_backscatter_algorithm_355'],
+                    'shots':
+                        variables['shots'],
+                    'station_altitude':
+                        variables['station_altitude'],
+                    'time':
+                        variables['time'],
+                    'time_bounds':
+                        variables['time_bounds'],
+                    'user_defined_category':
+                        variables['user_defined_category'],
+                    'vertical_resolution':
+                        variables['vertical_resolution_355'][binsBFile],
+                    'volumedepolarization':
+                        variables['vdr_355'][binsBFile],
+                    'wavelength':
+                        355,
+                    'zenith_angle':
+                        variables['zenith_angle']
+                }
+
+            if 'mdr_355' in variables:
+                var_b355['moleculardepolarization'] = \
+                    variables['mdr_355'][binsBFile]
+
+            dim_b355 = dimensions
+            dim_b355['altitude'] = binsBFile.stop - binsBFile.start
+            global_attri_b355 = global_attri
+            logger.info('Writing data to {file}'.format(file=filename))
+            self.__write_2_earlinet_nc(filename, var_b355, dim_b355,
+                                       global_attri_b355)
+
+    def __write_2_earlinet_e355(self, filename, variables, dimensions,
+                                global_attri, *args,
+                                range_lim=[0, 5000], **kwargs):
+        '''
+        write to earlinet e355 file.
+        '''
+
+        binsEFile = self.range_slice(variables['altitude'], range_lim)
+
+        if binsEFile.stop == binsEFile.start:
+            logger.warn(
+                'No bins were selected with your input range_lim.\n',
+                'Jump over {file}.'.format(file=filename))
+        else:
+            var_e355 = {
+                'altitude':
+                    variables['altitude'][binsEFile],
+                'atmospheric_molecular_calculation_source':
+                    variables['atmospheric_molecular_calculation_source'],
+                'backscatter':
+                    variables['bsc_355'][binsEFile],
+                'backscatter_calibration_range':
+                    variables['backscatter_calibration_range_355'],
+                'backscatter_calibration_range_search_algorithm':
+                    0,
+                'backscatter_calibration_search_range':
+                    variables['backscatter_calibration_search_range_355'],
+                'backscatter_calibration_value':
+                    variables['backscatter_calibration_value_355'],
+                'backscatter_evaluation_method':
+                    variables['backscatter_evaluation_method_355'],
+                'cirrus_contamination':
+                    variables['cirrus_contamination'],
+                'cirrus_contamination_source':
+                    variables['cirrus_contamination_source'],
+                'cloud_mask':
+                    variables['cloud_mask'][binsEFile],
+                'earlinet_product_type':
+                    1,
+                'elastic_backscatter_algorithm':
+                    1,
+                'error_backscatter':
+                    variables['bsc_std_355'][binsEFile],
+                'error_extinction':
+                    variables['ext_std_355'][binsEFile],
+                'error_retrieval_method':
+                    variables['error_retrieval_method_355'],
+                'extinction':
+                    variables['ext_355'][binsEFile],
+                'extinction_assumed_wavelength_dependence':
+                    variables['extinction_assumed_wavelength_dependence_355'],
+                'extinction_evaluation_algorithm':
+                    variables['extinction_evaluation_algorithm_355'],
+                'latitude':
+                    variables['latitude'],
+                'longitude':
+                    variables['longitude'],
+                'raman_backscatter_algorithm':
+                    variables['raman_backscatter_algorithm_355'],
+                'shots':
+                    variables['shots'],
+                'station_altitude':
+                    variables['station_altitude'],
+                'time':
+                    variables['time'],
+                'time_bounds':
+                    variables['time_bounds'],
+                'user_defined_category':
+                    variables['user_defined_category'],
+                'vertical_resolution':
+                    variables['vertical_resolution_355'][binsEFile],
+                'wavelength':
+                    355,
+                'zenith_angle':
+                    variables['zenith_angle']
+            }
+            dim_e355 = dimensions
+            dim_e355['altitude'] = binsEFile.stop - binsEFile.start
+            global_attri_e355 = global_attri
+            logger.info('Writing data to {file}'.format(file=filename))
+            self.__write_2_earlinet_nc(filename, var_e355, dim_e355,
+                                       global_attri_e355)
+
+    def __write_2_earlinet_b532(self, filename, variables, dimensions,
+                                global_attri, *args,
+                                range_lim=[0, 14000], **kwargs):
+        '''
+        write to earlinet b532 file.
+        '''
+
+        binsBFile = self.range_slice(variables['altitude'], range_lim)
+
+        if binsBFile.stop == binsBFile.start:
+            logger.warn(
+                'No bins were selected with your input range_lim.\n',
+                'Jump over {file}.'.format(file=filename))
+        else:
+            if variables.get('method', self.method).lower() == 'raman':
+                var_b532 = {
+                    'altitude':
+                        variables['altitude'][binsBFile],
+                    'atmospheric_molecular_calculation_source':
+                        variables['atmospheric_molecular_calculation_source'],
+                    'backscatter':
+                        variables['bsc_532'][binsBFile],
+                    'backscatter_calibration_range':
+                        variables['backscatter_calibration_range_532'],
+                    'backscatter_calibration_range_search_algorithm':
+                        0,
+                    'backscatter_calibration_search_range':
+                        variables['backscatter_calibration_search_range_532'],
+                    'backscatter_calibration_value':
+                        variables['backscatter_calibration_value_532'],
+                    'backscatter_evaluation_method':
+                        variables['backscatter_evaluation_method_532'],
+                    'cirrus_contamination':
+                        variables['cirrus_contamination'],
+                    'cirrus_contamination_source':
+                        variables['cirrus_contamination_source'],
+                    'cloud_mask':
+                        variables['cloud_mask'][binsBFile],
+                    'earlinet_product_type':
+                        6,
+                    'elastic_backscatter_algorithm':
+                        1,
+                    'error_backscatter':
+                        variables['bsc_std_532'][binsBFile],
+                    'error_particledepolarization':
+                        variables['pdr_std_532'][binsBFile],
+                    'error_retrieval_method':
+                        variables['error_retrieval_method_532'],
+                    'error_volumedepolarization':
+                        variables['vdr_std_532'][binsBFile],
+                    'latitude':
+                        variables['latitude'],
+                    'longitude':
+                        variables['longitude'],
+                    'particledepolarization':
+                        variables['pdr_532'][binsBFile],
+                    'raman_backscatter_algorithm':
+                        variables['raman_backscatter_algorithm_532'],
+                    'shots':
+                        variables['shots'],
+                    'station_altitude':
+                        variables['station_altitude'],
+                    'time':
+                        variables['time'],
+                    'time_bounds':
+                        variables['time_bounds'],
+                    'user_defined_category':
+                        variables['user_defined_category'],
+                    'vertical_resolution':
+                        variables['vertical_resolution_532'][binsBFile],
+                    'volumedepolarization':
+                        variables['vdr_532'][binsBFile],
+                    'wavelength':
+                        532,
+                    'zenith_angle':
+                        variables['zenith_angle']
+                }
+            elif variables.get('method', self.method).lower() == 'klett':
+                var_b532 = {
+                    'altitude':
+                        variables['altitude'][binsBFile],
+                    'assumed_particle_lidar_ratio':
+                        variables['assumed_particle_lidar_ratio'],
+                    'atmospheric_molecular_calculation_source':
+                        variables['atmospheric_molecular_calculation_source'],
+                    'backscatter':
+                        variables['bsc_532'][binsBFile],
+                    'backscatter_calibration_range':
+                        variables['backscatter_calibration_range_532'],
+                    'backscatter_calibration_range_search_algorithm':
+                        0,
+                    'backscatter_calibration_search_range':
+                        variables['backscatter_calibration_search_range_532'],
+                    'backscatter_calibration_value':
+                        variables['backscatter_calibration_value_532'],
+                    'backscatter_evaluation_method':
+                        variables['backscatter_evaluation_method_532'],
+                    'cirrus_contamination':
+                        variables['cirrus_contamination'],
+                    'cirrus_contamination_source':
+                        variables['cirrus_contamination_source'],
+                    'cloud_mask':
+                        variables['cloud_mask'][binsBFile],
+                    'earlinet_product_type':
+                        6,
+                    'elastic_backscatter_algorithm':
+                        1,
+                    'error_backscatter':
+                        variables['bsc_std_532'][binsBFile],
+                    'error_particledepolarization':
+                        variables['pdr_std_532'][binsBFile],
+                    'error_retrieval_method':
+                        variables['error_retrieval_method_532'],
+                    'error_volumedepolarization':
+                        variables['vdr_std_532'][binsBFile],
+                    'latitude':
+                        variables['latitude'],
+                    'longitude':
+                        variables['longitude'],
+                    'particledepolarization':
+                        variables['pdr_532'][binsBFile],
+                    'raman_backscatter_algorithm':
+                        variables['raman_backscatter_algorithm_532'],
+                    'shots':
+                        variables['shots'],
+                    'station_altitude':
+                        variables['station_altitude'],
+                    'time':
+                        variables['time'],
+                    'time_bounds':
+                        variables['time_bounds'],
+                    'user_defined_category':
+                        variables['user_defined_category'],
+                    'vertical_resolution':
+                        variables['vertical_resolution_532'][binsBFile],
+                    'volumedepolarization':
+                        variables['vdr_532'][binsBFile],
+                    'wavelength':
+                        532,
+                    'zenith_angle':
+                        variables['zenith_angle']
+                }
+            if 'mdr_532' in variables:
+                var_b532['moleculardepolarization'] = \
+                    variables['mdr_532'][binsBFile]
+
+            dim_b532 = dimensions
+            dim_b532['altitude'] = binsBFile.stop - binsBFile.start
+            global_attri_b532 = global_attri
+            logger.info('Writing data to {file}'.format(file=filename))
+            self.__write_2_earlinet_nc(filename, var_b532, dim_b532,
+                                       global_attri_b532)
+
+    def __write_2_earlinet_e532(self, filename, variables, dimensions,
+                                global_attri, *args,
+                                range_lim=[0, 5000], **kwargs):
+        '''
+        write to earlient e532 file.
+        '''
+
+        binsEFile = self.range_slice(variables['altitude'], range_lim)
+
+        if binsEFile.stop == binsEFile.start:
+            logger.warn(
+                'No bins were selected with your input range_lim.\n',
+                'Jump over {file}.'.format(file=filename))
+        else:
+            var_e532 = {
+                'altitude':
+                    variables['altitude'][binsEFile],
+                'atmospheric_molecular_calculation_source':
+                    variables['atmospheric_molecular_calculation_source'],
+                'backscatter':
+                    variables['bsc_532'][binsEFile],
+                'backscatter_calibration_range':
+                    variables['backscatter_calibration_range_532'],
+                'backscatter_calibration_range_search_algorithm':
+                    0,
+                'backscatter_calibration_search_range':
+                    variables['backscatter_calibration_search_range_532'],
+                'backscatter_calibration_value':
+                    variables['backscatter_calibration_value_532'],
+                'backscatter_evaluation_method':
+                    variables['backscatter_evaluation_method_532'],
+                'cirrus_contamination':
+                    variables['cirrus_contamination'],
+                'cirrus_contamination_source':
+                    variables['cirrus_contamination_source'],
+                'cloud_mask':
+                    variables['cloud_mask'][binsEFile],
+                'earlinet_product_type':
+                    5,
+                'elastic_backscatter_algorithm':
+                    1,
+                'error_backscatter':
+                    variables['bsc_std_532'][binsEFile],
+                'error_extinction':
+                    variables['ext_std_532'][binsEFile],
+                'error_retrieval_method':
+                    variables['error_retrieval_method_532'],
+                'extinction':
+                    variables['ext_532'][binsEFile],
+                'extinction_assumed_wavelength_dependence':
+                    variables['extinction_assumed_wavelength_dependence_532'],
+                'extinction_evaluation_algorithm':
+                    variables['extinction_evaluation_algorithm_532'],
+                'latitude':
+                    variables['latitude'],
+                'longitude':
+                    variables['longitude'],
+                'raman_backscatter_algorithm':
+                    variables['raman_backscatter_algorithm_532'],
+                'shots':
+                    variables['shots'],
+                'station_altitude':
+                    variables['station_altitude'],
+                'time':
+                    variables['time'],
+                'time_bounds':
+                    variables['time_bounds'],
+                'user_defined_category':
+                    variables['user_defined_category'],
+                'vertical_resolution':
+                    variables['vertical_resolution_532'][binsEFile],
+                'wavelength':
+                    532,
+                'zenith_angle':
+                    variables['zenith_angle']
+            }
+            dim_e532 = dimensions
+            dim_e532['altitude'] = binsEFile.stop - binsEFile.start
+            global_attri_e532 = global_attri
+            logger.info('Writing data to {file}'.format(file=filename))
+            self.__write_2_earlinet_nc(filename, var_e532, dim_e532,
+                                       global_attri_e532)
+
+    def __write_2_earlinet_b1064(self, filename, variables, dimensions,
+                                 global_attri, *args,
+                                 range_lim=[0, 14000], **kwargs):
+        '''
+        write to earlinet b1064 file.
+        '''
+
+        binsBFile = self.range_slice(variables['altitude'], range_lim)
+
+        if binsBFile.stop == binsBFile.start:
+            logger.warn(
+                'No bins were selected with your input range_lim.\n',
+                'Jump over {file}.'.format(file=filename))
+        else:
+            if variables.get('method', self.method).lower() == 'raman':
+                var_b1064 = {
+                    'altitude':
+                        variables['altitude'][binsBFile],
+                    'atmospheric_molecular_calculation_source':
+                        variables['atmospheric_molecular_calculation_source'],
+                    'backscatter':
+                        variables['bsc_1064'][binsBFile],
+                    'backscatter_calibration_range':
+                        variables['backscatter_calibration_range_1064'],
+                    'backscatter_calibration_range_search_algorithm':
+                        0,
+                    'backscatter_calibration_search_range':
+                        variables['backscatter_calibration_search_range_1064'],
+                    'backscatter_calibration_value':
+                        variables['backscatter_calibration_value_1064'],
+                    'backscatter_evaluation_method':
+                        variables['backscatter_evaluation_method_1064'],
+                    'cirrus_contamination':
+                        variables['cirrus_contamination'],
+                    'cirrus_contamination_source':
+                        variables['cirrus_contamination_source'],
+                    'cloud_mask':
+                        variables['cloud_mask'][binsBFile],
+                    'earlinet_product_type':
+                        8,
+                    'elastic_backscatter_algorithm':
+                        1,
+                    'error_backscatter':
+                        variables['bsc_std_1064'][binsBFile],
+                    'error_retrieval_method':
+                        variables['error_retrieval_method_1064'],
+                    'latitude':
+                        variables['latitude'],
+                    'longitude':
+                        variables['longitude'],
+                    'raman_backscatter_algorithm':
+                        variables['raman_backscatter_algorithm_1064'],
+                    'shots':
+                        variables['shots'],
+                    'station_altitude':
+                        variables['station_altitude'],
+                    'time':
+                        variables['time'],
+                    'time_bounds':
+                        variables['time_bounds'],
+                    'user_defined_category':
+                        variables['user_defined_category'],
+                    'vertical_resolution':
+                        variables['vertical_resolution_1064'][binsBFile],
+                    'wavelength':
+                        1064,
+                    'zenith_angle':
+                        variables['zenith_angle']
+                }
+            elif variables.get('method', self.method).lower() == 'klett':
+                var_b1064 = {
+                    'altitude':
+                        variables['altitude'][binsBFile],
+                    'assumed_particle_lidar_ratio':
+                        variables['assumed_particle_lidar_ratio'],
+                    'assumed_particle_lidar_ratio_error':
+                        0,
+                        # variables['assumed_particle_lidar_ratio']*0.1,
+                    'atmospheric_molecular_calculation_source':
+                        variables['atmospheric_molecular_calculation_source'],
+                    'backscatter':
+                        variables['bsc_1064'][binsBFile],
+                    'backscatter_calibration_range':
+                        variables['backscatter_calibration_range_1064'],
+                    'backscatter_calibration_range_search_algorithm':
+                        0,
+                    'backscatter_calibration_search_range':
+                        variables['backscatter_calibration_search_range_1064'],
+                    'backscatter_calibration_value':
+                        variables['backscatter_calibration_value_1064'],
+                    'backscatter_evaluation_method':
+                        variables['backscatter_evaluation_method_1064'],
+                    'cirrus_contamination':
+                        variables['cirrus_contamination'],
+                    'cirrus_contamination_source':
+                        variables['cirrus_contamination_source'],
+                    'cloud_mask':
+                        variables['cloud_mask'][binsBFile],
+                    'cloud_mask_type':
+                        0,
+                    'earlinet_product_type':
+                        8,
+                    'elastic_backscatter_algorithm':
+                        1,
+                    'error_backscatter':
+                        variables['bsc_std_1064'][binsBFile],
+                    'error_retrieval_method':
+                        variables['error_retrieval_method_1064'],
+                    'latitude':
+                        variables['latitude'],
+                    'longitude':
+                        variables['longitude'],
+                    'molecular_calculation_source':
+                        0,
+                    'particledepolarization':
+                        'nan',
+                    'raman_backscatter_algorithm':
+                        variables['raman_backscatter_algorithm_1064'],
+                    'scc_product_type':
+                        1,
+                    'shots':
+                        variables['shots'],
+                    'station_altitude':
+                        variables['station_altitude'],
+                    'time':
+                        variables['time'],
+                    'time_bounds':
+                        variables['time_bounds'],
+                    'user_defined_category':
+                        variables['user_defined_category'],
+                    'vertical_resolution':
+                        variables['vertical_resolution_1064'][binsBFile],
+                    'volumedepolarization':
+                        'nan',
+                    'wavelength':
+                        1064,
+                    'zenith_angle':
+                        variables['zenith_angle']
+                }
+
+            dim_b1064 = dimensions
+            dim_b1064['altitude'] = binsBFile.stop - binsBFile.start
+            global_attri_b1064 = global_attri
+            logger.info('Writing data to {file}'.format(file=filename))
+            self.__write_2_earlinet_nc(filename, var_b1064, dim_b1064,
+                                       global_attri_b1064)
+
+    def method_tag(self, variables, variant=None):
+        '''
+        tag of the backscatter method and of the range variant in the
+        filenames. The method is only added if several methods are converted,
+        so that their files don't collide.
+        '''
+
+        tag = ''
+        if len(self.methods) > 1:
+            tag += '_' + variables.get('method', self.method)
+        if variant:
+            tag += '_' + variant
+
+        return tag
+
+    def check_output_dir(self, interactive=True):
+        '''
+        determine whether the output directory exists or not. If not, ask
+        whether to create it.
+
+        Keywords
+        --------
+        interactive: bool
+            ask before creating the directory. Outside of the main thread
+            (e.g., in the writers), the directory is always created without
+            asking.
+        '''
+
+        if not os.path.exists(self.outputDir):
+            logger.warning(
+                'Output directory for saving the results does' +
+                'not exist.\n{path}'.format(path=self.outputDir))
+            if (not interactive) or \
+               (threading.current_thread() is not threading.main_thread()):
+                os.makedirs(self.outputDir, exist_ok=True)
+                return
+
+            # prompt up the request for creating the output directory
+            res = input("Create the folder forcefully? (yes|no): ")
+            if res.lower() == 'yes':
+                os.mkdir(self.outputDir)
+
+    def output_filename(self, variables, prodType, variant=None):
+        '''
+        absolute path of the EARLINET file of the product.
+        yyyymmdd_HHMM_{smooth}_{station_ID}_{polly}[_{method}][_{variant}]_
+        {b355|e355|b532|e532|b1064}.nc
+
+        Parameters
+        ----------
+        variables: dict
+            data container.
+        prodType: str
+            product type. (b355 | e355 | b532 | e532 | b1064)
+        variant: str
+            name of the range variant.
+
+        Returns
+        -------
+        filename: str
+        '''
+
+        if prodType not in EARLINET_PRODUCTS:
+            logger.error('Unknown prodType: {0}'.format(prodType))
+            raise ValueError
+
+        wavelength = int(prodType[1:])
+
+        return os.path.join(
+            self.outputDir,
+            '{date}_{smooth:04.0f}_{station_ID}_{polly}{tag}_{prod}.nc'.
+            format(
+                date=datetime.utcfromtimestamp(variables['time']).
+                strftime('%Y%m%d_%H%M'),
+                smooth=variables[
+                    'vertical_resolution_{0:d}'.format(wavelength)][0],
+                station_ID=self.camp_info['station_ID'].lower(),
+                polly=self.pollyType.lower(),
+                tag=self.method_tag(variables, variant),
+                prod=prodType))
+
+    def write_to_earlinet_nc(self, variables, dimensions, global_attri, *args,
+                             range_lim=[None, None],
+                             prodType='b355', variant=None, **kwargs):
+        '''
+        write the variables, dimensions and global_attri to EARLINET files.
+        The output directory is not checked here (see check_output_dir).
+
+        Parameters
+        ----------
+        variables: dict
+        dimensions: dict
+        global_attri: dict
+        Keywords
+        --------
+        range_lim: 2-element list
+            [bottom_height, top_height]. (m)
+        prodType: str
+            product type:
+            |product name|description|
+            |:----------:|:----------|
+            |'b355'|backscatter at 355 nm|
+            |'e355'|extinction at 355 nm|
+            |'b532'|backscatter at 532 nm|
+            |'e532'|extinction at 532 nm|
+            |'b1064'|backscatter at 1064 nm|
+        variant: str
+            name of the range variant, which is added to the filename.
+        Returns
+        -------
+        filename: str
+            absolute path of the exported file.
+        '''
+
+#        if not (len(range_lim) is 2):
+        if len(range_lim) != 2:
+            logger.error('range_lim must be 2-element list')
+            raise ValueError
+
+        if (not variables) or (not dimensions) or (not global_attri):
+            return
+
+        filename = self.output_filename(variables, prodType, variant=variant)
+
+        if prodType == 'b355':
+            self.__write_2_earlinet_b355(
+                filename, variables, dimensions, global_attri, *args,
+                range_lim=range_lim, **kwargs)
+
+        elif prodType == 'e355':
+            self.__write_2_earlinet_e355(
+                filename, variables, dimensions, global_attri, *args,
+                range_lim=range_lim, **kwargs)
+
+        elif prodType == 'b532':
+            self.__write_2_earlinet_b532(
+                filename, variables, dimensions, global_attri, *args,
+                range_lim=range_lim, **kwargs)
+
+        elif prodType == 'e532':
+            self.__write_2_earlinet_e532(
+                filename, variables, dimensions, global_attri, *args,
+                range_lim=range_lim, **kwargs)
+
+        elif prodType == 'b1064':
+            self.__write_2_earlinet_b1064(
+                filename, variables, dimensions, global_attri, *args,
+                range_lim=range_lim, **kwargs)
+
+        return filename
+
+    @traced('write_nc')
+    def __write_2_earlinet_nc(self, filename, variables, dimensions,
+                              global_attri):
+        '''
+        write to EARLINET nc file.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path of the output file.
+        variables: dict
+            variables to be exported.
+        dimensions: dict
+            dimensions.
+        global_attri: dict
+            global attributes.
+        '''
+
+        # whether overwrite the file if it exists
+        if (os.path.exists(filename)) and \
+           (os.path.isfile(filename)) and (not self.force):
+            logger.warning('{file} exists. Jump over!'.format(file=filename))
+            return
+
+        elif (os.path.exists(filename)) and \
+             (os.path.isfile(filename)) and self.force:
+            logger.warning(
+                '{file} exists. Overwrite it!'.format(file=filename))
+
+        if not variables:
+            # no available data
+            return
+
+        # assemble the variables and the global attributes before the file
+        # is opened, so that NETCDF_LOCK is only held for the netCDF calls
+        npTypeDict = {
+            'byte': np.byte,
+            'int': np.intc,
+            'float': np.single,
+            'double': np.double
+        }
+        ncVariables = []
+        for var_key in variables.keys():
+            kwargs = {}
+            if '_FillValue' in self.metadata[var_key].keys():
+                # with fill_values
+                kwargs['fill_value'] = self.metadata[var_key]['_FillValue']
+            attris = [
+                (var_attr, self.metadata[var_key][var_attr])
+                for var_attr in self.metadata[var_key].keys()
+                if var_attr not in ('dtype', 'dims', '_FillValue')]
+            ncVariables.append((
+                var_key,
+                npTypeDict[self.metadata[var_key]['dtype']],
+                tuple(self.metadata[var_key]['dims']),
+                kwargs, attris))
+
+        # global attributes
+        ncAttris = list(self.camp_info.items())
+
+        # write system, measurement_start_datetime and
+        # measurement_stop_datetime to global attributes
+        camp_info_file_base = os.path.basename(self.camp_info_file)
+        camp_info_filename = os.path.splitext(camp_info_file_base)[0]
+        system_label = self.campaign_dict[camp_info_filename]['system']
+        starttime = datetime.utcfromtimestamp(
+            int(variables['time_bounds'][0]))
+        endtime = datetime.utcfromtimestamp(
+            int(variables['time_bounds'][1]))
+        ncAttris.append(('system', system_label))
+        ncAttris.append((
+            'measurement_start_datetime',
+            starttime.strftime('%Y-%m-%dT%H:%M:%SZ')))
+        ncAttris.append((
+            'measurement_stop_datetime',
+            endtime.strftime('%Y-%m-%dT%H:%M:%SZ')))
+
+        # write location to global attributes
+        city = self.campaign_dict[camp_info_filename]['location']
+        country = self.campaign_dict[camp_info_filename]['country']
+        loc_string = "{city}, {country}".format(city=city, country=country)
+        ncAttris.append(('location', loc_string))
+
+        # write history to global attributes
+        historyStr = "{process_time}: {program_name}".format(
+                     process_time=starttime.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                     program_name=self.camp_info['processor_name'])
+        ncAttris.append(('history', historyStr))
+
+        # netCDF/HDF5 library is not thread-safe
+        with NETCDF_LOCK:
+            dataset = Dataset(
+                filename, 'w', format=NETCDF_FORMAT, zlib=True,
+                complevel=NETCDF_COMPLEVEL)
+
+            try:
+                # create dimensions
+                for dim_key in self.metadata['dimensions']:
+                    dataset.createDimension(dim_key, dimensions[dim_key])
+
+                # create and write variables, write variable attributes
+                for var_key, npType, dims, kwargs, attris in ncVariables:
+                    ncVar = dataset.createVariable(
+                        var_key, npType, dims, zlib=True,
+                        complevel=NETCDF_COMPLEVEL, **kwargs)
+                    ncVar[:] = variables[var_key]
+                    for var_attr, value in attris:
+                        setattr(ncVar, var_attr, value)
+
+                # create global attributes
+                for attr_key, value in ncAttris:
+                    setattr(dataset, attr_key, value)
+            finally:
+                dataset.close()
+
+        tracer.annotate(bytes=os.path.getsize(filename))
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    """
+    Override the error message for argparse.
+
+    reference
+    ---------
+    https://stackoverflow.com/questions/5943249/python-argparse-and-controlling-overriding-the-exit-status-code/5943381
+    """
+
+    def _get_action_from_name(self, name):
+        """Given a name, get the Action instance registered with this parser.
+        If only it were made available in the ArgumentError object. It is
+        passed as it's first arg...
+        """
+
+        container = self._actions
+        if name is None:
+            return None
+        for action in container:
+            if '/'.join(action.option_strings) == name:
+                return action
+            elif action.metavar == name:
+                return action
+            elif action.dest == name:
+                return action
+
+    def error(self, message):
+        exc = sys.exc_info()[1]
+        if exc:
+            exc.argument = self._get_action_from_name(exc.argument_name)
+            raise exc
+        super(ArgumentParser, self).error(message)
+
+
+def show_list(flagShowCampaign=False,
+              flagShowInstrument=False,
+              flagShowAll=False):
+    '''
+    print the campaign and instrument list
+    '''
+
+    # initialize the instance
+    p2eConvertor = polly_2_earlinet_convertor()
+    camp_dict = p2eConvertor.campaign_dict
+
+    # print the full list
+    if flagShowAll:
+        for indx, camp_info_key in enumerate(camp_dict):
+            logger.info(
+                '{indx}: {starttime}-{endtime} {location} {instrument}'.
+                format(
+                    indx=indx + 1,
+                    starttime=camp_dict[camp_info_key]['starttime'].
+                    strftime('%Y-%m-%d'),
+                    endtime=camp_dict[camp_info_key]['endtime'].
+                    strftime('%Y-%m-%d'),
+                    location=camp_dict[camp_info_key]['location'],
+                    instrument=camp_dict[camp_info_key]['system']))
+
+    # print the campaign list
+    if flagShowCampaign:
+        for indx, location in enumerate(p2eConvertor.location_list):
+            logger.info(
+                '{indx}: {location}'.format(indx=indx + 1, location=location))
+
+    # print the instrument list
+    if flagShowInstrument:
+        for indx, instrument in enumerate(p2eConvertor.instrument_list):
+            logger.info(
+                '{indx}: {instrument}'.format(
+                    indx=indx + 1, instrument=instrument))
+
+
+def write_products(p2e_convertor, dims, dataMethods, global_attris,
+                   range_lim_b, range_lim_e, range_variants=None,
+                   write_queue=None):
+    '''
+    write all the available EARLINET products of the data containers. The
+    extinction products (e355, e532) are retrieved with the Raman method for
+    all the backscatter methods, so with several methods they are only
+    written from the Raman container.
+
+    Parameters
+    ----------
+    p2e_convertor: polly_2_earlinet_convertor
+    dims: dict
+        dimensions.
+    dataMethods: OrderedDict
+        data container of each backscatter method.
+    global_attris: dict
+        global attributes.
+    range_lim_b: 2-element list
+        range limit for the variables in b-files. [m]
+    range_lim_e: 2-element list
+        range limit for the variables in e-files. [m]
+    range_variants: list
+        additional range windows (see `polly2scc`).
+    write_queue: WriteBehindQueue
+        queue for writing the files in the background. The files are written
+        directly if None.
+
+    Returns
+    -------
+    written: list
+        (filename, future) of the written files. future is the write of
+        write_queue (None for direct writes).
+    skipped: list
+        existing files, which were not overwritten.
+    '''
+
+    written = []
+    skipped = []
+
+    def count_product(filename, prodType):
+        if os.path.isfile(filename):
+            metrics.inc('polly2scc_products_written_total', product=prodType)
+            metrics.inc(
+                'polly2scc_written_bytes_total', os.path.getsize(filename))
+
+    def write(data, *args, prodType='b355', variant=None, **kwargs):
+        filename = p2e_convertor.output_filename(
+            data, prodType, variant=variant)
+        if os.path.isfile(filename) and (not p2e_convertor.force):
+            logger.warning('{file} exists. Jump over!'.format(file=filename))
+            skipped.append(filename)
+        elif write_queue is None:
+            with tracer.span('write_product', product=prodType,
+                             variant=variant or ''):
+                p2e_convertor.write_to_earlinet_nc(
+                    data, *args, prodType=prodType, variant=variant,
+                    **kwargs)
+            written.append((filename, None))
+            count_product(filename, prodType)
+        else:
+            future = write_queue.submit(
+                p2e_convertor, data, *args, prodType=prodType,
+                variant=variant, **kwargs)
+
+            def done(future):
+                if future.exception() is None:
+                    count_product(filename, prodType)
+
+            future.add_done_callback(done)
+            written.append((filename, future))
+
+    methods = list(dataMethods.keys())
+    extMethod = 'raman' if 'raman' in methods else methods[0]
+
+    for method, data in dataMethods.items():
+        availProdList = p2e_convertor.list_avail_prodType(data)
+        if method != extMethod:
+            availProdList = [prod for prod in availProdList
+                             if prod not in ['e355', 'e532']]
+
+        for prod in availProdList:
+            if prod in ['b355', 'b532', 'b1064']:
+                # using range window for backscatter
+                write(
+                    data, dict(dims), global_attris,
+                    range_lim=range_lim_b, prodType=prod)
+
+            elif prod in ['e355', 'e532']:
+                # using range window for extinction
+                write(
+                    data, dict(dims), global_attris,
+                    range_lim=range_lim_e, prodType=prod)
+
+            else:
+                raise RuntimeError('Unknown product {0}'.format(prod))
+
+            # range variants, written from the same data container
+            for name, rangeLim, variantProds in range_variants or []:
+                if (variantProds is None) or (prod in variantProds):
+                    write(
+                        data, dict(dims), global_attris,
+                        range_lim=rangeLim, prodType=prod, variant=name)
+
+    return written, skipped
+
+
+def polly2scc(polly_type, location, file_type, category, method, filename,
+              output_dir, range_lim_b, range_lim_e, camp_info, force,
+              range_variants=None, store_dir='', query='',
+              catalogue_file=CATALOGUE_FILE, recursive=False, since=None,
+              until=None, prefetch=0, prefetch_budget=PREFETCH_BUDGET,
+              scratch_dir=None, writers=0, writer_processes=False,
+              report='', journal_file='', resume=False,
+              p2e_convertor=None, distributed=False, claim_dir='',
+              claim_stale=CLAIM_STALE, jobs=1, memory_budget=0,
+              memory_model='', preempt=None, metrics_file='',
+              trace_file=''):
+    """
+    convert the polly files according to the input information
+
+    parameters
+    ----------
+    polly_type: str
+        the name of the running instrument. see the full list in
+        `doc\\pollyType.md`
+    location: str
+        the location for the measurements. The naming should be included in
+        `config\\campaign_list.toml`.
+    file_type: str
+        the type of the results that you need to convert.
+        (`labview` or `picasso`)
+    category: integer
+        the category of your measurements.
+        1: cirrus; 2:climatol; 4:dicycles; 8:etna; 16:forfires;
+        32:photosmog; 64:rurban; 128:sahadust; 256:stratos;
+        512:satellite_overpasses
+    method: str
+        Klett or Raman method for calculating backscatter values.
+        (klett | raman | raman,klett)
+        With several methods, the file is read once and the method is added
+        to the output filenames.
+    filename: str
+        the path of your results. (wildcards are supported.)
+    output_dir: str
+        the directory for saving the converted netCDF files.
+    range_lim_b: 2-element list
+        range limit for the variables in b-files (b355, b532, b1064). [m]
+    range_lim_e: 2-element list
+        range limit for the variables in e-files (e355, e532). [m]
+    camp_info: str
+        filename of the campaign configuration file.
+        (only the filename is necessary)
+    force: boolean
+        flag to control whether to override the previous results.
+        (default: false)
+    range_variants: list
+        additional range windows, which are written next to the default
+        files. Each variant is (name, [bottom, top], products) (see
+        `parse_range_variant`); products is None for all the products. The
+        name is added to the filenames.
+    store_dir: str
+        directory for saving the profile store of each file (see
+        `export_profile_store`). No profile store is written if empty.
+    query: str
+        SQL condition for selecting the files from the catalogue (see
+        `ArchiveCatalogue.query`). If set, filename is ignored.
+    catalogue_file: str
+        filename of the catalogue written by `index_data_files`.
+    recursive: boolean
+        whether to search the sub directories of the filename path.
+    since: datetime
+        only convert files with the start time in the filename from since on.
+    until: datetime
+        only convert files with the start time in the filename before until.
+    prefetch: int
+        number of files which are copied to the scratch directory ahead of
+        the conversion (see `InputPrefetcher`). 0 for no prefetch.
+    prefetch_budget: float
+        maximum size of the prefetched files. [MB]
+    scratch_dir: str
+        local directory for the prefetched files (default: system temp
+        folder).
+    writers: int
+        number of background writers for the EARLINET files (see
+        `WriteBehindQueue`). 0 for writing the files directly.
+    writer_processes: boolean
+        whether to use processes instead of threads as writers.
+    report: str
+        filename of the run report (*.json or *.csv) with the status and the
+        timings of each input file (see `write_run_report`).
+    journal_file: str
+        filename of the checkpoint journal (see `RunJournal`).
+    resume: boolean
+        whether to resume the run of journal_file. The files which were done
+        are skipped without reading them again.
+    p2e_convertor: polly_2_earlinet_convertor
+        convertor to reuse (e.g., by a worker of the job queue). It has to be
+        created with the options above.
+    distributed: boolean
+        whether to share the files with the other nodes which convert the
+        same files (see `FileClaims`). The files done by any node are
+        skipped. journal_file is not used, since the claims work as a
+        shared journal.
+    claim_dir: str
+        shared directory for the claims (default: CLAIM_DIR in the output
+        directory).
+    claim_stale: float
+        age of a claim without heartbeat before it is stolen. [s]
+    jobs: int
+        number of worker processes for converting the files in parallel
+        (see `convert_files_parallel`). prefetch and writers are not used
+        with several jobs.
+    memory_budget: float
+        memory budget for the files converted in parallel. [MB] No budget
+        if 0.
+    memory_model: str
+        JSON file with the measured peak memory of previous runs, to
+        calibrate the memory estimates (see `MemoryModel`). It is updated
+        with the peaks of this run.
+    preempt: callable
+        checked after each file. If it returns True, the run stops, and can
+        be continued from the journal.
+    metrics_file: str
+        file for the metrics of the process in the Prometheus text format
+        (see `MetricsRegistry`), e.g., for the textfile collector of the
+        node exporter.
+    trace_file: str
+        file for the spans of each input file as JSON lines (see `Tracer`).
+        The spans are appended.
+
+    returns
+    -------
+    records: list
+        result of each input file (see `convert_files`).
+    """
+
+    if p2e_convertor is None:
+        p2e_convertor = polly_2_earlinet_convertor(
+            polly_type, location,
+            category=category,
+            method=method,
+            output_dir=output_dir,
+            camp_info_file=camp_info,
+            fileType=file_type,
+            force=force)
+
+    if query:
+        # select files from the catalogue
+        catalogue = ArchiveCatalogue(catalogue_file, readonly=True)
+        try:
+            fileLists = catalogue.query(query, fileType=file_type)
+        finally:
+            catalogue.close()
+        logger.info(
+            'number of files from the catalogue: {nFiles:d}'.format(
+                nFiles=len(fileLists)))
+    else:
+        # search files lazily, to start with the first file found
+        filePath = os.path.dirname(filename)
+        basename = os.path.basename(filename)
+        fileLists = p2e_convertor.iter_data_files(
+            basename, filepath=filePath, recursive=recursive, since=since,
+            until=until)
+
+    if distributed:
+        journal = FileClaims(
+            claim_dir or os.path.join(output_dir, CLAIM_DIR),
+            stale=claim_stale)
+        fileLists = journal.claim_tasks(fileLists)
+    elif journal_file:
+        journal = RunJournal(journal_file, resume=resume)
+        if journal.done:
+            logger.info(
+                '{nFiles:d} files were done in {file}.'.format(
+                    nFiles=len(journal.done), file=journal_file))
+            # skip the files done before
+            fileLists = (task for task in fileLists
+                         if not journal.is_done(task))
+    else:
+        journal = None
+
+    if (jobs > 1) and (prefetch or writers):
+        logger.warning(
+            'prefetch and writers are not used with several jobs.')
+        prefetch = 0
+        writers = 0
+
+    # convert all the files
+    if prefetch:
+        # copy the next files to the scratch directory during the conversion
+        prefetcher = InputPrefetcher(
+            fileLists, p2e_convertor.input_files, depth=prefetch,
+            budget=prefetch_budget * 1024 ** 2, scratch_dir=scratch_dir)
+        fileLists = prefetcher
+    else:
+        prefetcher = None
+        fileLists = ((task, task) for task in fileLists)
+
+    # once before the conversion, never in the workers or writers
+    p2e_convertor.check_output_dir()
+    if writers:
+        writeQueue = WriteBehindQueue(
+            writers=writers, processes=writer_processes)
+    else:
+        writeQueue = None
+
+    if trace_file:
+        tracer.start(trace_file)
+
+    try:
+        if jobs > 1:
+            records, pendingWrites = convert_files_parallel(
+                p2e_convertor, fileLists, range_lim_b, range_lim_e,
+                range_variants=range_variants, store_dir=store_dir,
+                journal=journal, jobs=jobs,
+                memory_budget=memory_budget * 1024 ** 2,
+                memory_model=MemoryModel(memory_model), preempt=preempt)
+        else:
+            records, pendingWrites = convert_files(
+                p2e_convertor, fileLists, range_lim_b, range_lim_e,
+                range_variants=range_variants, store_dir=store_dir,
+                write_queue=writeQueue, journal=journal, preempt=preempt)
+    finally:
+        if writeQueue is not None:
+            # only report the files after all the writes were finished
+            try:
+                writeQueue.close()
+            except RuntimeError as e:
+                # the files of the failed writes are marked below
+                logger.error(str(e))
+        if journal is not None:
+            journal.close()
+        if trace_file:
+            tracer.stop()
+
+    check_pending_writes(pendingWrites)
+    if journal is not None:
+        # results of the previous runs first
+        records = list(journal.done.values()) + records
+
+    summary = OrderedDict()
+    for record in records:
+        summary[record['status']] = summary.get(record['status'], 0) + 1
+    logger.info('number of files: {nFiles:d} ({summary})'.format(
+        nFiles=len(records),
+        summary=', '.join(
+            '{0} {1}'.format(number, status)
+            for status, number in summary.items())))
+    for record in records:
+        if record['status'] == STATUS_ERROR:
+            logger.error('{file}: {message}'.format(**record))
+
+    if report:
+        write_run_report(report, records)
+    if writeQueue is not None:
+        logger.info(
+            ('Write-behind: {written} files written, {blocked:.2f} s ' +
+             'blocked by the full queue.').format(**writeQueue.stats()))
+    if distributed:
+        logger.info('Claims: {0:d} stale claims stolen.'.format(
+            journal.nStolen))
+    if prefetcher is not None:
+        logger.info(
+            ('Prefetch: {files} files ({size:.1f} MB), {fetch:.2f} s ' +
+             'copying, {stall:.2f} s waiting for files.').format(
+                **prefetcher.stats()))
+
+    cacheStats = molecular_cache.stats()
+    logger.info(
+        'Molecular cache: {hits} hits, {misses} misses, {size} entries.'
+        .format(**cacheStats))
+
+    if metrics_file:
+        metrics.write_textfile(metrics_file)
+
+    return records
+
+
+def new_record(task):
+    '''
+    result of an input file, before the conversion (see `convert_file`).
+    '''
+
+    return OrderedDict([
+        ('file', task), ('status', STATUS_ERROR), ('message', ''),
+        ('methods', ''), ('written', 0), ('skipped', 0),
+        ('read_time', 0.0), ('write_time', 0.0), ('total_time', 0.0)])
+
+
+def convert_file(p2e_convertor, task, localFile, range_lim_b, range_lim_e,
+                 range_variants=None, store_dir='', write_queue=None,
+                 started=None):
+    '''
+    convert one input file. Errors are caught and returned in the result.
+
+    Parameters
+    ----------
+    p2e_convertor: polly_2_earlinet_convertor
+    task: str
+        input file.
+    localFile: str
+        file to read (e.g., the prefetched copy of task).
+    range_lim_b, range_lim_e, range_variants, store_dir:
+        see `polly2scc`.
+    write_queue: WriteBehindQueue
+        queue for writing the files in the background.
+    started: float
+        time (time.time()) when the search for the input file started, for
+        the discover span of the trace.
+
+    Returns
+    -------
+    record: OrderedDict
+        result of the input file with the REPORT_FIELDS. status is one of
+        STATUS_CONVERTED, STATUS_SKIPPED_EXISTING, STATUS_UNSUPPORTED_KLETT,
+        STATUS_NO_CAMPAIGN and STATUS_ERROR. The times are in seconds; with
+        write_queue, write_time is the time for queueing the files.
+    futures: list
+        pending writes of write_queue.
+    '''
+
+    record = new_record(task)
+    futures = []
+    cacheStats = molecular_cache.stats()
+    fileSpan = tracer.begin(
+        'file', started=started, file=task,
+        file_type=p2e_convertor.fileType)
+    if started is not None:
+        tracer.record('discover', started)
+    t0 = time.perf_counter()
+
+    try:
+        # read once for all the backscatter methods
+        with tracer.span('read'):
+            if tracer.enabled and os.path.isfile(localFile):
+                tracer.annotate(size=os.path.getsize(localFile))
+            dims, dataMethods, global_attris = \
+                p2e_convertor.read_data_file_methods(localFile)
+            if dataMethods:
+                tracer.annotate(
+                    bins=dims['altitude'], methods=','.join(dataMethods))
+        record['read_time'] = time.perf_counter() - t0
+
+        if not dataMethods:
+            record['status'], record['message'] = \
+                p2e_convertor.read_status or (STATUS_ERROR, 'no data')
+            return record, futures
+
+        record['methods'] = ','.join(dataMethods.keys())
+
+        if store_dir:
+            storeFile = os.path.join(
+                store_dir,
+                os.path.splitext(os.path.basename(task))[0] +
+                PROFILE_STORE_EXT)
+            with tracer.span('store'):
+                write_profile_store(
+                    storeFile, dims, dataMethods, global_attris,
+                    {'source': os.path.basename(task),
+                     'pollyType': p2e_convertor.pollyType,
+                     'location': p2e_convertor.location,
+                     'fileType': p2e_convertor.fileType,
+                     'category': p2e_convertor.category,
+                     'camp_info_file':
+                        os.path.abspath(p2e_convertor.camp_info_file)})
+            logger.info(
+                'Write profile store {file}'.format(file=storeFile))
+
+        t1 = time.perf_counter()
+        written, skipped = write_products(
+            p2e_convertor, dims, dataMethods, global_attris,
+            range_lim_b, range_lim_e, range_variants=range_variants,
+            write_queue=write_queue)
+        record['write_time'] = time.perf_counter() - t1
+
+        record['written'] = len(written)
+        record['skipped'] = len(skipped)
+        if skipped and (not written):
+            record['status'] = STATUS_SKIPPED_EXISTING
+        else:
+            record['status'] = STATUS_CONVERTED
+            if not written:
+                record['message'] = 'no available products'
+
+        futures = [future for filename, future in written
+                   if future is not None]
+
+    except Exception as e:
+        logger.exception('Failed in converting {file}'.format(file=task))
+        record['status'] = STATUS_ERROR
+        record['message'] = '{0}: {1}'.format(type(e).__name__, e)
+
+    finally:
+        record['total_time'] = time.perf_counter() - t0
+        # also for the files without data
+        count_file_metrics(record, cacheStats)
+        if fileSpan is not None:
+            fileSpan['attributes'].update(
+                status=record['status'], written=record['written'],
+                skipped=record['skipped'])
+        tracer.end(fileSpan)
+
+    return record, futures
+
+
+def count_file_metrics(record, cacheStats):
+    '''
+    update the metrics with the result of an input file.
+
+    Parameters
+    ----------
+    record: OrderedDict
+        result of the input file (see `convert_file`).
+    cacheStats: dict
+        statistics of the molecular cache before the file.
+    '''
+
+    metrics.inc('polly2scc_files_total', status=record['status'])
+    if record['status'] == STATUS_ERROR:
+        # exception class or reason of the reader
+        metrics.inc(
+            'polly2scc_errors_total', error=record['message'].split(':')[0])
+    for stage in ['read', 'write', 'total']:
+        metrics.observe(
+            'polly2scc_stage_seconds', record[stage + '_time'], stage=stage)
+
+    newStats = molecular_cache.stats()
+    metrics.inc('polly2scc_cache_hits_total',
+                newStats['hits'] - cacheStats['hits'], cache='molecular')
+    metrics.inc('polly2scc_cache_misses_total',
+                newStats['misses'] - cacheStats['misses'], cache='molecular')
+
+
+def convert_files(p2e_convertor, fileLists, range_lim_b, range_lim_e,
+                  range_variants=None, store_dir='', write_queue=None,
+                  journal=None, preempt=None):
+    '''
+    convert the input files. Errors are caught for each file, so that one
+    bad file does not stop the batch.
+
+    Parameters
+    ----------
+    p2e_convertor: polly_2_earlinet_convertor
+    fileLists: iterable
+        (task, localFile) of the input files. localFile is the file to read
+        (e.g., the prefetched copy of task).
+    range_lim_b, range_lim_e, range_variants, store_dir:
+        see `polly2scc`.
+    write_queue: WriteBehindQueue
+        queue for writing the files in the background.
+    journal: RunJournal
+        journal for the results of the finished files.
+    preempt: callable
+        checked after each file. The conversion stops if it returns True.
+
+    Returns
+    -------
+    records: list
+        result of each input file (see `convert_file`).
+    pendingWrites: list
+        (record, futures) of the files written by write_queue. The records
+        are updated by `check_pending_writes` after flushing write_queue.
+    '''
+
+    records = []
+    pendingWrites = []
+    started = time.time()
+    for task, localFile in fileLists:
+        record, futures = convert_file(
+            p2e_convertor, task, localFile, range_lim_b, range_lim_e,
+            range_variants=range_variants, store_dir=store_dir,
+            write_queue=write_queue, started=started)
+        records.append(record)
+        if futures:
+            pendingWrites.append((record, futures))
+        if journal is not None:
+            journal.add(record, futures)
+
+        if (preempt is not None) and preempt():
+            logger.info('Preempted after {file}'.format(file=task))
+            break
+        started = time.time()
+
+    return records, pendingWrites
+
+
+def _convert_file_measured(p2e_convertor, task, localFile, args, kwargs,
+                           trace=False):
+    '''
+    convert one input file in a worker process of `convert_files_parallel`,
+    and measure the peak memory of the conversion above the resident memory
+    of the worker before the conversion (baseline). With trace, the spans
+    of the file are returned to the parent process, which exports them.
+    '''
+
+    rss, peak = process_memory(reset=True)
+    # only the metrics and spans of this file are sent to the parent process
+    metrics.reset()
+    if trace:
+        tracer.start()
+    else:
+        tracer.stop()
+    record, futures = convert_file(
+        p2e_convertor, task, localFile, *args, **kwargs)
+    if rss is not None:
+        peak = process_memory()[1] - rss
+
+    return record, peak, (os.getpid(), rss), metrics.snapshot(), \
+        tracer.collect()
+
+
+def convert_files_parallel(p2e_convertor, fileLists, range_lim_b,
+                           range_lim_e, range_variants=None, store_dir='',
+                           journal=None, jobs=2, memory_budget=0,
+                           memory_model=None, preempt=None):
+    '''
+    convert the input files with worker processes. A file is only started
+    when its estimated peak memory fits into the memory budget together
+    with the running files (see `MemoryModel`) and the baseline memory of
+    the workers. A file larger than the budget is converted alone.
+
+    Parameters
+    ----------
+    p2e_convertor: polly_2_earlinet_convertor
+    fileLists: iterable
+        (task, localFile) of the input files.
+    range_lim_b, range_lim_e, range_variants, store_dir:
+        see `polly2scc`.
+    journal: RunJournal
+        journal for the results of the finished files.
+    jobs: int
+        number of worker processes.
+    memory_budget: float
+        memory budget for the running files. [B] No budget if 0.
+    memory_model: MemoryModel
+        model of the peak memory, calibrated with the measured peaks.
+    preempt: callable
+        checked after starting each file. No more files are started if it
+        returns True.
+
+    Returns
+    -------
+    records: list
+        result of each input file (see `convert_file`), in the order of
+        fileLists.
+    pendingWrites: list
+        always empty, since the files are written by the workers.
+    '''
+
+    memoryModel = memory_model or MemoryModel()
+    fileType = p2e_convertor.fileType
+    records = []
+    running = {}
+    memory = [0]   # estimated memory of the running files
+    # resident memory of each worker before its last file, measured in the
+    # workers. Until the first measurement, a worker is assumed to be as
+    # large as this process.
+    baselines = {}
+    ownBaseline = process_memory()[0] or 0
+
+    def baseline():
+        # all the workers stay alive while the files are converted
+        return jobs * (max(baselines.values()) if baselines else ownBaseline)
+
+    def collect(futures):
+        for future in futures:
+            index, task, size, estimate = running.pop(future)
+            memory[0] -= estimate
+            try:
+                record, peak, (pid, rss), samples, spans = future.result()
+                if rss is not None:
+                    baselines[pid] = rss
+                metrics.merge(samples)
+                tracer.add(spans)
+            except Exception as e:
+                # e.g., worker killed by the system
+                logger.error('Failed in converting {file}: {err}'.format(
+                    file=task, err=e))
+                record, peak = new_record(task), None
+                record['message'] = '{0}: {1}'.format(type(e).__name__, e)
+                count_file_metrics(record, molecular_cache.stats())
+
+            if peak is not None:
+                memoryModel.observe(fileType, size, peak)
+            logger.info(
+                ('Memory of {file}: estimated {estimate:.1f} MB, ' +
+                 'observed {peak} MB').format(
+                    file=os.path.basename(task), estimate=estimate / 1024 ** 2,
+                    peak='n/a' if peak is None else
+                    '{0:.1f}'.format(peak / 1024 ** 2)))
+            records[index] = record
+            if journal is not None:
+                journal.add(record)
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        for index, (task, localFile) in enumerate(fileLists):
+            try:
+                size = os.path.getsize(localFile)
+            except OSError:
+                size = 0
+            estimate = memoryModel.estimate(fileType, size)
+            if memory_budget and (estimate + baseline() > memory_budget):
+                logger.warning(
+                    ('{file} needs about {estimate:.0f} MB, more than the ' +
+                     'memory budget. Convert it alone.').format(
+                        file=task, estimate=estimate / 1024 ** 2))
+
+            # wait for free workers and memory
+            while running and \
+                    ((len(running) >= jobs) or
+                     (memory_budget and
+                      (memory[0] + estimate + baseline() > memory_budget))):
+                done, notDone = wait(running, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            records.append(None)
+            future = executor.submit(
+                _convert_file_measured, p2e_convertor, task, localFile,
+                (range_lim_b, range_lim_e),
+                dict(range_variants=range_variants, store_dir=store_dir),
+                trace=tracer.enabled)
+            running[future] = (index, task, size, estimate)
+            memory[0] += estimate
+
+            if (preempt is not None) and preempt():
+                logger.info('Preempted after {file}'.format(file=task))
+                break
+
+        done, notDone = wait(running)
+        collect(done)
+    finally:
+        executor.shutdown(wait=True)
+        memoryModel.save()
+
+    return records, []
+
+
+def check_pending_writes(pendingWrites):
+    '''
+    mark the files with failed background writes as error. Only call it
+    after flushing the write queue.
+    '''
+
+    for record, futures in pendingWrites:
+        errors = [future.exception() for future in futures
+                  if future.exception() is not None]
+        if errors and (record['status'] != STATUS_ERROR):
+            metrics.inc(
+                'polly2scc_errors_total', error=type(errors[0]).__name__)
+        if errors:
+            record['status'] = STATUS_ERROR
+            record['message'] = '{0:d} of {1:d} writes failed: {2}'.format(
+                len(errors), len(futures), errors[0])
+
+
+def write_run_report(filename, records, fields=REPORT_FIELDS):
+    '''
+    write the result of each input file to a JSON or CSV (by the extension
+    of filename) report.
 
-    def __write_2_earlinet_b1064(self, filename, variables, dimensions,
-                                 global_attri, *args,
-                                 range_lim=[0, 14000], **kwargs):
-        '''
-        write to earlinet b1064 file.
-        '''
+    Parameters
+    ----------
+    filename: str
+        filename of the report. (*.json | *.csv)
+    records: list
+        results of the input files (see `convert_files`).
+    fields: list
+        columns of the CSV report.
+    '''
+
+    if os.path.splitext(filename)[1].lower() == '.csv':
+        with open(filename, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.DictWriter(fh, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(records)
+    else:
+        summary = OrderedDict()
+        for record in records:
+            summary[record['status']] = summary.get(record['status'], 0) + 1
+        report = OrderedDict([
+            ('created', datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')),
+            ('summary', summary),
+            ('files', records)])
+        with open(filename, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+    logger.info('Write run report {file}'.format(file=filename))
+
+
+def index_data_files(directories, catalogue_file, polly_type='',
+                     location=''):
+    """
+    index the labview and Picasso files below the directories into the
+    catalogue. Files which were not modified since the last indexing are
+    skipped, and files which were removed are dropped from the catalogue.
+
+    parameters
+    ----------
+    directories: list
+        root directories of the archive.
+    catalogue_file: str
+        filename of the SQLite catalogue.
+    polly_type: str
+        instrument of the labview files (Picasso files contain it).
+    location: str
+        location of the labview files (Picasso files contain it).
+
+    returns
+    -------
+    counts: dict
+        number of indexed, unchanged and removed files.
+    """
+
+    convertors = {
+        fileType: polly_2_earlinet_convertor(
+            polly_type, location, fileType=fileType)
+        for fileType in ['labview', 'picasso']}
+    patterns = [(LABVIEW_FILE_PATTERN, 'labview'),
+                (PICASSO_FILE_PATTERN, 'picasso')]
+    counts = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+
+    catalogue = ArchiveCatalogue(catalogue_file)
+    try:
+        for directory in directories:
+            directory = os.path.abspath(directory)
+            found = set()
+
+            for path in iter_data_files(
+                    directory, [item[0] for item in patterns],
+                    recursive=True):
+                fileType = [item[1] for item in patterns
+                            if fnmatch.fnmatch(os.path.basename(path),
+                                               item[0])][0]
+                found.add(path)
+                stat = os.stat(path)
+                if catalogue.is_current(path, stat.st_mtime, stat.st_size):
+                    counts['unchanged'] += 1
+                    continue
+
+                try:
+                    entries = convertors[fileType].scan_data_file(path)
+                except Exception as e:
+                    logger.warning(
+                        'Failed in indexing {file}: {err}'.format(
+                            file=path, err=e))
+                    continue
+
+                catalogue.update(path, entries)
+                counts['indexed'] += 1
+
+            for path in catalogue.paths(directory):
+                if path not in found:
+                    catalogue.remove(path)
+                    counts['removed'] += 1
+    finally:
+        catalogue.close()
+
+    logger.info(
+        ('Catalogue {file}: {indexed} indexed, {unchanged} unchanged, ' +
+         '{removed} removed.').format(file=catalogue_file, **counts))
+
+    return counts
+
+
+def export_profile_store(filename, output_dir, range_lim_b, range_lim_e,
+                         force=False, range_variants=None):
+    """
+    regenerate the EARLINET files from the profile stores, without reading
+    the original labview or picasso files. The campaign info is loaded again,
+    so that the global attributes and the station coordinates of the exported
+    files follow the current campaign info file.
+
+    parameters
+    ----------
+    filename: str
+        the path of the profile stores. (wildcards are supported.)
+    output_dir: str
+        the directory for saving the converted netCDF files.
+    range_lim_b: 2-element list
+        range limit for the variables in b-files (b355, b532, b1064). [m]
+    range_lim_e: 2-element list
+        range limit for the variables in e-files (e355, e532). [m]
+    force: boolean
+        flag to control whether to override the previous results.
+    range_variants: list
+        additional range windows (see `polly2scc`).
+    """
 
-        if not range_lim[0] is None:
-            flagBinsBFile = (variables['altitude'] >= range_lim[0]) & \
-                            (variables['altitude'] <= range_lim[1])
+    storeFiles = sorted(glob.glob(filename))
+    if not storeFiles:
+        logger.warning('No profile store was found: {0}'.format(filename))
+
+    for storeFile in storeFiles:
+        logger.info('Start exporting {file}'.format(file=storeFile))
+        info, dims, dataMethods, storeAttris = \
+            read_profile_store(storeFile)
+
+        p2e_convertor = polly_2_earlinet_convertor(
+            info['pollyType'], info['location'],
+            category=info['category'],
+            method=info['methods'],
+            output_dir=output_dir,
+            camp_info_file=info['camp_info_file'],
+            fileType=info['fileType'],
+            force=force)
+        p2e_convertor.check_output_dir()
+
+        if os.path.isfile(p2e_convertor.camp_info_file):
+            global_attris = p2e_convertor.load_camp_info(
+                p2e_convertor.camp_info_file)
+            if not global_attris['processor_name']:
+                # set from the input file by the reader
+                global_attris['processor_name'] = \
+                    storeAttris['processor_name']
+                global_attris['processor_version'] = \
+                    storeAttris['processor_version']
         else:
-            flagBinsBFile = np.ones(variables['altitude'].shape, dtype=bool)
+            logger.warning(
+                'Campaign info file {file} does not exist. '.format(
+                    file=p2e_convertor.camp_info_file) +
+                'Use the campaign info saved in {store}.'.format(
+                    store=storeFile))
+            global_attris = storeAttris
+        p2e_convertor.camp_info = global_attris
+
+        for data in dataMethods.values():
+            if 'height' in data:
+                data['altitude'] = data['height'] + \
+                    global_attris['station_altitude']
+            else:
+                # stores of version 1 only have the altitude
+                data['altitude'] = data['altitude'] + \
+                    (global_attris['station_altitude'] -
+                     data['station_altitude'])
+            data['station_altitude'] = global_attris['station_altitude']
+            data['latitude'] = global_attris['station_latitude']
+            data['longitude'] = global_attris['station_longitude']
 
-        if np.sum(flagBinsBFile) == 0:
-            logger.warn(
-                'No bins were selected with your input range_lim.\n',
-                'Jump over {file}.'.format(file=filename))
+        write_products(
+            p2e_convertor, dims, dataMethods, global_attris,
+            range_lim_b, range_lim_e, range_variants=range_variants)
+
+
+def measurement_time(options):
+    '''
+    time of the latest measurement of a job, from the until option or the
+    filename. None if unknown.
+    '''
+
+    if options.get('until'):
+        return options['until']
+
+    basename = os.path.basename(options.get('filename') or '')
+    if basename and (not glob.has_magic(basename)):
+        timeSpan = filename_time(basename)
+        if timeSpan is not None:
+            return timeSpan[0]
+
+    return options.get('since')
+
+
+def submit_job(queue_file, options, max_attempts=JOB_MAX_ATTEMPTS,
+               priority='auto'):
+    '''
+    submit a conversion to the job queue.
+
+    Parameters
+    ----------
+    queue_file: str
+        filename of the job queue (see `JobQueue`).
+    options: dict
+        options of `polly2scc` (see JOB_OPTIONS). The paths are saved as
+        absolute paths, since the workers can run in other directories.
+    max_attempts: int
+        attempts before the job is dead-lettered.
+    priority: str
+        priority class (see PRIORITY_CLASSES). With 'auto', jobs of
+        measurements within REALTIME_WINDOW (from the until option or the
+        filename, see `measurement_time`) are real-time jobs.
+
+    Returns
+    -------
+    jobId: int
+    '''
+
+    options = dict(options)
+    if (not options.get('filename')) and (not options.get('query')):
+        raise ValueError('Either filename or query has to be set.')
+
+    measured = measurement_time(options)
+    if priority == 'auto':
+        if (measured is not None) and \
+                (measured >= datetime.utcnow() - REALTIME_WINDOW):
+            priority = 'realtime'
         else:
-            if self.method.lower() == 'raman':
-                var_b1064 = {
-                    'altitude':
-                        variables['altitude'][flagBinsBFile],
-                    'atmospheric_molecular_calculation_source':
-                        variables['atmospheric_molecular_calculation_source'],
-                    'backscatter':
-                        variables['bsc_1064'][flagBinsBFile],
-                    'backscatter_calibration_range':
-                        variables['backscatter_calibration_range_1064'],
-                    'backscatter_calibration_range_search_algorithm':
-                        0,
-                    'backscatter_calibration_search_range':
-                        variables['backscatter_calibration_search_range_1064'],
-                    'backscatter_calibration_value':
-                        variables['backscatter_calibration_value_1064'],
-                    'backscatter_evaluation_method':
-                        variables['backscatter_evaluation_method_1064'],
-                    'cirrus_contamination':
-                        variables['cirrus_contamination'],
-                    'cirrus_contamination_source':
-                        variables['cirrus_contamination_source'],
-                    'cloud_mask':
-                        variables['cloud_mask'][flagBinsBFile],
-                    'earlinet_product_type':
-                        8,
-                    'elastic_backscatter_algorithm':
-                        1,
-                    'error_backscatter':
-                        variables['bsc_std_1064'][flagBinsBFile],
-                    'error_retrieval_method':
-                        variables['error_retrieval_method_1064'],
-                    'latitude':
-                        variables['latitude'],
-                    'longitude':
-                        variables['longitude'],
-                    'raman_backscatter_algorithm':
-                        variables['raman_backscatter_algorithm_1064'],
-                    'shots':
-                        variables['shots'],
-                    'station_altitude':
-                        variables['station_altitude'],
-                    'time':
-                        variables['time'],
-                    'time_bounds':
-                        variables['time_bounds'],
-                    'user_defined_category':
-                        variables['user_defined_category'],
-                    'vertical_resolution':
-                        variables['vertical_resolution_1064'][flagBinsBFile],
-                    'wavelength':
-                        1064,
-                    'zenith_angle':
-                        variables['zenith_angle']
-                }
-            elif self.method.lower() == 'klett':
-                var_b1064 = {
-                    'altitude':
-                        variables['altitude'][flagBinsBFile],
-                    'assumed_particle_lidar_ratio':
-                        variables['assumed_particle_lidar_ratio'],
-                    'assumed_particle_lidar_ratio_error':
-                        0,
-                        # variables['assumed_particle_lidar_ratio']*0.1,
-                    'atmospheric_molecular_calculation_source':
-                        variables['atmospheric_molecular_calculation_source'],
-                    'backscatter':
-                        variables['bsc_1064'][flagBinsBFile],
-                    'backscatter_calibration_range':
-                        variables['backscatter_calibration_range_1064'],
-                    'backscatter_calibration_range_search_algorithm':
-                        0,
-                    'backscatter_calibration_search_range':
-                        variables['backscatter_calibration_search_range_1064'],
-                    'backscatter_calibration_value':
-                        variables['backscatter_calibration_value_1064'],
-                    'backscatter_evaluation_method':
-                        variables['backscatter_evaluation_method_1064'],
-                    'cirrus_contamination':
-                        variables['cirrus_contamination'],
-                    'cirrus_contamination_source':
-                        variables['cirrus_contamination_source'],
-                    'cloud_mask':
-                        variables['cloud_mask'][flagBinsBFile],
-                    'cloud_mask_type':
-                        0,
-                    'earlinet_product_type':
-                        8,
-                    'elastic_backscatter_algorithm':
-                        1,
-                    'error_backscatter':
-                        variables['bsc_std_1064'][flagBinsBFile],
-                    'error_retrieval_method':
-                        variables['error_retrieval_method_1064'],
-                    'latitude':
-                        variables['latitude'],
-                    'longitude':
-                        variables['longitude'],
-                    'molecular_calculation_source':
-                        0,
-                    'particledepolarization':
-                        'nan',
-                    'raman_backscatter_algorithm':
-                        variables['raman_backscatter_algorithm_1064'],
-                    'scc_product_type':
-                        1,
-                    'shots':
-                        variables['shots'],
-                    'station_altitude':
-                        variables['station_altitude'],
-                    'time':
-                        variables['time'],
-                    'time_bounds':
-                        variables['time_bounds'],
-                    'user_defined_category':
-                        variables['user_defined_category'],
-                    'vertical_resolution':
-                        variables['vertical_resolution_1064'][flagBinsBFile],
-                    'volumedepolarization':
-                        'nan',
-                    'wavelength':
-                        1064,
-                    'zenith_angle':
-                        variables['zenith_angle']
-                }
+            priority = 'backfill'
 
-            dim_b1064 = dimensions
-            dim_b1064['altitude'] = np.sum(flagBinsBFile)
-            global_attri_b1064 = global_attri
-            logger.info('Writing data to {file}'.format(file=filename))
-            self.__write_2_earlinet_nc(filename, var_b1064, dim_b1064,
-                                       global_attri_b1064)
+    for key in ['filename', 'output_dir', 'store_dir', 'report',
+                'catalogue_file', 'trace_file']:
+        if options.get(key):
+            options[key] = os.path.abspath(options[key])
+    for key in ['since', 'until']:
+        if options.get(key):
+            options[key] = options[key].strftime('%Y-%m-%d %H:%M')
 
-    def write_to_earlinet_nc(self, variables, dimensions, global_attri, *args,
-                             range_lim=[None, None],
-                             prodType='b355', **kwargs):
-        '''
-        write the variables, dimensions and global_attri to EARLINET files.
+    jobQueue = JobQueue(queue_file)
+    try:
+        jobId = jobQueue.submit(
+            options, max_attempts=max_attempts, priority=priority,
+            measured=measured)
+    finally:
+        jobQueue.close()
 
-        Parameters
-        ----------
-        variables: dict
-        dimensions: dict
-        global_attri: dict
-        Keywords
-        --------
-        range_lim: 2-element list
-            [bottom_height, top_height]. (m)
-        prodType: str
-            product type:
-            |product name|description|
-            |:----------:|:----------|
-            |'b355'|backscatter at 355 nm|
-            |'e355'|extinction at 355 nm|
-            |'b532'|backscatter at 532 nm|
-            |'e532'|extinction at 532 nm|
-            |'b1064'|backscatter at 1064 nm|
-        Returns
-        -------
-        filename: str
-            absolute path of the exported file.
-        '''
+    logger.info('Submit {priority} job {jobId:d} to {file}'.format(
+        priority=priority, jobId=jobId, file=queue_file))
 
-#        if not (len(range_lim) is 2):
-        if len(range_lim) != 2:
-            logger.error('range_lim must be 2-element list')
-            raise ValueError
+    return jobId
 
-        if (not variables) or (not dimensions) or (not global_attri):
-            return
 
-        # determine whether the output directory exists or not
-        if not os.path.exists(self.outputDir):
-            logger.warning(
-                'Output directory for saving the results does' +
-                'not exist.\n{path}'.format(path=self.outputDir))
-            # prompt up the request for creating the output directory
-            res = input("Create the folder forcefully? (yes|no): ")
-            if res.lower() == 'yes':
-                os.mkdir(self.outputDir)
+def _renew_lease(queue_file, jobId, owner, lease, stopEvent, lostEvent):
+    '''
+    renew the lease of the running job until stopEvent is set. lostEvent is
+    set if the lease was lost (e.g., to a worker which took over the job
+    after a long pause), so that the job is stopped after its current file.
+    '''
 
-        if prodType == 'b355':
-            # write to b355
-            # yyyymmdd_HHMM_{station_ID}_{polly}_{b355|e355}.nc
-            filename = os.path.join(
-                self.outputDir,
-                '{date}_{smooth:04.0f}_{station_ID}_{polly}_b355.nc'.format(
-                    date=datetime.utcfromtimestamp(variables['time']).
-                    strftime('%Y%m%d_%H%M'),
-                    smooth=variables['vertical_resolution_355'][0],
-                    station_ID=self.camp_info['station_ID'].lower(),
-                    polly=self.pollyType.lower()))
+    jobQueue = JobQueue(queue_file)
+    try:
+        while not stopEvent.wait(lease / 3.0):
+            if not jobQueue.renew(jobId, owner, lease=lease):
+                logger.warning('Lost the lease of job {0:d}'.format(jobId))
+                lostEvent.set()
+                break
+    finally:
+        jobQueue.close()
 
-            self.__write_2_earlinet_b355(
-                filename, variables, dimensions, global_attri, *args,
-                range_lim=range_lim, **kwargs)
 
-        elif prodType == 'e355':
-            # write to e355
-            # yyyymmdd_HHMM_{station_ID}_{polly}_{b355|e355}.nc
-            filename = os.path.join(
-                self.outputDir,
-                '{date}_{smooth:04.0f}_{station_ID}_{polly}_e355.nc'.format(
-                    date=datetime.utcfromtimestamp(variables['time']).
-                    strftime('%Y%m%d_%H%M'),
-                    smooth=variables['vertical_resolution_355'][0],
-                    station_ID=self.camp_info['station_ID'].lower(),
-                    polly=self.pollyType.lower()))
+def run_job(job, convertors, journal_dir, preempt=None):
+    '''
+    run a job of the queue.
 
-            self.__write_2_earlinet_e355(
-                filename, variables, dimensions, global_attri, *args,
-                range_lim=range_lim, **kwargs)
+    Parameters
+    ----------
+    job: dict
+        job from `JobQueue.claim`.
+    convertors: dict
+        warm convertors of the worker, reused by the jobs with the same
+        convertor options.
+    journal_dir: str
+        directory for the journals of the jobs. A retried job resumes its
+        journal, so that the files done before are not read again.
+    preempt: callable
+        stop the job after the current file if it returns True (see
+        `polly2scc`).
+
+    Returns
+    -------
+    records: list
+        result of each input file (see `convert_files`).
+    '''
 
-        elif prodType == 'b532':
-            # write to b532
-            # yyyymmdd_HHMM_{station_ID}_{polly}_{b532|e532}.nc
-            filename = os.path.join(
-                self.outputDir,
-                '{date}_{smooth:04.0f}_{station_ID}_{polly}_b532.nc'.format(
-                    date=datetime.utcfromtimestamp(variables['time']).
-                    strftime('%Y%m%d_%H%M'),
-                    smooth=variables['vertical_resolution_532'][0],
-                    station_ID=self.camp_info['station_ID'].lower(),
-                    polly=self.pollyType.lower()))
+    options = dict(job['options'])
+    for key in ['since', 'until']:
+        if options.get(key):
+            options[key] = parse_datetime(options[key])
+
+    convertorKey = json.dumps(
+        [options[key] for key in ['polly_type', 'location', 'file_type',
+                                  'category', 'method', 'output_dir',
+                                  'force']])
+    if convertorKey not in convertors:
+        convertors[convertorKey] = polly_2_earlinet_convertor(
+            options['polly_type'], options['location'],
+            category=options['category'],
+            method=options['method'],
+            output_dir=options['output_dir'],
+            fileType=options['file_type'],
+            force=options['force'])
+    p2e_convertor = convertors[convertorKey]
+    # campaign info file could be searched by the previous job
+    p2e_convertor.camp_info_file = os.path.join(
+        PROJECTDIR, 'config', options['camp_info'])
+
+    return polly2scc(
+        journal_file=os.path.join(
+            journal_dir, 'job_{0:d}.journal'.format(job['id'])),
+        resume=True, p2e_convertor=p2e_convertor, preempt=preempt,
+        **options)
+
+
+def _worker_loop(queue_file, lease=JOB_LEASE, backoff=JOB_BACKOFF,
+                 poll_interval=JOB_POLL_INTERVAL, drain=False, quotas=None,
+                 metrics_port=0):
+    '''
+    claim and run the jobs of the queue in this process. A job is preempted
+    after its current file when a job of a higher priority class was not
+    taken by an idle worker for JOB_PREEMPT_POLLS poll intervals. The
+    preempting worker claims that job, so that only one worker yields to it.
+    A job is also stopped after its current file when its lease was lost.
+    '''
 
-            self.__write_2_earlinet_b532(
-                filename, variables, dimensions, global_attri, *args,
-                range_lim=range_lim, **kwargs)
+    if metrics_port:
+        def collect_queue(registry):
+            # own connection, called from the threads of the server
+            jobQueue = JobQueue(queue_file)
+            try:
+                stats = jobQueue.stats()
+            finally:
+                jobQueue.close()
+            for state in JOB_STATES:
+                registry.set('polly2scc_queue_jobs', stats[state], state=state)
+
+        metrics.add_collector(collect_queue)
+        metricsServer = serve_metrics(metrics_port)
+    else:
+        metricsServer = None
 
-        elif prodType == 'e532':
-            # write to e532
-            # yyyymmdd_HHMM_{station_ID}_{polly}_{b532|e532}.nc
-            filename = os.path.join(
-                self.outputDir,
-                '{date}_{smooth:04.0f}_{station_ID}_{polly}_e532.nc'.format(
-                    date=datetime.utcfromtimestamp(variables['time']).
-                    strftime('%Y%m%d_%H%M'),
-                    smooth=variables['vertical_resolution_532'][0],
-                    station_ID=self.camp_info['station_ID'].lower(),
-                    polly=self.pollyType.lower()))
-            self.__write_2_earlinet_e532(
-                filename, variables, dimensions, global_attri, *args,
-                range_lim=range_lim, **kwargs)
+    owner = '{0}:{1:d}'.format(socket.gethostname(), os.getpid())
+    journalDir = os.path.splitext(queue_file)[0] + '_journals'
+    if not os.path.exists(journalDir):
+        os.makedirs(journalDir, exist_ok=True)
+    convertors = {}
+    nJobs = 0
+    nextJob = None
 
-        elif prodType == 'b1064':
-            # write to b1064
-            # yyyymmdd_HHMM_{station_ID}_{polly}_{b1064}.nc
-            filename = os.path.join(
-                self.outputDir,
-                '{date}_{smooth:04.0f}_{station_ID}_{polly}_b1064.nc'.
-                format(
-                    date=datetime.utcfromtimestamp(variables['time']).
-                    strftime('%Y%m%d_%H%M'),
-                    smooth=variables['vertical_resolution_1064'][0],
-                    station_ID=self.camp_info['station_ID'].lower(),
-                    polly=self.pollyType.lower()))
-            self.__write_2_earlinet_b1064(
-                filename, variables, dimensions, global_attri, *args,
-                range_lim=range_lim, **kwargs)
+    jobQueue = JobQueue(queue_file, backoff=backoff)
+    try:
+        while True:
+            if nextJob is not None:
+                # claimed when preempting the previous job
+                job, nextJob = nextJob, None
+            else:
+                job = jobQueue.claim(owner, lease=lease, quotas=quotas)
+            if job is None:
+                if drain and (not jobQueue.stats()['queued']):
+                    break
+                time.sleep(poll_interval)
+                continue
 
-        else:
-            logger.error('Unknown prodType: {0}'.format(fileType))
-            raise ValueError
+            logger.info(
+                'Worker {owner} runs {priority} job {id:d} (attempt {n:d})'
+                .format(owner=owner, priority=job['priority'], id=job['id'],
+                        n=job['attempts']))
+            higherClasses = PRIORITY_CLASSES[
+                :PRIORITY_CLASSES.index(job['priority'])]
+            preempted = []
+            stopEvent = threading.Event()
+            lostEvent = threading.Event()
+
+            def preempt():
+                if lostEvent.is_set() or preempted:
+                    return True
+                if not higherClasses:
+                    return False
+                # taking the waiting job lets only this worker yield to it
+                waitingJob = jobQueue.claim(
+                    owner, lease=lease, quotas=quotas,
+                    priorities=higherClasses,
+                    waited=JOB_PREEMPT_POLLS * poll_interval)
+                if waitingJob is not None:
+                    preempted.append(waitingJob)
+                return waitingJob is not None
+
+            heartbeat = threading.Thread(
+                target=_renew_lease,
+                args=(queue_file, job['id'], owner, lease, stopEvent,
+                      lostEvent))
+            heartbeat.daemon = True
+            heartbeat.start()
+            try:
+                records = run_job(
+                    job, convertors, journalDir, preempt=preempt)
+            except Exception as e:
+                logger.exception('Job {0:d} failed.'.format(job['id']))
+                records = None
+                message = '{0}: {1}'.format(type(e).__name__, e)
+            finally:
+                stopEvent.set()
+                heartbeat.join()
+            nJobs += 1
+            if preempted:
+                nextJob = preempted[0]
+
+            if lostEvent.is_set():
+                # the job belongs to another worker now
+                logger.warning('Job {0:d} stopped after losing its lease.'
+                               .format(job['id']))
+                continue
+
+            if records is None:
+                jobQueue.fail(job['id'], owner, message=message)
+                continue
+
+            if preempted:
+                # continued from the journal later
+                logger.info('Job {0:d} yields to {1} job {2:d}.'.format(
+                    job['id'], nextJob['priority'], nextJob['id']))
+                jobQueue.release(job['id'], owner)
+                continue
+
+            errors = [record for record in records
+                      if record['status'] == STATUS_ERROR]
+            if errors:
+                jobQueue.fail(
+                    job['id'], owner,
+                    message='{0:d} of {1:d} files failed: {2}: {3}'.format(
+                        len(errors), len(records), errors[0]['file'],
+                        errors[0]['message']))
+            else:
+                jobQueue.complete(
+                    job['id'], owner, files=len(records),
+                    message='{0:d} files'.format(len(records)))
+                journalFile = os.path.join(
+                    journalDir, 'job_{0:d}.journal'.format(job['id']))
+                if os.path.exists(journalFile):
+                    os.remove(journalFile)
+    finally:
+        jobQueue.close()
+        if metricsServer is not None:
+            metricsServer.shutdown()
+
+    return nJobs
+
+
+def run_worker(queue_file, concurrency=1, lease=JOB_LEASE,
+               backoff=JOB_BACKOFF, poll_interval=JOB_POLL_INTERVAL,
+               drain=False, quotas=None, metrics_port=0):
+    '''
+    run the jobs of the queue with worker processes. Each worker process
+    keeps its convertors (and molecular cache) warm between the jobs.
 
-        return filename
+    Parameters
+    ----------
+    queue_file: str
+        filename of the job queue (see `JobQueue`).
+    concurrency: int
+        number of worker processes. With 1, the jobs are run in this process.
+    lease: float
+        lease of a running job. [s]
+    backoff: float
+        delay before the first retry of a failed job. [s]
+    poll_interval: float
+        interval for polling an empty queue. [s]
+    drain: boolean
+        whether to stop when no job is queued, instead of waiting for new
+        jobs.
+    quotas: dict
+        maximum number of running jobs of the priority classes, for all the
+        workers of the queue. (e.g., {'backfill': 2})
+    metrics_port: int
+        port of the metrics endpoint (see `serve_metrics`). With several
+        worker processes, the metrics of worker i are served on
+        metrics_port + i. No endpoint if 0.
+    '''
 
-    def __write_2_earlinet_nc(self, filename, variables, dimensions,
-                              global_attri):
-        '''
-        write to EARLINET nc file.
+    kwargs = dict(lease=lease, backoff=backoff, poll_interval=poll_interval,
+                  drain=drain, quotas=quotas)
+    if concurrency <= 1:
+        return _worker_loop(queue_file, metrics_port=metrics_port, **kwargs)
+
+    workers = [multiprocessing.Process(
+                   target=_worker_loop, args=(queue_file,),
+                   kwargs=dict(
+                       kwargs,
+                       metrics_port=metrics_port + iWorker if metrics_port
+                       else 0))
+               for iWorker in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        # the leases of the running jobs expire, and the jobs are retried
+        for worker in workers:
+            worker.terminate()
+        raise
 
-        Parameters
-        ----------
-        filename: str
-            absolute path of the output file.
-        variables: dict
-            variables to be exported.
-        dimensions: dict
-            dimensions.
-        global_attri: dict
-            global attributes.
-        '''
 
-        # whether overwrite the file if it exists
-        if (os.path.exists(filename)) and \
-           (os.path.isfile(filename)) and (not self.force):
-            logger.warning('{file} exists. Jump over!'.format(file=filename))
-            return
+def show_queue(queue_file, requeue_dead=False):
+    '''
+    print the number of jobs of each state, the throughput and the dead jobs
+    of the queue.
+    '''
 
-        elif (os.path.exists(filename)) and \
-             (os.path.isfile(filename)) and self.force:
-            logger.warning(
-                '{file} exists. Overwrite it!'.format(file=filename))
+    jobQueue = JobQueue(queue_file)
+    try:
+        if requeue_dead:
+            logger.info('Requeue {0:d} dead jobs.'.format(jobQueue.requeue()))
+
+        stats = jobQueue.stats()
+        logger.info(
+            ('Jobs: {queued} queued, {running} running, {done} done, ' +
+             '{dead} dead.').format(**stats))
+        logger.info(
+            ('Throughput: {jobs_per_hour:.1f} jobs/h, {files_per_hour:.1f} ' +
+             'files/h. Oldest queued job waits {oldest_wait:.0f} s.').format(
+                **stats))
+        for priority, latency in stats['latency'].items():
+            logger.info('Latency of {0} jobs: {1}'.format(
+                priority, ', '.join(
+                    '{0} {1:.0f} s'.format(key, value)
+                    for key, value in latency.items())))
+        for job in jobQueue.jobs('dead'):
+            logger.info('dead job {id:d}: {message}'.format(**job))
+    finally:
+        jobQueue.close()
+
+    return stats
+
+
+def file_checksum(filename):
+    '''
+    SHA-256 checksum of the file (hex).
+    '''
 
-        if not variables:
-            # no available data
-            return
+    sha256 = hashlib.sha256()
+    with open(filename, 'rb') as fh:
+        for block in iter(lambda: fh.read(UPLOAD_CHUNK), b''):
+            sha256.update(block)
 
-        dataset = Dataset(
-            filename, 'w', format=NETCDF_FORMAT, zlib=True,
-            complevel=NETCDF_COMPLEVEL)
+    return sha256.hexdigest()
 
-        # create dimensions
-        for dim_key in self.metadata['dimensions']:
-            dataset.createDimension(dim_key, dimensions[dim_key])
 
-        # create and write variables, write variable attributes
-        npTypeDict = {
-            'byte': np.byte,
-            'int': np.intc,
-            'float': np.single,
-            'double': np.double
-        }
-        for var_key in variables.keys():
-            # create variable
-            if '_FillValue' in self.metadata[var_key].keys():
-                # with fill_values
-                dataset.createVariable(
-                    var_key,
-                    npTypeDict[self.metadata[var_key]['dtype']],
-                    tuple(self.metadata[var_key]['dims']),
-                    fill_value=self.metadata[var_key]['_FillValue'],
-                    zlib=True,
-                    complevel=NETCDF_COMPLEVEL)
-            else:
-                # without fill_values
-                dataset.createVariable(
-                    var_key,
-                    npTypeDict[self.metadata[var_key]['dtype']],
-                    tuple(self.metadata[var_key]['dims']),
-                    zlib=True,
-                    complevel=NETCDF_COMPLEVEL)
-
-            # write variables
-            dataset.variables[var_key][:] = variables[var_key]
-
-            # write attributes
-            for var_attr in self.metadata[var_key].keys():
-                if (not var_attr == 'dtype') and \
-                   (not var_attr == 'dims') and \
-                   (not var_attr == '_FillValue'):
-                    setattr(
-                        dataset.variables[var_key],
-                        var_attr,
-                        self.metadata[var_key][var_attr])
-
-        # create global attributes
-        for attr_key in self.camp_info.keys():
-            setattr(dataset, attr_key, self.camp_info[attr_key])
+def upload_file(session, filename, checksum, max_attempts=UPLOAD_MAX_ATTEMPTS,
+                backoff=UPLOAD_BACKOFF):
+    '''
+    upload one file with `PUT <url>/<basename>`, unless the endpoint has a
+    file with the same checksum. Connection errors, 5xx, 408 and 429 are
+    retried after backoff * 2 ** (attempt - 1) seconds.
 
-        # write system, measurement_start_datetime and
-        # measurement_stop_datetime to global attributes
-        camp_info_file_base = os.path.basename(self.camp_info_file)
-        camp_info_filename = os.path.splitext(camp_info_file_base)[0]
-        system_label = self.campaign_dict[camp_info_filename]['system']
-        starttime = datetime.utcfromtimestamp(int(variables['time_bounds'][0]))
-        endtime = datetime.utcfromtimestamp(int(variables['time_bounds'][1]))
-        setattr(dataset, 'system', system_label)
-        setattr(
-            dataset, 'measurement_start_datetime',
-            starttime.strftime('%Y-%m-%dT%H:%M:%SZ'))
-        setattr(
-            dataset, 'measurement_stop_datetime',
-            endtime.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    Returns
+    -------
+    record: OrderedDict
+        result of the upload with the UPLOAD_FIELDS. status is one of
+        STATUS_UPLOADED, STATUS_UPLOAD_EXISTS and STATUS_ERROR.
+    '''
 
-        # write location to global attributes
-        city = system_label = \
-            self.campaign_dict[camp_info_filename]['location']
-        country = system_label = \
-            self.campaign_dict[camp_info_filename]['country']
-        loc_string = "{city}, {country}".format(city=city, country=country)
-        setattr(dataset, 'location', loc_string)
+    name = os.path.basename(filename)
+    record = OrderedDict([
+        ('file', filename), ('status', STATUS_ERROR), ('message', ''),
+        ('checksum', checksum), ('size', os.path.getsize(filename)),
+        ('attempts', 0), ('upload_time', 0.0)])
+    t0 = time.perf_counter()
 
-        # write history to global attributes
-        historyStr = "{process_time}: {program_name}".format(
-                     process_time=starttime.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                     program_name=self.camp_info['processor_name'])
-        setattr(dataset, 'history', historyStr)
+    for attempt in range(1, max_attempts + 1):
+        record['attempts'] = attempt
+        try:
+            status, headers, body = session.request('HEAD', name)
+            if (status == 200) and \
+                    (headers.get('X-Checksum-SHA256') == checksum):
+                record['status'] = STATUS_UPLOAD_EXISTS
+                record['message'] = ''
+                break
+
+            with open(filename, 'rb') as fh:
+                status, headers, body = session.request(
+                    'PUT', name, body=fh, headers={
+                        'Content-Type': 'application/x-netcdf',
+                        'Content-Length': str(record['size']),
+                        'X-Checksum-SHA256': checksum,
+                        'Idempotency-Key': checksum})
+            if status in [200, 201]:
+                record['status'] = STATUS_UPLOADED
+                record['message'] = ''
+                break
+
+            record['message'] = 'HTTP {0:d}: {1}'.format(
+                status, body.decode('utf-8', 'replace')[:200])
+            if (status < 500) and (status not in [408, 429]):
+                # not retried
+                break
+        except (OSError, http.client.HTTPException) as e:
+            record['message'] = '{0}: {1}'.format(type(e).__name__, e)
+
+        if attempt < max_attempts:
+            logger.warning('Retry upload of {file}: {message}'.format(
+                file=name, message=record['message']))
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+    record['upload_time'] = time.perf_counter() - t0
+
+    return record
+
+
+def upload_files(filename, url, journal_file=UPLOAD_JOURNAL,
+                 connections=UPLOAD_CONNECTIONS,
+                 max_attempts=UPLOAD_MAX_ATTEMPTS, backoff=UPLOAD_BACKOFF,
+                 timeout=UPLOAD_TIMEOUT, token=None, report=''):
+    '''
+    upload the EARLINET files to an HTTP endpoint.
 
-        dataset.close()
+    The files are uploaded concurrently over a pool of keep-alive
+    connections (see `UploadSession`). Each upload is identified by the
+    SHA-256 checksum of the file: files which were uploaded with the same
+    checksum (by the upload journal) or which the endpoint has with the
+    same checksum are not uploaded again. Failed uploads are retried (see
+    `upload_file`), and are uploaded again in the next run.
 
+    Parameters
+    ----------
+    filename: str
+        files to upload, with wildcards (e.g., '/data/earlinet/*.nc').
+    url: str
+        URL of the endpoint. A file is uploaded to <url>/<basename>.
+    journal_file: str
+        journal of the uploads (see `RunJournal`), which is continued by the
+        next run.
+    connections: int
+        number of concurrent uploads.
+    max_attempts: int
+        attempts of each upload.
+    backoff: float
+        delay before the first retry. [s]
+    timeout: float
+        timeout of the connections. [s]
+    token: str
+        bearer token for the endpoint. Taken from the environment variable
+        UPLOAD_TOKEN_ENV if None.
+    report: str
+        report of the uploads. (*.json | *.csv)
+
+    Returns
+    -------
+    records: list
+        result of each file (see `upload_file`).
+    '''
 
-class ArgumentParser(argparse.ArgumentParser):
-    """
-    Override the error message for argparse.
+    if token is None:
+        token = os.environ.get(UPLOAD_TOKEN_ENV, '')
 
-    reference
-    ---------
-    https://stackoverflow.com/questions/5943249/python-argparse-and-controlling-overriding-the-exit-status-code/5943381
-    """
+    fileList = sorted(
+        os.path.abspath(item) for item in glob.glob(filename)
+        if os.path.isfile(item))
+    logger.info('number of files to upload: {0:d}'.format(len(fileList)))
 
-    def _get_action_from_name(self, name):
-        """Given a name, get the Action instance registered with this parser.
-        If only it were made available in the ArgumentError object. It is
-        passed as it's first arg...
-        """
+    journal = RunJournal(journal_file, resume=True)
+    session = UploadSession(url, timeout=timeout, token=token)
 
-        container = self._actions
-        if name is None:
+    def upload(task):
+        checksum = file_checksum(task)
+        done = journal.done.get(task)
+        if (done is not None) and (done['checksum'] == checksum):
             return None
-        for action in container:
-            if '/'.join(action.option_strings) == name:
-                return action
-            elif action.metavar == name:
-                return action
-            elif action.dest == name:
-                return action
 
-    def error(self, message):
-        exc = sys.exc_info()[1]
-        if exc:
-            exc.argument = self._get_action_from_name(exc.argument_name)
-            raise exc
-        super(ArgumentParser, self).error(message)
+        return upload_file(
+            session, task, checksum, max_attempts=max_attempts,
+            backoff=backoff)
 
-
-def show_list(flagShowCampaign=False,
-              flagShowInstrument=False,
-              flagShowAll=False):
+    records = []
+    nJournaled = 0
+    executor = ThreadPoolExecutor(max_workers=max(int(connections), 1))
+    try:
+        futures = [executor.submit(upload, task) for task in fileList]
+        for future in as_completed(futures):
+            record = future.result()
+            if record is None:
+                nJournaled += 1
+                continue
+
+            journal.add(record)
+            records.append(record)
+            metrics.inc('polly2scc_uploads_total', status=record['status'])
+            if record['status'] == STATUS_UPLOADED:
+                metrics.inc('polly2scc_uploaded_bytes_total', record['size'])
+                logger.info('Upload {file}'.format(file=record['file']))
+            elif record['status'] == STATUS_ERROR:
+                logger.error('Failed in uploading {file}: {message}'.format(
+                    **record))
+    finally:
+        executor.shutdown(wait=True)
+        session.close()
+        journal.close()
+
+    records.sort(key=lambda record: record['file'])
+    summary = OrderedDict()
+    for record in records:
+        summary[record['status']] = summary.get(record['status'], 0) + 1
+    logger.info(
+        'Uploads: {0:d} files{1}, {2:d} done before, {3:d} connections.'
+        .format(
+            len(records),
+            ' ({0})'.format(', '.join(
+                '{0} {1}'.format(number, status)
+                for status, number in summary.items())) if summary else '',
+            nJournaled, session.nConnections))
+
+    if report:
+        write_run_report(report, records, fields=UPLOAD_FIELDS)
+
+    return records
+
+
+def load_validation_spec(metadata_file=METADATA_FILE):
     '''
-    print the campaign and instrument list
+    load the variable definitions (metadata_file) and the required content
+    of each product (EARLINET_PRODUCTS_FILE) from the config folder.
+
+    Returns
+    -------
+    spec: dict
+        'metadata' and 'products'.
     '''
 
-    # initialize the instance
-    p2eConvertor = polly_2_earlinet_convertor()
-    camp_dict = p2eConvertor.campaign_dict
+    spec = {}
+    for key, basename in [('metadata', metadata_file),
+                          ('products', EARLINET_PRODUCTS_FILE)]:
+        with open(os.path.join(PROJECTDIR, 'config', basename), 'r',
+                  encoding='utf-8') as fh:
+            spec[key] = toml.loads(fh.read())
 
-    # print the full list
-    if flagShowAll:
-        for indx, camp_info_key in enumerate(camp_dict):
-            logger.info(
-                '{indx}: {starttime}-{endtime} {location} {instrument}'.
-                format(
-                    indx=indx + 1,
-                    starttime=camp_dict[camp_info_key]['starttime'].
-                    strftime('%Y-%m-%d'),
-                    endtime=camp_dict[camp_info_key]['endtime'].
-                    strftime('%Y-%m-%d'),
-                    location=camp_dict[camp_info_key]['location'],
-                    instrument=camp_dict[camp_info_key]['system']))
+    return spec
 
-    # print the campaign list
-    if flagShowCampaign:
-        for indx, location in enumerate(p2eConvertor.location_list):
-            logger.info(
-                '{indx}: {location}'.format(indx=indx + 1, location=location))
 
-    # print the instrument list
-    if flagShowInstrument:
-        for indx, instrument in enumerate(p2eConvertor.instrument_list):
-            logger.info(
-                '{indx}: {instrument}'.format(
-                    indx=indx + 1, instrument=instrument))
+def _same_value(actual, expected, dtype):
+    '''
+    whether the attribute value equals the value of the metadata.
+    '''
 
+    if isinstance(expected, str):
+        return str(actual) == expected
+    try:
+        return np.array_equal(
+            np.asarray(actual).astype(dtype),
+            np.asarray(expected).astype(dtype))
+    except (TypeError, ValueError):
+        return False
 
-def polly2scc(polly_type, location, file_type, category, method, filename,
-              output_dir, range_lim_b, range_lim_e, camp_info, force):
-    """
-    convert the polly files according to the input information
 
-    parameters
+def validate_file(filename, spec):
+    '''
+    check an EARLINET file against the specification: the dimensions, the
+    variables of the product with their dtype, dimensions and attributes
+    (including _FillValue, flag_values and valid_range), the values of the
+    small variables against flag_values and valid_range, and the global
+    attributes. Only the headers and the variables up to
+    VALIDATE_MAX_VALUES values are read.
+
+    Parameters
     ----------
-    polly_type: str
-        the name of the running instrument. see the full list in
-        `doc\\pollyType.md`
-    location: str
-        the location for the measurements. The naming should be included in
-        `config\\campaign_list.toml`.
-    file_type: str
-        the type of the results that you need to convert.
-        (`labview` or `picasso`)
-    category: integer
-        the category of your measurements.
-        1: cirrus; 2:climatol; 4:dicycles; 8:etna; 16:forfires;
-        32:photosmog; 64:rurban; 128:sahadust; 256:stratos;
-        512:satellite_overpasses
-    method: str
-        Klett or Raman method for calculating backscatter values.
-        (klett | raman)
     filename: str
-        the path of your results. (wildcards are supported.)
-    output_dir: str
-        the directory for saving the converted netCDF files.
-    range_lim_b: 2-element list
-        range limit for the variables in b-files (b355, b532, b1064). [m]
-    range_lim_e: 2-element list
-        range limit for the variables in e-files (e355, e532). [m]
-    camp_info: str
-        filename of the campaign configuration file.
-        (only the filename is necessary)
-    force: boolean
-        flag to control whether to override the previous results.
-        (default: false)
-    """
+        EARLINET file. The product is taken from the filename (see
+        PRODUCT_PATTERN).
+    spec: dict
+        see `load_validation_spec`.
 
-    p2e_convertor = polly_2_earlinet_convertor(
-        polly_type, location,
-        category=category,
-        method=method,
-        output_dir=output_dir,
-        camp_info_file=camp_info,
-        fileType=file_type,
-        force=force)
+    Returns
+    -------
+    record: OrderedDict
+        verdict of the file with the VALIDATE_FIELDS. status is
+        STATUS_VALID, STATUS_INVALID or STATUS_ERROR (not readable);
+        problems lists the violations.
+    '''
 
-    # search files
-    filePath = os.path.dirname(filename)
-    basename = os.path.basename(filename)
-    fileLists = p2e_convertor.search_data_files(basename, filepath=filePath)
+    metadata = spec['metadata']
+    products = spec['products']
+    match = re.search(PRODUCT_PATTERN, os.path.basename(filename))
+    record = OrderedDict([
+        ('file', filename), ('product', match.group(1) if match else ''),
+        ('status', STATUS_ERROR), ('problems', []), ('time', 0.0)])
+    problems = record['problems']
+    npTypeDict = {
+        'byte': np.byte,
+        'int': np.intc,
+        'float': np.single,
+        'double': np.double
+    }
+    t0 = time.perf_counter()
 
-    # convert all the files
-    for task in fileLists:
-        dims, data, global_attris = p2e_convertor.read_data_file(task)
+    try:
+        with NETCDF_LOCK, Dataset(filename, 'r') as fh:
+            fh.set_auto_maskandscale(False)
+
+            for dimName in metadata['dimensions']:
+                if dimName not in fh.dimensions:
+                    problems.append('missing dimension {0}'.format(dimName))
+                elif (dimName in products['dimensions']) and \
+                        (len(fh.dimensions[dimName]) !=
+                         products['dimensions'][dimName]):
+                    problems.append(
+                        'dimension {0} = {1:d}, expected {2:d}'.format(
+                            dimName, len(fh.dimensions[dimName]),
+                            products['dimensions'][dimName]))
+
+            if not match:
+                problems.append('unknown product')
+            else:
+                for varName in products[record['product']]['variables']:
+                    if varName not in fh.variables:
+                        problems.append(
+                            'missing variable {0}'.format(varName))
+
+            for varName, var in fh.variables.items():
+                if varName not in metadata:
+                    problems.append('unknown variable {0}'.format(varName))
+                    continue
+
+                varMeta = metadata[varName]
+                dtype = np.dtype(npTypeDict[varMeta['dtype']])
+                if var.dtype != dtype:
+                    problems.append('{0}: dtype {1}, expected {2}'.format(
+                        varName, var.dtype, dtype))
+                if var.dimensions != tuple(varMeta['dims']):
+                    problems.append('{0}: dims {1}, expected {2}'.format(
+                        varName, var.dimensions, tuple(varMeta['dims'])))
+
+                attrs = var.ncattrs()
+                for attr, expected in varMeta.items():
+                    if attr in ['dtype', 'dims']:
+                        continue
+                    if attr not in attrs:
+                        problems.append('{0}: missing attribute {1}'.format(
+                            varName, attr))
+                    elif not _same_value(
+                            var.getncattr(attr), expected, dtype):
+                        problems.append(
+                            '{0}: {1} = {2}, expected {3}'.format(
+                                varName, attr, var.getncattr(attr),
+                                expected))
+
+                if (var.size > VALIDATE_MAX_VALUES) or \
+                        (('flag_values' not in varMeta) and
+                         ('valid_range' not in varMeta)):
+                    continue
+
+                values = np.ravel(var[...])
+                if '_FillValue' in varMeta:
+                    values = values[values != np.asarray(
+                        varMeta['_FillValue']).astype(dtype)]
+                if values.dtype.kind == 'f':
+                    values = values[~np.isnan(values)]
+                if 'flag_values' in varMeta:
+                    for value in values[
+                            ~np.isin(values, varMeta['flag_values'])]:
+                        problems.append(
+                            '{0}: value {1} not in flag_values'.format(
+                                varName, value))
+                if 'valid_range' in varMeta:
+                    low, high = varMeta['valid_range']
+                    for value in values[(values < low) | (values > high)]:
+                        problems.append(
+                            '{0}: value {1} outside valid_range'.format(
+                                varName, value))
+
+            if match and ('wavelength' in fh.variables) and \
+                    (fh.variables['wavelength'].size == 1):
+                wavelength = float(
+                    np.ravel(fh.variables['wavelength'][...])[0])
+                if wavelength != products[record['product']]['wavelength']:
+                    problems.append('wavelength {0:g}, expected {1:d}'.format(
+                        wavelength,
+                        products[record['product']]['wavelength']))
+
+            # may be empty (e.g., scc_version before the SCC processing)
+            globalAttrs = fh.ncattrs()
+            for attr in products['global_attributes']:
+                if attr not in globalAttrs:
+                    problems.append(
+                        'missing global attribute {0}'.format(attr))
+
+        record['status'] = STATUS_INVALID if problems else STATUS_VALID
+    except Exception as e:
+        problems.append('{0}: {1}'.format(type(e).__name__, e))
+
+    record['time'] = time.perf_counter() - t0
+
+    return record
+
+
+def validate_files(filename, jobs=None, report='',
+                   metadata_file=METADATA_FILE):
+    '''
+    validate the EARLINET files in parallel (see `validate_file`).
 
-        availProdList = p2e_convertor.list_avail_prodType(data)
+    Parameters
+    ----------
+    filename: str
+        files to validate, with wildcards (e.g., '/data/earlinet/*.nc').
+    jobs: int
+        number of processes (default: number of CPUs).
+    report: str
+        report of the verdicts. (*.json | *.csv)
+    metadata_file: str
+        variable definitions in the config folder.
+
+    Returns
+    -------
+    records: list
+        verdict of each file, in the order of the filenames.
+    '''
 
-        for prod in availProdList:
-            if prod in ['b355', 'b532', 'b1064']:
-                # using range window for backscatter
-                p2e_convertor.write_to_earlinet_nc(
-                    data, dims, global_attris,
-                    range_lim=range_lim_b, prodType=prod)
+    spec = load_validation_spec(metadata_file)
+    fileList = sorted(
+        os.path.abspath(item) for item in glob.glob(filename)
+        if os.path.isfile(item))
+    jobs = jobs or os.cpu_count() or 1
+    t0 = time.perf_counter()
+
+    validate = functools.partial(validate_file, spec=spec)
+    if (jobs > 1) and (len(fileList) > 1):
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # chunks, since a file takes a few milliseconds
+            records = list(executor.map(
+                validate, fileList,
+                chunksize=max(1, len(fileList) // (jobs * 4))))
+    else:
+        records = [validate(item) for item in fileList]
+
+    summary = OrderedDict()
+    for record in records:
+        summary[record['status']] = summary.get(record['status'], 0) + 1
+        if record['status'] != STATUS_VALID:
+            logger.error('{file}: {problems}'.format(
+                file=record['file'], problems='; '.join(record['problems'])))
+    logger.info('Validated {0:d} files in {1:.2f} s{2}'.format(
+        len(records), time.perf_counter() - t0,
+        ' ({0})'.format(', '.join(
+            '{0} {1}'.format(number, status)
+            for status, number in summary.items())) if summary else ''))
+
+    if report:
+        reportRecords = records
+        if os.path.splitext(report)[1].lower() == '.csv':
+            # one column for the problems
+            reportRecords = [
+                OrderedDict(record, problems='; '.join(record['problems']))
+                for record in records]
+        write_run_report(report, reportRecords, fields=VALIDATE_FIELDS)
+
+    return records
+
+
+def summarize_trace(trace_file, top=TRACE_SUMMARY_TOP, name=''):
+    '''
+    print the time of each span name and the slowest spans of a trace file
+    (see `Tracer`).
 
-            elif prod in ['e355', 'e532']:
-                # using range window for extinction
-                p2e_convertor.write_to_earlinet_nc(
-                    data, dims, global_attris,
-                    range_lim=range_lim_e, prodType=prod)
+    Parameters
+    ----------
+    trace_file: str
+        trace file with one span per line.
+    top: int
+        number of the slowest spans.
+    name: str
+        only show the slowest spans with this name (e.g., 'read').
+
+    Returns
+    -------
+    stats: OrderedDict
+        count, total, mean, max and self time of each span name, by the
+        total time. The self time is the time not spent in the child spans.
+    slowest: list
+        the slowest spans, with the self time ('self') and the input file
+        ('file').
+    '''
 
-            else:
-                raise RuntimeError('Unknown product {0}'.format(prod))
+    spans = []
+    with open(trace_file, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                # incomplete line of a running conversion
+                continue
+
+    childTime = {}
+    files = {}
+    for span in spans:
+        if span['parent'] is not None:
+            key = span['trace'], span['parent']
+            childTime[key] = childTime.get(key, 0.0) + span['duration']
+        if span['name'] == 'file':
+            files[span['trace']] = span['attributes'].get('file', '')
+
+    stats = {}
+    for span in spans:
+        # queued writes can overlap with their file
+        span['self'] = max(
+            span['duration'] -
+            childTime.get((span['trace'], span['span']), 0.0), 0.0)
+        span['file'] = files.get(span['trace'], '')
+        spanStats = stats.setdefault(
+            span['name'],
+            OrderedDict([('count', 0), ('total', 0.0), ('mean', 0.0),
+                         ('max', 0.0), ('self', 0.0)]))
+        spanStats['count'] += 1
+        spanStats['total'] += span['duration']
+        spanStats['max'] = max(spanStats['max'], span['duration'])
+        spanStats['self'] += span['self']
+    for spanStats in stats.values():
+        spanStats['mean'] = spanStats['total'] / spanStats['count']
+    stats = OrderedDict(
+        sorted(stats.items(), key=lambda item: -item[1]['total']))
+
+    slowest = sorted(
+        (span for span in spans if (not name) or (span['name'] == name)),
+        key=lambda span: -span['duration'])[:top]
+
+    logger.info('{0:d} spans of {1:d} files in {2}'.format(
+        len(spans), len(files), trace_file))
+    logger.info('{0:<16s}{1:>8s}{2:>12s}{3:>12s}{4:>12s}{5:>12s}'.format(
+        'span', 'count', 'total [s]', 'mean [s]', 'max [s]', 'self [s]'))
+    for spanName, spanStats in stats.items():
+        logger.info(
+            ('{0:<16s}{count:>8d}{total:>12.3f}{mean:>12.3f}{max:>12.3f}' +
+             '{self:>12.3f}').format(spanName, **spanStats))
+    logger.info('Slowest spans:')
+    logger.info('{0:>12s}{1:>12s}  {2:<16s}{3}'.format(
+        'time [s]', 'self [s]', 'span', 'file and attributes'))
+    for span in slowest:
+        logger.info(
+            '{duration:>12.3f}{self:>12.3f}  {name:<16s}{0} {1}'.format(
+                os.path.basename(span['file']),
+                json.dumps(span['attributes'], sort_keys=True), **span))
+
+    return stats, slowest
 
 
 def main():
@@ -2684,7 +7916,8 @@ def main():
         type=int)
     parser.add_argument(
         "-m", "--method",
-        help='choose Klett or Raman method for backscatter values',
+        help='choose Klett or Raman method for backscatter values\n' +
+             '(raman | klett | raman,klett)',
         dest='method', default='raman',
         type=str)
     parser.add_argument(
@@ -2705,6 +7938,12 @@ def main():
         help='setup the height range for the converted b-files. \n' +
              '(e.g., --range_b 200 16000)',
         dest='range_lim_b', type=int, nargs=2, default=[None, None])
+    helpMsg = 'add a named range variant, which is written next to the\n' + \
+              'default files (can be repeated). The name is added to the\n' + \
+              'filenames. (e.g., --variant cut:500:8000:b532,e532)'
+    parser.add_argument(
+        "--variant", help=helpMsg, dest='range_variants',
+        type=parse_range_variant, action='append', default=[])
     helpMsg = 'setup the campaign info file [*.toml].\n' + \
               'If not set, the program will search the config folder for ' + \
               'a suitable one.'
@@ -2714,13 +7953,121 @@ def main():
         "--force",
         help='whether to overwrite the nc files if they exists',
         dest='force', action='store_true')
+    parser.add_argument(
+        "-r", "--recursive",
+        help='search the files in the sub directories of the filename path',
+        dest='recursive', action='store_true')
+    helpMsg = 'only convert the files with the start time in the ' + \
+              'filename\nfrom SINCE on (e.g., --since 2020-05-01 or ' + \
+              '--since "2020-05-01 12:00")'
+    parser.add_argument(
+        "--since", help=helpMsg, dest='since', type=parse_datetime,
+        default=None)
+    helpMsg = 'only convert the files with the start time in the ' + \
+              'filename\nbefore UNTIL (e.g., --until 2020-06-01)'
+    parser.add_argument(
+        "--until", help=helpMsg, dest='until', type=parse_datetime,
+        default=None)
+    helpMsg = 'copy the next PREFETCH files to a local scratch folder\n' + \
+              'during the conversion, for files on network shares\n' + \
+              '(default: 0, no prefetch)'
+    parser.add_argument(
+        "--prefetch", help=helpMsg, dest='prefetch', type=int, default=0)
+    parser.add_argument(
+        "--prefetch_budget",
+        help='maximum size of the prefetched files in MB ' +
+             '(default: {0})'.format(PREFETCH_BUDGET),
+        dest='prefetch_budget', type=float, default=PREFETCH_BUDGET)
+    parser.add_argument(
+        "--scratch_dir",
+        help='local folder for the prefetched files ' +
+             '(default: system temp folder)',
+        dest='scratch_dir', default=None)
+    helpMsg = 'number of background writers for the EARLINET files, so\n' + \
+              'that the next file is read during writing (default: 0)'
+    parser.add_argument(
+        "--writers", help=helpMsg, dest='writers', type=int, default=0)
+    parser.add_argument(
+        "--writer_processes",
+        help='use processes instead of threads as background writers',
+        dest='writer_processes', action='store_true')
+    helpMsg = 'write the result of each finished file to a checkpoint\n' + \
+              'journal, for resuming the run with --resume'
+    parser.add_argument(
+        "--journal", help=helpMsg, dest='journal_file', default='')
+    helpMsg = 'resume the run of the journal. The files which were done\n' + \
+              'are skipped; the failed files are converted again.'
+    parser.add_argument(
+        "--resume", help=helpMsg, dest='resume', default='',
+        metavar='JOURNAL')
+    helpMsg = 'number of processes for converting files in parallel\n' + \
+              '(default: 1)'
+    parser.add_argument(
+        "--jobs", help=helpMsg, dest='jobs', type=int, default=1)
+    helpMsg = 'only start a file when the estimated peak memory of the\n' + \
+              'running files fits into MEMORY_BUDGET MB (default: 0, ' + \
+              'no budget)'
+    parser.add_argument(
+        "--memory_budget", help=helpMsg, dest='memory_budget', type=float,
+        default=0)
+    helpMsg = 'JSON file with the measured peak memory of the previous\n' + \
+              'runs, for calibrating the memory estimates'
+    parser.add_argument(
+        "--memory_model", help=helpMsg, dest='memory_model', default='')
+    helpMsg = 'write the metrics in the Prometheus text format to the\n' + \
+              'file at the end (e.g., for the node exporter)'
+    parser.add_argument(
+        "--metrics_file", help=helpMsg, dest='metrics_file', default='')
+    helpMsg = 'append the spans of each input file to the trace file\n' + \
+              '(JSON lines, see `polly2scc trace-summary`)'
+    parser.add_argument(
+        "--trace", help=helpMsg, dest='trace_file', default='')
+    helpMsg = 'share the files with the other nodes running the same\n' + \
+              'command, by claim files on the shared filesystem'
+    parser.add_argument(
+        "--distributed", help=helpMsg, dest='distributed',
+        action='store_true')
+    parser.add_argument(
+        "--claim_dir",
+        help='shared folder for the claims ' +
+             '(default: {0} in the output folder)'.format(CLAIM_DIR),
+        dest='claim_dir', default='')
+    parser.add_argument(
+        "--claim_stale",
+        help='age of a claim without heartbeat before it is taken over\n' +
+             'by another node in s (default: {0})'.format(CLAIM_STALE),
+        dest='claim_stale', type=float, default=CLAIM_STALE)
+    helpMsg = 'write the status and timings of each file to a report\n' + \
+              '[*.json | *.csv]'
+    parser.add_argument(
+        "--report", help=helpMsg, dest='report', default='')
+    helpMsg = 'convert the files selected from the catalogue instead of\n' + \
+              '--filename. The query is a SQL condition on the columns\n' + \
+              'path, file_type, method, start_time, end_time, system,\n' + \
+              'location, smoothing, products and campaign.\n' + \
+              '(e.g., --query "method = \'raman\' AND ' + \
+              'start_time >= \'2020-05-01\'")'
+    parser.add_argument(
+        "--query", help=helpMsg, dest='query', default='')
+    parser.add_argument(
+        "--catalogue",
+        help='setup the catalogue file (default: {0})'.format(CATALOGUE_FILE),
+        dest='catalogue_file', default=CATALOGUE_FILE)
+    helpMsg = 'setup the directory for the profile store of each file,\n' + \
+              'which can be exported again with `polly2scc export`'
+    parser.add_argument(
+        "--store_dir", help=helpMsg, dest='store_dir', default='')
     parser.add_argument(
         "--version", help='show version', dest='version', action='store_true')
 
     # sub argument
-    helpMsg = "list supported campaign and instruments."
+    helpMsg = "list supported campaign and instruments, index the " + \
+              "archive, export profile stores, run the job queue, " + \
+              "summarize a trace, or validate and upload the EARLINET " + \
+              "files."
     subparsers = parser.add_subparsers(dest='list', help=helpMsg)
 
+    helpMsg = "list supported campaign and instruments."
     list_parser = subparsers.add_parser("list", help=helpMsg)
 
     list_parser.add_argument(
@@ -2739,6 +8086,195 @@ def main():
         dest='flagShowAll',
         action='store_true')
 
+    helpMsg = "index the input files of the archive into the catalogue."
+    index_parser = subparsers.add_parser("index", help=helpMsg)
+
+    index_parser.add_argument(
+        "directories", nargs='+',
+        help='root directories of the labview and Picasso files')
+    index_parser.add_argument(
+        "--catalogue",
+        help='setup the catalogue file (default: {0})'.format(CATALOGUE_FILE),
+        dest='catalogue_file', default=CATALOGUE_FILE)
+    index_parser.add_argument(
+        "-p", "--polly_type",
+        help="instrument type of the labview files", dest='polly_type',
+        default='')
+    index_parser.add_argument(
+        "-l", "--location",
+        help="campaign location of the labview files", dest='location',
+        default='')
+
+    helpMsg = "export the EARLINET files from profile stores."
+    export_parser = subparsers.add_parser("export", help=helpMsg)
+
+    export_parser.add_argument(
+        "-f", "--filename",
+        help='setup the filename of the profile store [*.p2s]',
+        dest='filename', default='')
+    export_parser.add_argument(
+        "-d", "--output_dir",
+        help='setup the directory for the converted files',
+        dest='output_dir', default='')
+    export_parser.add_argument(
+        "--range_e",
+        help='setup the height range for the converted e-files.',
+        dest='range_lim_e', type=int, nargs=2, default=[None, None])
+    export_parser.add_argument(
+        "--range_b",
+        help='setup the height range for the converted b-files.',
+        dest='range_lim_b', type=int, nargs=2, default=[None, None])
+    export_parser.add_argument(
+        "--variant", help='add a named range variant',
+        dest='range_variants', type=parse_range_variant, action='append',
+        default=[])
+    export_parser.add_argument(
+        "--force",
+        help='whether to overwrite the nc files if they exists',
+        dest='force', action='store_true')
+
+    helpMsg = "submit the conversion with the options above to the " + \
+              "job queue."
+    submit_parser = subparsers.add_parser("submit", help=helpMsg)
+
+    submit_parser.add_argument(
+        "--queue",
+        help='setup the job queue file (default: {0})'.format(JOB_QUEUE_FILE),
+        dest='queue_file', default=JOB_QUEUE_FILE)
+    submit_parser.add_argument(
+        "--priority",
+        help='priority class of the job (default: auto, real-time for\n' +
+             'measurements of the last {0:d} days)'.format(
+                 REALTIME_WINDOW.days),
+        dest='priority', choices=['auto'] + PRIORITY_CLASSES,
+        default='auto')
+    submit_parser.add_argument(
+        "--max_attempts",
+        help='attempts before the job is dead-lettered ' +
+             '(default: {0})'.format(JOB_MAX_ATTEMPTS),
+        dest='max_attempts', type=int, default=JOB_MAX_ATTEMPTS)
+
+    helpMsg = "run the jobs of the job queue."
+    worker_parser = subparsers.add_parser("worker", help=helpMsg)
+
+    worker_parser.add_argument(
+        "--queue",
+        help='setup the job queue file (default: {0})'.format(JOB_QUEUE_FILE),
+        dest='queue_file', default=JOB_QUEUE_FILE)
+    worker_parser.add_argument(
+        "--concurrency", help='number of worker processes (default: 1)',
+        dest='concurrency', type=int, default=1)
+    worker_parser.add_argument(
+        "--lease",
+        help='lease of a running job in s (default: {0})'.format(JOB_LEASE),
+        dest='lease', type=float, default=JOB_LEASE)
+    worker_parser.add_argument(
+        "--backoff",
+        help='delay before the first retry of a failed job in s ' +
+             '(default: {0})'.format(JOB_BACKOFF),
+        dest='backoff', type=float, default=JOB_BACKOFF)
+    worker_parser.add_argument(
+        "--drain", help='stop when no job is queued',
+        dest='drain', action='store_true')
+    worker_parser.add_argument(
+        "--metrics_port",
+        help='serve the metrics at http://127.0.0.1:METRICS_PORT/metrics\n' +
+             '(worker i at METRICS_PORT + i)',
+        dest='metrics_port', type=int, default=0)
+    worker_parser.add_argument(
+        "--quota",
+        help='maximum number of running jobs of a priority class for\n' +
+             'all the workers (e.g., --quota backfill=2)',
+        dest='quotas', type=parse_quota, action='append', default=[])
+
+    helpMsg = "show the state and the throughput of the job queue."
+    queue_parser = subparsers.add_parser("queue", help=helpMsg)
+
+    queue_parser.add_argument(
+        "--queue",
+        help='setup the job queue file (default: {0})'.format(JOB_QUEUE_FILE),
+        dest='queue_file', default=JOB_QUEUE_FILE)
+    queue_parser.add_argument(
+        "--requeue_dead", help='queue the dead jobs again',
+        dest='requeue_dead', action='store_true')
+
+    helpMsg = "show the slowest spans of a trace file."
+    trace_parser = subparsers.add_parser("trace-summary", help=helpMsg)
+
+    trace_parser.add_argument(
+        "trace_file", help='trace file written with --trace')
+    trace_parser.add_argument(
+        "--top",
+        help='number of the slowest spans (default: {0:d})'.format(
+            TRACE_SUMMARY_TOP),
+        dest='top', type=int, default=TRACE_SUMMARY_TOP)
+    trace_parser.add_argument(
+        "--name", help='only show the slowest spans with this name',
+        dest='name', default='')
+
+    helpMsg = "check the EARLINET files against the specification."
+    validate_parser = subparsers.add_parser("validate", help=helpMsg)
+
+    validate_parser.add_argument(
+        "-f", "--filename",
+        help='setup the EARLINET files to check (e.g., "/data/*.nc")',
+        dest='filename', default='')
+    validate_parser.add_argument(
+        "--jobs", help='number of processes (default: number of CPUs)',
+        dest='jobs', type=int, default=None)
+    validate_parser.add_argument(
+        "--report", help='write the verdict of each file to a report\n' +
+                         '[*.json | *.csv]',
+        dest='report', default='')
+
+    helpMsg = "upload the EARLINET files to an HTTP endpoint."
+    upload_parser = subparsers.add_parser("upload", help=helpMsg)
+
+    upload_parser.add_argument(
+        "-f", "--filename",
+        help='setup the EARLINET files to upload (e.g., "/data/*.nc")',
+        dest='filename', required=True)
+    upload_parser.add_argument(
+        "--url",
+        help='URL of the endpoint. The files are uploaded to URL/<name>.\n' +
+             'A bearer token is taken from ${0}.'.format(UPLOAD_TOKEN_ENV),
+        dest='url', required=True)
+    upload_parser.add_argument(
+        "--journal",
+        help='journal of the uploads, continued by the next run ' +
+             '(default: {0})'.format(UPLOAD_JOURNAL),
+        dest='journal_file', default=UPLOAD_JOURNAL)
+    upload_parser.add_argument(
+        "--connections",
+        help='number of concurrent uploads (default: {0:d})'.format(
+            UPLOAD_CONNECTIONS),
+        dest='connections', type=int, default=UPLOAD_CONNECTIONS)
+    upload_parser.add_argument(
+        "--max_attempts",
+        help='attempts of each upload (default: {0:d})'.format(
+            UPLOAD_MAX_ATTEMPTS),
+        dest='max_attempts', type=int, default=UPLOAD_MAX_ATTEMPTS)
+    upload_parser.add_argument(
+        "--backoff",
+        help='delay before the first retry in s (default: {0})'.format(
+            UPLOAD_BACKOFF),
+        dest='backoff', type=float, default=UPLOAD_BACKOFF)
+    upload_parser.add_argument(
+        "--report", help='write the result of each upload to a report\n' +
+                         '[*.json | *.csv]',
+        dest='report', default='')
+
+    helpMsg = "serve a local stand-in of the upload endpoint."
+    stub_parser = subparsers.add_parser("upload-stub", help=helpMsg)
+
+    stub_parser.add_argument(
+        "-d", "--output_dir",
+        help='setup the directory for the uploaded files',
+        dest='output_dir', required=True)
+    stub_parser.add_argument(
+        "--port", help='port of the endpoint (default: 8080)',
+        dest='port', type=int, default=8080)
+
     # if no input arguments
     if len(sys.argv) == 1:
         parser.print_help(sys.stderr)
@@ -2753,11 +8289,51 @@ def main():
             'your inputs.\n{message}'.format(message=e.message))
         raise ValueError
 
-    if args.list:
+    if args.list == 'list':
         show_list(
                   args.flagShowCampaign,
                   args.flagShowInstrument,
                   args.flagShowAll)
+    elif args.list == 'index':
+        index_data_files(
+            args.directories, args.catalogue_file,
+            polly_type=args.polly_type, location=args.location)
+    elif args.list == 'export':
+        export_profile_store(
+            args.filename, args.output_dir, args.range_lim_b,
+            args.range_lim_e, force=args.force,
+            range_variants=args.range_variants)
+    elif args.list == 'submit':
+        submit_job(
+            args.queue_file,
+            {key: getattr(args, key) for key in JOB_OPTIONS},
+            max_attempts=args.max_attempts, priority=args.priority)
+    elif args.list == 'worker':
+        run_worker(
+            args.queue_file, concurrency=args.concurrency, lease=args.lease,
+            backoff=args.backoff, drain=args.drain,
+            quotas=dict(args.quotas), metrics_port=args.metrics_port)
+    elif args.list == 'queue':
+        show_queue(args.queue_file, requeue_dead=args.requeue_dead)
+    elif args.list == 'trace-summary':
+        summarize_trace(args.trace_file, top=args.top, name=args.name)
+    elif args.list == 'validate':
+        records = validate_files(
+            args.filename, jobs=args.jobs, report=args.report)
+        if any(record['status'] != STATUS_VALID for record in records):
+            sys.exit(1)
+    elif args.list == 'upload':
+        upload_files(
+            args.filename, args.url, journal_file=args.journal_file,
+            connections=args.connections, max_attempts=args.max_attempts,
+            backoff=args.backoff, report=args.report)
+    elif args.list == 'upload-stub':
+        server = serve_upload_stub(args.output_dir, port=args.port)
+        try:
+            while True:
+                time.sleep(JOB_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            server.shutdown()
     elif args.version:
         _v = VersionInfo('polly2scc').semantic_version()
         logger.info('Version {0}'.format(_v.release_string()))
@@ -2766,7 +8342,19 @@ def main():
         polly2scc(
             args.polly_type, args.location, args.file_type,
             args.category, args.method, args.filename, args.output_dir,
-            args.range_lim_b, args.range_lim_e, args.camp_info, args.force)
+            args.range_lim_b, args.range_lim_e, args.camp_info, args.force,
+            range_variants=args.range_variants, store_dir=args.store_dir,
+            query=args.query, catalogue_file=args.catalogue_file,
+            recursive=args.recursive, since=args.since, until=args.until,
+            prefetch=args.prefetch, prefetch_budget=args.prefetch_budget,
+            scratch_dir=args.scratch_dir, writers=args.writers,
+            writer_processes=args.writer_processes, report=args.report,
+            journal_file=args.resume or args.journal_file,
+            resume=bool(args.resume), distributed=args.distributed,
+            claim_dir=args.claim_dir, claim_stale=args.claim_stale,
+            jobs=args.jobs, memory_budget=args.memory_budget,
+            memory_model=args.memory_model, metrics_file=args.metrics_file,
+            trace_file=args.trace_file)
 
 
 # When running through terminal
@@ -0,0 +1,109 @@
+import sys
+import os
+import unittest
+import subprocess
+import numpy as np
+
+projectDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(
+    projectDir, 'include', 'iannis_b-lidar_molecular-de3d2ef2f36b'))
+
+from molecular import rayleigh_depol, raman_scattering, utilities, \
+    rayleigh_scattering
+
+
+class Test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        print('Start to test molecular...')
+
+    @classmethod
+    def tearDownClass(self):
+        print('Finish testing molecular!')
+
+    def test_depol_profile_rayleigh_depol(self):
+        print('---> Test on rayleigh_depol.DepolarizationLidar with profiles')
+
+        lidar = rayleigh_depol.DepolarizationLidar(532, 0.7)
+        temperatures = np.linspace(200, 300, 7)
+
+        delta_profile = lidar.delta_mol_temperature(temperatures)
+
+        self.assertEqual(delta_profile.shape, temperatures.shape)
+        for T, delta in zip(temperatures, delta_profile):
+            self.assertAlmostEqual(
+                delta, lidar.delta_mol_temperature(T), places=14)
+
+    def test_depol_profile_raman_scattering(self):
+        print('---> Test on raman_scattering.DepolarizationLidar ' +
+              'with profiles')
+
+        lidar = raman_scattering.DepolarizationLidar(355, 1.0)
+        temperatures = np.linspace(200, 300, 7)
+
+        delta_profile, x_N2, x_O2 = lidar.delta_mol_temperature(temperatures)
+
+        self.assertEqual(delta_profile.shape, temperatures.shape)
+        for indx, T in enumerate(temperatures):
+            delta, x_N2_T, x_O2_T = lidar.delta_mol_temperature(T)
+            self.assertAlmostEqual(delta_profile[indx], delta, places=14)
+            self.assertAlmostEqual(x_N2[indx], x_N2_T, places=14)
+            self.assertAlmostEqual(x_O2[indx], x_O2_T, places=14)
+
+    def test_optical_depth_profile(self):
+        print('---> Test on cumulative molecular optical depth profiles')
+
+        altitude = np.linspace(0, 30000, 2001)
+        tau, transmission = utilities.atmospheric_optical_depth_profile_us_std(
+            [355, 532], altitude)
+
+        self.assertEqual(tau.shape, (2, altitude.size))
+        self.assertTrue(np.allclose(transmission, np.exp(-2 * tau)))
+        for indx, wavelength in enumerate([355, 532]):
+            self.assertAlmostEqual(
+                tau[indx, -1],
+                utilities.atmospheric_optical_depth_us_std(
+                    wavelength, 0, 30000),
+                places=5)
+
+    def test_molecular_profile(self):
+        print('---> Test on rayleigh_scattering.MolecularProfile')
+
+        pressure = np.linspace(50, 1000, 101)
+        temperature = np.linspace(210, 290, 101)
+        wavelengths = [355, 532, 1064]
+
+        profile = rayleigh_scattering.MolecularProfile(pressure, temperature)
+        beta_pi = profile.beta_pi(wavelengths)
+        alpha = profile.alpha(wavelengths)
+
+        self.assertEqual(beta_pi.shape, (3, 101))
+        for indx, wavelength in enumerate(wavelengths):
+            self.assertTrue(np.allclose(
+                beta_pi[indx],
+                rayleigh_scattering.beta_pi_rayleigh(
+                    wavelength, pressure=pressure, temperature=temperature),
+                rtol=1e-12, atol=0))
+            self.assertTrue(np.allclose(
+                alpha[indx],
+                rayleigh_scattering.alpha_rayleigh(
+                    wavelength, pressure=pressure, temperature=temperature),
+                rtol=1e-12, atol=0))
+
+    def test_no_plotting_import(self):
+        print('---> Test that matplotlib is not loaded at import time')
+
+        code = 'import sys\n' + \
+               'import molecular.rayleigh_depol\n' + \
+               'import molecular.raman_scattering\n' + \
+               'print("matplotlib" in sys.modules)'
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(sys.path)
+        out = subprocess.check_output([sys.executable, '-c', code], env=env)
+
+        self.assertEqual(out.decode('utf-8').strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
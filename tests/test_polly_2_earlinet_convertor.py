@@ -2,6 +2,13 @@ import sys
 import os
 import unittest
 import shutil
+import json
+import hashlib
+import tracemalloc
+import time
+import threading
+import multiprocessing
+import urllib.request
 
 projectDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 tmpDir = os.path.join(projectDir, 'data', 'tmp')
@@ -10,6 +17,20 @@ sys.path.append(os.path.join(projectDir, 'src'))
 from polly2scc import *
 
 
+def convert_distributed(nodeDir):
+    '''
+    one node of the distributed conversion in test_distributed.
+    '''
+
+    records = polly2scc(
+        'arielle', 'leipzig', 'labview', 2, 'raman',
+        os.path.join(tmpDir, 'distributed', '*smooth.txt'), nodeDir,
+        [0, 14000], [0, 15000], '', True, distributed=True,
+        claim_dir=os.path.join(tmpDir, 'claims'), claim_stale=60)
+
+    return [record['file'] for record in records]
+
+
 class Test(unittest.TestCase):
 
     @classmethod
@@ -80,6 +101,92 @@ class Test(unittest.TestCase):
             '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'
         )
 
+    def test_iter_data_files(self):
+        print('---> Test on the recursive search with time window')
+
+        archiveDir = os.path.join(tmpDir, 'archive')
+        fileList = [
+            os.path.join('2019', '07', '23',
+                         'le_arielle-20190723_2100-0058-49smooth.txt'),
+            os.path.join('2020', '05', '06',
+                         '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_' +
+                         'profiles.nc'),
+            os.path.join('2020', '06', '01',
+                         '2020_06_01_Mon_TROPOS_12_00_01_1200_1259_' +
+                         'profiles.nc'),
+            os.path.join('misc', 'profiles_without_time_profiles.nc')]
+        for item in fileList:
+            os.makedirs(os.path.dirname(os.path.join(archiveDir, item)))
+            open(os.path.join(archiveDir, item), 'w').close()
+
+        self.assertTupleEqual(
+            filename_time('2020_05_06_Wed_TROPOS_00_00_01_0000_0059_' +
+                          'profiles.nc'),
+            (datetime(2020, 5, 6), datetime(2020, 5, 7)))
+        self.assertEqual(
+            filename_time('le_arielle-20190723_2100-0058-49smooth.txt')[0],
+            datetime(2019, 7, 23, 21, 0))
+
+        found = list(iter_data_files(
+            archiveDir, '*_profiles.nc', recursive=True))
+        self.assertListEqual(
+            found, [os.path.join(archiveDir, item) for item in fileList[1:]])
+        self.assertListEqual(
+            list(iter_data_files(archiveDir, '*_profiles.nc')), [])
+
+        p2eConvertor = polly_2_earlinet_convertor(fileType='picasso')
+        found = p2eConvertor.iter_data_files(
+            '*', filepath=archiveDir, recursive=True,
+            since=datetime(2020, 5, 6, 12), until=datetime(2020, 6, 1))
+        self.assertFalse(isinstance(found, list))
+        self.assertListEqual(
+            list(found), [os.path.join(archiveDir, fileList[1])])
+
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_datetime('06.05.2020')
+
+        shutil.rmtree(archiveDir)
+
+    def test_prefetch(self):
+        print('---> Test on prefetching the input files')
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'arielle', 'leipzig', fileType='labview')
+        fileList = p2eConvertor.search_data_files(
+            '*smooth.txt', filepath=os.path.join(projectDir, 'data'))
+        scratchDir = os.path.join(tmpDir, 'scratch')
+        os.mkdir(scratchDir)
+
+        # budget below the file size: one file after the other
+        prefetcher = InputPrefetcher(
+            fileList, p2eConvertor.input_files, depth=2, budget=1,
+            scratch_dir=scratchDir)
+        tasks = []
+        for task, localFile in prefetcher:
+            tasks.append(task)
+            self.assertEqual(len(os.listdir(scratchDir)), 1)
+            self.assertEqual(os.path.dirname(os.path.dirname(localFile)),
+                             scratchDir)
+            for item, localItem in zip(
+                    p2eConvertor.input_files(task),
+                    p2eConvertor.input_files(localFile)):
+                with open(item, 'rb') as fh, open(localItem, 'rb') as lfh:
+                    self.assertEqual(fh.read(), lfh.read())
+
+        self.assertListEqual(tasks, fileList)
+        self.assertListEqual(os.listdir(scratchDir), [])
+        self.assertEqual(prefetcher.stats()['files'], len(fileList))
+
+        outputDir = os.path.join(tmpDir, 'prefetch')
+        os.mkdir(outputDir)
+        polly2scc(
+            'arielle', 'leipzig', 'labview', 1, 'raman',
+            os.path.join(projectDir, 'data', 'le_*smooth.txt'), outputDir,
+            [0, 15000], [0, 15000], '', True,
+            prefetch=2, scratch_dir=scratchDir)
+        self.assertEqual(len(os.listdir(outputDir)), 5)
+        self.assertListEqual(os.listdir(scratchDir), [])
+
     def test_convert_labview_file(self):
         print('---> Test on convert labview file')
 
@@ -172,6 +279,1196 @@ class Test(unittest.TestCase):
             self.assertTrue(os.path.exists(b1064))
             os.remove(b1064)
 
+    def test_picasso_output_checksums(self):
+        print('---> Test on bitwise-equal output of the picasso sample')
+
+        with open(os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles_' +
+                'checksums.json'), 'r') as fh:
+            refChecksums = json.load(fh)
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'PollyXT_TROPOS', 'leipzig',
+            fileType='picasso', category=1,
+            output_dir=tmpDir,
+            force=True)
+        dims, data, global_attris = p2eConvertor.read_data_file(
+            os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'))
+
+        for prod in sorted(refChecksums.keys()):
+            ncFile = p2eConvertor.write_to_earlinet_nc(
+                    data, dims, global_attris,
+                    range_lim=[0, 15000], prodType=prod)
+
+            with Dataset(ncFile, 'r') as fh:
+                fh.set_auto_maskandscale(False)
+                # no variable is dropped
+                self.assertSetEqual(
+                    set(fh.variables), set(refChecksums[prod]), msg=prod)
+                for varname in fh.variables:
+                    values = np.ascontiguousarray(fh.variables[varname][:])
+                    checksum = hashlib.sha1(
+                        values.dtype.str.encode('utf-8') +
+                        values.tobytes()).hexdigest()
+                    self.assertEqual(
+                        checksum, refChecksums[prod][varname],
+                        msg='{0}: {1}'.format(prod, varname))
+            os.remove(ncFile)
+
+    def test_write_behind(self):
+        print('---> Test on writing in the background')
+
+        with open(os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles_' +
+                'checksums.json'), 'r') as fh:
+            refChecksums = json.load(fh)
+
+        outputDir = os.path.join(tmpDir, 'write_behind')
+        os.mkdir(outputDir)
+        p2eConvertor = polly_2_earlinet_convertor(
+            'PollyXT_TROPOS', 'leipzig',
+            fileType='picasso', category=1,
+            output_dir=outputDir,
+            force=True)
+        dims, data, global_attris = p2eConvertor.read_data_file(
+            os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'))
+
+        # one pending write at most
+        writeQueue = WriteBehindQueue(writers=1, maxsize=1)
+        for prod in sorted(refChecksums.keys()):
+            writeQueue.submit(
+                p2eConvertor, data, dict(dims), global_attris,
+                range_lim=[0, 15000], prodType=prod)
+        fileList = writeQueue.flush()
+        self.assertEqual(len(fileList), len(refChecksums))
+
+        for prod, ncFile in zip(sorted(refChecksums.keys()), fileList):
+            with Dataset(ncFile, 'r') as fh:
+                fh.set_auto_maskandscale(False)
+                for varname in fh.variables:
+                    values = np.ascontiguousarray(fh.variables[varname][:])
+                    checksum = hashlib.sha1(
+                        values.dtype.str.encode('utf-8') +
+                        values.tobytes()).hexdigest()
+                    self.assertEqual(
+                        checksum, refChecksums[prod][varname],
+                        msg='{0}: {1}'.format(prod, varname))
+
+        # failed writes are reported by flush
+        writeQueue.submit(
+            p2eConvertor, data, dict(dims), global_attris,
+            range_lim=[0, 15000], prodType='b2000')
+        with self.assertRaises(RuntimeError):
+            writeQueue.close()
+        self.assertDictEqual(
+            writeQueue.stats(),
+            dict(written=5, failed=1, blocked=writeQueue.blockTime))
+
+        # the output directory is created without asking in the writers
+        p2eConvertor.outputDir = os.path.join(outputDir, 'missing')
+        thread = threading.Thread(target=p2eConvertor.check_output_dir)
+        thread.start()
+        thread.join()
+        self.assertTrue(os.path.isdir(p2eConvertor.outputDir))
+
+    def test_batch_report(self):
+        print('---> Test on the per-file results of a batch')
+
+        batchDir = os.path.join(tmpDir, 'batch')
+        outputDir = os.path.join(tmpDir, 'batch_output')
+        os.mkdir(batchDir)
+        os.mkdir(outputDir)
+        for suffix in ['smooth.txt', 'smooth-info.txt']:
+            shutil.copy(
+                os.path.join(
+                    projectDir, 'data',
+                    'le_arielle-20190723_2100-0058-49' + suffix),
+                batchDir)
+        # without info file
+        shutil.copy(
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            os.path.join(
+                batchDir, 'le_arielle-20190723_2200-0058-49smooth.txt'))
+        # broken file
+        with open(os.path.join(
+                batchDir,
+                'le_arielle-20190723_2300-0058-49smooth.txt'), 'w') as fh:
+            fh.write('broken')
+        shutil.copy(
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth-info.txt'),
+            os.path.join(
+                batchDir, 'le_arielle-20190723_2300-0058-49smooth-info.txt'))
+
+        reportFile = os.path.join(tmpDir, 'batch_report.json')
+        records = polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(batchDir, '*smooth.txt'), outputDir,
+            [0, 14000], [0, 15000], '', False, report=reportFile)
+
+        self.assertListEqual(
+            [record['status'] for record in records],
+            [STATUS_CONVERTED, STATUS_ERROR, STATUS_ERROR])
+        self.assertEqual(records[0]['written'], 5)
+        self.assertEqual(records[1]['message'], 'no labview info file')
+        self.assertTrue(records[2]['message'].startswith('IndexError'))
+        with open(reportFile, 'r') as fh:
+            report = json.load(fh)
+        self.assertDictEqual(report['summary'], {'converted': 1, 'error': 2})
+        self.assertListEqual(report['files'], records)
+
+        # existing files are not overwritten
+        reportFile = os.path.join(tmpDir, 'batch_report.csv')
+        records = polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(batchDir, '*smooth.txt'), outputDir,
+            [0, 14000], [0, 15000], '', False, report=reportFile,
+            writers=1)
+
+        self.assertEqual(records[0]['status'], STATUS_SKIPPED_EXISTING)
+        self.assertEqual(records[0]['skipped'], 5)
+        with open(reportFile, 'r') as fh:
+            rows = list(csv.DictReader(fh))
+        self.assertListEqual(
+            [row['status'] for row in rows],
+            [STATUS_SKIPPED_EXISTING, STATUS_ERROR, STATUS_ERROR])
+
+    def test_resume(self):
+        print('---> Test on resuming a run from the journal')
+
+        batchDir = os.path.join(tmpDir, 'resume')
+        os.mkdir(batchDir)
+        for suffix in ['smooth.txt', 'smooth-info.txt']:
+            shutil.copy(
+                os.path.join(
+                    projectDir, 'data',
+                    'le_arielle-20190723_2100-0058-49' + suffix),
+                batchDir)
+        # without info file
+        shutil.copy(
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            os.path.join(
+                batchDir, 'le_arielle-20190723_2200-0058-49smooth.txt'))
+
+        journalFile = os.path.join(tmpDir, 'resume.journal')
+        polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(batchDir, '*smooth.txt'), batchDir,
+            [0, 14000], [0, 15000], '', True, journal_file=journalFile,
+            writers=1)
+
+        with open(journalFile, 'r') as fh:
+            journal = [json.loads(line) for line in fh]
+        self.assertListEqual(
+            [record['status'] for record in journal],
+            [STATUS_CONVERTED, STATUS_ERROR])
+
+        # interrupted while writing the journal
+        with open(journalFile, 'a') as fh:
+            fh.write('{"file": ')
+        # done files are not read again
+        os.remove(os.path.join(
+            batchDir, 'le_arielle-20190723_2100-0058-49smooth.txt'))
+        shutil.copy(
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth-info.txt'),
+            os.path.join(
+                batchDir, 'le_arielle-20190723_2200-0058-49smooth-info.txt'))
+
+        records = polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(batchDir, '*smooth.txt'), batchDir,
+            [0, 14000], [0, 15000], '', True, journal_file=journalFile,
+            resume=True)
+
+        self.assertListEqual(
+            [record['file'] for record in records],
+            [record['file'] for record in journal])
+        self.assertDictEqual(records[0], journal[0])
+        self.assertEqual(records[1]['status'], STATUS_CONVERTED)
+        self.assertTrue(RunJournal(journalFile, resume=True).is_done(
+            records[1]['file']))
+
+    def test_job_queue(self):
+        print('---> Test on the job queue')
+
+        queueFile = os.path.join(tmpDir, 'jobs.sqlite')
+        jobDir = os.path.join(tmpDir, 'jobs')
+        os.mkdir(jobDir)
+        for suffix in ['smooth.txt', 'smooth-info.txt']:
+            shutil.copy(
+                os.path.join(
+                    projectDir, 'data',
+                    'le_arielle-20190723_2100-0058-49' + suffix),
+                jobDir)
+        options = {
+            'polly_type': 'arielle', 'location': 'leipzig',
+            'file_type': 'labview', 'category': 2, 'method': 'raman',
+            'filename': os.path.join(jobDir, '*smooth.txt'),
+            'output_dir': jobDir, 'range_lim_b': [0, 14000],
+            'range_lim_e': [0, 15000], 'camp_info': '', 'force': True}
+
+        # leases
+        jobQueue = JobQueue(queueFile, backoff=0.5)
+        jobId = jobQueue.submit(options)
+        job = jobQueue.claim('worker1', lease=-1)
+        self.assertEqual(job['id'], jobId)
+        self.assertDictEqual(job['options'], options)
+        # expired lease is claimed by the next worker
+        job = jobQueue.claim('worker2')
+        self.assertEqual(job['attempts'], 2)
+        self.assertIsNone(jobQueue.claim('worker1'))
+        # the heartbeat of worker1 stops its job after the current file
+        from polly2scc import _renew_lease
+        lostEvent = threading.Event()
+        _renew_lease(queueFile, jobId, 'worker1', 0.3, threading.Event(),
+                     lostEvent)
+        self.assertTrue(lostEvent.is_set())
+        self.assertFalse(jobQueue.complete(jobId, 'worker1'))
+        self.assertTrue(jobQueue.fail(jobId, 'worker2', message='test'))
+        stats = jobQueue.stats()
+        self.assertListEqual(
+            [stats[state] for state in JOB_STATES], [1, 0, 0, 0])
+        self.assertGreater(stats['oldest_wait'], 0)
+        # not before the back-off
+        self.assertIsNone(jobQueue.claim('worker1'))
+        jobQueue.close()
+
+        # without info file
+        badFile = os.path.join(
+            tmpDir, 'le_arielle-20190723_2200-0058-49smooth.txt')
+        shutil.copy(
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            badFile)
+        badJob = submit_job(
+            queueFile, dict(options, filename=badFile), max_attempts=2)
+
+        nJobs = run_worker(queueFile, backoff=0, poll_interval=0.1,
+                           drain=True)
+        self.assertEqual(nJobs, 3)
+        stats = show_queue(queueFile)
+        self.assertEqual(stats['done'], 1)
+        self.assertEqual(stats['dead'], 1)
+        self.assertEqual(stats['files_per_hour'], 1.0)
+        jobQueue = JobQueue(queueFile)
+        deadJobs = jobQueue.jobs('dead')
+        self.assertEqual(deadJobs[0]['id'], badJob)
+        self.assertEqual(deadJobs[0]['attempts'], 2)
+        self.assertIn('no labview info file', deadJobs[0]['message'])
+        self.assertEqual(jobQueue.requeue(), 1)
+        jobQueue.close()
+        self.assertEqual(
+            len([filename for filename in os.listdir(jobDir)
+                 if filename.endswith('.nc')]), 5)
+
+    def test_distributed(self):
+        print('---> Test on distributing the files over processes')
+
+        inputDir = os.path.join(tmpDir, 'distributed')
+        os.mkdir(inputDir)
+        fileList = []
+        for hour in range(12, 20):
+            basename = 'le_arielle-20190723_{0:02d}00-0058-49'.format(hour)
+            for suffix in ['smooth.txt', 'smooth-info.txt']:
+                shutil.copy(
+                    os.path.join(
+                        projectDir, 'data',
+                        'le_arielle-20190723_2100-0058-49' + suffix),
+                    os.path.join(inputDir, basename + suffix))
+            fileList.append(os.path.join(inputDir, basename + 'smooth.txt'))
+
+        # claim of a crashed node
+        claims = FileClaims(
+            os.path.join(tmpDir, 'claims'), owner='crashed', stale=60)
+        self.assertTrue(claims.claim(fileList[3]))
+        self.assertFalse(claims.claim(fileList[3]))
+        # failed files are released for a retry, not marked as done
+        self.assertTrue(claims.claim(fileList[4]))
+        claims.write({'file': fileList[4], 'status': STATUS_ERROR})
+        self.assertFalse(claims.is_done(fileList[4]))
+        self.assertFalse(
+            os.path.exists(claims._path(fileList[4], '.claim')))
+        claims._stopEvent.set()
+        claimFile = claims._path(fileList[3], '.claim')
+        os.utime(claimFile, (time.time() - 120, time.time() - 120))
+
+        nodeDirs = [os.path.join(tmpDir, 'node{0:d}'.format(iNode))
+                    for iNode in range(3)]
+        for nodeDir in nodeDirs:
+            os.mkdir(nodeDir)
+        with multiprocessing.Pool(3) as pool:
+            nodeFiles = pool.map(convert_distributed, nodeDirs)
+
+        # no file converted twice
+        self.assertListEqual(
+            sorted(sum(nodeFiles, [])), sorted(fileList))
+        self.assertFalse(os.path.exists(claimFile))
+        for filename in fileList:
+            self.assertTrue(claims.is_done(filename))
+        with open(claims._path(fileList[3], '.done'), 'r') as fh:
+            self.assertNotEqual(json.load(fh)['owner'], 'crashed')
+
+    def test_memory_budget(self):
+        print('---> Test on the parallel conversion with a memory budget')
+
+        memoryModel = MemoryModel(model={'labview': (1000, 2.0)})
+        self.assertEqual(memoryModel.estimate('labview', 500), 2000)
+        memoryModel.observe('labview', 500, 3000)
+        memoryModel.observe('labview', 1000, 1500)
+        self.assertEqual(memoryModel.estimate('labview', 500), 3000)
+        # single outliers are ignored by the calibration
+        memoryModel = MemoryModel(model={'labview': (1000, 2.0)})
+        for iSample in range(19):
+            memoryModel.observe('labview', 500, 2000)
+        memoryModel.observe('labview', 500, 8000)
+        self.assertEqual(memoryModel.estimate('labview', 500), 2000)
+
+        inputDir = os.path.join(tmpDir, 'parallel')
+        outputDir = os.path.join(tmpDir, 'parallel_output')
+        os.mkdir(inputDir)
+        os.mkdir(outputDir)
+        with open(os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth-info.txt'),
+                'r', encoding='utf-8', errors='ignore') as fh:
+            info = fh.read()
+        fileList = []
+        for hour in range(12, 16):
+            basename = 'le_arielle-20190723_{0:02d}00-0058-49'.format(hour)
+            shutil.copy(
+                os.path.join(
+                    projectDir, 'data',
+                    'le_arielle-20190723_2100-0058-49smooth.txt'),
+                os.path.join(inputDir, basename + 'smooth.txt'))
+            # other start time for other output files
+            with open(os.path.join(inputDir, basename + 'smooth-info.txt'),
+                      'w', encoding='utf-8') as fh:
+                fh.write(info.replace(
+                    '190723 2100', '190723 {0:02d}00'.format(hour)))
+            fileList.append(os.path.join(inputDir, basename + 'smooth.txt'))
+
+        modelFile = os.path.join(tmpDir, 'memory_model.json')
+        records = polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(inputDir, '*smooth.txt'), outputDir,
+            [0, 14000], [0, 15000], '', True, jobs=2, memory_budget=1,
+            memory_model=modelFile)
+
+        self.assertListEqual(
+            [record['file'] for record in records], fileList)
+        self.assertListEqual(
+            [record['status'] for record in records], [STATUS_CONVERTED] * 4)
+        self.assertEqual(len(os.listdir(outputDir)), 20)
+        if process_memory()[0] is not None:
+            with open(modelFile, 'r') as fh:
+                self.assertEqual(len(json.load(fh)['labview']), 4)
+
+    def test_priority_classes(self):
+        print('---> Test on the priority classes of the job queue')
+
+        queueFile = os.path.join(tmpDir, 'priority.sqlite')
+        jobQueue = JobQueue(queueFile)
+        backfill = [jobQueue.submit({'filename': 'a'}),
+                    jobQueue.submit({'filename': 'b'})]
+        realtime = [
+            jobQueue.submit({'filename': 'c'}, priority='realtime',
+                            measured=datetime(2020, 5, 6, 0, 0)),
+            jobQueue.submit({'filename': 'd'}, priority='realtime',
+                            measured=datetime(2020, 5, 6, 1, 0))]
+
+        # the most recent real-time job first
+        quotas = {'backfill': 1}
+        self.assertTrue(jobQueue.is_waiting('realtime', quotas=quotas))
+        self.assertListEqual(
+            [jobQueue.claim('worker', quotas=quotas)['id']
+             for iJob in range(3)],
+            [realtime[1], realtime[0], backfill[0]])
+        # quota of the backfill jobs
+        self.assertIsNone(jobQueue.claim('worker', quotas=quotas))
+        self.assertFalse(jobQueue.is_waiting('backfill', quotas=quotas))
+        self.assertTrue(jobQueue.release(backfill[0], 'worker'))
+        self.assertEqual(jobQueue.claim('worker')['attempts'], 1)
+
+        for jobId in realtime:
+            jobQueue.complete(jobId, 'worker')
+        stats = jobQueue.stats()
+        self.assertListEqual(list(stats['latency'].keys()), ['realtime'])
+        self.assertListEqual(
+            list(stats['latency']['realtime'].keys()), ['p50', 'p90', 'p99'])
+        jobQueue.close()
+
+        # a running job only takes the waiting real-time job after idle
+        # workers could take it, and only one worker takes it
+        jobQueue = JobQueue(os.path.join(tmpDir, 'preempt.sqlite'))
+        jobId = jobQueue.submit({'filename': 'e'}, priority='realtime')
+        jobQueue.submit({'filename': 'f'})
+        self.assertIsNone(jobQueue.claim(
+            'worker1', priorities=['realtime'], waited=60))
+        time.sleep(0.2)
+        self.assertEqual(jobQueue.claim(
+            'worker1', priorities=['realtime'], waited=0.1)['id'], jobId)
+        self.assertIsNone(jobQueue.claim('worker2', priorities=['realtime']))
+        self.assertEqual(jobQueue.claim('worker2')['priority'], 'backfill')
+        jobQueue.close()
+
+        self.assertEqual(
+            parse_quota('backfill=2'), ('backfill', 2))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_quota('urgent=2')
+        self.assertEqual(
+            measurement_time({'filename': os.path.join(
+                tmpDir, 'le_arielle-20190723_2100-0058-49smooth.txt')}),
+            datetime(2019, 7, 23, 21, 0))
+
+        # preempted after the first file, and continued from the journal
+        inputDir = os.path.join(tmpDir, 'preempt')
+        os.mkdir(inputDir)
+        for suffix in ['smooth.txt', 'smooth-info.txt']:
+            shutil.copy(
+                os.path.join(
+                    projectDir, 'data',
+                    'le_arielle-20190723_2100-0058-49' + suffix),
+                inputDir)
+        shutil.copy(
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            os.path.join(
+                inputDir, 'le_arielle-20190723_2200-0058-49smooth.txt'))
+        journalFile = os.path.join(tmpDir, 'preempt.journal')
+        for nRecords in [1, 2]:
+            records = polly2scc(
+                'arielle', 'leipzig', 'labview', 2, 'raman',
+                os.path.join(inputDir, '*smooth.txt'), inputDir,
+                [0, 14000], [0, 15000], '', True,
+                journal_file=journalFile, resume=True,
+                preempt=lambda: True)
+            self.assertEqual(len(records), nRecords)
+
+    def test_metrics(self):
+        print('---> Test on the metrics in the Prometheus text format')
+
+        registry = MetricsRegistry()
+        registry.inc('polly2scc_files_total', status='converted')
+        registry.inc('polly2scc_files_total', status='converted')
+        registry.observe('polly2scc_stage_seconds', 0.2, stage='read')
+        registry.observe('polly2scc_stage_seconds', 3.0, stage='read')
+        other = MetricsRegistry()
+        other.inc('polly2scc_files_total', status='error')
+        registry.merge(other.snapshot())
+        text = registry.render()
+        self.assertIn(
+            '# TYPE polly2scc_files_total counter\n', text)
+        self.assertIn(
+            'polly2scc_files_total{status="converted"} 2.0\n', text)
+        self.assertIn('polly2scc_files_total{status="error"} 1.0\n', text)
+        self.assertIn(
+            'polly2scc_stage_seconds_bucket{stage="read",le="+Inf"} 2\n',
+            text)
+        self.assertIn(
+            'polly2scc_stage_seconds_count{stage="read"} 2\n', text)
+
+        metrics.reset()
+        metricsFile = os.path.join(tmpDir, 'polly2scc.prom')
+        polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            tmpDir, [0, 14000], [0, 15000], '', True,
+            metrics_file=metricsFile)
+        with open(metricsFile, 'r') as fh:
+            text = fh.read()
+        self.assertIn(
+            'polly2scc_files_total{status="converted"} 1.0\n', text)
+        self.assertIn(
+            'polly2scc_products_written_total{product="b532"} 1.0\n', text)
+        self.assertIn('polly2scc_written_bytes_total ', text)
+
+        server = serve_metrics(0)
+        try:
+            url = 'http://127.0.0.1:{0:d}/metrics'.format(
+                server.server_address[1])
+            with urllib.request.urlopen(url) as response:
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.read().decode('utf-8'),
+                                 metrics.render())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_trace(self):
+        print('---> Test on the tracing spans of each input file')
+
+        traceFile = os.path.join(tmpDir, 'polly2scc.trace')
+        polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            tmpDir, [0, 14000], [0, 15000], '', True, writers=2,
+            trace_file=traceFile)
+        self.assertFalse(tracer.enabled)
+
+        with open(traceFile, 'r') as fh:
+            spans = [json.loads(line) for line in fh]
+        spanIds = {span['span']: span for span in spans}
+        for span in spans:
+            # one tree, also for the spans of the writer threads
+            self.assertEqual(span['trace'], spans[0]['trace'])
+            if span['name'] != 'file':
+                self.assertIn(span['parent'], spanIds)
+        self.assertListEqual(
+            sorted(set(span['name'] for span in spans)),
+            ['discover', 'file', 'molecular', 'read', 'read_data',
+             'read_info', 'regrid', 'write_nc', 'write_product'])
+        fileSpan = [span for span in spans if span['name'] == 'file'][0]
+        self.assertEqual(fileSpan['attributes']['status'], STATUS_CONVERTED)
+        self.assertEqual(fileSpan['attributes']['written'], 5)
+        readSpan = [span for span in spans if span['name'] == 'read'][0]
+        self.assertEqual(readSpan['attributes']['bins'], 1974)
+
+        stats, slowest = summarize_trace(traceFile, top=3)
+        self.assertEqual(stats['write_product']['count'], 5)
+        self.assertEqual(len(slowest), 3)
+        self.assertGreaterEqual(
+            slowest[0]['duration'], slowest[-1]['duration'])
+        stats, slowest = summarize_trace(traceFile, name='write_nc')
+        self.assertListEqual(
+            [span['name'] for span in slowest], ['write_nc'] * 5)
+
+    def test_upload(self):
+        print('---> Test on uploading the EARLINET files')
+
+        uploadDir = os.path.join(tmpDir, 'upload')
+        serverDir = os.path.join(tmpDir, 'upload_server')
+        os.mkdir(uploadDir)
+        for index in range(3):
+            with open(os.path.join(
+                    uploadDir, 'file_{0:d}.nc'.format(index)), 'wb') as fh:
+                fh.write(os.urandom(100000 + index))
+        pattern = os.path.join(uploadDir, '*.nc')
+        journalFile = os.path.join(tmpDir, 'upload.journal')
+
+        server = serve_upload_stub(serverDir)
+        try:
+            url = 'http://127.0.0.1:{0:d}/earlinet'.format(
+                server.server_address[1])
+
+            # retried after the failures of the endpoint
+            server.fail_next = 2
+            records = upload_files(
+                pattern, url, journal_file=journalFile, connections=2,
+                backoff=0.01,
+                report=os.path.join(tmpDir, 'upload_report.csv'))
+            self.assertListEqual(
+                [record['status'] for record in records],
+                [STATUS_UPLOADED] * 3)
+            self.assertEqual(
+                sum(record['attempts'] for record in records), 5)
+            self.assertLessEqual(server.nConnections, 2)
+            for record in records:
+                with open(record['file'], 'rb') as fh1, open(os.path.join(
+                        serverDir, os.path.basename(record['file'])),
+                        'rb') as fh2:
+                    self.assertEqual(fh1.read(), fh2.read())
+
+            # done by the journal, except the changed file
+            self.assertListEqual(
+                upload_files(pattern, url, journal_file=journalFile), [])
+            with open(os.path.join(uploadDir, 'file_0.nc'), 'ab') as fh:
+                fh.write(b'changed')
+            records = upload_files(pattern, url, journal_file=journalFile)
+            self.assertListEqual(
+                [os.path.basename(record['file']) for record in records],
+                ['file_0.nc'])
+
+            # the endpoint has the same files
+            os.remove(journalFile)
+            records = upload_files(pattern, url, journal_file=journalFile)
+            self.assertListEqual(
+                [record['status'] for record in records],
+                [STATUS_UPLOAD_EXISTS] * 3)
+
+            # not retried
+            server.token = 'secret'
+            os.remove(journalFile)
+            records = upload_files(
+                pattern, url, journal_file=journalFile, token='wrong')
+            self.assertListEqual(
+                [(record['status'], record['attempts'])
+                 for record in records], [(STATUS_ERROR, 1)] * 3)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_validate(self):
+        print('---> Test on validating the EARLINET files')
+
+        outputDir = os.path.join(tmpDir, 'validate')
+        os.mkdir(outputDir)
+        polly2scc(
+            'arielle', 'leipzig', 'labview', 2, 'raman',
+            os.path.join(
+                projectDir, 'data',
+                'le_arielle-20190723_2100-0058-49smooth.txt'),
+            outputDir, [0, 14000], [0, 15000], '', True)
+        records = validate_files(os.path.join(outputDir, '*.nc'), jobs=2)
+        self.assertEqual(len(records), 5)
+        for record in records:
+            self.assertEqual(record['status'], STATUS_VALID, record)
+
+        # spec violations
+        brokenFile = os.path.join(
+            outputDir, '20190723_2100_0366_lei_arielle_b532.nc')
+        with Dataset(brokenFile, 'a') as fh:
+            fh.variables['backscatter'].units = 'km'
+            fh.variables['cirrus_contamination'][...] = 5
+            fh.delncattr('PI')
+        shutil.copy(
+            os.path.join(
+                outputDir, '20190723_2100_0366_lei_arielle_b355.nc'),
+            os.path.join(outputDir, 'copy_b532.nc'))
+        with open(os.path.join(outputDir, 'broken_e355.nc'), 'w') as fh:
+            fh.write('broken')
+        reportFile = os.path.join(tmpDir, 'validate.csv')
+        records = validate_files(
+            os.path.join(outputDir, '*.nc'), jobs=1, report=reportFile)
+        verdicts = {os.path.basename(record['file']): record
+                    for record in records}
+        self.assertListEqual(
+            verdicts['20190723_2100_0366_lei_arielle_b532.nc']['problems'],
+            ['backscatter: units = km, expected 1/(m*sr)',
+             'cirrus_contamination: value 5 not in flag_values',
+             'missing global attribute PI'])
+        self.assertListEqual(
+            verdicts['copy_b532.nc']['problems'],
+            ['wavelength 355, expected 532'])
+        self.assertEqual(
+            verdicts['broken_e355.nc']['status'], STATUS_ERROR)
+        self.assertEqual(
+            verdicts['20190723_2100_0366_lei_arielle_e532.nc']['status'],
+            STATUS_VALID)
+        self.assertTrue(os.path.isfile(reportFile))
+
+    def test_multi_method(self):
+        print('---> Test on converting Raman and Klett results in one pass')
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'PollyXT_TROPOS', 'leipzig',
+            fileType='picasso', category=1, method='raman,klett',
+            output_dir=tmpDir,
+            force=True)
+        dims, dataMethods, global_attris = \
+            p2eConvertor.read_data_file_methods(
+                os.path.join(
+                    projectDir, 'data',
+                    '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'))
+
+        self.assertListEqual(list(dataMethods.keys()), ['raman', 'klett'])
+        self.assertIn('assumed_particle_lidar_ratio', dataMethods['klett'])
+        self.assertNotIn('assumed_particle_lidar_ratio', dataMethods['raman'])
+        self.assertFalse(np.array_equal(
+            dataMethods['raman']['bsc_532'], dataMethods['klett']['bsc_532']))
+        self.assertIs(
+            dataMethods['raman']['molecular_profile'],
+            dataMethods['klett']['molecular_profile'])
+
+        for method, data in dataMethods.items():
+            b532 = p2eConvertor.write_to_earlinet_nc(
+                data, dict(dims), global_attris,
+                range_lim=[0, 15000], prodType='b532')
+            self.assertTrue(
+                os.path.basename(b532).endswith(
+                    '_{0}_b532.nc'.format(method)))
+            os.remove(b532)
+
+        # the extinction products are only written from the Raman method
+        written, skipped = write_products(
+            p2eConvertor, dims, dataMethods, global_attris,
+            [0, 15000], [0, 5000])
+        filenames = sorted(
+            os.path.basename(filename).split('_pollyxt_tropos_')[1]
+            for filename, future in written)
+        self.assertListEqual(
+            filenames,
+            ['klett_b1064.nc', 'klett_b355.nc', 'klett_b532.nc',
+             'raman_b1064.nc', 'raman_b355.nc', 'raman_b532.nc',
+             'raman_e355.nc', 'raman_e532.nc'])
+        for filename, future in written:
+            os.remove(filename)
+
+    def test_range_variants(self):
+        print('---> Test on range variants')
+
+        self.assertTupleEqual(
+            parse_range_variant('cut:500:8000:b532,e532'),
+            ('cut', [500, 8000], ['b532', 'e532']))
+        self.assertTupleEqual(
+            parse_range_variant('low:0:2000'), ('low', [0, 2000], None))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_range_variant('bad_name:0:2000')
+        for spec in ['cut:0:2000:b533', 'klett:0:2000', 'e532:0:2000']:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_range_variant(spec)
+
+        variantDir = os.path.join(tmpDir, 'variants')
+        os.mkdir(variantDir)
+        polly2scc(
+            'PollyXT_TROPOS', 'leipzig', 'picasso', 1, 'raman',
+            os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'),
+            variantDir,
+            [0, 14000], [0, 15000], 'Leipzig_campaign_info_9.toml', True,
+            range_variants=[('cut', [500, 8000], ['b532'])])
+
+        fileList = sorted(os.listdir(variantDir))
+        self.assertEqual(len(fileList), 6)
+        self.assertIn(
+            '20200506_0029_0458_lei_pollyxt_tropos_cut_b532.nc', fileList)
+        with Dataset(os.path.join(
+                variantDir,
+                '20200506_0029_0458_lei_pollyxt_tropos_cut_b532.nc')) as fh:
+            altitude = fh.variables['altitude'][:]
+        self.assertGreaterEqual(altitude.min(), 500)
+        self.assertLessEqual(altitude.max(), 8000)
+
+    def test_profile_store(self):
+        print('---> Test on exporting from the profile store')
+
+        with open(os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles_' +
+                'checksums.json'), 'r') as fh:
+            refChecksums = json.load(fh)
+
+        storeDir = os.path.join(tmpDir, 'store')
+        exportDir = os.path.join(tmpDir, 'export')
+        os.mkdir(storeDir)
+        os.mkdir(exportDir)
+        polly2scc(
+            'PollyXT_TROPOS', 'leipzig', 'picasso', 1, 'raman',
+            os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'),
+            storeDir,
+            [0, 15000], [0, 15000], '', True, store_dir=storeDir)
+
+        storeFile = os.path.join(
+            storeDir,
+            '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.p2s')
+        info, dims, dataMethods, global_attris = \
+            read_profile_store(storeFile)
+        self.assertListEqual(info['methods'], ['raman'])
+        self.assertIsInstance(dataMethods['raman'], ProfileContainer)
+        self.assertNotIn('molecular_profile', dataMethods['raman'])
+
+        export_profile_store(
+            storeFile, exportDir, [0, 15000], [0, 15000], force=True)
+
+        fileList = sorted(os.listdir(exportDir))
+        self.assertEqual(len(fileList), len(refChecksums))
+        for prod in sorted(refChecksums.keys()):
+            ncFile = [item for item in fileList
+                      if item.endswith('_{0}.nc'.format(prod))][0]
+            with Dataset(os.path.join(exportDir, ncFile), 'r') as fh:
+                fh.set_auto_maskandscale(False)
+                for varname in fh.variables:
+                    values = np.ascontiguousarray(fh.variables[varname][:])
+                    checksum = hashlib.sha1(
+                        values.dtype.str.encode('utf-8') +
+                        values.tobytes()).hexdigest()
+                    self.assertEqual(
+                        checksum, refChecksums[prod][varname],
+                        msg='{0}: {1}'.format(prod, varname))
+
+        # the export follows changes of the campaign info file
+        campInfoFile = os.path.join(tmpDir, 'Leipzig_campaign_info_5.toml')
+        shutil.copy(
+            os.path.join(projectDir, 'config', 'Leipzig_campaign_info_5.toml'),
+            campInfoFile)
+        shutil.rmtree(storeDir)
+        os.mkdir(storeDir)
+        polly2scc(
+            'PollyXT_TROPOS', 'leipzig', 'picasso', 1, 'raman',
+            os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'),
+            storeDir,
+            [None, None], [None, None], campInfoFile, True,
+            store_dir=storeDir)
+        b532 = [item for item in os.listdir(storeDir)
+                if item.endswith('_b532.nc')][0]
+        with Dataset(os.path.join(storeDir, b532), 'r') as fh:
+            altitude = fh.variables['altitude'][:]
+            stationAltitude = float(fh.variables['station_altitude'][0])
+
+        with open(campInfoFile, 'r', encoding='utf-8') as fh:
+            campInfo = toml.loads(fh.read())
+        campInfo['station_altitude'] = stationAltitude + 10
+        campInfo['PI'] = 'New PI'
+        with open(campInfoFile, 'w', encoding='utf-8') as fh:
+            toml.dump(campInfo, fh)
+
+        export_profile_store(
+            storeFile, exportDir, [None, None], [None, None], force=True)
+        with Dataset(os.path.join(exportDir, b532), 'r') as fh:
+            self.assertEqual(fh.PI, 'New PI')
+            self.assertEqual(
+                float(fh.variables['station_altitude'][0]),
+                stationAltitude + 10)
+            self.assertTrue(np.allclose(
+                fh.variables['altitude'][:], altitude + 10))
+
+    def test_archive_catalogue(self):
+        print('---> Test on the archive catalogue')
+
+        catalogueFile = os.path.join(tmpDir, 'catalogue.sqlite')
+        dataDir = os.path.join(projectDir, 'data')
+        counts = index_data_files(
+            [dataDir], catalogueFile, polly_type='arielle',
+            location='leipzig')
+        self.assertEqual(counts['indexed'], 3)
+
+        # nothing changed since the last indexing
+        counts = index_data_files(
+            [dataDir], catalogueFile, polly_type='arielle',
+            location='leipzig')
+        self.assertEqual(counts['indexed'], 0)
+        self.assertEqual(counts['unchanged'], 3)
+
+        catalogue = ArchiveCatalogue(catalogueFile, readonly=True)
+        picassoFile = os.path.join(
+            dataDir, '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc')
+        self.assertListEqual(
+            catalogue.query("method = 'klett'"), [picassoFile])
+        self.assertListEqual(
+            catalogue.query(
+                "start_time >= '2019-07-23' AND start_time < '2019-07-24'",
+                fileType='labview'),
+            [os.path.join(
+                dataDir, 'le_arielle-20190723_2100-0058-49smooth.txt')])
+        row = catalogue.conn.execute(
+            'SELECT system, location, smoothing, products, campaign ' +
+            'FROM inputs WHERE path = ? AND method = ?',
+            (picassoFile, 'raman')).fetchone()
+        catalogue.close()
+        self.assertTupleEqual(
+            row, ('PollyXT_TROPOS', 'Leipzig', 457.5,
+                  'b355,e355,b532,e532,b1064', 'Leipzig_campaign_info_5'))
+
+    def test_molecular_depol(self):
+        print('---> Test on molecular depolarization ratio')
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'arielle', 'leipzig',
+            fileType='labview', category=1,
+            output_dir=tmpDir,
+            force=True)
+
+        fileLists = p2eConvertor.search_data_files(
+            'le_*smooth.txt', filepath=os.path.join(projectDir, 'data')
+        )
+        dims, data, global_attris = p2eConvertor.read_data_file(fileLists[0])
+
+        self.assertEqual(data['mdr_355'].shape, data['altitude'].shape)
+        self.assertTrue(np.all((data['mdr_532'] > 0.003) &
+                               (data['mdr_532'] < 0.01)))
+
+        # sounding (columns 28 and 29, height in m) interpolated onto the
+        # range bins
+        with open(fileLists[0], 'r', errors='ignore') as fh:
+            labviewData = np.loadtxt(fh, skiprows=1)
+        for iRow in [100, 500, 1000, 1500]:
+            self.assertAlmostEqual(
+                np.interp(labviewData[iRow, 27], data['height'],
+                          data['temperature']),
+                labviewData[iRow, 28], delta=0.1)
+        temperature = np.interp(
+            [2000, 5000, 10000], data['height'], data['temperature'])
+        self.assertTrue(np.all(np.diff(temperature) < -10))
+        self.assertGreater(np.ptp(data['mdr_532']), 1e-5)
+
+        b532 = p2eConvertor.write_to_earlinet_nc(
+                data, dims, global_attris,
+                range_lim=[0, 15000], prodType='b532')
+        with Dataset(b532, 'r') as fh:
+            self.assertIn('moleculardepolarization', fh.variables)
+        os.remove(b532)
+
+        # not written without the filter FWHM of the campaign
+        camp_label = os.path.splitext(
+            os.path.basename(p2eConvertor.camp_info_file))[0]
+        p2eConvertor.campaign_dict[camp_label].pop('depol_filter_fwhm_532')
+        with self.assertLogs(logger, 'WARNING') as logs:
+            dims, data, global_attris = p2eConvertor.read_data_file(
+                fileLists[0])
+        self.assertTrue(any(
+            ('depol_filter_fwhm_532' in line) and (camp_label in line)
+            for line in logs.output))
+        self.assertIn('mdr_355', data)
+        self.assertNotIn('mdr_532', data)
+
+        b532 = p2eConvertor.write_to_earlinet_nc(
+                data, dims, global_attris,
+                range_lim=[0, 15000], prodType='b532')
+        with Dataset(b532, 'r') as fh:
+            self.assertNotIn('moleculardepolarization', fh.variables)
+        os.remove(b532)
+
+    def test_molecular_optical_depth(self):
+        print('---> Test on molecular optical depth profiles')
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'arielle', 'leipzig',
+            fileType='labview', category=1,
+            output_dir=tmpDir,
+            force=True)
+
+        fileLists = p2eConvertor.search_data_files(
+            'le_*smooth.txt', filepath=os.path.join(projectDir, 'data')
+        )
+        dims, data, global_attris = p2eConvertor.read_data_file(fileLists[0])
+
+        # filled by the reader
+        for wavelength in WAVELENGTHS:
+            self.assertEqual(data['mol_od_{0:d}'.format(wavelength)].shape,
+                             data['altitude'].shape)
+        self.assertEqual(data['mol_od_355'][0], 0)
+        self.assertTrue(np.all(np.diff(data['mol_od_355']) > 0))
+        self.assertTrue(np.all(data['mol_od_355'] >= data['mol_od_532']))
+        self.assertTrue(np.allclose(
+            data['mol_trans_532'], np.exp(-2 * data['mol_od_532'])))
+
+        # close to the US standard atmosphere
+        self.assertLess(data['pressure'][-1], 200)
+        from molecular.utilities import \
+            atmospheric_optical_depth_profile_us_std
+        tauStd, transStd = atmospheric_optical_depth_profile_us_std(
+            WAVELENGTHS, np.ma.filled(data['altitude'], np.nan))
+        for iWL, wavelength in enumerate(WAVELENGTHS):
+            self.assertTrue(np.allclose(
+                data['mol_od_{0:d}'.format(wavelength)][1:],
+                tauStd[iWL][1:], rtol=0.1),
+                msg='{0:d} nm'.format(wavelength))
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'PollyXT_TROPOS', 'leipzig',
+            fileType='picasso', category=1,
+            output_dir=tmpDir,
+            force=True)
+        dims, data, global_attris = p2eConvertor.read_data_file(
+            os.path.join(
+                projectDir, 'data',
+                '2020_05_06_Wed_TROPOS_00_00_01_0000_0059_profiles.nc'))
+        self.assertTrue(np.allclose(
+            data['mol_trans_1064'], np.exp(-2 * data['mol_od_1064'])))
+
+    def test_molecular_cache(self):
+        print('---> Test on molecular cache')
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'arielle', 'leipzig',
+            fileType='labview', category=1,
+            output_dir=tmpDir,
+            force=True)
+
+        fileLists = p2eConvertor.search_data_files(
+            'le_*smooth.txt', filepath=os.path.join(projectDir, 'data')
+        )
+
+        molecular_cache.clear()
+        dims, data1, global_attris = p2eConvertor.read_data_file(fileLists[0])
+        stats1 = molecular_cache.stats()
+        dims, data2, global_attris = p2eConvertor.read_data_file(fileLists[0])
+        stats2 = molecular_cache.stats()
+
+        # the second file of the same sounding is served from the cache
+        self.assertGreater(stats1['misses'], 0)
+        self.assertEqual(stats2['misses'], stats1['misses'])
+        self.assertGreater(stats2['hits'], stats1['hits'])
+        self.assertTrue(np.array_equal(data1['mdr_532'], data2['mdr_532']))
+        self.assertIs(data1['molecular_profile'], data2['molecular_profile'])
+
+        # least-recently-used entries are discarded
+        cache = MolecularCache(maxsize=2)
+        cache.fetch('a', lambda: 1)
+        cache.fetch('b', lambda: 2)
+        cache.fetch('a', lambda: 1)
+        cache.fetch('c', lambda: 3)
+        self.assertEqual(cache.fetch('b', lambda: 4), 4)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 4, 'size': 2})
+
+        # shared by threads, with one value per key
+        cache = MolecularCache(maxsize=16)
+        values = []
+
+        def fetch(indx):
+            for key in range(8):
+                values.append((key, cache.fetch(key, lambda: object())))
+
+        threads = [threading.Thread(target=fetch, args=(indx,))
+                   for indx in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 64)
+        self.assertEqual(stats['size'], 8)
+        for key in range(8):
+            self.assertEqual(
+                len(set(id(value) for k, value in values if k == key)), 1)
+
+    def test_profile_container(self):
+        print('---> Test on ProfileContainer')
+
+        height = np.arange(5, dtype=np.double)
+        bsc = np.ma.masked_array(
+            np.arange(5, dtype=np.double), mask=[0, 0, 1, 0, 0])
+        data = ProfileContainer(5, {
+            'altitude': height,
+            'bsc_355': bsc,
+            'backscatter_calibration_value_355': 1.5,
+            'latitude': 51.35})
+        data.set_constant('cloud_mask', -127, dtype=np.byte)
+
+        # per-bin quantities are views of one block
+        self.assertIs(
+            data['altitude'].base, np.ma.getdata(data['bsc_355']).base)
+        self.assertTrue(np.array_equal(data['altitude'], height))
+        self.assertListEqual(
+            list(np.ma.getmaskarray(data['bsc_355'])),
+            [False, False, True, False, False])
+
+        # constant-valued profiles are not allocated
+        self.assertEqual(data['cloud_mask'].strides, (0,))
+        self.assertEqual(data['cloud_mask'].dtype, np.byte)
+        self.assertTrue(np.all(data['cloud_mask'][height > 1] == -127))
+
+        # dict compatibility
+        self.assertIn('bsc_355', data.keys())
+        self.assertNotIn('bsc_532', data)
+        self.assertEqual(data['backscatter_calibration_value_355'], 1.5)
+        self.assertEqual(len(data), 5)
+        for indx in range(PROFILE_BLOCK_ROWS):
+            data['ext_{0:d}'.format(indx)] = height * indx
+        del data['bsc_355']
+        self.assertTrue(np.array_equal(data['ext_7'], height * 7))
+        self.assertTrue(np.array_equal(data['altitude'], height))
+        self.assertSetEqual(
+            set(data.as_dict().keys()), set(data.keys()))
+
+        # views keep the data of their key across set, delete and the
+        # allocation of new blocks
+        data = ProfileContainer(3, {'a': np.arange(3.0),
+                                    'b': np.arange(3.0) + 10})
+        viewA = data['a']
+        viewB = data['b']
+        data['a'] = np.arange(3.0) + 20
+        self.assertTrue(np.array_equal(viewB, [10, 11, 12]))
+        self.assertTrue(np.array_equal(viewA, [20, 21, 22]))
+        del data['a']
+        for indx in range(2 * PROFILE_BLOCK_ROWS):
+            data['c_{0:d}'.format(indx)] = np.full(3, -1.0)
+        self.assertTrue(np.array_equal(viewA, [20, 21, 22]))
+        self.assertTrue(np.array_equal(viewB, [10, 11, 12]))
+        self.assertTrue(np.array_equal(data['b'], [10, 11, 12]))
+        data['b'] = np.ma.masked_invalid([np.nan, 1.0, 2.0])
+        self.assertTrue(np.isnan(viewB[0]))
+        self.assertTrue(np.array_equal(viewB[1:], [1, 2]))
+        self.assertEqual(len(data), 1 + 2 * PROFILE_BLOCK_ROWS)
+
+    def test_read_nc_variable(self):
+        print('---> Test on reading packed netCDF variables')
+
+        ncFile = os.path.join(tmpDir, 'packed.nc')
+        with Dataset(ncFile, 'w') as fh:
+            fh.createDimension('x', 5)
+            packed = fh.createVariable('packed', np.int16, ('x',),
+                                       fill_value=-32767)
+            packed.missing_value = np.int16(-1)
+            packed.scale_factor = 0.5
+            packed.add_offset = 100.0
+            packed.set_auto_maskandscale(False)
+            packed[:] = np.array([0, 2, -32767, -1, 4], dtype=np.int16)
+            counts = fh.createVariable('counts', np.int32, ('x',),
+                                       fill_value=-999)
+            counts[:] = np.ma.masked_equal([1, 2, -999, 4, 5], -999)
+
+        with Dataset(ncFile, 'r') as fh:
+            fh.set_auto_maskandscale(False)
+            values = read_nc_variable(fh.variables['packed'])
+            np.testing.assert_array_equal(
+                values, [100.0, 101.0, np.nan, np.nan, 102.0])
+            values = read_nc_variable(fh.variables['counts'])
+            np.testing.assert_array_equal(
+                values, [1, 2, np.nan, 4, 5])
+        with Dataset(ncFile, 'r') as fh:
+            # same as the auto-masking of netCDF4
+            np.testing.assert_array_equal(
+                np.ma.filled(fh.variables['packed'][:], np.nan),
+                [100.0, 101.0, np.nan, np.nan, 102.0])
+
+    def test_range_slice(self):
+        print('---> Test on range_slice')
+
+        p2eConvertor = polly_2_earlinet_convertor('arielle', 'leipzig')
+        altitude = np.arange(100, 15000, 7.5)
+
+        for range_lim in [[0, 15000], [200, 5000], [1000, 1000],
+                          [102.5, 110], [20000, 30000], [None, None]]:
+            binsSlice = p2eConvertor.range_slice(altitude, range_lim)
+            if range_lim[0] is None:
+                flagBins = np.ones(altitude.shape, dtype=bool)
+            else:
+                flagBins = (altitude >= range_lim[0]) & \
+                           (altitude <= range_lim[1])
+            self.assertTrue(
+                np.array_equal(altitude[binsSlice], altitude[flagBins]))
+
+    def test_write_memory(self):
+        print('---> Test on memory allocations of the product writers')
+
+        p2eConvertor = polly_2_earlinet_convertor(
+            'arielle', 'leipzig',
+            fileType='labview', category=1,
+            output_dir=tmpDir,
+            force=True)
+
+        fileLists = p2eConvertor.search_data_files(
+            'le_*smooth.txt', filepath=os.path.join(projectDir, 'data')
+        )
+        dims, data, global_attris = p2eConvertor.read_data_file(fileLists[0])
+
+        # the per-bin variables of the product are views of the profiles,
+        # so that the peak is well below one copy of the ~10 profiles
+        tracemalloc.start()
+        b355 = p2eConvertor.write_to_earlinet_nc(
+                data, dims, global_attris,
+                range_lim=[0, 15000], prodType='b355')
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        os.remove(b355)
+
+        self.assertLess(peak, 5 * data.n_bins * 8)
+
     def test_list_avail_prodType(self):
         print('---> Test on list_avail_prodType')
 